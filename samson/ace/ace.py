@@ -3,21 +3,26 @@ from samson.ace.constraints import IdentityConstraint
 from samson.ace.consequence import Consequence, Requirement
 from samson.ace.exploit import IdentityExploit
 from samson.ace.state import State
+from collections import deque
 
 import logging
 log = logging.getLogger(__name__)
 
 
+def _primitive_classes(primitive) -> list:
+    # Keys may be `State`s rather than primitive classes
+    cls = primitive if isinstance(primitive, type) else type(primitive)
+    return [cls] + list(cls.__bases__)
+
+
+
 def get_runtime_exploits(primitive):
     all_exploits = []
 
     if primitive:
-        for cls in [primitive] + [_ for _ in primitive.__bases__]:
-            if cls in RUNTIME.exploit_mappings:
-                attacks = RUNTIME.exploit_mappings[cls]
-                for attack in attacks:
-                    exploit = RUNTIME.exploits[attack]
-                    all_exploits.append(exploit)
+        for cls in _primitive_classes(primitive):
+            for attack in RUNTIME.exploit_mappings.get(cls, []):
+                all_exploits.append(RUNTIME.exploits[attack])
 
     return all_exploits
 
@@ -27,15 +32,20 @@ def get_runtime_constraints(primitive):
     all_constraints = []
 
     if primitive:
-        for cls in [primitive] + [_ for _ in primitive.__bases__]:
+        for cls in _primitive_classes(primitive):
             if cls in RUNTIME.constraints:
-                constraint = RUNTIME.constraints[cls]
-                all_constraints.append(constraint)
+                all_constraints.append(RUNTIME.constraints[cls])
 
     return all_constraints
 
 
 
+def _node_key(node: tuple) -> tuple:
+    state, removed, keys = node
+    return id(state), frozenset(id(constraint) for constraint in removed), keys
+
+
+
 class AsymmetricKey(State):
     def __init__(self, size):
         super().__init__(constraints=[IdentityConstraint(needed_consequence=Consequence.PLAINTEXT_RECOVERY)], exploits=[])
@@ -140,10 +150,19 @@ class MAC(object):
 
 
 class ACE(object):
-    def __init__(self):
-        self.revealed = set()
+    """
+    Attack Chain Engine. Searches for a chain of exploits from the states revealed to the attacker to the goal.
+    """
+
+    def __init__(self, subgoals: dict=None):
+        """
+        Parameters:
+            subgoals (dict): Solved key recovery sub-goals shared between solvers.
+        """
+        self.revealed = []
         self.goal_state = None
         self.goal_consequence = None
+        self.subgoals = {} if subgoals is None else subgoals
 
 
     def execute(self, func):
@@ -167,7 +186,8 @@ class ACE(object):
 
     # Reveal a state to the attacker
     def reveal(self, state):
-        self.revealed.add(state)
+        if state not in self.revealed:
+            self.revealed.append(state)
 
 
     def taint(self, state):
@@ -177,120 +197,159 @@ class ACE(object):
 
 
 
-    @RUNTIME.report
-    def solve(self):
-        trace_found = False
+    def _solve_key(self, state) -> list:
+        """
+        Solves the KEY_RECOVERY sub-goal for the key of `state`'s owner. Results are memoized by key.
+        """
+        key = getattr(state.owner, 'key', None)
 
-        if len(self.revealed) == 0:
-            raise Exception('No revealed states to analyze')
+        if not isinstance(key, State):
+            return None
+
+        while key.parent:
+            key = key.parent
+
+        if id(key) not in self.subgoals:
+            log.debug('Cannot continue without key. Attempting key recovery.')
+
+            # Mark the sub-goal as unsolvable while we work on it so cycles terminate
+            self.subgoals[id(key)] = (key, None)
+
+            new_solver = ACE(self.subgoals)
+            new_solver.reveal(key)
+            new_solver.goal(key, Consequence.PLAINTEXT_RECOVERY)
 
-        for revealed_state in self.revealed:
             try:
-                current_state = revealed_state
-                exploit_chain = []
-
-                while current_state != None:
-                    has_exploit   = False
-                    return_to_top = False
-                    constraint    = None
-
-                    for exploit in current_state.exploits:
-                        return_to_top = False
-
-                        # See if there are any outstanding constraints that we can solve
-                        while True:
-                            needed_consequences = [other_constraint.needed_consequence for other_constraint in current_state.constraints if other_constraint.prevents_consequence in exploit.requirements and not other_constraint.needed_consequence in current_state.requirements_satisfied]
-                            if needed_consequences:
-
-                                # So far, we only know how to solve KEY_RECOVERY
-                                # TODO: If we solve this, why not just early exit?
-                                if needed_consequences[0] == Consequence.KEY_RECOVERY:
-                                    log.debug('Cannot continue without key. Attempting key recovery.')
-                                    new_solver = ACE()
-
-                                    original_key = current_state.owner.key
-                                    while original_key.parent:
-                                        original_key = original_key.parent
-
-                                    new_solver.reveal(original_key)
-                                    new_solver.goal(original_key, Consequence.PLAINTEXT_RECOVERY)
-
-                                    exploit_chain.append(new_solver.solve())
-                                    current_state.requirements_satisfied.append(Consequence.KEY_RECOVERY)
-
-                                    # Let's restart
-                                    current_state = revealed_state
-                                    return_to_top = True
-                                    break
-                            else:
-                                break
-
-                        if return_to_top:
-                            log.debug('Returning to top')
-                            break
-
-
-                        # Check to make sure we satisfy requirements
-
-                        # Exploit suitability logic:
-                        # 1.a) The exploit directly fulfills the breaking consequence for the constraint
-                        # OR
-                        # 1.b) The exploit is not prevented by the constraint AND there does not exist a constraint that prevents any of the exploits requirements
-                        # 2  ) The exploit's consequence is not prevented by any other constraint
-                        # 3  ) This is the goal state but not the goal consequence
-                        if all([requirement in current_state.requirements_satisfied for requirement in exploit.requirements]) and not needed_consequences:
-                            for constraint in current_state.constraints:
-                                print(f'Needed? {exploit.consequence == constraint.needed_consequence}')
-                                print(f'Directly prevented? {exploit.consequence == constraint.prevents_consequence}')
-                                print(f'Indirectly prevented? {any([constraint.needed_consequence == other_constraint.prevents_consequence for other_constraint in current_state.constraints if other_constraint != constraint])}')
-                                print(f'Is goal? {(current_state.child is None and exploit.consequence != self.goal_consequence)}')
-
-                                print('Provided', exploit.consequence)
-                                print('Needed', constraint.needed_consequence)
-                                print('Evaluated', exploit)
-                                print(constraint)
-                                print(current_state)
-                                print()
-
-                                # See if the attack will work
-                                if (exploit.consequence == constraint.needed_consequence \
-                                        and (exploit.consequence != constraint.prevents_consequence)) \
-                                    and not any([constraint.needed_consequence == other_constraint.prevents_consequence for other_constraint in current_state.constraints if other_constraint != constraint]) \
-                                    and not (current_state.child is None and exploit.consequence != self.goal_consequence):
-
-                                    log.debug(f'{constraint.needed_consequence} reachable with {exploit}')
-                                    has_exploit = True
-
-                                    current_state.remove_constraint(constraint)
-                                    break
-                        else:
-                            # Just so the exception raises correctly
-                            constraint = None
-
-                        # Break out of exploit loop if we're already satisfied
-                        if has_exploit:
-                            break
-
-                    # Did we find _any_ exploits for this state?
-                    if not return_to_top:
-                        if has_exploit:
-                            current_state = current_state.child
-                            exploit_chain.append(exploit)
-                        else:
-                            raise RuntimeError()
-
-                # Full exploit chain
-                trace_found = True
+                self.subgoals[id(key)] = (key, new_solver.solve())
             except RuntimeError:
                 pass
 
-            if trace_found:
-                break
+        return self.subgoals[id(key)][1]
+
+
+    def _successors(self, state, removed: tuple, keys: frozenset):
+        """
+        Yields the nodes reachable from (`state`, `removed`, `keys`) and the exploits used to reach them.
+        """
+        constraints = list(state.constraints)
+        for constraint in removed:
+            if constraint in constraints:
+                constraints.remove(constraint)
+
+        satisfied = state.requirements_satisfied + ([Consequence.KEY_RECOVERY] if id(state) in keys else [])
+
+        # Exploit suitability logic:
+        # 1.a) The exploit directly fulfills the breaking consequence for the constraint
+        # OR
+        # 1.b) The exploit is not prevented by the constraint AND there does not exist a constraint that prevents any of the exploits requirements
+        # 2  ) The exploit's consequence is not prevented by any other constraint
+        # 3  ) This is the goal state but not the goal consequence
+        breakable = [constraint for constraint in constraints if not any([constraint.needed_consequence == other_constraint.prevents_consequence for other_constraint in constraints if other_constraint != constraint])]
+        unmet     = [(idx, constraint) for idx, constraint in enumerate(constraints) if not constraint.needed_consequence in satisfied]
+
+        # Consequences compare with custom, unhashable semantics (e.g. CompositeConsequence), so lookups are
+        # indexed by the identity of each distinct consequence/requirement rather than once per exploit
+        breakers = {}
+        blockers = {}
+
+        def breaker(consequence):
+            if id(consequence) not in breakers:
+                breakers[id(consequence)] = next((constraint for constraint in breakable if consequence == constraint.needed_consequence and consequence != constraint.prevents_consequence), None)
+
+            return breakers[id(consequence)]
+
+
+        def blocking(requirement):
+            if id(requirement) not in blockers:
+                blockers[id(requirement)] = [(idx, constraint.needed_consequence) for idx, constraint in unmet if constraint.prevents_consequence in [requirement]]
+
+            return blockers[id(requirement)]
+
+
+        for exploit in state.exploits:
+            # See if there are any outstanding constraints that we can solve
+            needed_consequences = [needed for _, needed in sorted(dict(item for requirement in exploit.requirements for item in blocking(requirement)).items())]
+
+            if needed_consequences:
+                # So far, we only know how to solve KEY_RECOVERY
+                if needed_consequences[0] == Consequence.KEY_RECOVERY and id(state) not in keys:
+                    key_chain = self._solve_key(state)
+
+                    if key_chain is not None:
+                        yield (state, removed, keys | {id(state)}), key_chain
+
+                continue
+
+
+            if not all([requirement in satisfied for requirement in exploit.requirements]):
+                continue
+
+            if state.child is None and exploit.consequence != self.goal_consequence:
+                continue
+
+            constraint = breaker(exploit.consequence)
+
+            if constraint is not None:
+                log.debug(f'{constraint.needed_consequence} reachable with {exploit}')
+
+                # Only constraints that propagated to the child matter from here on. Dropping the rest lets
+                # paths from different revealed states merge
+                child_removed = tuple(removed_constraint for removed_constraint in removed + (constraint,) if state.child is not None and removed_constraint in state.child.constraints)
+                yield (state.child, child_removed, keys), exploit
+
+
+
+    @RUNTIME.report
+    def solve(self) -> list:
+        """
+        Breadth-first search over (state, removed constraints, recovered keys) nodes starting from each
+        revealed state. Nodes are only expanded once across all revealed states, and key recovery
+        sub-goals are solved once per key.
+
+        Returns:
+            list: Exploit chain. Solved key recovery sub-goals appear as nested chains.
+        """
+        if len(self.revealed) == 0:
+            raise Exception('No revealed states to analyze')
+
+        visited     = set()
+        unfulfilled = None
+
+        for revealed_state in self.revealed:
+            start   = (revealed_state, (), frozenset())
+            parents = {}
+            queue   = deque([start])
+
+            while queue:
+                node     = queue.popleft()
+                node_key = _node_key(node)
+
+                if node_key in visited:
+                    continue
+
+                visited.add(node_key)
+                has_successor = False
+
+                for successor, step in self._successors(*node):
+                    has_successor = True
+                    parents[_node_key(successor)] = (node, step)
+
+                    # Walked past the goal state. Rebuild the chain
+                    if successor[0] is None:
+                        exploit_chain = []
+                        current       = successor
+
+                        while current is not start:
+                            current, step = parents[_node_key(current)]
+                            exploit_chain.append(step)
+
+                        exploit_chain = [exploit for exploit in exploit_chain[::-1] if not issubclass(type(exploit), IdentityExploit)]
+                        return exploit_chain
 
+                    queue.append(successor)
 
-        if not trace_found:
-            raise RuntimeError(f'No suitable exploit found. Last consequence not fulfilled: {constraint.needed_consequence if constraint else "None (no constraint evaluated due to requirements)"}')
+                if not has_successor:
+                    unfulfilled = [constraint.needed_consequence for constraint in node[0].constraints if constraint not in node[1]]
 
 
-        exploit_chain = [exploit for exploit in exploit_chain if not issubclass(type(exploit), IdentityExploit)]
-        return exploit_chain
+        raise RuntimeError(f'No suitable exploit found. Last consequence not fulfilled: {unfulfilled[0] if unfulfilled else "None (no constraint evaluated due to requirements)"}')
@@ -6,6 +6,7 @@ from samson.core.base_object import BaseObject
 from samson.oracles.chosen_plaintext_oracle import ChosenPlaintextOracle
 from samson.analysis.integer_analysis import IntegerAnalysis
 from itertools import groupby
+from functools import lru_cache
 from types import FunctionType
 
 import logging
@@ -21,6 +22,55 @@ WELL_KNOWN_GROUPS = {
 }
 
 
+def _calculate_min_size(size) -> (int, int):
+    min_size     = 0
+    typical_size = 0
+
+    sizes = size.sizes
+    if type(sizes) is int:
+        min_size     += sizes
+        typical_size += sizes
+
+    else:
+        if size.size_type not in [SizeType.ARBITRARY, SizeType.DEPENDENT]:
+            min_size += sizes[0]
+
+        if size.typical:
+            typical_size += size.typical[0]
+
+    return min_size, typical_size
+
+
+@lru_cache(maxsize=None)
+def _ephemeral_sizes(primitive) -> (int, int, int):
+    """
+    Sums the minimum and typical sizes of `primitive`'s ephemeral and auth tag. The third element is how many
+    times the minimum block cipher size has to be added (block cipher modes with DEPENDENT sizes).
+    """
+    min_size     = 0
+    typical_size = 0
+    dependent    = 0
+    all_sizes    = []
+
+    if hasattr(primitive, 'EPHEMERAL') and not primitive.EPHEMERAL.ephemeral_type == EphemeralType.KEY:
+        all_sizes.append(primitive.EPHEMERAL.size)
+
+    if hasattr(primitive, 'AUTH_TAG_SIZE'):
+        all_sizes.append(primitive.AUTH_TAG_SIZE)
+
+
+    for size in all_sizes:
+        component_min, component_typical = _calculate_min_size(size)
+        min_size     += component_min
+        typical_size += component_typical
+
+        if issubclass(primitive, BlockCipherMode) and size.size_type == SizeType.DEPENDENT:
+            dependent += 1
+
+    return min_size, typical_size, dependent
+
+
+
 class Fingerprint(BaseObject):
     def __init__(self, candidates, modes, max_input_analysis, io_relation, block_size):
         self.candidates = candidates
@@ -55,21 +105,41 @@ class Fingerprinter(object):
     NOOP_FILTER  = lambda prim: True
     BASIC_FILTER = lambda prim: prim.USAGE_FREQUENCY != FrequencyType.NEGLIGIBLE and prim.USAGE_TYPE == UsageType.GENERAL
 
-    def __init__(self, oracle: ChosenPlaintextOracle):
-        self.oracle = oracle
+    def __init__(self, oracle: ChosenPlaintextOracle, threads: int=1):
+        """
+        Parameters:
+            oracle (ChosenPlaintextOracle): Oracle to fingerprint.
+            threads                  (int): Number of oracle probes to run concurrently.
+        """
+        self.oracle  = oracle
+        self.threads = threads
+
+
+    def __repr__(self):
+        return f"<Fingerprinter: oracle={self.oracle}, threads={self.threads}>"
+
+    def __str__(self):
+        return self.__repr__()
 
 
     @RUNTIME.report
     def execute(self, initial_filter: FunctionType=BASIC_FILTER, min_input_len: int=1) -> Fingerprint:
-        sample   = self.oracle.request(b'a'*min_input_len)
-        base_len = len(sample)
-        filtered = RUNTIME.search_primitives(initial_filter)
+        # The IO relation and max input probes are independent of each other
+        probes = [
+            lambda: self.oracle.test_io_relation(min_input_len, threads=self.threads),
+            lambda: self.oracle.test_max_input(threads=self.threads)
+        ]
+
+        if self.threads > 1:
+            io_rel_analysis, max_input = RUNTIME.threaded(2)(lambda probe: probe())(probes)
+        else:
+            io_rel_analysis, max_input = [probe() for probe in probes]
 
-        io_rel_analysis  = self.oracle.test_io_relation(min_input_len)
-        io_relation      = io_rel_analysis['io_relation']
-        block_size       = io_rel_analysis['block_size']
+        base_len    = io_rel_analysis['base_len']
+        io_relation = io_rel_analysis['io_relation']
+        block_size  = io_rel_analysis['block_size']
 
-        max_val_analysis = IntegerAnalysis.analyze(self.oracle.test_max_input())
+        max_val_analysis = IntegerAnalysis.analyze(max_input)
 
         modifiers = {}
         if max_val_analysis.n != -1:
@@ -98,58 +168,21 @@ class Fingerprinter(object):
                 log.debug('Max input size looks like Diffie-Hellman modulus')
 
 
-        matching = [match for match in filtered if block_size*8 in match.BLOCK_SIZE and match.IO_RELATION_TYPE == io_relation]
+        matching = RUNTIME.search_primitives(initial_filter, block_size=block_size*8, io_relation=io_relation)
         bc_modes = []
 
 
         # Punish IV/nonce/AEAD primitives if we can prove the output doesn't contain their ephemeral/tag
         # This is only really possible if the output is smaller than their ephemeral/tag
 
-        def calculate_min_size(size):
-            min_size     = 0
-            typical_size = 0
-
-            sizes = size.sizes
-            if type(sizes) is int:
-                min_size     += sizes
-                typical_size += sizes
-
-            else:
-                if size.size_type not in [SizeType.ARBITRARY, SizeType.DEPENDENT]:
-                    min_size += sizes[0]
-
-                if size.typical:
-                    typical_size += size.typical[0]
-
-            return min_size, typical_size
-
-
         # If the primitive is a block cipher mode and its ephemeral/tag is DEPENDENT, we'll want to check
         # against known block ciphers.
-        block_ciphers = [prim for prim in filtered if issubclass(prim, BlockCipher) and block_size*8 in prim.BLOCK_SIZE]
-        minimum_bc    = min([calculate_min_size(block_cipher.BLOCK_SIZE)[0] for block_cipher in block_ciphers]) if block_ciphers else 0
+        block_ciphers = [prim for prim in RUNTIME.search_primitives(initial_filter, block_size=block_size*8) if issubclass(prim, BlockCipher)]
+        minimum_bc    = min([_calculate_min_size(block_cipher.BLOCK_SIZE)[0] for block_cipher in block_ciphers]) if block_ciphers else 0
 
         for match in matching:
-            min_size     = 0
-            typical_size = 0
-            all_sizes    = []
-
-
-            if hasattr(match, 'EPHEMERAL') and not match.EPHEMERAL.ephemeral_type == EphemeralType.KEY:
-                all_sizes.append(match.EPHEMERAL.size)
-
-            if hasattr(match, 'AUTH_TAG_SIZE'):
-                all_sizes.append(match.AUTH_TAG_SIZE)
-
-
-            for size in all_sizes:
-                component_min, component_typical = calculate_min_size(size)
-                min_size     += component_min
-                typical_size += component_typical
-
-                if issubclass(match, BlockCipherMode) and size.size_type == SizeType.DEPENDENT:
-                    min_size += minimum_bc
-
+            min_size, typical_size, dependent = _ephemeral_sizes(match)
+            min_size += minimum_bc * dependent
 
             for size in [min_size, typical_size]:
                 if base_len*8 < size:
@@ -165,7 +198,7 @@ class Fingerprinter(object):
             from samson.block_ciphers.modes.ecb import ECB
 
             log.debug('Block ciphers in candidates. Attempting to find possible block cipher modes')
-            bc_modes = [prim for prim in filtered if issubclass(prim, BlockCipherMode) and not issubclass(prim, StreamingBlockCipherMode)]
+            bc_modes = [prim for prim in RUNTIME.search_primitives(initial_filter) if issubclass(prim, BlockCipherMode) and not issubclass(prim, StreamingBlockCipherMode)]
 
             # Check for ECB
             if self.oracle.test_stateless_blocks(block_size):
@@ -125,6 +125,31 @@ def count_items(items: list) -> dict:
 
 
 
+# Printable bytes roughly ordered by their frequency in English text, source code and encodings like Base64
+ENGLISH_BYTE_ORDER = b' etaoinsrhldcumfpgwybvkxjqzETAOINSRHLDCUMFPGWYBVKXJQZ0123456789.,\n\'"-=:;/_()!?+&%*@#<>[]{}|\\$^~`\t\r'
+
+def frequency_order(alphabet: bytes=bytes(range(256)), order: bytes=ENGLISH_BYTE_ORDER) -> bytes:
+    """
+    Orders an alphabet so its most likely bytes come first. Bytes not in `order` keep their relative order at the end.
+
+    Parameters:
+        alphabet (bytes): Bytes to order.
+        order    (bytes): Bytes from most to least likely.
+
+    Returns:
+        bytes: Ordered alphabet.
+
+    Examples:
+        >>> from samson.analysis.general import frequency_order
+        >>> frequency_order(b'zyx\\x00 ea')
+        b' eayxz\\x00'
+
+    """
+    ranks = {byte: rank for rank, byte in enumerate(order)}
+    return bytes(sorted(alphabet, key=lambda byte: ranks.get(byte, len(order))))
+
+
+
 def chisquare(observed_dict: dict, expected_freq_dict: dict, length_override: int=0) -> float:
     """
     Calculates the Chi-squared score of an `observed_dict` against the `expected_freq_dict`.
@@ -378,37 +403,22 @@ def simulate_until_event(p: float, runs: int, visual: bool=False) -> float:
 
 
 def generate_rc4_bias_map(ciphertexts):
-    bias_map = [{} for i in range(256)]
-
-    for c in ciphertexts:
-        for i, byte in enumerate(c):
-            if byte in bias_map[i]:
-                bias_map[i][byte] = bias_map[i][byte] + 1
-            else:
-                bias_map[i][byte] = 1
-
-    for i,_ in enumerate(bias_map):
-        bias_map[i] = sorted(bias_map[i].items(), key=lambda kv: kv[1], reverse=True)
-
-    return bias_map
+    from samson.analysis.rc4_bias_map import RC4BiasMap
+    bias_map = RC4BiasMap()
+    bias_map.update(ciphertexts)
+    return bias_map.to_list()
 
 
 
-def generate_random_rc4_bias_map(data=b'\x00' * 51, key_size=128, sample_size=2**20):
-    from samson.stream_ciphers.rc4 import RC4
-    ciphertexts = []
+def generate_random_rc4_bias_map(data=b'\x00' * 51, key_size=128, sample_size=2**20, processes=None):
+    from samson.analysis.rc4_bias_map import RC4BiasMap
+    return RC4BiasMap.generate_random(sample_size, data, key_size, processes).to_list()
 
-    for _ in range(sample_size):
-        key = os.urandom(key_size // 8)
-        cipher = RC4(key)
-        ciphertexts.append(cipher.generate(len(data)) ^ data)
 
 
-    return generate_rc4_bias_map(ciphertexts)
+def incremental_rc4_bias_map_gen(filepath, start_idx=0, data=b'\x00' * 51, key_size=128, sample_size=2**30, chunk_size=2**24, processes=None):
+    from samson.analysis.rc4_bias_map import RC4BiasMap
 
-
-
-def incremental_rc4_bias_map_gen(filepath, start_idx=0, data=b'\x00' * 51, key_size=128, sample_size=2**30, chunk_size=2**24):
     if sample_size % chunk_size > 0:
         iteration_mod = 1
     else:
@@ -423,41 +433,39 @@ def incremental_rc4_bias_map_gen(filepath, start_idx=0, data=b'\x00' * 51, key_s
         else:
             mod_sample_size = chunk_size
 
-        bias_map = generate_random_rc4_bias_map(data, key_size, mod_sample_size)
-
-
-        with open(filepath + ".{}".format(i), "w+") as f:
-            f.write(json.dumps(bias_map))
+        bias_map = RC4BiasMap.generate_random(mod_sample_size, data, key_size, processes)
+        bias_map.save(filepath + ".{}".format(i))
 
         del bias_map
 
 
 
 def merge_rc4_bias_map_files(base_path, num):
+    from samson.analysis.rc4_bias_map import RC4BiasMap, BIAS_MAP_MAGIC
     bias_maps = []
 
     for i in range(num):
-        with open("{}.{}".format(base_path, i)) as f:
+        with open("{}.{}".format(base_path, i), 'rb') as f:
             content = f.read()
 
-        bias_maps.append(json.loads(content))
+        # Support chunks written in the legacy JSON format
+        if content.startswith(BIAS_MAP_MAGIC):
+            bias_maps.append(RC4BiasMap.deserialize(content))
+        else:
+            bias_maps.append(json.loads(content))
 
     return merge_rc4_bias_maps(bias_maps)
 
 
 
 def merge_rc4_bias_maps(bias_maps):
-    merged_map = [{} for i in range(256)]
+    from samson.analysis.rc4_bias_map import RC4BiasMap
+    merged_map = RC4BiasMap()
 
     for bias_map in bias_maps:
-        for i,_ in enumerate(bias_map):
-            for k,v in bias_map[i]:
-                if k in merged_map[i]:
-                    merged_map[i][k] += v
-                else:
-                    merged_map[i][k] = v
+        if type(bias_map) is not RC4BiasMap:
+            bias_map = RC4BiasMap.from_list(bias_map)
 
-    for i,_ in enumerate(merged_map):
-        merged_map[i] = sorted(merged_map[i].items(), key=lambda kv: kv[1], reverse=True)
+        merged_map.merge(bias_map)
 
-    return merged_map
+    return merged_map.to_list()
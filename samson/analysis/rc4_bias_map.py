@@ -0,0 +1,286 @@
+from samson.core.base_object import BaseObject
+from samson.utilities.runtime import RUNTIME
+from operator import add
+from array import array
+import struct
+import zlib
+import sys
+import os
+
+# Binary format: magic, (number of positions, sample count), then zlib-compressed little-endian uint64 counters
+BIAS_MAP_MAGIC  = b'SAMSONRC4\x01'
+BIAS_MAP_HEADER = struct.Struct('<HQ')
+
+
+def _random_keystream_counts(params: tuple) -> bytes:
+    data, key_size, sample_size = params
+    bias_map = RC4BiasMap(len(data))
+    bias_map.sample_random(sample_size, data, key_size)
+    return bias_map.serialize()
+
+
+
+class RC4BiasMap(BaseObject):
+    """
+    Streaming accumulator of byte frequencies per position over RC4 ciphertexts/keystreams.
+    Counts are kept in a flat `positions`x256 `array('Q')` so memory is constant regardless of sample size.
+
+    Examples:
+        >>> from samson.analysis.rc4_bias_map import RC4BiasMap
+        >>> bias_map = RC4BiasMap(4)
+        >>> bias_map.update([b'\\x00\\x01', b'\\x00\\x02'])
+        >>> bias_map.most_common(0)
+        [(0, 2)]
+        >>> RC4BiasMap.deserialize(bias_map.serialize()) == bias_map
+        True
+
+    """
+
+    def __init__(self, positions: int=256, counts: array=None, num_samples: int=0):
+        """
+        Parameters:
+            positions     (int): Number of keystream positions to track (at most 256).
+            counts      (array): Initial counters (`positions`*256 uint64s).
+            num_samples   (int): Number of samples already accumulated into `counts`.
+        """
+        if positions > 256:
+            raise ValueError("RC4BiasMap can track at most 256 positions")
+
+        self.positions   = positions
+        self.counts      = counts if counts is not None else array('Q', bytes(8*256*positions))
+        self.num_samples = num_samples
+        self._offsets    = range(0, 256*positions, 256)
+
+
+    def __reprdir__(self):
+        return ['positions', 'num_samples']
+
+
+    def __eq__(self, other: 'RC4BiasMap') -> bool:
+        return type(self) == type(other) and self.positions == other.positions and self.num_samples == other.num_samples and self.counts == other.counts
+
+
+    def __getitem__(self, idx: int) -> array:
+        return self.counts[idx*256:(idx+1)*256]
+
+
+    def update(self, ciphertexts: list):
+        """
+        Accumulates byte frequencies of `ciphertexts`. Bytes beyond `positions` are ignored.
+
+        Parameters:
+            ciphertexts (list): Iterable of bytes-like ciphertexts.
+        """
+        counts  = self.counts
+        offsets = self._offsets
+        num     = 0
+
+        for c in ciphertexts:
+            for idx in map(add, offsets, c):
+                counts[idx] += 1
+
+            num += 1
+
+        self.num_samples += num
+
+
+    def sample_random(self, sample_size: int, data: bytes=None, key_size: int=128):
+        """
+        Encrypts `data` under `sample_size` random keys and accumulates the ciphertexts.
+
+        Parameters:
+            sample_size (int): Number of random keys.
+            data      (bytes): Plaintext. Defaults to null bytes (i.e. the raw keystream).
+            key_size    (int): Key size in bits.
+        """
+        from samson.stream_ciphers.rc4 import RC4
+
+        if data is None:
+            data = bytes(self.positions)
+
+        key_len  = key_size // 8
+        length   = len(data)
+        batch    = 2**12
+        data_int = int.from_bytes(data, 'big')
+
+        for start in range(0, sample_size, batch):
+            num  = min(batch, sample_size-start)
+            keys = os.urandom(key_len*num)
+            keys = [keys[i:i+key_len] for i in range(0, len(keys), key_len)]
+            keystreams = RC4.batch_generate(keys, length)
+
+            if data_int:
+                keystreams = ((int.from_bytes(ks, 'big') ^ data_int).to_bytes(length, 'big') for ks in keystreams)
+
+            self.update(keystreams)
+
+
+    @staticmethod
+    def generate_random(sample_size: int, data: bytes=b'\x00' * 51, key_size: int=128, processes: int=None) -> 'RC4BiasMap':
+        """
+        Generates a bias map from `sample_size` random keys across `processes` workers.
+        Workers return their counters which are merged by summation.
+
+        Parameters:
+            sample_size (int): Number of random keys.
+            data      (bytes): Plaintext.
+            key_size    (int): Key size in bits.
+            processes   (int): Number of worker processes. Defaults to one.
+
+        Returns:
+            RC4BiasMap: Accumulated bias map.
+        """
+        processes = processes or 1
+        bias_map  = RC4BiasMap(len(data))
+
+        if processes == 1:
+            bias_map.sample_random(sample_size, data, key_size)
+            return bias_map
+
+        chunk  = -(-sample_size // processes)
+        params = [(data, key_size, min(chunk, sample_size-i)) for i in range(0, sample_size, chunk)]
+
+        for result in RUNTIME.parallel(processes)(_random_keystream_counts)(params):
+            bias_map.merge(RC4BiasMap.deserialize(result))
+
+        return bias_map
+
+
+    def merge(self, other: 'RC4BiasMap'):
+        """
+        Merges `other` into this bias map in-place. `other` may track fewer positions.
+
+        Parameters:
+            other (RC4BiasMap): Bias map to merge.
+        """
+        if other.positions > self.positions:
+            raise ValueError("Cannot merge a bias map tracking more positions")
+
+        n = len(other.counts)
+        self.counts[:n]   = array('Q', map(add, self.counts[:n], other.counts))
+        self.num_samples += other.num_samples
+
+
+    def __add__(self, other: 'RC4BiasMap') -> 'RC4BiasMap':
+        result = RC4BiasMap(self.positions, array('Q', self.counts), self.num_samples)
+        result.merge(other)
+        return result
+
+
+    def most_common(self, idx: int, n: int=None) -> list:
+        """
+        Returns the most common bytes at position `idx`.
+
+        Parameters:
+            idx (int): Position.
+            n   (int): Number of results. Returns all non-zero counts if not specified.
+
+        Returns:
+            list: List of (byte, count) tuples sorted by count.
+        """
+        items = sorted(((byte, count) for byte, count in enumerate(self[idx]) if count), key=lambda kv: kv[1], reverse=True)
+        return items[:n] if n else items
+
+
+    def to_list(self) -> list:
+        """
+        Converts to the legacy bias map format (list of sorted (byte, count) tuples per position).
+
+        Returns:
+            list: Bias map.
+        """
+        return [self.most_common(i) for i in range(self.positions)] + [[] for _ in range(256-self.positions)]
+
+
+    @staticmethod
+    def from_list(bias_map: list) -> 'RC4BiasMap':
+        """
+        Converts from the legacy bias map format.
+
+        Parameters:
+            bias_map (list): List of (byte, count) pairs per position.
+
+        Returns:
+            RC4BiasMap: Bias map.
+        """
+        result = RC4BiasMap(len(bias_map))
+        counts = result.counts
+
+        for i, items in enumerate(bias_map):
+            for byte, count in items:
+                counts[i*256 + byte] += count
+
+        # Every sample contributes exactly one count to position zero
+        result.num_samples = sum(count for _, count in bias_map[0]) if bias_map else 0
+        return result
+
+
+    def serialize(self) -> bytes:
+        """
+        Serializes the bias map into a compact binary format.
+
+        Returns:
+            bytes: Serialized bias map.
+        """
+        counts = self.counts
+
+        if sys.byteorder == 'big':
+            counts = array('Q', counts)
+            counts.byteswap()
+
+        return BIAS_MAP_MAGIC + BIAS_MAP_HEADER.pack(self.positions, self.num_samples) + zlib.compress(counts.tobytes())
+
+
+    @staticmethod
+    def deserialize(data: bytes) -> 'RC4BiasMap':
+        """
+        Deserializes a bias map from its binary format.
+
+        Parameters:
+            data (bytes): Serialized bias map.
+
+        Returns:
+            RC4BiasMap: Bias map.
+        """
+        if not data.startswith(BIAS_MAP_MAGIC):
+            raise ValueError("Invalid RC4 bias map")
+
+        idx = len(BIAS_MAP_MAGIC)
+        positions, num_samples = BIAS_MAP_HEADER.unpack_from(data, idx)
+
+        counts = array('Q')
+        counts.frombytes(zlib.decompress(data[idx+BIAS_MAP_HEADER.size:]))
+
+        if sys.byteorder == 'big':
+            counts.byteswap()
+
+        if len(counts) != positions*256:
+            raise ValueError("Invalid RC4 bias map")
+
+        return RC4BiasMap(positions, counts, num_samples)
+
+
+    def save(self, filepath: str):
+        """
+        Writes the bias map to `filepath`.
+
+        Parameters:
+            filepath (str): Path to write to.
+        """
+        with open(filepath, 'wb') as f:
+            f.write(self.serialize())
+
+
+    @staticmethod
+    def load(filepath: str) -> 'RC4BiasMap':
+        """
+        Reads a bias map from `filepath`.
+
+        Parameters:
+            filepath (str): Path to read from.
+
+        Returns:
+            RC4BiasMap: Bias map.
+        """
+        with open(filepath, 'rb') as f:
+            return RC4BiasMap.deserialize(f.read())
@@ -1,5 +1,8 @@
 from types import FunctionType
 
+# XOR_TABLES[k] translates a bytes-like object into itself XOR `k`
+XOR_TABLES = [bytes(b ^ k for b in range(256)) for k in range(256)]
+
 class Analyzer(object):
     """
     Base class for all Analyzers.
@@ -38,3 +41,55 @@ class Analyzer(object):
             list: `in_list` sorted and truncated.
         """
         return sorted(in_list, key=lambda item: self.analyze(key(item)), reverse=True)[:num]
+
+
+    def analyze_many(self, candidates: list, top_k: int=None) -> list:
+        """
+        Analyzes many bytes-like objects. Subclasses may prefilter candidates with cheaper statistics
+        and only fully analyze the `top_k` best, assigning zero to the rest.
+
+        Parameters:
+            candidates (list): Bytes-like objects to be analyzed.
+            top_k       (int): Number of candidates to fully analyze. Analyzes all if not specified.
+
+        Returns:
+            list: Scores in the same order as `candidates`.
+        """
+        return [self.analyze(candidate) for candidate in candidates]
+
+
+    def rank_xor_keys(self, column: bytes, top_k: int=None) -> list:
+        """
+        Ranks single-byte XOR keys for `column` from most to least promising. The base implementation
+        has no cheap statistic and returns every key.
+
+        Parameters:
+            column (bytes): Bytes encrypted under the same keystream byte.
+            top_k    (int): Maximum number of keys to return.
+
+        Returns:
+            list: Candidate keys.
+        """
+        return list(range(256))[:top_k]
+
+
+    def analyze_xor_column(self, column: bytes, top_k: int=None) -> list:
+        """
+        Scores all 256 single-byte XOR decryptions of `column`. Only the `top_k` keys
+        ranked by `rank_xor_keys` are fully analyzed; the rest are assigned zero.
+
+        Parameters:
+            column (bytes): Bytes encrypted under the same keystream byte.
+            top_k    (int): Number of keys to fully analyze. Analyzes all if not specified.
+
+        Returns:
+            list: Scores indexed by key.
+        """
+        column = bytes(column)
+        scores = [0.0]*256
+        keys   = self.rank_xor_keys(column, top_k)
+
+        for key, score in zip(keys, self.analyze_many([column.translate(XOR_TABLES[key]) for key in keys])):
+            scores[key] = score
+
+        return scores
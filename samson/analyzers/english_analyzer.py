@@ -1,5 +1,6 @@
 from samson.analyzers.analyzer import Analyzer
 from samson.analysis.general import chisquare
+from samson.utilities.runtime import RUNTIME
 from collections import Counter
 import string
 import re
@@ -11,6 +12,20 @@ ASCII_RANGE     = {k:0 for k in [10, 13] + list(range(20, 127))}
 ASCII_LOWER     = {k:0 for k in bytes(string.ascii_lowercase, 'utf-8')}
 DELIMITER_REGEX = re.compile(b'[?.,! ]')
 
+# Per-byte character class tables (after lowercasing) for `bytes.translate`
+LOWER_TABLE = bytes(range(256)).lower()
+ALPHA_TABLE = bytes([int(b in ASCII_LOWER) for b in LOWER_TABLE])
+ASCII_TABLE = bytes([int(b in ASCII_RANGE) for b in LOWER_TABLE])
+
+# Class tables composed with every single-byte XOR key
+ALPHA_XOR_TABLES = [bytes(ALPHA_TABLE[b ^ k] for b in range(256)) for k in range(256)]
+ASCII_XOR_TABLES = [bytes(ASCII_TABLE[b ^ k] for b in range(256)) for k in range(256)]
+
+
+@RUNTIME.global_cache()
+def _most_common_words() -> frozenset:
+    return frozenset(_eng_data.MOST_COMMON_WORDS)
+
 
 def _num_common_first_letters(words):
     if not len(words):
@@ -28,6 +43,10 @@ def key_count(in_bytes, key):
     return (key, in_bytes.count(key))
 
 
+def character_class_score(alphabet_ratio: float, ascii_ratio: float) -> float:
+    return (((alphabet_ratio + 0.6) ** 9) * 60) * ((ascii_ratio + 0.3) ** 5)
+
+
 class EnglishAnalyzer(Analyzer):
     """
     Analyzer for English text.
@@ -56,7 +75,55 @@ class EnglishAnalyzer(Analyzer):
 
         word_score = sum([len(word) ** (3.5 + (bytes(word, 'utf-8') in delimited_words) * 1) for word in found_words])
 
-        return (word_freq * 2 + 1) * (((alphabet_ratio + 0.6) ** 9) * 60) * ((ascii_ratio + 0.3) ** 5) * (common_words + 1) * (first_letter_freq + 1) * (word_score + 1) * (bigram_score * 25)
+        return (word_freq * 2 + 1) * character_class_score(alphabet_ratio, ascii_ratio) * (common_words + 1) * (first_letter_freq + 1) * (word_score + 1) * (bigram_score * 25)
+
+
+    def analyze_many(self, candidates: list, top_k: int=None) -> list:
+        """
+        Scores many bytes-like objects. If `top_k` is specified, candidates are first ranked by their
+        character class ratios (computed with `bytes.translate`) and only the `top_k` best are fully
+        analyzed. The rest are assigned zero.
+
+        Parameters:
+            candidates (list): Bytes-like objects to be "scored".
+            top_k       (int): Number of candidates to fully analyze.
+
+        Returns:
+            list: Scores in the same order as `candidates`.
+        """
+        if top_k is None or top_k >= len(candidates):
+            return [self.analyze(candidate) for candidate in candidates]
+
+        prefilter = []
+        for candidate in candidates:
+            candidate = bytes(candidate)
+            length    = len(candidate) or 1
+            prefilter.append(character_class_score(candidate.translate(ALPHA_TABLE).count(1) / length, candidate.translate(ASCII_TABLE).count(1) / length))
+
+        scores = [0.0]*len(candidates)
+        for idx in sorted(range(len(candidates)), key=prefilter.__getitem__, reverse=True)[:top_k]:
+            scores[idx] = self.analyze(candidates[idx])
+
+        return scores
+
+
+    def rank_xor_keys(self, column: bytes, top_k: int=None) -> list:
+        """
+        Ranks single-byte XOR keys for `column` by the character class ratios of their decryptions.
+        Each key costs one `bytes.translate` pass per class table and no decryption.
+
+        Parameters:
+            column (bytes): Bytes encrypted under the same keystream byte.
+            top_k    (int): Maximum number of keys to return.
+
+        Returns:
+            list: Candidate keys sorted by descending likelihood.
+        """
+        column = bytes(column)
+        length = len(column) or 1
+        scores = [character_class_score(column.translate(alpha).count(1) / length, column.translate(ascii).count(1) / length) for alpha, ascii in zip(ALPHA_XOR_TABLES, ASCII_XOR_TABLES)]
+
+        return sorted(range(256), key=scores.__getitem__, reverse=True)[:top_k]
 
 
 
@@ -85,7 +152,7 @@ class EnglishAnalyzer(Analyzer):
         first_letter_freq = _num_common_first_letters(delimited_words)
 
         found_words  = _eng_data.TOKENIZE([bytes_lower.decode('latin-1')])
-        common_words = len([word for word in found_words if word in _eng_data.MOST_COMMON_WORDS])
+        common_words = len([word for word in found_words if word in _most_common_words()])
 
         # We divide it by the `length*2` to normalize it since I empirically found that the chisquared of
         # a uniform distribution of `length` bytes tends towards it.
@@ -10,9 +10,10 @@ from .nostradamus_attack import NostradamusAttack
 from .ocb_auth_forgery_attack import OCBAuthForgeryAttack
 from .pkcs1v15_padding_oracle_attack import PKCS1v15PaddingOracleAttack
 from .rc4_prepend_attack import RC4PrependAttack
+from .tmto_attack import TMTOAttack
 from .xor_bitflipping_attack import XORBitflippingAttack
 from .xor_dictionary_attack import XORDictionaryAttack
 from .xor_transposition_attack import XORTranspositionAttack
 
 
-__all__ = ["CBCIVKeyEquivalenceAttack", "CBCPaddingOracleAttack", "CRIMEAttack", "DiffieHellmanSubgroupConfinementAttack", "ECBPrependAttack", "InsecureTwistAttack", "InvalidCurveAttack", "MangersAttack", "NostradamusAttack", "OCBAuthForgeryAttack", "PKCS1v15PaddingOracleAttack", "RC4PrependAttack", "XORBitflippingAttack", "XORDictionaryAttack", "XORTranspositionAttack"]
+__all__ = ["CBCIVKeyEquivalenceAttack", "CBCPaddingOracleAttack", "CRIMEAttack", "DiffieHellmanSubgroupConfinementAttack", "ECBPrependAttack", "InsecureTwistAttack", "InvalidCurveAttack", "MangersAttack", "NostradamusAttack", "OCBAuthForgeryAttack", "PKCS1v15PaddingOracleAttack", "RC4PrependAttack", "TMTOAttack", "XORBitflippingAttack", "XORDictionaryAttack", "XORTranspositionAttack"]
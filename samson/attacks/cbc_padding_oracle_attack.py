@@ -3,6 +3,7 @@ from samson.oracles.padding_oracle import PaddingOracle
 from samson.utilities.runtime import RUNTIME
 from samson.ace.decorators import define_exploit
 from samson.ace.consequence import Consequence, Requirement, Manipulation
+import asyncio
 import struct
 
 import logging
@@ -39,6 +40,27 @@ class CBCPaddingOracleAttack(object):
         self.threads    = threads
 
 
+    def _build_exploit_blocks(self, block: Bytes, preceding_block: Bytes, plaintext: Bytes) -> dict:
+        exploit_blocks = {}
+
+        # Generate candidate blocks
+        for possible_char in self.alphabet:
+            test_byte = struct.pack('B', possible_char)
+            payload   = test_byte + plaintext
+            prefix    = b'\x00' * (self.block_size - len(payload))
+
+            padding = (struct.pack('B', len(payload)) * (len(payload))) ^ payload
+
+            fake_block    = prefix + padding
+            exploit_block = fake_block ^ preceding_block
+            new_cipher    = bytes(exploit_block + block)
+
+            exploit_blocks[new_cipher] = test_byte
+
+        return exploit_blocks
+
+
+
     @RUNTIME.report
     def decrypt(self, ciphertext: bytes, iv: bytes=None) -> Bytes:
         """
@@ -72,22 +94,7 @@ class CBCPaddingOracleAttack(object):
 
             for _ in RUNTIME.report_progress(range(len(block)), desc='Bytes cracked', unit='bytes'):
                 last_working_char = None
-                exploit_blocks    = {}
-
-                # Generate candidate blocks
-                for possible_char in self.alphabet:
-                    test_byte = struct.pack('B', possible_char)
-                    payload   = test_byte + plaintext
-                    prefix    = b'\x00' * (self.block_size - len(payload))
-
-                    padding = (struct.pack('B', len(payload)) * (len(payload))) ^ payload
-
-                    fake_block    = prefix + padding
-                    exploit_block = fake_block ^ preceding_block
-                    new_cipher    = bytes(exploit_block + block)
-
-                    exploit_blocks[new_cipher] = test_byte
-
+                exploit_blocks    = self._build_exploit_blocks(block, preceding_block, plaintext)
 
                 if self.batch_requests:
                     best_block = self.oracle.check_padding([k for k,v in exploit_blocks.items()])
@@ -111,6 +118,44 @@ class CBCPaddingOracleAttack(object):
     execute = decrypt
 
 
+    async def decrypt_async(self, ciphertext: bytes, iv: bytes=None) -> Bytes:
+        """
+        Decrypts the `ciphertext` using an asynchronous CBC padding oracle (e.g. `AsyncPaddingOracle`). All candidates for a byte
+        are sent concurrently, and all blocks are cracked concurrently. The oracle bounds the number of requests in flight.
+
+        Parameters:
+            ciphertext (bytes): Bytes-like ciphertext to be decrypted.
+            iv         (bytes): Initialization vector (or previous ciphertext block) of the ciphertext to crack.
+
+        Returns:
+            Bytes: Plaintext corresponding to the inputted ciphertext.
+        """
+        blocks = Bytes.wrap(ciphertext).chunk(self.block_size)
+        if not iv:
+            iv     = blocks[0]
+            blocks = blocks[1:]
+
+        preceding_blocks = [Bytes.wrap(iv)] + blocks[:-1]
+
+        async def crack_block(block, preceding_block):
+            plaintext = Bytes(b'')
+
+            for _ in range(len(block)):
+                exploit_blocks = self._build_exploit_blocks(block, preceding_block, plaintext)
+                results        = await asyncio.gather(*[self.oracle.check_padding(exploit_block) for exploit_block in exploit_blocks])
+
+                last_working_char = max([byte for byte, correct in zip(exploit_blocks.values(), results) if correct])
+                plaintext         = last_working_char + plaintext
+
+            return plaintext
+
+        plaintexts = await asyncio.gather(*[crack_block(block, preceding_block) for block, preceding_block in zip(blocks, preceding_blocks)])
+        return Bytes(b''.join(plaintexts))
+
+
+    execute_async = decrypt_async
+
+
     def encrypt(self, ciphertext: bytes, new_plaintext: bytes, iv: bytes=None, pad: bool=True) -> Bytes:
         """
         Encrypts the `new_plaintext` using a CBC padding oracle on `ciphertext`.
@@ -1,5 +1,7 @@
 from samson.oracles.oracle import Oracle
 from samson.utilities.bytes import Bytes
+from samson.utilities.runtime import RUNTIME
+from samson.analysis.general import frequency_order
 import struct
 import string
 
@@ -22,16 +24,30 @@ class CRIMEAttack(object):
         * The user has access to a length oracle that takes in arbitrary bytes and outputs the compressed length.
     """
 
-    def __init__(self, oracle: Oracle, alphabet: bytes=alphabet, padding_chars: bytes=padding_chars):
+    def __init__(self, oracle: Oracle, alphabet: bytes=alphabet, padding_chars: bytes=padding_chars, threads: int=1, batch_size: int=None, early_stop: bool=False):
         """
         Parameters:
             oracle (Oracle): A length oracle that takes in arbitrary bytes and outputs the compressed length.
-            alphabet       (bytes): Allowed characters to try.
+            alphabet       (bytes): Allowed characters to try. They're tried in English frequency order.
             padding_chars  (bytes): Characters not likely to show up and can be used as "padding."
+            threads          (int): Number of threads to query the oracle with.
+            batch_size       (int): Number of characters to try at once. Defaults to `threads`.
+            early_stop      (bool): Whether to accept a guess as soon as it compresses smaller than two agreeing guesses instead of trying the whole alphabet.
+                                    Much faster, but a likely-but-wrong character that compresses smaller before the right one is tried is accepted.
         """
         self.oracle = oracle
-        self.alphabet = alphabet
+        self.alphabet = frequency_order(alphabet)
         self.padding_chars = padding_chars
+        self.threads = threads
+        self.batch_size = batch_size
+        self.early_stop = early_stop
+
+
+    def _request_many(self, payloads: list) -> list:
+        if self.threads > 1:
+            return RUNTIME.threaded(threads=self.threads)(self.oracle.request)(payloads)
+
+        return [self.oracle.request(payload) for payload in payloads]
 
 
 
@@ -54,10 +70,26 @@ class CRIMEAttack(object):
         if padding == None:
             raise RuntimeError("No suitable padding found")
 
+        batch_size = self.batch_size or self.threads
+
         ctr = 0
         while (len(plaintext) - len(known_plaintext)) < secret_len:
             log.debug(f'Attempt format of "{(plaintext + b"{}" + padding).decode()}"')
-            padded_sizes = [(struct.pack('B', char), self.oracle.request(plaintext + struct.pack('B', char) + padding + constant_padding)) for char in self.alphabet]
+            padded_sizes = []
+
+            for i in range(0, len(self.alphabet), batch_size):
+                chars  = [struct.pack('B', char) for char in self.alphabet[i:i + batch_size]]
+                sizes  = self._request_many([plaintext + char + padding + constant_padding for char in chars])
+                padded_sizes.extend(zip(chars, sizes))
+
+                # With the right padding, every wrong guess compresses to the same size. Stop as soon as
+                # one guess is strictly smaller than at least two others that agree
+                if self.early_stop:
+                    all_sizes = [size for _, size in padded_sizes]
+                    smallest  = min(all_sizes)
+
+                    if all_sizes.count(smallest) == 1 and any(all_sizes.count(size) > 1 for size in all_sizes if size > smallest):
+                        break
 
             sorted_sizes = sorted(padded_sizes, key=lambda req: req[1])
             log.debug(f'Sizes for iteration {ctr}: {sorted_sizes}')
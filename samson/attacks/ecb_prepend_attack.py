@@ -1,8 +1,7 @@
-from samson.utilities.manipulation import get_blocks
 from samson.utilities.bytes import Bytes
 from samson.oracles.chosen_plaintext_oracle import ChosenPlaintextOracle
+from samson.analysis.general import frequency_order
 from samson.utilities.runtime import RUNTIME
-import struct
 
 import logging
 log = logging.getLogger(__name__)
@@ -20,28 +19,33 @@ class ECBPrependAttack(object):
         * The user's input is prepended to the secret plaintext
     """
 
-    def __init__(self, oracle: ChosenPlaintextOracle):
+    def __init__(self, oracle: ChosenPlaintextOracle, threads: int=1, batch_size: int=None, alphabet: bytes=None):
         """
         Parameters:
             oracle (ChosenPlaintextOracle): An oracle that takes in plaintext and returns the ciphertext.
+            threads                  (int): Number of threads to query the oracle with (synchronous oracles only).
+            batch_size               (int): Number of candidate bytes to send at once. Defaults to `threads` (or the oracle's concurrency for `execute_async`).
+            alphabet               (bytes): Bytes to try first, most likely first. The remaining bytes are tried afterwards. Defaults to English frequency order.
         """
-        self.oracle = oracle
+        self.oracle     = oracle
+        self.threads    = threads
+        self.batch_size = batch_size
 
+        alphabet        = frequency_order() if alphabet is None else bytes(alphabet)
+        self.alphabet   = alphabet + bytes(byte for byte in range(256) if byte not in alphabet)
 
-    @RUNTIME.report
-    def execute(self) -> Bytes:
-        """
-        Executes the attack.
 
-        Parameters:
-            unpad (bool): Whether or not to PKCS7 unpad the result.
-        
-        Returns:
-            Bytes: The recovered plaintext.
-        """
-        baseline   = len(self.oracle.request(b''))
-        block_size = self.oracle.test_io_relation()['block_size']
+    def __repr__(self):
+        return f"<ECBPrependAttack: oracle={self.oracle}, threads={self.threads}, batch_size={self.batch_size}>"
+
+    def __str__(self):
+        return self.__repr__()
+
 
+    def _steps(self, baseline: int, block_size: int, batch_size: int):
+        """
+        Runs the attack as a generator. It yields lists of plaintexts and receives their ciphertexts.
+        """
         plaintexts = []
         for curr_block in RUNTIME.report_progress(range(baseline // block_size), unit='blocks'):
             log.debug(f"Starting iteration {curr_block}")
@@ -53,16 +57,79 @@ class ECBPrependAttack(object):
                 else:
                     payload = plaintexts[-1][curr_byte + 1:]
 
-                one_byte_short = get_blocks(self.oracle.request(payload), block_size=block_size)[curr_block]
+                one_byte_short = None
+
+                for i in range(0, 256, batch_size):
+                    candidates = self.alphabet[i:i + batch_size]
+                    requests   = [payload + plaintext + bytes([candidate]) for candidate in candidates]
 
-                for i in range(256):
-                    curr_byte  = struct.pack('B', i)
-                    ciphertext = self.oracle.request(payload + plaintext + curr_byte)
+                    # The target block rides along with the first batch
+                    if one_byte_short is None:
+                        ciphertext, *ciphertexts = yield [payload] + requests
+                        one_byte_short = bytes(ciphertext[curr_block*block_size:(curr_block+1)*block_size])
+                    else:
+                        ciphertexts = yield requests
 
                     # We're always editing the first block to look like block 'curr_block'
-                    if get_blocks(ciphertext, block_size=block_size)[0] == one_byte_short:
-                        plaintext += curr_byte
+                    first_blocks = {bytes(ciphertext[:block_size]): candidate for ciphertext, candidate in zip(ciphertexts, candidates)}
+
+                    if one_byte_short in first_blocks:
+                        plaintext += bytes([first_blocks[one_byte_short]])
                         break
 
+                else:
+                    # The padding changed under us, so we've run off the end of the secret
+                    return Bytes(b''.join(plaintexts + [plaintext]))
+
             plaintexts.append(plaintext)
         return Bytes(b''.join(plaintexts))
+
+
+    @RUNTIME.report
+    def execute(self) -> Bytes:
+        """
+        Executes the attack.
+
+        Returns:
+            Bytes: The recovered plaintext.
+        """
+        baseline   = len(self.oracle.request(b''))
+        block_size = self.oracle.test_io_relation()['block_size']
+        steps      = self._steps(baseline, block_size, self.batch_size or self.threads)
+
+        if self.threads > 1:
+            request_many = RUNTIME.threaded(threads=self.threads)(self.oracle.request)
+        else:
+            request_many = lambda requests: [self.oracle.request(request) for request in requests]
+
+        try:
+            requests = next(steps)
+
+            while True:
+                requests = steps.send(request_many(requests))
+
+        except StopIteration as stop:
+            return stop.value
+
+
+    @RUNTIME.report
+    async def execute_async(self) -> Bytes:
+        """
+        Executes the attack with an asynchronous oracle (e.g. `AsyncChosenPlaintextOracle`). Each batch of candidates
+        is sent concurrently.
+
+        Returns:
+            Bytes: The recovered plaintext.
+        """
+        baseline   = len(await self.oracle.request(b''))
+        block_size = (await self.oracle.test_io_relation())['block_size']
+        steps      = self._steps(baseline, block_size, self.batch_size or self.oracle.concurrency)
+
+        try:
+            requests = next(steps)
+
+            while True:
+                requests = steps.send(await self.oracle.request_many(requests))
+
+        except StopIteration as stop:
+            return stop.value
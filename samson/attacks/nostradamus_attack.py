@@ -7,6 +7,10 @@ import logging
 log = logging.getLogger(__name__)
 
 
+def _find_collision(collision_func: FunctionType, idx: int, p1: bytes, p2: bytes) -> (int, tuple):
+    return idx, collision_func(p1, p2)
+
+
 class NostradamusAttack(object):
     """
     Performs an precomputed multicollision attack.
@@ -20,13 +24,15 @@ class NostradamusAttack(object):
     # `construction_func` takes in a message and POSSIBLY an IV and outputs a generator that yields the intermediary state
 
 
-    def __init__(self, k: int, collision_func: FunctionType, output_size: int, prefixes: list=None):
+    def __init__(self, k: int, collision_func: FunctionType, output_size: int, prefixes: list=None, checkpoint: str=None, processes: int=1):
         """
         Parameters:
             k               (int): Number of levels the tree will have.
             collision_func (func): Function that finds a collision in the hash function. Should return a tuple (input_bytes1, input_bytes2, colliding_state).
             output_size     (int): Size of the hash output.
             prefixes       (list): List of bytes-like prefixes. These are the starting nodes of the tree. You should set this to values you want to guarantee are in the tree.
+            checkpoint      (str): Name to checkpoint the partially built tree under (see `RUNTIME.checkpoint`).
+            processes       (int): Number of processes to find each level's collisions with. `collision_func` must be picklable if greater than one.
         """
         self.k = k
         self.prefixes = prefixes or [int.to_bytes(i, output_size, 'little') for i in range(2 ** k)]
@@ -36,14 +42,18 @@ class NostradamusAttack(object):
         self.hash_tree = {}
         self.crafted_hash = None
 
-        self._generate_tree()
+        self._generate_tree(checkpoint, processes)
 
 
 
     @RUNTIME.report
-    def _generate_tree(self):
+    def _generate_tree(self, checkpoint: str=None, processes: int=1):
         """
         Builds a binary hash tree of colliding, intermediary Merkle-Damgard construction states.
+
+        Parameters:
+            checkpoint (str): Name to checkpoint the partially built tree under.
+            processes  (int): Number of processes to find each level's collisions with.
         """
         log.debug('Generating hash tree')
         tree = []
@@ -68,10 +78,32 @@ class NostradamusAttack(object):
             solution_tree.append([])
 
 
+        # Resume from the collisions found so far
+        checkpoint = RUNTIME.checkpoint(checkpoint, inputs=(self.k, self.prefixes))
+        start, tree, solution_tree, promoted_prefix = checkpoint.load(default=(0, tree, solution_tree, promoted_prefix))
+
         for i in RUNTIME.report_progress(range(self.k)):
-            for (p1, p2) in tree[i]:
-                p1_suffix, p2_suffix, intermediary_collision = self.collision_func(p1, p2)
-                solution_tree[i].append((p1, p2, p1_suffix, p2_suffix, intermediary_collision))
+            if i < start:
+                continue
+
+            # The pairs of a level are independent. Collisions may be found out of order, but only
+            # the solved prefix of the level is checkpointed
+            pairs = [(self.collision_func, idx, p1, p2) for idx, (p1, p2) in enumerate(tree[i]) if idx >= len(solution_tree[i])]
+
+            if processes > 1 and len(pairs) > 1:
+                solutions = RUNTIME.parallel(processes, starmap=True, chunk_size=1, stream=True)(_find_collision)(pairs)
+            else:
+                solutions = (_find_collision(*pair) for pair in pairs)
+
+            solved = {}
+            for idx, solution in solutions:
+                solved[idx] = solution
+
+                while len(solution_tree[i]) in solved:
+                    p1, p2 = tree[i][len(solution_tree[i])]
+                    p1_suffix, p2_suffix, intermediary_collision = solved.pop(len(solution_tree[i]))
+                    solution_tree[i].append((p1, p2, p1_suffix, p2_suffix, intermediary_collision))
+                    checkpoint.save((i, tree, solution_tree, promoted_prefix))
 
             # Add solutions
             if i < (self.k - 1):
@@ -94,6 +126,8 @@ class NostradamusAttack(object):
 
                 tree[i + 1] = [(next_level_states[sol][-1], next_level_states[sol + 1][-1]) for sol in range(0, len(next_level_states), 2)]
 
+            checkpoint.save((i + 1, tree, solution_tree, promoted_prefix), force=True)
+
         # We're done generating the tree; time to set the output fields
         for layer in solution_tree:
             for p1_init, p2_init, p1_msg, p2_msg, result in layer:
@@ -101,6 +135,7 @@ class NostradamusAttack(object):
                 self.hash_tree[p2_init] = (p1_init, p2_init, p1_msg, p2_msg, result)
 
         self.crafted_hash = solution_tree[-1][0][-1]
+        checkpoint.clear()
 
 
 
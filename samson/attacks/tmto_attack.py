@@ -0,0 +1,329 @@
+from samson.auxiliary.chain_table import ChainTable
+from samson.utilities.runtime import RUNTIME
+from types import FunctionType
+import os
+
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _table_salt(table_index: int, space_bits: int) -> int:
+    return (table_index * _GOLDEN) & ((1 << space_bits) - 1)
+
+
+def _generate_chains(params: tuple) -> bytes:
+    function, space_bits, chain_length, dp_bits, table_index, first, count = params
+    chains = []
+    walk   = _ChainWalker(function, space_bits, chain_length, dp_bits, table_index)
+    mask   = (1 << space_bits) - 1
+
+    for i in range(first, first+count):
+        start = (i * _GOLDEN + 1) & mask
+        end   = walk.endpoint(start)
+
+        if end is not None:
+            chains.append((start, end))
+
+    return ChainTable.from_chains(chains, space_bits, chain_length, dp_bits, table_index).serialize()
+
+
+
+class _ChainWalker(object):
+    """
+    Chain arithmetic of a single table. With `dp_bits`, chains use a single reduction and end on distinguished points
+    (Hellman tables). Otherwise, each column uses its own reduction (rainbow tables).
+    """
+
+    def __init__(self, function: FunctionType, space_bits: int, chain_length: int, dp_bits: int, table_index: int):
+        self.function     = function
+        self.mask         = (1 << space_bits) - 1
+        self.chain_length = chain_length
+        self.dp_mask      = (1 << dp_bits) - 1
+        self.dp_bits      = dp_bits
+        self.salt         = _table_salt(table_index, space_bits)
+
+
+    def reduce(self, output: int, column: int) -> int:
+        if self.dp_bits:
+            return (output ^ self.salt) & self.mask
+
+        return (output ^ ((self.salt + column) & self.mask)) & self.mask
+
+
+    def endpoint(self, start: int) -> int:
+        function, reduce = self.function, self.reduce
+        point = start
+
+        if self.dp_bits:
+            dp_mask = self.dp_mask
+
+            for _ in range(self.chain_length):
+                point = reduce(function(point), 0)
+
+                if not point & dp_mask:
+                    return point
+
+            # Chain is too long (likely cycling); discard it
+            return None
+
+        for column in range(self.chain_length):
+            point = reduce(function(point), column)
+
+        return point
+
+
+    def candidates(self, output: int) -> list:
+        """
+        Returns the (endpoint, column) pairs to look up for `output`.
+        """
+        function, reduce = self.function, self.reduce
+
+        if self.dp_bits:
+            point   = reduce(output, 0)
+            dp_mask = self.dp_mask
+
+            for _ in range(self.chain_length):
+                if not point & dp_mask:
+                    return [(point, None)]
+
+                point = reduce(function(point), 0)
+
+            return []
+
+        results = []
+        for column in range(self.chain_length-1, -1, -1):
+            point = reduce(output, column)
+
+            for next_column in range(column+1, self.chain_length):
+                point = reduce(function(point), next_column)
+
+            results.append((point, column))
+
+        return results
+
+
+    def regenerate(self, start: int, output: int, column: int) -> int:
+        """
+        Walks the chain from `start` looking for a preimage of `output`. Returns None on a false alarm.
+        """
+        function, reduce = self.function, self.reduce
+        point = start
+
+        if column is not None:
+            for i in range(column):
+                point = reduce(function(point), i)
+
+            return point if function(point) == output else None
+
+        for _ in range(self.chain_length):
+            curr = function(point)
+
+            if curr == output:
+                return point
+
+            point = reduce(curr, 0)
+
+            if not point & self.dp_mask:
+                break
+
+        return None
+
+
+
+class A51KeystreamFunction(object):
+    """
+    One-way function mapping (part of) an A5/1 internal state to its first keystream bits.
+    The search space is embedded into the low bits of the 64-bit state (R1 || R2 || R3).
+    """
+
+    def __init__(self, space_bits: int=64, output_bits: int=64, base_state: int=0):
+        """
+        Parameters:
+            space_bits  (int): Number of unknown state bits.
+            output_bits (int): Number of keystream bits.
+            base_state  (int): Known state bits.
+        """
+        self.space_bits  = space_bits
+        self.output_bits = output_bits
+        self.base_state  = base_state & ~((1 << space_bits) - 1)
+
+
+    def __repr__(self):
+        return f"<A51KeystreamFunction: space_bits={self.space_bits}, output_bits={self.output_bits}, base_state={self.base_state}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def __call__(self, point: int) -> int:
+        from samson.stream_ciphers.a51 import A51
+        return A51.from_state(self.base_state | point).generate_bits(self.output_bits)
+
+
+
+class TMTOAttack(object):
+    """
+    Time-memory tradeoff inverting a one-way function over a `space_bits` search space (e.g. recovering an A5/1
+    internal state from keystream). Precomputation builds `num_tables` sorted chain tables which can be
+    saved to and memory-mapped from disk. With `dp_bits`, Hellman tables with distinguished points are used;
+    otherwise, rainbow tables.
+
+    Examples:
+        >>> from samson.attacks.tmto_attack import TMTOAttack
+        >>> function = lambda x: (x * 0x5DEECE66D + 11) % 2**20 ^ 0xBEEF
+        >>> attack = TMTOAttack(function, space_bits=16, chain_length=64, num_chains=2**11)
+        >>> attack.generate_tables()
+        >>> x = attack.tables[0].starts[5]
+        >>> function(attack.invert(function(x))) == function(x)
+        True
+
+    References:
+        "A Cryptanalytic Time-Memory Trade-Off" (https://doi.org/10.1109/TIT.1980.1056220)
+        "Making a Faster Cryptanalytic Time-Memory Trade-Off" (https://doi.org/10.1007/978-3-540-45146-4_36)
+    """
+
+    def __init__(self, function: FunctionType, space_bits: int, chain_length: int, num_chains: int, num_tables: int=1, dp_bits: int=0):
+        """
+        Parameters:
+            function    (func): One-way function taking a point of the search space and returning an int. Must be picklable for parallel precomputation.
+            space_bits   (int): Size of the search space in bits (at most 64).
+            chain_length (int): Chain length (maximum chain length with distinguished points).
+            num_chains   (int): Number of chains per table.
+            num_tables   (int): Number of tables.
+            dp_bits      (int): Number of zero bits that make a point distinguished. Zero uses rainbow tables.
+        """
+        if space_bits > 64:
+            raise ValueError("Search space cannot exceed 64 bits")
+
+        self.function     = function
+        self.space_bits   = space_bits
+        self.chain_length = chain_length
+        self.num_chains   = num_chains
+        self.num_tables   = num_tables
+        self.dp_bits      = dp_bits
+        self.tables       = []
+
+
+    def __repr__(self):
+        return f"<TMTOAttack: space_bits={self.space_bits}, chain_length={self.chain_length}, num_chains={self.num_chains}, num_tables={self.num_tables}, dp_bits={self.dp_bits}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def _walker(self, table: ChainTable) -> _ChainWalker:
+        return _ChainWalker(self.function, table.space_bits, table.chain_length, table.dp_bits, table.table_index)
+
+
+    @RUNTIME.report
+    def generate_tables(self, processes: int=None, directory: str=None):
+        """
+        Precomputes the chain tables. Chains are split into equal batches across `processes` workers.
+
+        Parameters:
+            processes   (int): Number of worker processes. Defaults to one.
+            directory   (str): (Optional) Directory to save the tables to.
+        """
+        processes   = processes or 1
+        self.tables = []
+
+        for table_index in range(self.num_tables):
+            batch  = -(-self.num_chains // processes)
+            params = [(self.function, self.space_bits, self.chain_length, self.dp_bits, table_index, first, min(batch, self.num_chains-first)) for first in range(table_index*self.num_chains, (table_index+1)*self.num_chains, batch)]
+
+            if processes == 1:
+                results = [_generate_chains(param) for param in params]
+            else:
+                results = RUNTIME.parallel(processes)(_generate_chains)(params)
+
+            table = ChainTable.from_chains([], self.space_bits, self.chain_length, self.dp_bits, table_index)
+            for result in results:
+                table = table.merge(ChainTable.deserialize(result))
+
+            self.tables.append(table)
+
+        if directory:
+            self.save_tables(directory)
+
+
+    def save_tables(self, directory: str):
+        """
+        Writes the tables to `directory`.
+
+        Parameters:
+            directory (str): Directory to write to.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        for table in self.tables:
+            table.save(os.path.join(directory, f'table_{table.table_index}.bin'))
+
+
+    def load_tables(self, directory: str):
+        """
+        Memory-maps the tables in `directory`.
+
+        Parameters:
+            directory (str): Directory to read from.
+        """
+        tables = []
+
+        for filename in sorted(os.listdir(directory)):
+            if filename.startswith('table_') and filename.endswith('.bin'):
+                table = ChainTable.load(os.path.join(directory, filename))
+
+                if (table.space_bits, table.chain_length, table.dp_bits) != (self.space_bits, self.chain_length, self.dp_bits):
+                    raise ValueError(f"Table '{filename}' was generated with different parameters")
+
+                tables.append(table)
+
+        self.tables = tables
+
+
+    def invert(self, output: int) -> int:
+        """
+        Looks up a preimage of `output`.
+
+        Parameters:
+            output (int): Output of `function`.
+
+        Returns:
+            int: Preimage or None if not covered by the tables.
+        """
+        for table in self.tables:
+            walker = self._walker(table)
+
+            for end, column in walker.candidates(output):
+                for start in table.find(end):
+                    preimage = walker.regenerate(start, output, column)
+
+                    if preimage is not None:
+                        return preimage
+
+        return None
+
+
+    def execute(self, frames: list, frame_bits: int, output_bits: int):
+        """
+        Streams observed frames (e.g. A5/1 keystream bursts) through the tables. Each window of `output_bits`
+        consecutive bits of a frame is looked up.
+
+        Parameters:
+            frames     (list): Iterable of frames (ints or bytes-like objects of `frame_bits` bits, first bit most significant).
+            frame_bits  (int): Number of bits per frame.
+            output_bits (int): Number of bits produced by `function`.
+
+        Returns:
+            generator: Yields (frame index, bit offset, preimage) for each recovered window.
+        """
+        mask = (1 << output_bits) - 1
+
+        for frame_idx, frame in enumerate(frames):
+            if type(frame) is not int:
+                frame = int.from_bytes(frame, 'big') >> (len(frame)*8 - frame_bits)
+
+            for offset in range(frame_bits - output_bits + 1):
+                window   = (frame >> (frame_bits - output_bits - offset)) & mask
+                preimage = self.invert(window)
+
+                if preimage is not None:
+                    yield frame_idx, offset, preimage
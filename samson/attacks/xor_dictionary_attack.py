@@ -1,10 +1,14 @@
 from samson.utilities.manipulation import xor_buffs
 from samson.analyzers.analyzer import Analyzer
 from samson.utilities.runtime import RUNTIME
+from samson.auxiliary.aho_corasick import build_automaton
 
 import logging
 log = logging.getLogger(__name__)
 
+# Bytes a plaintext is assumed to consist of
+PRINTABLE_BYTES = frozenset([9, 10, 13] + list(range(32, 127)))
+
 # TODO: Make work with more than two ciphertexts.
 class XORDictionaryAttack(object):
     """
@@ -16,6 +20,10 @@ class XORDictionaryAttack(object):
     will produce the correct keystream segment. This segment is then XOR'd with the other ciphertext and
     fed through the analyzer. The word with the highest score is most likely correct.
 
+    Candidates are generated by crib dragging over a trie of the wordlist. A word is only extended while
+    the other plaintext remains valid (i.e. within `valid_bytes`), so whole subtrees of words sharing an
+    invalid prefix are pruned before reaching the analyzer.
+
     Conditions:
         * A stream/OTP-like cipher is used. I.E. plaintext XOR keystream
         * The user has collected more than one ciphertext using the same keystream.
@@ -31,8 +39,34 @@ class XORDictionaryAttack(object):
         self.wordlist = wordlist
 
 
+    @staticmethod
+    def _prefix(prepend: str, delimiter: str) -> str:
+        """
+        Text placed before the next word. Candidates are `(prefix + word).rstrip()`, so the word starts right after it.
+        """
+        return (prepend + delimiter).lstrip()
+
+
+    def _drag(self, prepend: str, delimiter: str, two_time: bytes, valid_bytes: set):
+        """
+        Yields every word that can follow `prepend` without producing invalid bytes in the other plaintext.
+        """
+        cipher_len = len(two_time)
+        base       = bytes(self._prefix(prepend, delimiter), 'utf-8')
+        start      = len(base)
+
+        if start >= cipher_len:
+            return
+
+        # The delimiter itself must decrypt correctly
+        if any(two_time[idx] ^ char not in valid_bytes for idx, char in enumerate(base)):
+            return
+
+        yield from self.automaton.prefix_search(lambda depth, char: two_time[start+depth] ^ char in valid_bytes, cipher_len - start)
+
+
     @RUNTIME.report
-    def execute(self, ciphertexts: list, word_ranges: list=[2,3], delimiter: str=' ') -> list:
+    def execute(self, ciphertexts: list, word_ranges: list=[2,3], delimiter: str=' ', valid_bytes: set=PRINTABLE_BYTES) -> list:
         """
         Executes the attack.
         
@@ -40,6 +74,7 @@ class XORDictionaryAttack(object):
             ciphertexts (list): List of bytes-like ciphertexts using the same keystream.
             word_ranges (list): List of numbers of words to try. E.G. [2, 3, 4] means try the Cartesian product of 2, 3, and 4-tuple word combinations.
             delimiter    (str): Delimiter to use between word combinations.
+            valid_bytes  (set): Bytes the other plaintext may contain. Hypotheses producing any other byte are pruned.
         
         Returns:
             list: Top 10 possible plaintexts.
@@ -53,6 +88,8 @@ class XORDictionaryAttack(object):
         trimmed_list = [word for word in self.wordlist if len(word) <= cipher_len]
         prepend_list = ['']
 
+        self.automaton = build_automaton(tuple(trimmed_list))
+
         last_num_processed = 0
         results = []
 
@@ -60,13 +97,15 @@ class XORDictionaryAttack(object):
             log.debug(f"Starting word range {j}")
 
             for i in range(j - last_num_processed):
-                word_scores = []
+                candidates = []
                 for prepend in prepend_list:
-                    for word in trimmed_list:
-                        mod_word = (prepend + delimiter + word).strip()
-                        xor_result = xor_buffs((bytes(mod_word, 'utf-8') + b'\x00' * cipher_len)[:cipher_len], two_time)[:len(two_time)]
-                        analysis = self.analyzer.analyze(xor_result)
-                        word_scores.append((mod_word, analysis / (len(word) ** 2)))
+                    for word in self._drag(prepend, delimiter, two_time, valid_bytes):
+                        mod_word = (self._prefix(prepend, delimiter) + word).rstrip()
+                        candidates.append((mod_word, word, xor_buffs((bytes(mod_word, 'utf-8') + b'\x00' * cipher_len)[:cipher_len], two_time)[:len(two_time)]))
+
+                log.debug(f"{len(candidates)} candidates survived pruning")
+                analyses    = self.analyzer.analyze_many([xor_result for _, _, xor_result in candidates])
+                word_scores = [(mod_word, analysis / (len(word) ** 2)) for (mod_word, word, _), analysis in zip(candidates, analyses)]
 
                 prepend_list = [word for word, _ in sorted(word_scores, key=lambda score: score[1], reverse=True)[:10 ** (i + 1 + last_num_processed)]]
             last_num_processed = j
@@ -1,5 +1,5 @@
 from samson.utilities.bytes import Bytes
-from samson.analyzers.analyzer import Analyzer
+from samson.analyzers.analyzer import Analyzer, XOR_TABLES
 from samson.utilities.runtime import RUNTIME
 import struct
 
@@ -30,13 +30,14 @@ class XORTranspositionAttack(object):
 
 
     @RUNTIME.report
-    def execute(self, ciphertexts: list, iterations: int=3) -> list:
+    def execute(self, ciphertexts: list, iterations: int=3, top_k: int=None) -> list:
         """
         Executes the attack.
         
         Parameters:
             ciphertexts (list): List of bytes-like ciphertexts using the same keystream.
             iterations   (int): Number of iterations of the full-text analysis phase. Accuracy-time trade-off.
+            top_k        (int): (Optional) Number of candidate key bytes per position that are fully analyzed. The rest are pruned using the analyzer's cheap statistics. Searches all 256 if not specified.
 
         Returns:
             list: List of recovered plaintexts.
@@ -52,13 +53,10 @@ class XORTranspositionAttack(object):
         # Transposition analysis first (transposition)
         transposed_plaintexts = []
         for cipher in RUNTIME.report_progress(transposed_ciphers, desc='Transposition analysis', unit='ciphers'):
-            all_chars = {}
-            for char in range(256):
-                plaintext = Bytes(struct.pack('B', char)).stretch(len(cipher)) ^ cipher
+            scores    = self.analyzer.analyze_xor_column(cipher, top_k)
+            best_char = max(range(256), key=scores.__getitem__)
 
-                all_chars[char] = (self.analyzer.analyze(plaintext), plaintext)
-
-            transposed_plaintexts.append(sorted(all_chars.items(), key=lambda kv: kv[1][0], reverse=True)[0][1][1])
+            transposed_plaintexts.append(bytearray(bytes(cipher).translate(XOR_TABLES[best_char])))
 
 
         retransposed_plaintexts = [bytearray(transposed) for transposed in zip(*transposed_plaintexts)]
@@ -72,17 +70,18 @@ class XORTranspositionAttack(object):
 
             for i in RUNTIME.report_progress(range(min_size), desc='Building differential mask', unit='bytes'):
                 all_chars = {}
+                column    = bytes([curr_cipher[i] for curr_cipher in retransposed_plaintexts])
+                chars     = range(256) if top_k is None else sorted(set(self.analyzer.rank_xor_keys(column, top_k)).union([0]))
 
-                for char in range(256):
-                    full_text_analyses = []
+                for char in chars:
+                    cipher_copies = []
 
                     for curr_cipher in retransposed_plaintexts:
-                        cipher_copy = bytearray([_ for _ in curr_cipher])
-                        cipher_copy[i] = ord(Bytes(struct.pack('B', char)) ^ struct.pack('B', curr_cipher[i]))
-
-                        full_text_analyses.append(self.analyzer.analyze(cipher_copy))
+                        cipher_copy    = bytearray(curr_cipher)
+                        cipher_copy[i] = char ^ curr_cipher[i]
+                        cipher_copies.append(cipher_copy)
 
-                    all_chars[char] = (sum(full_text_analyses), char)
+                    all_chars[char] = (sum(self.analyzer.analyze_many(cipher_copies)), char)
 
                 best_char = sorted(all_chars.items(), key=lambda kv: kv[1][0], reverse=True)[0][1][1]
                 differential_mask += struct.pack('B', best_char)
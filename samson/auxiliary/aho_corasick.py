@@ -0,0 +1,202 @@
+from samson.utilities.runtime import RUNTIME
+from types import FunctionType
+from collections import deque
+
+
+class AhoCorasick(object):
+    """
+    Aho-Corasick automaton over a wordlist. The underlying trie also supports pruned prefix searches
+    where whole subtrees are discarded as soon as a prefix is rejected.
+
+    Examples:
+        >>> from samson.auxiliary.aho_corasick import AhoCorasick
+        >>> ac = AhoCorasick(['he', 'she', 'his', 'hers'])
+        >>> ac.search(b'ushers')
+        [(1, 'she'), (2, 'he'), (2, 'hers')]
+
+        >>> sorted(ac.prefix_search(lambda depth, char: char != ord('i')))
+        ['he', 'hers', 'she']
+
+    References:
+        "Efficient String Matching: An Aid to Bibliographic Search" (https://doi.org/10.1145/360825.360855)
+    """
+
+    def __init__(self, words: list, encoding: str='utf-8'):
+        """
+        Parameters:
+            words    (list): Words to index. Strings are encoded with `encoding`.
+            encoding  (str): Encoding for string words.
+        """
+        self.goto     = [{}]
+        self.fail     = [0]
+        self.output   = [[]]
+        self.depth    = [0]
+        self.encoding = encoding
+        self.num_words = 0
+
+        for word in words:
+            self.add_word(word)
+
+        self._build_failure_links()
+
+
+    def __repr__(self):
+        return f"<AhoCorasick: num_words={self.num_words}, num_states={len(self.goto)}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def _encode(self, word) -> bytes:
+        return word.encode(self.encoding) if type(word) is str else bytes(word)
+
+
+    def add_word(self, word: str):
+        node = 0
+        for char in self._encode(word):
+            next_node = self.goto[node].get(char)
+
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][char] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.depth.append(self.depth[node] + 1)
+
+            node = next_node
+
+        if word not in self.output[node]:
+            self.output[node].append(word)
+            self.num_words += 1
+
+
+    def _build_failure_links(self):
+        goto, fail = self.goto, self.fail
+        queue = deque(goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+
+            for char, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+
+                while state and char not in goto[state]:
+                    state = fail[state]
+
+                fail[child] = goto[state].get(char, 0) if goto[state].get(char, 0) != child else 0
+
+
+    def step(self, state: int, char: int) -> int:
+        """
+        Advances the automaton from `state` by `char`.
+
+        Parameters:
+            state (int): Current state.
+            char  (int): Next byte.
+
+        Returns:
+            int: Next state.
+        """
+        goto, fail = self.goto, self.fail
+
+        while state and char not in goto[state]:
+            state = fail[state]
+
+        return goto[state].get(char, 0)
+
+
+    def matches(self, state: int) -> list:
+        """
+        Returns every word ending at `state` (including shorter suffixes).
+        """
+        results = []
+        while state:
+            results.extend(self.output[state])
+            state = self.fail[state]
+
+        return results
+
+
+    def search(self, text: bytes) -> list:
+        """
+        Finds all occurrences of indexed words in `text`.
+
+        Parameters:
+            text (bytes): Text to search.
+
+        Returns:
+            list: List of (start index, word) tuples sorted by start index.
+        """
+        text    = self._encode(text)
+        state   = 0
+        results = []
+
+        for idx, char in enumerate(text):
+            state = self.step(state, char)
+
+            for word in self.matches(state):
+                results.append((idx - len(self._encode(word)) + 1, word))
+
+        return sorted(results, key=lambda match: (match[0], len(match[1])))
+
+
+    def is_prefix(self, text: bytes) -> bool:
+        """
+        Determines whether `text` is the prefix of an indexed word.
+        """
+        node = 0
+        for char in self._encode(text):
+            node = self.goto[node].get(char)
+
+            if node is None:
+                return False
+
+        return True
+
+
+    def prefix_search(self, accept: FunctionType, max_depth: int=None):
+        """
+        Depth-first search over the trie. A branch is pruned as soon as `accept`(depth, char) is False,
+        so words sharing a rejected prefix are never visited individually. If `max_depth` is reached, every
+        word below the current node is yielded (i.e. words truncated at `max_depth`).
+
+        Parameters:
+            accept (func): Predicate taking the zero-based depth and byte.
+            max_depth (int): Maximum depth to check.
+
+        Returns:
+            generator: Accepted words.
+        """
+        goto, output = self.goto, self.output
+        stack = [0]
+
+        while stack:
+            node  = stack.pop()
+            depth = self.depth[node]
+
+            yield from output[node]
+
+            if max_depth is not None and depth >= max_depth:
+                stack.extend(goto[node].values())
+                continue
+
+            for char, child in goto[node].items():
+                if accept(depth, char):
+                    stack.append(child)
+
+
+
+@RUNTIME.global_cache(8)
+def build_automaton(words: tuple) -> AhoCorasick:
+    """
+    Builds (and caches) an `AhoCorasick` automaton for `words`.
+
+    Parameters:
+        words (tuple): Words to index.
+
+    Returns:
+        AhoCorasick: Automaton.
+    """
+    return AhoCorasick(words)
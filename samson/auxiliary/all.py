@@ -5,6 +5,7 @@ from .naive_collider import NaiveMDCollider
 from .token_list_handler import TokenListHandler
 from .tokenizer import Tokenizer
 from .viterbi_decoder import ViterbiDecoder
+from .work_queue import WorkQueue, WorkQueueServer, RemoteWorkQueue
 
 
-__all__ = ["GeneticAlgorithm", "MarkovChainHandler", "MarkovState", "NaiveMDCollider", "TokenListHandler", "Tokenizer", "ViterbiDecoder"]
+__all__ = ["GeneticAlgorithm", "MarkovChainHandler", "MarkovState", "NaiveMDCollider", "TokenListHandler", "Tokenizer", "ViterbiDecoder", "WorkQueue", "WorkQueueServer", "RemoteWorkQueue"]
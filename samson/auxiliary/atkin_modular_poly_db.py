@@ -1,34 +1,140 @@
 from samson.utilities.bytes import Bytes
+from samson.utilities.runtime import RUNTIME
 from samson.math.symbols import Symbol
 from samson.math.algebra.rings.integer_ring import ZZ
+import struct
+import zlib
 import os
 
 CURR_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# Binary cache format: zlib-compressed records of
+# (x exponent, y exponent, signed coefficient byte length) followed by the coefficient's magnitude
+CACHE_MAGIC   = b'SAMSONMP\x01'
+RECORD_HEADER = struct.Struct('>HHi')
 
-def parse_atkin(data: str):
-    x = Symbol('x')
-    y = Symbol('y')
 
-    P = ZZ[x, y]
-    p = P.zero
+def parse_atkin_terms(data: str) -> list:
+    terms = []
     for line in data.strip().split('\n'):
         xp, yp, c = [int(c) for c in line.strip().split()]
-        p += x**xp*y**yp*c
-    
-    return p
+        terms.append((xp, yp, c))
 
+    return terms
 
 
-# https://www.i2m.univ-amu.fr/perso/david.kohel/dbs/files/PolMod_Atk.tgz
-class AtkinDB(object):
-    def __init__(self) -> None:
-        self.db = {}
+def build_bivariate(terms: list) -> 'Polynomial':
+    """
+    Builds a polynomial in ZZ[x][y] from (x exponent, y exponent, coefficient) terms.
+    """
+    x = Symbol('x')
+    y = Symbol('y')
+
+    P  = ZZ[x, y]
+    Px = P.ring
+
+    y_coeffs = {}
+    for xp, yp, c in terms:
+        y_coeffs.setdefault(yp, {})[xp] = ZZ(c)
+
+    return P({yp: Px(x_coeffs) for yp, x_coeffs in y_coeffs.items()})
+
+
+def parse_atkin(data: str):
+    return build_bivariate(parse_atkin_terms(data))
+
+
+def pack_terms(terms: list) -> bytes:
+    buffer = []
+    for xp, yp, c in terms:
+        mag = abs(c)
+        mag = mag.to_bytes((mag.bit_length() + 7) // 8, 'big')
+        buffer.append(RECORD_HEADER.pack(xp, yp, -len(mag) if c < 0 else len(mag)))
+        buffer.append(mag)
+
+    return CACHE_MAGIC + zlib.compress(b''.join(buffer))
+
+
+def unpack_terms(data: bytes) -> list:
+    if not data.startswith(CACHE_MAGIC):
+        raise ValueError("Invalid modular polynomial cache")
+
+    data  = zlib.decompress(data[len(CACHE_MAGIC):])
+    terms = []
+    idx   = 0
+    h_len = RECORD_HEADER.size
+
+    while idx < len(data):
+        xp, yp, c_len = RECORD_HEADER.unpack_from(data, idx)
+        idx  += h_len
+        c     = int.from_bytes(data[idx:idx+abs(c_len)], 'big')
+        idx  += abs(c_len)
+        terms.append((xp, yp, -c if c_len < 0 else c))
+
+    return terms
+
+
+
+class CachedModularDB(object):
+    """
+    Lazily loads modular polynomials. Parsed terms are persisted to `cache_dir` in a compact binary
+    format so subsequent processes (e.g. parallel SEA workers) skip the parsing. Subclasses implement `read_terms`.
+    """
+    CACHE_NAME = None
+
+    def __init__(self, cache_dir: str=None) -> None:
+        self.db        = {}
+        self.cache_dir = cache_dir or os.path.join(RUNTIME.cache_dir, self.CACHE_NAME)
+
+
+    def _cache_path(self, idx: int) -> str:
+        return os.path.join(self.cache_dir, f'pol.{str(idx).zfill(3)}.bin')
+
+
+    def read_terms(self, idx: int) -> list:
+        raise NotImplementedError
+
+
+    def load_terms(self, idx: int) -> list:
+        cache_path = self._cache_path(idx)
+
+        try:
+            with open(cache_path, 'rb') as f:
+                return unpack_terms(f.read())
+        except (OSError, ValueError, zlib.error, struct.error):
+            pass
+
+        terms = self.read_terms(idx)
+
+        # The cache is strictly an optimization; don't fail on read-only filesystems
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+
+            with open(tmp_path, 'wb') as f:
+                f.write(pack_terms(terms))
+
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+        return terms
 
 
     def __getitem__(self, idx):
         if idx not in self.db:
-            data = Bytes.read_file(f'{CURR_DIR}/atkin_db/pol.{str(idx).zfill(3)}.dbz.out').decode()
-            self.db[idx] = parse_atkin(data)
+            self.db[idx] = build_bivariate(self.load_terms(idx))
 
         return self.db[idx]
+
+
+
+# https://www.i2m.univ-amu.fr/perso/david.kohel/dbs/files/PolMod_Atk.tgz
+class AtkinDB(CachedModularDB):
+    """
+    Lazily loads Atkin modular polynomials.
+    """
+    CACHE_NAME = 'atkin_db'
+
+    def read_terms(self, idx: int) -> list:
+        return parse_atkin_terms(Bytes.read_file(f'{CURR_DIR}/atkin_db/pol.{str(idx).zfill(3)}.dbz.out').decode())
@@ -0,0 +1,201 @@
+from array import array
+from bisect import bisect_left
+import struct
+import mmap
+import sys
+import os
+
+# Binary format: magic, (number of chains, space bits, chain length, distinguished point bits, table index),
+# then the sorted endpoints and their start points as little-endian uint64s
+CHAIN_TABLE_MAGIC  = b'SAMSONTMTO\x01'
+CHAIN_TABLE_HEADER = struct.Struct('<QHQHQ')
+
+
+class ChainTable(object):
+    """
+    Sorted table of precomputation chains (start point, endpoint) used by time-memory tradeoffs.
+    Tables can be memory-mapped from disk, and endpoints are binary searched in place.
+
+    Examples:
+        >>> from samson.auxiliary.chain_table import ChainTable
+        >>> table = ChainTable.from_chains([(1, 40), (2, 10), (3, 40)], space_bits=8, chain_length=16)
+        >>> len(table), table.find(40), table.find(41)
+        (2, [1], [])
+
+    """
+
+    def __init__(self, ends: array, starts: array, space_bits: int, chain_length: int, dp_bits: int=0, table_index: int=0):
+        """
+        Parameters:
+            ends         (array): Sorted endpoints (any sequence of ints, e.g. a memoryview of a mapping).
+            starts       (array): Start points corresponding to `ends`.
+            space_bits     (int): Size of the search space in bits.
+            chain_length   (int): Chain length (maximum chain length for distinguished points).
+            dp_bits        (int): Number of zero bits that make a point distinguished (zero for rainbow tables).
+            table_index    (int): Index of the table, which selects its reduction functions.
+        """
+        self.ends         = ends
+        self.starts       = starts
+        self.space_bits   = space_bits
+        self.chain_length = chain_length
+        self.dp_bits      = dp_bits
+        self.table_index  = table_index
+
+
+    def __repr__(self):
+        return f"<ChainTable: size={len(self)}, space_bits={self.space_bits}, chain_length={self.chain_length}, dp_bits={self.dp_bits}, table_index={self.table_index}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def __len__(self) -> int:
+        return len(self.ends)
+
+
+    def find(self, end: int) -> list:
+        """
+        Finds the start points of all chains ending in `end`.
+
+        Parameters:
+            end (int): Endpoint.
+
+        Returns:
+            list: Start points.
+        """
+        ends, starts = self.ends, self.starts
+        idx     = bisect_left(ends, end)
+        results = []
+
+        while idx < len(ends) and ends[idx] == end:
+            results.append(starts[idx])
+            idx += 1
+
+        return results
+
+
+    @staticmethod
+    def from_chains(chains: list, space_bits: int, chain_length: int, dp_bits: int=0, table_index: int=0, unique: bool=True) -> 'ChainTable':
+        """
+        Builds a table from (start, end) pairs.
+
+        Parameters:
+            chains        (list): Iterable of (start, end) pairs.
+            space_bits     (int): Size of the search space in bits.
+            chain_length   (int): Chain length.
+            dp_bits        (int): Distinguished point bits.
+            table_index    (int): Index of the table.
+            unique        (bool): Whether to keep only one chain per endpoint. Merged chains only cover the same points.
+
+        Returns:
+            ChainTable: Table.
+        """
+        ends, starts = array('Q'), array('Q')
+        last = None
+
+        for start, end in sorted(chains, key=lambda chain: chain[1]):
+            if unique and end == last:
+                continue
+
+            ends.append(end)
+            starts.append(start)
+            last = end
+
+        return ChainTable(ends, starts, space_bits, chain_length, dp_bits, table_index)
+
+
+    def merge(self, other: 'ChainTable', unique: bool=True) -> 'ChainTable':
+        """
+        Merges the chains of two tables with the same parameters.
+
+        Parameters:
+            other (ChainTable): Table to merge.
+            unique      (bool): Whether to keep only one chain per endpoint.
+
+        Returns:
+            ChainTable: Merged table.
+        """
+        if (self.space_bits, self.chain_length, self.dp_bits, self.table_index) != (other.space_bits, other.chain_length, other.dp_bits, other.table_index):
+            raise ValueError("Cannot merge tables with different parameters")
+
+        chains = list(zip(self.starts, self.ends)) + list(zip(other.starts, other.ends))
+        return ChainTable.from_chains(chains, self.space_bits, self.chain_length, self.dp_bits, self.table_index, unique)
+
+
+    def serialize(self) -> bytes:
+        ends, starts = array('Q', self.ends), array('Q', self.starts)
+
+        if sys.byteorder == 'big':
+            ends.byteswap()
+            starts.byteswap()
+
+        header = CHAIN_TABLE_HEADER.pack(len(ends), self.space_bits, self.chain_length, self.dp_bits, self.table_index)
+        return CHAIN_TABLE_MAGIC + header + ends.tobytes() + starts.tobytes()
+
+
+    @staticmethod
+    def deserialize(data: bytes) -> 'ChainTable':
+        """
+        Deserializes a table. Endpoints and start points of a memory map are viewed in place
+        on little-endian machines.
+
+        Parameters:
+            data (bytes): Bytes-like serialized table.
+
+        Returns:
+            ChainTable: Table.
+        """
+        if data[:len(CHAIN_TABLE_MAGIC)] != CHAIN_TABLE_MAGIC:
+            raise ValueError("Invalid chain table")
+
+        idx = len(CHAIN_TABLE_MAGIC)
+        size, space_bits, chain_length, dp_bits, table_index = CHAIN_TABLE_HEADER.unpack_from(data, idx)
+        idx += CHAIN_TABLE_HEADER.size
+
+        if len(data) - idx != 16*size:
+            raise ValueError("Invalid chain table")
+
+        if sys.byteorder == 'big':
+            ends, starts = array('Q'), array('Q')
+            ends.frombytes(data[idx:idx+8*size])
+            starts.frombytes(data[idx+8*size:])
+            ends.byteswap()
+            starts.byteswap()
+        else:
+            view   = memoryview(data)
+            ends   = view[idx:idx+8*size].cast('Q')
+            starts = view[idx+8*size:].cast('Q')
+
+        return ChainTable(ends, starts, space_bits, chain_length, dp_bits, table_index)
+
+
+    def save(self, filepath: str):
+        """
+        Atomically writes the table to `filepath`.
+
+        Parameters:
+            filepath (str): Path to write to.
+        """
+        tmp_path = f'{filepath}.{os.getpid()}.tmp'
+
+        with open(tmp_path, 'wb') as f:
+            f.write(self.serialize())
+
+        os.replace(tmp_path, filepath)
+
+
+    @staticmethod
+    def load(filepath: str) -> 'ChainTable':
+        """
+        Memory-maps a table from `filepath`.
+
+        Parameters:
+            filepath (str): Path to read from.
+
+        Returns:
+            ChainTable: Table.
+        """
+        with open(filepath, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return ChainTable.deserialize(mapping)
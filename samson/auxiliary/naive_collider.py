@@ -1,4 +1,5 @@
 import math
+import random
 from types import FunctionType
 
 import logging
@@ -11,11 +12,13 @@ class NaiveMDCollider(object):
     strength algorithms.
     """
 
-    def __init__(self, construction_func: FunctionType, output_size: int):
+    def __init__(self, construction_func: FunctionType, output_size: int, memory: int=2**16, block_size: int=None):
         """
         Parameters:
             construction_func (func): Function that takes in two bytes-like arguments and returns the next Merkle-Damgard state.
-            output_size        (int): Size in bytes of the hash output.
+            output_size        (int): Size in bytes of the hash output (i.e. the chaining state).
+            memory             (int): Maximum number of distinguished points stored while searching for a collision.
+            block_size         (int): Size in bytes of the construction's message blocks. Defaults to `output_size`.
 
         Examples:
             >>> def construction_func(iv, message):
@@ -24,11 +27,16 @@ class NaiveMDCollider(object):
         """
         self.construction_func = construction_func
         self.output_size = output_size
+        self.block_size = block_size or output_size
+        self.memory = memory
+
+        # Expect about 2^(n/2) steps to a collision, so only store one in 2^(n/2)/memory points
+        self.dp_bits = max(output_size * 4 - int(math.log2(memory)) + 2, 0)
 
 
 
     @staticmethod
-    def initialize_with_known_prefixes(prefixes: list, iv: bytes, construction_func: FunctionType, output_size: int):
+    def initialize_with_known_prefixes(prefixes: list, iv: bytes, construction_func: FunctionType, output_size: int, block_size: int=None):
         """
         Initializes a NaiveMDCollider using known prefixes. In Nostradamus-attack terms, the initial states
         you're trying to find collisions for.
@@ -38,6 +46,7 @@ class NaiveMDCollider(object):
             iv               (bytes): Initial state of the Merkle-Damgard function (possibly None).
             construction_func (func): Function that takes in two bytes-like arguments and returns the next Merkle-Damgard state.
             output_size        (int): Size in bytes of the hash output.
+            block_size         (int): Size in bytes of the construction's message blocks. Defaults to `output_size`.
         
         Returns:
             NaiveMDCollider: NaiveMDCollider initialized with known prefixes.
@@ -45,19 +54,52 @@ class NaiveMDCollider(object):
         k = math.ceil(math.log(len(prefixes), 2))
 
         # Find the maximum length of padded prefixes
-        padding_size = math.ceil(max([len(prefix) for prefix in prefixes]) / output_size) * output_size
+        block_size   = block_size or output_size
+        padding_size = math.ceil(max([len(prefix) for prefix in prefixes]) / block_size) * block_size
 
         prefixes = [(prefix + (b'\x00' * padding_size))[:padding_size] for prefix in prefixes]
         hashed_prefixes = [list(construction_func(iv, prefix))[-1] for prefix in prefixes]
 
-        return NaiveMDCollider(construction_func, output_size), k, prefixes, hashed_prefixes
+        return NaiveMDCollider(construction_func, output_size, block_size=block_size), k, prefixes, hashed_prefixes
+
+
+
+
+    def _block(self, point: bytes, salt: int) -> bytes:
+        block = int.to_bytes(int.from_bytes(point, 'big') ^ salt, self.output_size, 'big')
+        return block.ljust(self.block_size, b'\x00')[:self.block_size]
+
+
+    def _step(self, point: bytes, states: tuple, salt: int) -> bytes:
+        """
+        The random mapping walked by `find_collision`. The point's lowest bit selects which chaining state
+        to continue from, and the salted point (fit to the block size) is the next message block.
+        """
+        state = bytes(next(iter(self.construction_func(states[point[-1] & 1], self._block(point, salt)))))
+
+        # Points are full chaining states; comparing truncated ones would yield false collisions
+        if len(state) != self.output_size:
+            raise ValueError(f"Construction yielded a {len(state)}-byte state, but `output_size` is {self.output_size}")
+
+        return state
+
 
 
+    def _walk(self, point: bytes, steps: int, states: tuple, salt: int) -> bytes:
+        for _ in range(steps):
+            point = self._step(point, states, salt)
+
+        return point
+
 
 
     def find_collision(self, p1: bytes, p2: bytes) -> (bytes, bytes, bytes):
         """
-        Finds a collision using bruteforce.
+        Finds a collision using a distinguished-point birthday search (van Oorschot-Wiener).
+
+        Walks chains of the mapping `x -> H(p_i, x)`, where the bit `i` is taken from `x`, and only stores their
+        distinguished endpoints. Two chains ending at the same point have merged, and retracing them yields
+        the collision. Only one block is compressed per step, starting from the given chaining states.
 
         Parameters:
             p1 (bytes): First sample.
@@ -66,19 +108,56 @@ class NaiveMDCollider(object):
         Returns:
             (bytes, bytes, bytes): Tuple of bytes representing the collision as (p1_suffix, p2_suffix, self.hasher.hash(p1 + p1_suffix)).
         """
-        input_for_p1 = b'\x00' * self.output_size
-        state_to_collide = list(self.construction_func(p1, input_for_p1))[0]
+        states  = (p1, p2)
+        n_bits  = self.output_size * 8
+        max_len = 20 << self.dp_bits
+        dp_mask = (1 << self.dp_bits) - 1
+
+        while True:
+            salt  = random.getrandbits(n_bits)
+            table = {}
+
+            while len(table) < self.memory:
+                start  = random.getrandbits(n_bits).to_bytes(self.output_size, 'big')
+                point  = start
+                length = 0
+
+                while length < max_len:
+                    point   = self._step(point, states, salt)
+                    length += 1
+
+                    if not int.from_bytes(point, 'big') & dp_mask:
+                        break
+                else:
+                    # Stuck in a cycle without distinguished points
+                    continue
+
+
+                if point not in table:
+                    table[point] = (start, length)
+                    continue
+
+                # The chains merged. Align them and walk in lockstep to find where they meet
+                (other, other_length) = table[point]
+                a = self._walk(start, length - other_length, states, salt) if length > other_length else start
+                b = self._walk(other, other_length - length, states, salt) if other_length > length else other
+
+                # One chain started on the other
+                if a == b:
+                    continue
+
+                a_next, b_next = self._step(a, states, salt), self._step(b, states, salt)
+                while a_next != b_next:
+                    a, b = a_next, b_next
+                    a_next, b_next = self._step(a, states, salt), self._step(b, states, salt)
 
-        # Try a lot of values...
-        for j in range(2**(self.output_size * 32)):
-            attempt = int.to_bytes(j, self.output_size * 4, 'little')
 
-            # We'll need to keep a state counter since we may not get a collision on the first chunk
-            state_ctr = 0
+                # Both messages extend the same chaining state. Rerandomize the mapping and search again
+                if (a[-1] & 1) == (b[-1] & 1):
+                    break
 
-            for state in self.construction_func(p2, attempt):
-                state_ctr += 1
+                if a[-1] & 1:
+                    a, b = b, a
 
-                if state == state_to_collide:
-                    log.debug(f'Found collision for ({p1}, {p2})')
-                    return input_for_p1, attempt[:state_ctr * self.output_size], state_to_collide
+                log.debug(f'Found collision for ({p1}, {p2})')
+                return self._block(a, salt), self._block(b, salt), a_next
@@ -0,0 +1,189 @@
+from array import array
+import struct
+import mmap
+import sys
+import os
+
+# Binary format: magic, number of entries, key offsets (uint64), values (float64), then the concatenated sorted keys
+NGRAM_MAGIC  = b'SAMSONNG\x01'
+NGRAM_HEADER = struct.Struct('<Q')
+
+
+class NgramTable(object):
+    """
+    Read-only string to float table stored as sorted arrays. Tables can be memory-mapped from disk so
+    large n-gram models load instantly; lookups binary search the mapping and are memoized. The memo is
+    cleared once it holds `memo_size` keys so it stays bounded on long inputs.
+
+    Examples:
+        >>> from samson.auxiliary.ngram_table import NgramTable
+        >>> table = NgramTable.from_dict({'THE': -1.5, 'OF': -1.8})
+        >>> table['THE'], 'AND' in table, table.get('AND', 0.0)
+        (-1.5, False, 0.0)
+
+    """
+
+    def __init__(self, offsets: array, values: array, keys: bytes, base: int=0, memo_size: int=2**16):
+        """
+        Parameters:
+            offsets   (array): Offsets of each key relative to `base` (plus a final end offset).
+            values    (array): Values of each key.
+            keys      (bytes): Bytes-like object (e.g. a memory map) containing the concatenated, sorted UTF-8 keys.
+            base        (int): Offset of the first key in `keys`.
+            memo_size   (int): Maximum number of memoized lookups.
+        """
+        self.offsets   = offsets
+        self.values    = values
+        self.keys      = keys
+        self.base      = base
+        self.memo_size = memo_size
+        self._memo     = {}
+
+
+    def __repr__(self):
+        return f"<NgramTable: size={len(self)}, mapped={type(self.keys) is mmap.mmap}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+    def _find(self, key: str):
+        memo = self._memo
+
+        if key in memo:
+            return memo[key]
+
+        target  = key.encode('utf-8')
+        offsets = self.offsets
+        keys    = self.keys
+        base    = self.base
+        lo, hi  = 0, len(self.values)
+        result  = None
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            curr = keys[base+offsets[mid]:base+offsets[mid+1]]
+
+            if curr < target:
+                lo = mid + 1
+            elif curr > target:
+                hi = mid
+            else:
+                result = self.values[mid]
+                break
+
+        if len(memo) >= self.memo_size:
+            memo.clear()
+
+        memo[key] = result
+        return result
+
+
+    def __getitem__(self, key: str) -> float:
+        result = self._find(key)
+
+        if result is None:
+            raise KeyError(key)
+
+        return result
+
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+
+    def get(self, key: str, default: float=None) -> float:
+        result = self._find(key)
+        return default if result is None else result
+
+
+    @staticmethod
+    def from_dict(table: dict) -> 'NgramTable':
+        """
+        Compiles a dictionary into an `NgramTable`.
+
+        Parameters:
+            table (dict): String to float dictionary.
+
+        Returns:
+            NgramTable: Compiled table.
+        """
+        items   = sorted((key.encode('utf-8'), value) for key, value in table.items())
+        offsets = array('Q', [0])
+        values  = array('d')
+
+        for key, value in items:
+            offsets.append(offsets[-1] + len(key))
+            values.append(value)
+
+        return NgramTable(offsets, values, b''.join(key for key, _ in items))
+
+
+    def serialize(self) -> bytes:
+        offsets, values = self.offsets, self.values
+
+        if sys.byteorder == 'big':
+            offsets, values = array('Q', offsets), array('d', values)
+            offsets.byteswap()
+            values.byteswap()
+
+        return NGRAM_MAGIC + NGRAM_HEADER.pack(len(values)) + offsets.tobytes() + values.tobytes() + bytes(self.keys[self.base:])
+
+
+    def save(self, filepath: str):
+        """
+        Atomically writes the table to `filepath`.
+
+        Parameters:
+            filepath (str): Path to write to.
+        """
+        tmp_path = f'{filepath}.{os.getpid()}.tmp'
+
+        with open(tmp_path, 'wb') as f:
+            f.write(self.serialize())
+
+        os.replace(tmp_path, filepath)
+
+
+    @staticmethod
+    def load(filepath: str) -> 'NgramTable':
+        """
+        Memory-maps a table from `filepath`.
+
+        Parameters:
+            filepath (str): Path to read from.
+
+        Returns:
+            NgramTable: Table.
+        """
+        with open(filepath, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if mapping[:len(NGRAM_MAGIC)] != NGRAM_MAGIC:
+            raise ValueError("Invalid n-gram table")
+
+        idx    = len(NGRAM_MAGIC)
+        size,  = NGRAM_HEADER.unpack_from(mapping, idx)
+        idx   += NGRAM_HEADER.size
+
+        offsets = array('Q')
+        offsets.frombytes(mapping[idx:idx+8*(size+1)])
+        idx    += 8*(size+1)
+
+        values  = array('d')
+        values.frombytes(mapping[idx:idx+8*size])
+        idx    += 8*size
+
+        if sys.byteorder == 'big':
+            offsets.byteswap()
+            values.byteswap()
+
+        if len(mapping) - idx != offsets[-1]:
+            raise ValueError("Invalid n-gram table")
+
+        # Keys are read directly from the mapping
+        return NgramTable(offsets, values, mapping, idx)
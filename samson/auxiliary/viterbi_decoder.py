@@ -1,40 +1,142 @@
 # from samson.auxiliary.english_data import ENGLISH_ONE_GRAMS, ENGLISH_TWO_GRAMS
+from samson.auxiliary.ngram_table import NgramTable, NGRAM_MAGIC
+from samson.utilities.runtime import RUNTIME
 from math import log10
+import os
 
 from samson.auxiliary.lazy_loader import LazyLoader
 _eng_data = LazyLoader('_eng_data', globals(), 'samson.auxiliary.english_data')
 
-# http://practicalcryptography.com/cryptanalysis/text-characterisation/word-statistics-fitness-measure/
-class ViterbiDecoder(object):
+ENGLISH_NUM_TOKENS = 1024908267229
+
+# Bump when `compile_ngram_model` or the English data change so stale compiled models aren't loaded
+ENGLISH_MODEL_VERSION = 1
+
+
+def compile_ngram_model(one_grams: dict, two_grams: dict, num_tokens: int) -> (NgramTable, NgramTable):
     """
-    Statistical model that decodes non-delimited English text into tokens using maximum likelihood metrics.
+    Compiles raw one- and two-gram counts into log probability tables.
+
+    Parameters:
+        one_grams  (dict): Word counts.
+        two_grams  (dict): Word pair counts keyed by 'WORD1 WORD2'.
+        num_tokens  (int): Total number of tokens.
+
+    Returns:
+        (NgramTable, NgramTable): First and second order log probability tables.
     """
+    # Calculate first order log probabilities
+    Pw = {}
+    for key, count in one_grams.items():
+        Pw[key.upper()] = log10(float(count) / num_tokens)
+
+
+    # Calculate second order log probabilities
+    Pw2 = {}
+    for key, count in two_grams.items():
+        word1 = key.split()[0].upper()
+
+        if word1 not in Pw:
+            Pw2[key.upper()] = log10(float(count) / num_tokens)
+        else:
+            Pw2[key.upper()] = log10(float(count) / num_tokens) - Pw[word1]
+
+    return NgramTable.from_dict(Pw), NgramTable.from_dict(Pw2)
+
+
+@RUNTIME.global_cache()
+def load_english_model(cache_dir: str=None) -> (NgramTable, NgramTable):
+    """
+    Loads the compiled English n-gram model. The model is compiled from `english_data` once and
+    stored in `cache_dir`; subsequent loads memory-map the compiled tables. The file names are keyed by the
+    table format and `ENGLISH_MODEL_VERSION`, so models compiled by other versions are ignored.
+
+    Parameters:
+        cache_dir (str): Directory of the compiled model.
+
+    Returns:
+        (NgramTable, NgramTable): First and second order log probability tables.
+    """
+    cache_dir = cache_dir or os.path.join(RUNTIME.cache_dir, 'viterbi')
+    version   = f'v{ENGLISH_MODEL_VERSION}.{NGRAM_MAGIC[-1]}'
+    paths     = [os.path.join(cache_dir, f'english_{n}grams.{version}.bin') for n in (1, 2)]
+
+    try:
+        return tuple(NgramTable.load(path) for path in paths)
+    except (OSError, ValueError):
+        pass
+
+    tables = compile_ngram_model(_eng_data.ENGLISH_ONE_GRAMS, _eng_data.ENGLISH_TWO_GRAMS, ENGLISH_NUM_TOKENS)
+
+    # The compiled model is strictly an optimization; don't fail on read-only filesystems
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        for table, path in zip(tables, paths):
+            table.save(path)
+    except OSError:
+        pass
+
+    return tables
+
+
+
+class ViterbiLattice(object):
+    """
+    Dynamic programming state of a Viterbi decoding. Column `e` holds, for each length `L` of the last token,
+    the best log probability of decoding `text`[:e] and the length of the preceding token.
+    """
+
+    def __init__(self, max_word_len: int):
+        self.text  = ''
+        self.max_word_len = max_word_len
+        self.probs = [None]
+        self.backs = [None]
+
+
+    def __repr__(self):
+        return f"<ViterbiLattice: text={self.text}, max_word_len={self.max_word_len}>"
+
+    def __str__(self):
+        return self.__repr__()
 
-    def __init__(self):
-        self.Pw = {}
-        self.N = 1024908267229 ## Number of tokens
 
-        # Calculate first order log probabilities
-        for key in _eng_data.ENGLISH_ONE_GRAMS.keys():
-            self.Pw[key.upper()] = log10(float(_eng_data.ENGLISH_ONE_GRAMS[key]) / self.N)
+    def truncate(self, length: int):
+        self.text  = self.text[:length]
+        del self.probs[length+1:]
+        del self.backs[length+1:]
 
 
-        # Get second order word model
-        self.Pw2 = {}
 
-        # Calculate second order log probabilities
-        for key in _eng_data.ENGLISH_TWO_GRAMS.keys():
-            word1 = key.split()[0].upper()
+# http://practicalcryptography.com/cryptanalysis/text-characterisation/word-statistics-fitness-measure/
+class ViterbiDecoder(object):
+    """
+    Statistical model that decodes non-delimited English text into tokens using maximum likelihood metrics.
+    The n-gram model is compiled once per process and decodings are incremental: scoring a text sharing
+    a prefix with the previously scored text only computes the columns after the common prefix.
+    """
 
-            if word1 not in self.Pw:
-                self.Pw2[key.upper()] = log10(float(_eng_data.ENGLISH_TWO_GRAMS[key]) / self.N)
-            else:
-                self.Pw2[key.upper()] = log10(float(_eng_data.ENGLISH_TWO_GRAMS[key]) / self.N) - self.Pw[word1]
+    def __init__(self, one_grams: dict=None, two_grams: dict=None, num_tokens: int=ENGLISH_NUM_TOKENS, cache_size: int=2**18):
+        """
+        Parameters:
+            one_grams  (dict): (Optional) Word counts. Defaults to the English model.
+            two_grams  (dict): (Optional) Word pair counts keyed by 'WORD1 WORD2'.
+            num_tokens  (int): Total number of tokens in the model.
+            cache_size  (int): Maximum number of cached conditional probabilities. The cache is cleared when full.
+        """
+        self.N = num_tokens ## Number of tokens
+        self.cache_size = cache_size
 
+        if one_grams is None:
+            self.Pw, self.Pw2 = load_english_model()
+        else:
+            self.Pw, self.Pw2 = compile_ngram_model(one_grams, two_grams or {}, num_tokens)
 
         # Precalculate the probabilities we assign to words not in our dict, L is length of word
         self.unseen = [log10(10. / (self.N * 10**L)) for L in range(50)]
 
+        self._cPw_cache = {}
+        self._lattice   = None
 
 
 
@@ -45,22 +147,76 @@ class ViterbiDecoder(object):
         Parameters:
             word (str): Current word.
             prev (str): Previous word.
-        
+
         Returns:
             float: Log probability of `word` based on `prev`.
         """
-        second_order_word = (prev + ' ' + word)
+        key = (word, prev)
 
-        if word not in self.Pw:
-            return self.unseen[len(word)]
+        if key in self._cPw_cache:
+            return self._cPw_cache[key]
 
-        elif second_order_word not in self.Pw2:
-            return self.Pw[word]
+        first_order = self.Pw.get(word)
 
+        if first_order is None:
+            result = self.unseen[len(word)]
         else:
-            return self.Pw2[second_order_word]
+            result = self.Pw2.get(prev + ' ' + word, first_order)
+
+        if len(self._cPw_cache) >= self.cache_size:
+            self._cPw_cache.clear()
+
+        self._cPw_cache[key] = result
+        return result
+
 
 
+    def extend(self, lattice: ViterbiLattice, text: str) -> ViterbiLattice:
+        """
+        Extends `lattice` by appending `text` (already uppercased).
+
+        Parameters:
+            lattice (ViterbiLattice): Lattice to extend in-place.
+            text               (str): Text to append.
+
+        Returns:
+            ViterbiLattice: `lattice`.
+        """
+        max_word_len = lattice.max_word_len
+        probs, backs = lattice.probs, lattice.backs
+        full_text    = lattice.text + text
+        cPw          = self.cPw
+
+        for e in range(len(lattice.text)+1, len(full_text)+1):
+            col_prob = [-99e99]*(max_word_len+1)
+            col_back = [0]*(max_word_len+1)
+
+            for L in range(1, min(e, max_word_len)+1):
+                start = e - L
+                word  = full_text[start:e]
+
+                if not start:
+                    col_prob[L] = cPw(word)
+                    continue
+
+                prev_probs = probs[start]
+                best, best_k = -99e99*2, 0
+
+                for k in range(1, min(start, max_word_len)+1):
+                    candidate = prev_probs[k] + cPw(word, full_text[start-k:start])
+
+                    if candidate > best:
+                        best, best_k = candidate, k
+
+                col_prob[L] = best
+                col_back[L] = best_k
+
+            probs.append(col_prob)
+            backs.append(col_back)
+
+        lattice.text = full_text
+        return lattice
+
 
 
     def score(self, text: str, max_word_len=20) -> (float, list):
@@ -70,26 +226,39 @@ class ViterbiDecoder(object):
         Parameters:
             text         (str): Text to tokenize/decode.
             max_word_len (int): Maximum token length.
-        
+
         Returns:
             (float, list): Most probable decoding as (score, token_list).
         """
-        text = text.upper()
+        text    = text.upper()
+        lattice = self._lattice
+
+        # Reuse the columns of the longest common prefix with the previous decoding
+        if lattice and lattice.max_word_len == max_word_len:
+            common = 0
+            for a, b in zip(lattice.text, text):
+                if a != b:
+                    break
+                common += 1
+
+            lattice.truncate(common)
+        else:
+            lattice = ViterbiLattice(max_word_len)
 
-        prob = [[-99e99] * max_word_len for _ in range(len(text))]
-        strs = [[''] * max_word_len for _ in range(len(text))]
+        self._lattice = self.extend(lattice, text[len(lattice.text):])
 
-        for j in range(max_word_len):
-            prob[0][j] = self.cPw(text[:j+1])
-            strs[0][j] = [text[:j+1]]
+        if not text:
+            return (0, [])
 
-        for i in range(1,len(text)):
-            for j in range(max_word_len):
-                if i+j+1 > len(text): break
-                candidates = [(prob[i-k-1][k] + self.cPw(text[i: i+j+1], strs[i-k-1][k][-1]),
-                               strs[i-k-1][k] + [text[i: i+j+1]]) for k in range(min(i, max_word_len))]
+        # Find the best final token and follow the backpointers
+        n = len(text)
+        best_L = max(range(1, min(n, max_word_len)+1), key=lambda L: lattice.probs[n][L])
+        best   = lattice.probs[n][best_L]
 
-                prob[i][j], strs[i][j] = max(candidates)
+        tokens = []
+        e, L   = n, best_L
+        while e:
+            tokens.append(text[e-L:e])
+            e, L = e-L, lattice.backs[e][L]
 
-        ends = [(prob[-i-1][i], strs[-i-1][i]) for i in range(min(len(text), max_word_len))]
-        return max(ends)
+        return best, tokens[::-1]
@@ -0,0 +1,703 @@
+from samson.utilities.runtime import RUNTIME
+from multiprocessing.connection import Listener, Client
+from multiprocessing import AuthenticationError
+from types import FunctionType
+from enum import IntEnum
+import threading
+import traceback
+import sqlite3
+import socket
+import time
+import dill
+import os
+
+import logging
+log = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id      INTEGER PRIMARY KEY,
+    name    TEXT UNIQUE,
+    func    BLOB,
+    total   INTEGER,
+    chunked INTEGER,
+    starmap INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id          INTEGER PRIMARY KEY,
+    job         INTEGER,
+    idx         INTEGER,
+    payload     BLOB,
+    status      INTEGER,
+    attempts    INTEGER DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    completed   INTEGER,
+    result      BLOB,
+    error       TEXT
+);
+
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, job);
+CREATE INDEX IF NOT EXISTS tasks_completed ON tasks (job, completed);
+"""
+
+
+class TaskStatus(IntEnum):
+    PENDING   = 0
+    RUNNING   = 1
+    DONE      = 2
+    FAILED    = 3
+    CANCELLED = 4
+
+
+
+def chunk_range(space: range, chunk_size: int) -> list:
+    """
+    Splits `space` into consecutive ranges of at most `chunk_size` elements.
+
+    Parameters:
+        space     (range): Search space.
+        chunk_size  (int): Maximum elements per chunk.
+
+    Returns:
+        list: Ranges covering `space`.
+
+    Examples:
+        >>> from samson.auxiliary.work_queue import chunk_range
+        >>> chunk_range(range(10), 4)
+        [range(0, 4), range(4, 8), range(8, 10)]
+
+    """
+    return [space[i:i+chunk_size] for i in range(0, len(space), chunk_size)]
+
+
+
+class Job(object):
+    """
+    Handle to a job in a `WorkQueue`. Since all state lives in the queue, a job can be reattached after a restart with
+    `WorkQueue.job`.
+    """
+
+    def __init__(self, queue: 'WorkQueue', job_id: int, name: str, total: int, chunked: bool):
+        self.queue   = queue
+        self.job_id  = job_id
+        self.name    = name
+        self.total   = total
+        self.chunked = chunked
+
+
+    def __repr__(self):
+        return f"<Job: name={self.name}, total={self.total}, status={self.status()}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def status(self) -> dict:
+        """
+        Counts the job's tasks by status.
+
+        Returns:
+            dict: Number of tasks for each `TaskStatus`.
+        """
+        rows   = self.queue._query('SELECT status, COUNT(*) FROM tasks WHERE job=? GROUP BY status', (self.job_id,))
+        counts = {status: 0 for status in TaskStatus}
+
+        for status, count in rows:
+            counts[TaskStatus(status)] = count
+
+        return counts
+
+
+    def done(self) -> bool:
+        counts = self.status()
+        return counts[TaskStatus.PENDING] + counts[TaskStatus.RUNNING] == 0
+
+
+    def cancel(self):
+        """
+        Cancels the job's outstanding tasks. Tasks already running finish, but their results are ignored.
+        """
+        self.queue._query('UPDATE tasks SET status=? WHERE job=? AND status IN (?, ?)', (TaskStatus.CANCELLED, self.job_id, TaskStatus.PENDING, TaskStatus.RUNNING))
+
+
+    def stream(self, work: bool=False, poll_interval: float=0.25, timeout: float=None):
+        """
+        Yields results as tasks complete.
+
+        Parameters:
+            work          (bool): Whether to process the queue's tasks while waiting.
+            poll_interval (float): Seconds between polls of the queue.
+            timeout       (float): Seconds to wait for new results before raising `TimeoutError`.
+
+        Returns:
+            generator: Results formatted as (task index, result).
+        """
+        last_seen = 0
+        deadline  = timeout and time.time() + timeout
+
+        while True:
+            rows = self.queue._query('SELECT idx, completed, result, status, error FROM tasks WHERE job=? AND completed > ? ORDER BY completed', (self.job_id, last_seen))
+
+            for idx, completed, result, status, error in rows:
+                last_seen = completed
+
+                if status == TaskStatus.FAILED:
+                    raise RuntimeError(f'Task {idx} of job {self.name} failed: {error}')
+
+                yield idx, dill.loads(result)
+
+
+            if rows:
+                deadline = timeout and time.time() + timeout
+
+            elif self.done():
+                # Catch anything that completed between the two queries
+                if not self.queue._query('SELECT 1 FROM tasks WHERE job=? AND completed > ?', (self.job_id, last_seen)):
+                    return
+
+            elif not (work and self.queue.work_once(job=self)):
+                if deadline and time.time() > deadline:
+                    raise TimeoutError(f'No results for job {self.name} in {timeout} seconds')
+
+                time.sleep(poll_interval)
+
+
+    @RUNTIME.report
+    def results(self, work: bool=False, poll_interval: float=0.25, timeout: float=None) -> list:
+        """
+        Waits for all results.
+
+        Parameters:
+            work          (bool): Whether to process the queue's tasks while waiting.
+            poll_interval (float): Seconds between polls of the queue.
+            timeout       (float): Seconds to wait for new results before raising `TimeoutError`.
+
+        Returns:
+            list: Results in task order. Chunked jobs are flattened.
+        """
+        results  = [None] * self.total
+        progress = RUNTIME.report_progress(None, total=self.total, desc=self.name, unit='tasks')
+
+        for idx, result in self.stream(work=work, poll_interval=poll_interval, timeout=timeout):
+            results[idx] = result
+            progress.update(1)
+
+        if self.chunked:
+            results = [item for chunk in results for item in chunk]
+
+        return results
+
+
+    def get(self, work: bool=False, poll_interval: float=0.25, timeout: float=None) -> object:
+        """
+        Waits for the result of a single-task job.
+
+        Returns:
+            object: Result.
+        """
+        return self.results(work=work, poll_interval=poll_interval, timeout=timeout)[0]
+
+
+    @RUNTIME.report
+    def first(self, predicate: FunctionType=lambda result: result is not None, work: bool=False, poll_interval: float=0.25, timeout: float=None) -> (int, object):
+        """
+        Waits for the first result that satisfies `predicate` and cancels the remaining tasks. Useful for brute-force searches
+        where each task scans a chunk of the search space.
+
+        Parameters:
+            predicate      (func): Function that takes in a result and returns whether it's a solution.
+            work           (bool): Whether to process the queue's tasks while waiting.
+            poll_interval (float): Seconds between polls of the queue.
+            timeout       (float): Seconds to wait for new results before raising `TimeoutError`.
+
+        Returns:
+            (int, object): Task index and result, or (None, None) if no task found a solution.
+        """
+        progress = RUNTIME.report_progress(None, total=self.total, desc=self.name, unit='tasks')
+
+        for idx, result in self.stream(work=work, poll_interval=poll_interval, timeout=timeout):
+            progress.update(1)
+
+            if predicate(result):
+                self.cancel()
+                return idx, result
+
+        return None, None
+
+
+
+class WorkQueue(object):
+    """
+    SQLite-backed work queue. Stands in for a Celery broker: any process on the same host can open the database to submit
+    jobs or run a worker. Functions and arguments are serialized with `dill`.
+
+    The database must be on a local filesystem since SQLite's locking isn't reliable over network filesystems. To spread
+    a queue across machines, serve it with `WorkQueueServer` and connect to it with `RemoteWorkQueue`.
+
+    Tasks are leased to workers. If a worker dies, its lease expires and the task is handed out again. Failed tasks are retried
+    up to `retries` times. Since finished results are stored in the queue, resubmitting a named job after a restart resumes it.
+    """
+
+    def __init__(self, path: str=None, lease: float=600.0, retries: int=3):
+        """
+        Parameters:
+            path     (str): Path to the database. Defaults to 'work_queue.db' in `RUNTIME.cache_dir`.
+            lease  (float): Seconds a worker has to finish a task before it's handed out again.
+            retries  (int): Number of times to retry a task that raised.
+        """
+        if not path:
+            os.makedirs(RUNTIME.cache_dir, exist_ok=True)
+            path = os.path.join(RUNTIME.cache_dir, 'work_queue.db')
+
+        self.path    = path
+        self.lease   = lease
+        self.retries = retries
+        self.worker  = f'{socket.gethostname()}:{os.getpid()}'
+
+        self._local = threading.local()
+        self._funcs = {}
+        self._connect().executescript(_SCHEMA)
+
+
+    def __repr__(self):
+        return f"<WorkQueue: path={self.path}, lease={self.lease}, retries={self.retries}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def __reduce__(self):
+        return WorkQueue, (self.path, self.lease, self.retries)
+
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections can't be shared across threads or processes. The default rollback journal is kept
+        # since WAL mode needs shared memory and breaks across hosts
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._local.pid  = os.getpid()
+
+        return self._local.conn
+
+
+    def _worker_id(self) -> str:
+        return f'{self.worker}:{threading.get_ident()}'
+
+
+    def _query(self, query: str, params: tuple=()) -> list:
+        return self._connect().execute(query, params).fetchall()
+
+
+    def _job_from_row(self, row: tuple) -> Job:
+        job_id, name, total, chunked = row
+        return Job(self, job_id, name, total, bool(chunked))
+
+
+    def job(self, name: str) -> Job:
+        """
+        Reattaches to a job by name.
+
+        Parameters:
+            name (str): Job name.
+
+        Returns:
+            Job: The job or None if it doesn't exist.
+        """
+        rows = self._query('SELECT id, name, total, chunked FROM jobs WHERE name=?', (name,))
+        return self._job_from_row(rows[0]) if rows else None
+
+
+    def jobs(self) -> list:
+        return [self._job_from_row(row) for row in self._query('SELECT id, name, total, chunked FROM jobs ORDER BY id')]
+
+
+    def delete(self, job: Job):
+        self._delete_job(job.job_id)
+
+
+    def _delete_job(self, job_id: int):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM tasks WHERE job=?', (job_id,))
+        conn.execute('DELETE FROM jobs WHERE id=?', (job_id,))
+        conn.execute('COMMIT')
+
+
+    def submit(self, func: FunctionType, arg_list: list, name: str=None, starmap: bool=True, chunked: bool=False) -> Job:
+        """
+        Submits a job with one task per element of `arg_list`. If a job called `name` already exists, it's returned instead
+        so that finished tasks aren't recomputed.
+
+        Parameters:
+            func     (func): Function to run.
+            arg_list (list): Task arguments.
+            name      (str): Unique job name.
+            starmap  (bool): Whether to unpack each element as the function's arguments.
+            chunked  (bool): Whether each element is a chunk of items to map `func` over.
+
+        Returns:
+            Job: Handle to the job.
+        """
+        if name:
+            job = self.job(name)
+
+            if job:
+                if job.total != len(arg_list):
+                    raise ValueError(f'Job {name} already exists with {job.total} tasks')
+
+                log.info(f'Resuming job {name}: {job.status()}')
+                return job
+
+        job_id, name = self._insert_job(name, dill.dumps(func, recurse=True), [dill.dumps(args) for args in arg_list], chunked, starmap)
+        return Job(self, job_id, name, len(arg_list), chunked)
+
+
+    def _insert_job(self, name: str, func: bytes, payloads: list, chunked: bool, starmap: bool) -> (int, str):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            job_id = conn.execute('INSERT INTO jobs (name, func, total, chunked, starmap) VALUES (?, ?, ?, ?, ?)', (name, func, len(payloads), chunked, starmap)).lastrowid
+            name   = name or f'job-{job_id}'
+
+            conn.execute('UPDATE jobs SET name=? WHERE id=?', (name, job_id))
+            conn.executemany('INSERT INTO tasks (job, idx, payload, status) VALUES (?, ?, ?, ?)', [(job_id, idx, payload, TaskStatus.PENDING) for idx, payload in enumerate(payloads)])
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return job_id, name
+
+
+    def map(self, func: FunctionType, iterable: list, chunk_size: int=1, name: str=None, starmap: bool=False) -> Job:
+        """
+        Submits a job that maps `func` over `iterable` in chunks of `chunk_size` items.
+
+        Parameters:
+            func       (func): Function to run.
+            iterable   (list): Items to map over.
+            chunk_size  (int): Items per task.
+            name        (str): Unique job name.
+            starmap    (bool): Whether to unpack each item as the function's arguments.
+
+        Returns:
+            Job: Handle to the job. `Job.results` returns one result per item.
+        """
+        items = list(iterable)
+        return self.submit(func, [items[i:i+chunk_size] for i in range(0, len(items), chunk_size)], name=name, starmap=starmap, chunked=True)
+
+
+    def search(self, func: FunctionType, space: range, chunk_size: int, name: str=None) -> Job:
+        """
+        Submits a brute-force search. `func` takes in a `range` and returns a solution or None.
+
+        Parameters:
+            func      (func): Function that searches a chunk of the search space.
+            space    (range): Search space.
+            chunk_size (int): Elements per task.
+            name       (str): Unique job name.
+
+        Returns:
+            Job: Handle to the job. Use `Job.first` to wait for a solution.
+
+        Examples:
+            >>> import tempfile, os
+            >>> from samson.auxiliary.work_queue import WorkQueue
+            >>> queue = WorkQueue(os.path.join(tempfile.mkdtemp(), 'queue.db'))
+            >>> queue.search(lambda chunk: next((x for x in chunk if pow(11, x, 1009) == 13), None), range(1009), 100).first(work=True)[1]
+            357
+
+        """
+        return self.submit(func, chunk_range(space, chunk_size), starmap=False, name=name)
+
+
+    def run_async(self, func: FunctionType, *args, **kwargs) -> Job:
+        return self.submit(lambda args, kwargs: func(*args, **kwargs), [(args, kwargs)])
+
+
+    def run(self, func: FunctionType, *args, **kwargs) -> object:
+        return self.run_async(func, *args, **kwargs).get(work=True)
+
+
+    def distribute(self, func: FunctionType, arg_list: list, work: bool=True) -> list:
+        return self.submit(func, arg_list).results(work=work)
+
+
+    def _claim(self, job: Job=None) -> tuple:
+        return self._claim_task(job and job.job_id, self._worker_id())
+
+
+    def _claim_task(self, job_id: int, worker: str) -> tuple:
+        conn = self._connect()
+        now  = time.time()
+
+        conn.execute('BEGIN IMMEDIATE')
+
+        try:
+            row = conn.execute(f'SELECT id, job, payload, attempts FROM tasks WHERE (status=? OR (status=? AND lease_until < ?)) {"AND job=?" if job_id else ""} ORDER BY id LIMIT 1', (TaskStatus.PENDING, TaskStatus.RUNNING, now) + ((job_id,) if job_id else ())).fetchone()
+
+            if row:
+                conn.execute('UPDATE tasks SET status=?, worker=?, lease_until=?, attempts=attempts+1 WHERE id=?', (TaskStatus.RUNNING, worker, now + self.lease, row[0]))
+
+            conn.execute('COMMIT')
+
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        return row
+
+
+    def _complete(self, task_id: int, status: TaskStatus, result: bytes=None, error: str=None):
+        self._complete_task(task_id, status, result, error, self._worker_id())
+
+
+    def _complete_task(self, task_id: int, status: TaskStatus, result: bytes, error: str, worker: str):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+
+        # Ignore results of cancelled tasks and tasks that were handed to another worker
+        conn.execute('UPDATE tasks SET status=?, result=?, error=?, completed=(SELECT COALESCE(MAX(completed), 0) + 1 FROM tasks) WHERE id=? AND status=? AND worker=?', (status, result, error, task_id, TaskStatus.RUNNING, worker))
+        conn.execute('COMMIT')
+
+
+    def _load_func(self, job_id: int) -> (FunctionType, bool, bool):
+        if job_id not in self._funcs:
+            func, chunked, starmap = self._query('SELECT func, chunked, starmap FROM jobs WHERE id=?', (job_id,))[0]
+            self._funcs[job_id] = dill.loads(func), bool(chunked), bool(starmap)
+
+        return self._funcs[job_id]
+
+
+    def work_once(self, job: Job=None) -> bool:
+        """
+        Claims and runs a single task.
+
+        Parameters:
+            job (Job): Only claim tasks from this job.
+
+        Returns:
+            bool: Whether a task was run.
+        """
+        row = self._claim(job)
+
+        if not row:
+            return False
+
+        task_id, job_id, payload, attempts = row
+        func, chunked, starmap = self._load_func(job_id)
+
+        try:
+            args = dill.loads(payload)
+
+            if chunked:
+                result = [func(*item) if starmap else func(item) for item in args]
+            else:
+                result = func(*args) if starmap else func(args)
+
+            self._complete(task_id, TaskStatus.DONE, result=dill.dumps(result))
+
+        except Exception:
+            error = traceback.format_exc()
+
+            if attempts + 1 > self.retries:
+                log.error(f'Task {task_id} failed permanently: {error}')
+                self._complete(task_id, TaskStatus.FAILED, result=dill.dumps(None), error=error)
+            else:
+                log.warning(f'Task {task_id} failed (attempt {attempts + 1}/{self.retries + 1}): {error}')
+                self._query('UPDATE tasks SET status=? WHERE id=? AND status=?', (TaskStatus.PENDING, task_id, TaskStatus.RUNNING))
+
+        return True
+
+
+    def start_worker(self, poll_interval: float=1.0, max_tasks: int=None, stop_when_idle: bool=False) -> int:
+        """
+        Runs tasks until stopped.
+
+        Parameters:
+            poll_interval (float): Seconds to wait when the queue is empty.
+            max_tasks       (int): Maximum number of tasks to run.
+            stop_when_idle (bool): Whether to return once the queue is empty.
+
+        Returns:
+            int: Number of tasks run.
+        """
+        log.info(f'Starting worker {self.worker} on {self.path}')
+        num_tasks = 0
+
+        while max_tasks is None or num_tasks < max_tasks:
+            if self.work_once():
+                num_tasks += 1
+
+            elif stop_when_idle:
+                break
+
+            else:
+                time.sleep(poll_interval)
+
+        return num_tasks
+
+
+
+class WorkQueueServer(object):
+    """
+    Serves a `WorkQueue` over TCP so clients and workers on other machines can use it through `RemoteWorkQueue`. Connections
+    are authenticated with `authkey` (see `multiprocessing.connection`). Anyone with the key can run code on the workers.
+
+    Examples:
+        >>> import tempfile, os
+        >>> from samson.auxiliary.work_queue import WorkQueue, WorkQueueServer, RemoteWorkQueue
+        >>> server = WorkQueueServer(WorkQueue(os.path.join(tempfile.mkdtemp(), 'queue.db')), authkey=b'secret').start()
+        >>> RemoteWorkQueue(server.address, b'secret').map(lambda x: x*x, range(4)).results(work=True)
+        [0, 1, 4, 9]
+        >>> server.close()
+
+    """
+    METHODS = {'_query', '_insert_job', '_delete_job', '_claim_task', '_complete_task'}
+
+    def __init__(self, queue: WorkQueue, address: tuple=('localhost', 0), authkey: bytes=None):
+        """
+        Parameters:
+            queue   (WorkQueue): Queue to serve.
+            address     (tuple): (host, port) to listen on. Port 0 picks a free port.
+            authkey     (bytes): Shared secret clients must know.
+        """
+        if not authkey:
+            raise ValueError('An authkey is required')
+
+        self.queue    = queue
+        self.listener = Listener(address, authkey=authkey)
+        self.address  = self.listener.address
+
+
+    def __repr__(self):
+        return f"<WorkQueueServer: address={self.address}, queue={self.queue}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def start(self) -> 'WorkQueueServer':
+        """
+        Serves the queue on a background thread.
+
+        Returns:
+            WorkQueueServer: Itself.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+    def serve_forever(self):
+        log.debug(f'Serving {self.queue} on {self.address}')
+
+        while True:
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError as e:
+                log.warning(f'Rejected connection: {e}')
+                continue
+            except OSError:
+                # Listener was closed
+                return
+
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+
+    def close(self):
+        self.listener.close()
+
+
+    def _handle(self, conn: 'Connection'):
+        with conn:
+            while True:
+                try:
+                    method, args = conn.recv()
+                except (EOFError, OSError):
+                    return
+
+                try:
+                    if method not in self.METHODS:
+                        raise ValueError(f"Unknown method '{method}'")
+
+                    conn.send((True, getattr(self.queue, method)(*args)))
+
+                except Exception as e:
+                    conn.send((False, e))
+
+
+
+class RemoteWorkQueue(WorkQueue):
+    """
+    Client for a `WorkQueue` served by `WorkQueueServer`. Supports everything a local `WorkQueue` does, including running
+    workers. Task leases are set by the served queue.
+    """
+
+    def __init__(self, address: tuple, authkey: bytes, retries: int=3):
+        """
+        Parameters:
+            address (tuple): (host, port) of the server.
+            authkey (bytes): Shared secret of the server.
+            retries   (int): Number of times to retry a task that raised.
+        """
+        self.address = tuple(address)
+        self.authkey = authkey
+        self.path    = '{}:{}'.format(*self.address)
+        self.lease   = None
+        self.retries = retries
+        self.worker  = f'{socket.gethostname()}:{os.getpid()}'
+
+        self._local = threading.local()
+        self._funcs = {}
+
+
+    def __repr__(self):
+        return f"<RemoteWorkQueue: address={self.address}, retries={self.retries}>"
+
+
+    def __reduce__(self):
+        return RemoteWorkQueue, (self.address, self.authkey, self.retries)
+
+
+    def _connect(self) -> 'Connection':
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.conn = Client(self.address, authkey=self.authkey)
+            self._local.pid  = os.getpid()
+
+        return self._local.conn
+
+
+    def _call(self, method: str, *args) -> object:
+        conn = self._connect()
+        conn.send((method, args))
+        success, value = conn.recv()
+
+        if not success:
+            raise value
+
+        return value
+
+
+    def _query(self, query: str, params: tuple=()) -> list:
+        return self._call('_query', query, params)
+
+
+    def _insert_job(self, name: str, func: bytes, payloads: list, chunked: bool, starmap: bool) -> (int, str):
+        return self._call('_insert_job', name, func, payloads, chunked, starmap)
+
+
+    def _delete_job(self, job_id: int):
+        return self._call('_delete_job', job_id)
+
+
+    def _claim_task(self, job_id: int, worker: str) -> tuple:
+        return self._call('_claim_task', job_id, worker)
+
+
+    def _complete_task(self, task_id: int, status: TaskStatus, result: bytes, error: str, worker: str):
+        return self._call('_complete_task', task_id, status, result, error, worker)
@@ -1,11 +1,73 @@
 from z3 import BitVecs, Solver, LShR, Bool, Implies, sat, RotateLeft
 from samson.utilities.exceptions import NoSolutionException
+from samson.math.gf2_system import GF2LinearSystem, LinearWord
+from samson.utilities.runtime import RUNTIME
 from samson.core.primitives import BasePRNG
 from samson.core.metadata import CrackingDifficulty
+from types import FunctionType
 from inspect import isclass
 import random
 
 
+@RUNTIME.global_cache()
+def _linear_model(prng_class: type) -> tuple:
+    """
+    Derives the GF(2) state transition and output of `prng_class` by running its `gen_func` on symbolic words.
+
+    Returns:
+        tuple: (transition, output) lists of linear forms over the previous state, or None if the transition isn't linear.
+    """
+    bits  = prng_class.NATIVE_BITS
+    state = [LinearWord.variables(bits, bits*i) for i in range(prng_class.STATE_SIZE)]
+
+    try:
+        state, output = prng_class.gen_func(*state, SHFT_L=lambda x, n: x << n, SHFT_R=lambda x, n: x >> n, RotateLeft=lambda x, n: x.rotl(n))
+    except (TypeError, AttributeError):
+        return None
+
+    transition = [form for word in state for form in word.bits]
+
+    if None in transition:
+        return None
+
+    return transition, output.bits
+
+
+def _substitute(forms: list, state: list) -> list:
+    """
+    Expresses `forms` over the unknowns of `state`, where `state` holds the linear form of each bit the `forms` reference.
+    """
+    results = []
+
+    for form in forms:
+        if form is None:
+            results.append(None)
+            continue
+
+        result = form & 1
+        form >>= 1
+        idx    = 0
+
+        while form:
+            low   = form & -form
+            idx  += low.bit_length() - 1
+            result ^= state[idx]
+            form >>= low.bit_length()
+            idx  += 1
+
+        results.append(result)
+
+    return results
+
+
+def _observation(observation) -> tuple:
+    if observation is None or type(observation) is tuple:
+        return observation
+
+    return observation, None
+
+
+
 class IterativePRNG(BasePRNG):
     """
     Base class for PRNGs that iterate over fixed-size state.
@@ -33,38 +95,123 @@ class IterativePRNG(BasePRNG):
         return result
 
 
-    def crack(self, outputs: list) -> 'IterativePRNG':
+    def crack(self, outputs: list, observe: FunctionType=None) -> 'IterativePRNG':
         """
-        Cracks the PRNG's internal state using `outputs`.
+        Cracks the PRNG's internal state using `outputs`. Generators that are linear over GF(2) are solved by Gaussian
+        elimination over the observed bits; otherwise (or if the linear bits are insufficient), z3 is used.
 
         Parameters:
-            outputs (list): Observed, sequential outputs.
+            outputs  (list): Observed, sequential outputs. Each entry is an int, a (value, mask) tuple of partially observed bits, or `None` if unobserved.
+            observe  (func): (Optional) Function of the state after each step returning the observed word instead of the output (e.g. `lambda state: state[0]` for V8's `Math.random`). Must work on ints and `LinearWord`s.
 
         Returns:
             IterativePRNG: Cracked IterativePRNG of the subclass' class.
+
+        Examples:
+            >>> from samson.core.iterative_prng import IterativePRNG
+            >>> from samson.prngs.xorshift import Xorshift128Plus
+            >>> xs = Xorshift128Plus([0x1234, 0x5678])
+            >>> doubles  = [(xs.generate(), xs.state[0] >> 11)[1] / 2**53 for _ in range(4)]
+            >>> observed = [(int(d * 2**53) << 11, (2**53 - 1) << 11) for d in doubles]
+            >>> IterativePRNG.crack(Xorshift128Plus, observed, observe=lambda state: state[0]).state == xs.state
+            True
+
         """
-        state_vecs = BitVecs(' '.join([f'ostate{i}' for i in range(self.STATE_SIZE)]), self.NATIVE_BITS)
+        prng_class = self if isclass(self) else self.__class__
+
+        try:
+            return IterativePRNG._crack_linear(prng_class, outputs, observe)
+        except NoSolutionException:
+            if observe:
+                raise
+
+        return IterativePRNG._crack_z3(prng_class, outputs)
+
+
+    @staticmethod
+    def _crack_linear(prng_class: type, outputs: list, observe: FunctionType=None) -> 'IterativePRNG':
+        model = _linear_model(prng_class)
+
+        if not model:
+            raise NoSolutionException('PRNG is not linear over GF(2)')
+
+        transition, out_forms = model
+        bits     = prng_class.NATIVE_BITS
+        num_vars = bits*prng_class.STATE_SIZE
+
+        if observe:
+            out_forms = observe([LinearWord.variables(bits, bits*i) for i in range(prng_class.STATE_SIZE)]).bits
+
+
+        # `state` holds the linear form of each current state bit over the initial state
+        state  = [1 << (i+1) for i in range(num_vars)]
+        system = GF2LinearSystem(num_vars)
+
+        for observation in outputs:
+            prev  = state
+            state = _substitute(transition, prev)
+
+            if observation is None:
+                continue
+
+            value, mask = _observation(observation)
+
+            for form, bit in LinearWord(_substitute(out_forms, state if observe else prev)).equations(value, mask):
+                system.add_equation(form, bit)
+
+            if system.rank == num_vars:
+                break
+
+
+        if system.rank < num_vars:
+            raise NoSolutionException("Linear bits of the outputs don't determine the state")
+
+        solution = system.solve()
+        prng     = prng_class([(solution >> (bits*i)) & (2**bits-1) for i in range(prng_class.STATE_SIZE)])
+
+        for observation in outputs:
+            output = prng.generate()
+
+            if observation is None:
+                continue
+
+            value, mask = _observation(observation)
+            observed    = observe(prng.state) if observe else output
+
+            if (observed ^ value) & (mask if mask is not None else -1):
+                raise NoSolutionException('Outputs are inconsistent')
+
+        return prng
+
+
+    @staticmethod
+    def _crack_z3(prng_class: type, outputs: list) -> 'IterativePRNG':
+        state_vecs = BitVecs(' '.join([f'ostate{i}' for i in range(prng_class.STATE_SIZE)]), prng_class.NATIVE_BITS)
         sym_states = state_vecs
 
         solver     = Solver()
         conditions = []
 
-        for output in outputs:
-            sym_states, calc = self.gen_func(*sym_states, SHFT_L=lambda x, n: x << n, SHFT_R=LShR, RotateLeft=RotateLeft)
+        for observation in outputs:
+            sym_states, calc = prng_class.gen_func(*sym_states, SHFT_L=lambda x, n: x << n, SHFT_R=LShR, RotateLeft=RotateLeft)
+
+            if observation is None:
+                continue
+
+            value, mask = _observation(observation)
+
+            if mask is not None:
+                calc, value = calc & mask, value & mask
 
             condition = Bool('c%d' % int(random.random()))
-            solver.add(Implies(condition, calc == int(output)))
+            solver.add(Implies(condition, calc == int(value)))
             conditions += [condition]
 
         if solver.check(conditions) == sat:
             model  = solver.model()
             params = [model[vec].as_long() for vec in state_vecs]
 
-            if isclass(self):
-                prng = self(params)
-            else:
-                prng = self.__class__(params)
-
+            prng = prng_class(params)
             [prng.generate() for _ in outputs]
             return prng
 
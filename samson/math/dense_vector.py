@@ -2,7 +2,7 @@ from samson.utilities.runtime import RUNTIME
 from samson.core.base_object import BaseObject
 from samson.math.general import gcd
 from samson.math.algebra.rings.integer_ring import ZZ
-from samson.math.fft.all import ntt_convolution, gss_convolution
+from samson.math.fft.all import ntt_convolution, convolution
 from types import FunctionType
 
 class DenseVector(BaseObject):
@@ -163,9 +163,8 @@ class DenseVector(BaseObject):
                 return vec_c_zz*(content_a*content_b)
 
 
-            # TODO: Check for Quotient ring
             else:
-                return gss_convolution(vec_a.values, vec_b.values).dense_vector()
+                return convolution(vec_a.values, vec_b.values).dense_vector()
 
         else:
             vec = [0]*(len(vec_a) + len(vec_b))
@@ -1,5 +1,5 @@
 from samson.auxiliary.complexity import add_complexity, KnownComplexities
-from samson.utilities.exceptions import SearchspaceExhaustedException
+from samson.utilities.exceptions import SearchspaceExhaustedException, ProbabilisticFailureException
 from samson.math.general import is_prime, _integer_ring, _factor_gen, _mat, sieve_of_eratosthenes, kth_root, crt
 from samson.utilities.runtime import RUNTIME
 from typing import Tuple
@@ -317,7 +317,7 @@ def pollards_rho_log(g: 'RingElement', y: 'RingElement', order: int=None) -> int
 
 
 
-def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterations: int=30, f: FunctionType=None, apply_reduction: bool=True) -> int:
+def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterations: int=30, f: FunctionType=None, apply_reduction: bool=True, checkpoint: str=None) -> int:
     """
     Probabilistically finds the discrete logarithm of base `g` in GF(`p`) of `y` in the interval [`a`, `b`].
 
@@ -329,6 +329,7 @@ def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterat
         iterations       (int): Number of times to run the outer loop. If `f` is None, it's used in the pseudorandom map.
         f               (func): Pseudorandom map function of signature (`y`: RingElement, k: int) -> int.
         apply_reduction (bool): Whether or not to reduce the answer by the ring's order.
+        checkpoint       (str): Name to checkpoint the kangaroos' progress under (see `RUNTIME.checkpoint`). A custom `f` must be deterministic across runs.
 
     Returns:
         int: The discrete logarithm. Possibly None if it couldn't be found.
@@ -356,7 +357,6 @@ def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterat
     References:
         https://en.wikipedia.org/wiki/Pollard%27s_kangaroo_algorithm
     """
-    k = iterations
     R = g.ring
 
     # This pseudorandom map function has the following desirable properties:
@@ -364,25 +364,32 @@ def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterat
     # 2) Works across all rings
     if not f:
         n = kth_root(b-a, 2)
-        f = lambda y, k: pow(2, hash(y) % k, n)
+
+        # `hash` is salted per process, so a resumed run needs a map that's stable across processes
+        if checkpoint:
+            f = lambda y, k: pow(2, int(y) % k, n)
+        else:
+            f = lambda y, k: pow(2, hash(y) % k, n)
+
+    # State is (k, tame steps, tame kangaroo, wild kangaroo)
+    checkpoint = RUNTIME.checkpoint(checkpoint, inputs=(g, y, a, b))
+    k, i, xT, yT, xW, yW = checkpoint.load(default=(iterations, 0, 0, g*b, 0, y))
 
     while k > 1:
         N = (f(g, k) + f(g*b, k)) // 2 * 4
 
         # Tame kangaroo
-        xT = 0
-        yT = g*b
-
-        for _ in range(N):
+        while i < N:
             f_yT = f(yT, k)
             xT  += f_yT
             yT  += g*f_yT
+            i   += 1
 
+            if checkpoint.due():
+                checkpoint.save((k, i, xT, yT, xW, yW))
 
-        # Wild kangaroo
-        xW = 0
-        yW = y
 
+        # Wild kangaroo
         while xW < b - a + xT:
             f_yW = f(yW, k)
             xW  += f_yW
@@ -394,12 +401,18 @@ def pollards_kangaroo(g: 'RingElement', y: 'RingElement', a: int, b: int, iterat
                 if apply_reduction:
                     result %= R.order()
 
+                checkpoint.clear()
                 return result
 
+            if checkpoint.due():
+                checkpoint.save((k, i, xT, yT, xW, yW))
+
 
         # Didn't find it. Try another `k`
         k -= 1
+        i, xT, yT, xW, yW = 0, 0, g*b, 0, y
 
+    checkpoint.clear()
     raise ProbabilisticFailureException("Discrete logarithm not found")
 
 
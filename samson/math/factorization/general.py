@@ -588,7 +588,7 @@ def is_composite_power(n: int, precision: float=0.6) -> (bool, int, int):
 _POLLARD_QUICK_ITERATIONS = 25
 
 @RUNTIME.global_cache()
-def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rho_max_bits: int=90, use_msieve: bool=True, use_cado_nfs: bool=True, use_siqs: bool=True, use_smooth_p: bool=False, use_ecm: bool=False, ecm_attempts: int=100000, perfect_power_checks: bool=True, mersenne_check: bool=True, visual: bool=False, reraise_interrupt: bool=False, user_stop_func: FunctionType=None) -> Factors:
+def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rho_max_bits: int=90, use_msieve: bool=True, use_cado_nfs: bool=True, use_siqs: bool=True, use_smooth_p: bool=False, use_ecm: bool=False, ecm_attempts: int=100000, perfect_power_checks: bool=True, mersenne_check: bool=True, visual: bool=False, reraise_interrupt: bool=False, user_stop_func: FunctionType=None, checkpoint: str=None) -> Factors:
     """
     Factors an integer `n` into its prime factors.
 
@@ -608,6 +608,7 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
         visual               (bool): Whether or not to display a progress bar.
         reraise_interrupt    (bool): Whether or not to reraise a KeyboardInterrupt.
         user_stop_func       (func): A function that takes in (`n`, facs) and returns True if the user wants to stop factoring.
+        checkpoint            (str): Name to checkpoint the factors found so far under (see `RUNTIME.checkpoint`).
 
     Returns:
         Factors: Factorization of `n`.
@@ -642,6 +643,11 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
         return Factors(factors)
 
 
+    # Resume from the factors found so far
+    checkpoint = RUNTIME.checkpoint(checkpoint, inputs=original)
+    factors, n = checkpoint.load(default=(factors, n))
+
+
     def calc_prog(x):
         return round(math.log(x, 2), 2)
 
@@ -681,6 +687,7 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
                     progress_update(rek)
                     n //= rek
 
+        checkpoint.save((factors, n), force=True)
         return n
 
 
@@ -776,6 +783,7 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
                 # cado-nfs will always fully factor
                 factors += n_fac
                 n //= n_fac.recombine()
+                checkpoint.save((factors, n), force=True)
 
 
         if use_msieve:
@@ -786,6 +794,7 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
                 # msieve will always fully factor
                 factors += n_fac
                 n //= n_fac.recombine()
+                checkpoint.save((factors, n), force=True)
 
 
 
@@ -805,7 +814,7 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
 
         if use_siqs:
             while not is_factored(n):
-                primes, composites = _siqs.siqs(n, visual=visual)
+                primes, composites = _siqs.siqs(n, visual=visual, checkpoint=checkpoint.name and f'{checkpoint.name}.siqs-{n}')
                 factors += primes
 
                 n //= primes.recombine()
@@ -817,6 +826,8 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
 
 
     except KeyboardInterrupt:
+        checkpoint.save((factors, n), force=True)
+
         if reraise_interrupt:
             raise KeyboardInterrupt()
 
@@ -825,6 +836,9 @@ def factor(n: int, use_trial: bool=True, limit: int=1000, use_rho: bool=True, rh
     if n != 1:
         factors.add(n)
 
+    if n == 1 or is_prime(n):
+        checkpoint.clear()
+
     return factors
 
 
@@ -7,6 +7,7 @@ from samson.math.factorization.factors import Factors
 from samson.math.factorization.general import trial_division
 from samson.math.sparse_vector import SparseVector
 from samson.auxiliary.complexity import add_complexity, KnownComplexities
+from samson.utilities.runtime import RUNTIME
 from tqdm import tqdm
 import math
 
@@ -440,7 +441,7 @@ def find_factors(n: int, solutions: list, smooth_nums: list, M: BMatrix, marks:
 
 
 @add_complexity(KnownComplexities.SIQS)
-def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bool=False) -> (Factors, Factors):
+def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bool=False, checkpoint: str=None) -> (Factors, Factors):
     """
     Factors an integer `n` using the Self-Initializing Quadratic Sieve. Effective for integers up to 100 digits (~330 bits).
 
@@ -449,6 +450,7 @@ def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bo
         bound_ratio     (float): Percentage of wanted bound to optimized bound.
         relations_ratio (float): Percentage of wanted relations to required relations.
         visual           (bool): Whether or not to display progress bar.
+        checkpoint        (str): Name to periodically checkpoint the smooth relations under (see `RUNTIME.checkpoint`).
 
     Returns:
         (Factors, Factors): Formatted (prime factors, composite factors).
@@ -457,9 +459,13 @@ def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bo
     nf         = int(nf * bound_ratio)
     prime_base = find_base(n, nf)
 
-    smooth_relations = []
+    checkpoint = RUNTIME.checkpoint(checkpoint, inputs=n)
+    smooth_relations, relations_ratio = checkpoint.load(default=([], relations_ratio))
     num_poly = 0
 
+    if smooth_relations:
+        log.info(f"Resuming with {len(smooth_relations)} smooth relations from checkpoint")
+
     log.debug(f"Searching for smooth relations using {nf} factors over interval size {m}...")
 
     while True:
@@ -493,6 +499,7 @@ def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bo
             # Sieve
             sieve_array = sieve(prime_base, m)
             siqs_trial_div(n, m, g, h, sieve_array, prime_base, required_relations, smooth_relations, progress_update)
+            checkpoint.save((smooth_relations, relations_ratio))
 
 
 
@@ -510,6 +517,8 @@ def siqs(n: int, bound_ratio: float=1.0, relations_ratio: float=1.05, visual: bo
 
 
         if primes or composites:
+            checkpoint.clear()
             return primes, composites
         else:
             relations_ratio += 0.05
+            checkpoint.save((smooth_relations, relations_ratio), force=True)
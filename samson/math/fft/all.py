@@ -1,2 +1,3 @@
 from .gss import _convolution as gss_convolution
-from .ntt import linear_convolution as ntt_convolution
\ No newline at end of file
+from .ntt import linear_convolution as ntt_convolution
+from .convolution import convolution
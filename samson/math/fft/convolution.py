@@ -0,0 +1,59 @@
+from samson.math.fft.gss import _convolution as gss_convolution
+from samson.math.fft.ntt import linear_convolution as ntt_convolution
+from samson.math.sparse_vector import SparseVector
+
+from samson.auxiliary.lazy_loader import LazyLoader
+_integer_ring  = LazyLoader('_integer_ring', globals(), 'samson.math.algebra.rings.integer_ring')
+_quotient_ring = LazyLoader('_quotient_ring', globals(), 'samson.math.algebra.rings.quotient_ring')
+
+
+def ntt_modulus(ring: 'Ring') -> int:
+    """
+    Determines whether `ring` can be multiplied over with integer NTTs.
+
+    Parameters:
+        ring (Ring): Coefficient ring.
+
+    Returns:
+        int: 0 for ZZ, the modulus for ZZ/ZZ(n), and None if NTTs can't be used.
+    """
+    ZZ = _integer_ring.ZZ
+
+    if ring == ZZ:
+        return 0
+
+    elif isinstance(ring, _quotient_ring.QuotientRing) and ring.ring == ZZ:
+        return int(ring.quotient)
+
+    return None
+
+
+
+def convolution(L1: list, L2: list) -> SparseVector:
+    """
+    Unified convolution engine. Uses multi-prime NTTs for ZZ and ZZ/ZZ(n),
+    and falls back to Schonhage-Strassen for arbitrary rings.
+
+    Parameters:
+        L1 (list): First list of RingElements.
+        L2 (list): Second list of RingElements.
+
+    Returns:
+        SparseVector: Convolution of `L1` and `L2`.
+
+    Examples:
+        >>> from samson.math.all import ZZ
+        >>> from samson.math.fft.convolution import convolution
+        >>> R = ZZ/ZZ(2**127-1)
+        >>> convolution([R(1), R(2)], [R(3), R(-1)]).list()
+        [<QuotientElement: val=3, ring=ZZ/(ZZ(170141183460469231731687303715884105727))>, <QuotientElement: val=5, ring=ZZ/(ZZ(170141183460469231731687303715884105727))>, <QuotientElement: val=170141183460469231731687303715884105725, ring=ZZ/(ZZ(170141183460469231731687303715884105727))>]
+
+    """
+    R       = L1[0].ring
+    modulus = ntt_modulus(R)
+
+    if modulus is None:
+        return gss_convolution(L1, L2)
+
+    result = ntt_convolution([int(c) for c in L1], [int(c) for c in L2], modulus)
+    return SparseVector([R(c) for c in result], R.zero)
@@ -1,105 +1,288 @@
-from samson.math.general import is_prime, totient
-from samson.math.algebra.rings.integer_ring import ZZ
-from samson.utilities.manipulation import reverse_bits
+from samson.math.general import is_prime, mod_inv
+from samson.utilities.runtime import RUNTIME
+
+# NTT-friendly primes of the form c*2^k+1 as (prime, primitive root, k)
+NTT_PRIMES = [
+    (4179340454199820289, 3, 57),
+    (6269010681299730433, 5, 56),
+    (2485986994308513793, 5, 55),
+    (4719772409484279809, 3, 55),
+    (7097673012735901697, 3, 55),
+    (2936346957045563393, 3, 54),
+    (3188548536178311169, 7, 54),
+    (5998794703657500673, 5, 54),
+    (7728176960567771137, 14, 54),
+    (7908320945662590977, 3, 54),
+    (8592868089022906369, 11, 54),
+    (9097271247288401921, 6, 54),
+    (2422936599525326849, 3, 53),
+    (2747195772696002561, 3, 53),
+    (2783224569714966529, 7, 53),
+    (3161526938414088193, 5, 53),
+    (3377699720527872001, 26, 53),
+    (3774016487736475649, 3, 53),
+    (4044232465378705409, 3, 53),
+    (4134304457926115329, 7, 53),
+    (4242390848983007233, 11, 53),
+    (4512606826625236993, 7, 53),
+    (4782822804267466753, 5, 53),
+    (4854880398305394689, 3, 53),
+    (5071053180419178497, 3, 53),
+    (5179139571476070401, 3, 53),
+    (5323254759551926273, 5, 53),
+    (5395312353589854209, 3, 53),
+    (5503398744646746113, 3, 53),
+    (6151917090988097537, 3, 53),
+    (6566248256706183169, 7, 53),
+    (6782421038819966977, 5, 53),
+]
+
+_NEXT_SEARCH = [53, 2**(63-53)-1]
+
+
+def _find_primitive_root(p: int) -> int:
+    from samson.math.factorization.general import factor
+
+    facs = list(factor(p-1).keys())
+    g    = 2
+
+    while any(pow(g, (p-1) // q, p) == 1 for q in facs):
+        g += 1
+
+    return g
+
+
+def register_ntt_primes(count: int):
+    """
+    Extends the NTT prime registry with `count` more primes of the form c*2^k+1.
+    Only needed for coefficients larger than the precomputed registry can reconstruct.
+
+    Parameters:
+        count (int): Number of primes to add.
+    """
+    k, c = _NEXT_SEARCH
+
+    while count:
+        p = c*2**k + 1
+
+        if p.bit_length() < 62:
+            # Exhausted this power of two; drop down a level
+            k -= 1
+            c  = 2**(63-k)-1
+            continue
+
+        if is_prime(p) and p not in [prime for prime, _g, _k in NTT_PRIMES]:
+            NTT_PRIMES.append((p, _find_primitive_root(p), k))
+            count -= 1
+
+        c -= 2
+
+    _NEXT_SEARCH[0] = k
+    _NEXT_SEARCH[1] = c
+
+
+@RUNTIME.global_cache()
+def _root_tables(p: int, g: int, k: int, logn: int) -> (list, list, int):
+    n    = 1 << logn
+    w    = pow(g, (p-1) >> logn, p)
+    w_i  = pow(w, p-2, p)
+    half = n >> 1
+
+    fwd = [1]*max(half, 1)
+    inv = [1]*max(half, 1)
+
+    for i in range(1, half):
+        fwd[i] = fwd[i-1]*w % p
+        inv[i] = inv[i-1]*w_i % p
+
+    return fwd, inv, pow(n, p-2, p)
+
+
+@RUNTIME.global_cache()
+def _crt_parameters(num_primes: int) -> (list, int):
+    primes = [p for p, _g, _k in NTT_PRIMES[:num_primes]]
+    M      = 1
+
+    for p in primes:
+        M *= p
 
-from samson.auxiliary.lazy_loader import LazyLoader
-_dense_vector = LazyLoader('_dense_vector', globals(), 'samson.math.dense_vector')
+    coeffs = [(M // p) * mod_inv(M // p, p) for p in primes]
+    return coeffs, M
 
 
-def find_suitable_prime(X: list, Y: list) -> int:
-    n = len(X)
-    p = int(max(X + Y)**2*n+1)
-    while not is_prime(p):
-        p += n
 
-    return p
+def _bit_reverse(X: list):
+    n = len(X)
+    j = 0
 
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j  ^= bit
+            bit >>= 1
 
-def find_primitive_root(R: 'Ring', degree: int) -> 'RingElement':
-    phi = totient(R.order())
-    g   = R.mul_group().find_gen().val
-    r   = g**(phi // degree)
-    return r
+        j |= bit
 
+        if i < j:
+            X[i], X[j] = X[j], X[i]
 
-def build_power_table(w, n):
-    pow_table = []
-    temp      = w.ring.one
 
-    for _ in range(n // 2):
-        pow_table.append(temp)
-        temp *= w
-    
-    return pow_table
 
+def ntt(X: list, p: int, roots: list):
+    """
+    In-place iterative radix-2 number theoretic transform.
 
-def find_parameters(X, Y):
+    Parameters:
+        X     (list): List of integers mod `p` with power-of-two length.
+        p      (int): Prime modulus.
+        roots (list): Powers of a primitive len(`X`)-th root of unity (first half).
+    """
     n = len(X)
-    p = find_suitable_prime(X, Y)
-    R = ZZ/ZZ(p)
-    w = find_primitive_root(R, n)
+    _bit_reverse(X)
 
-    pow_table = build_power_table(w, n)
-    inv_table = build_power_table(~w, n)
+    length = 2
+    while length <= n:
+        half   = length >> 1
+        blocks = n // length
+        tw     = roots[::blocks][:half]
 
-    return R, pow_table, inv_table
+        if half >= blocks:
+            # Few, large blocks; vectorize across the butterflies
+            for start in range(0, n, length):
+                mid = start + half
+                lo  = X[start:mid]
+                hi  = [x*w % p for x, w in zip(X[mid:start+length], tw)]
 
+                X[start:mid]        = [(u+v) % p for u, v in zip(lo, hi)]
+                X[mid:start+length] = [(u-v) % p for u, v in zip(lo, hi)]
+        else:
+            # Many, small blocks; vectorize across the blocks with strided slices
+            for j in range(half):
+                w  = tw[j]
+                lo = X[j::length]
+                hi = [x*w % p for x in X[j+half::length]]
 
-def linear_convolution(X: list, Y: list) -> 'DenseVector':
-    lx = len(X)
-    ly = len(Y)
-    n  = 2**max(2*lx, 2*ly).bit_length()
-    Xn = [0]*(n - lx) + X
-    Yn = [0]*(n - ly) + Y
-    return circular_convolution(Xn, Yn)[-(lx+ly):]
+                X[j::length]      = [(u+v) % p for u, v in zip(lo, hi)]
+                X[j+half::length] = [(u-v) % p for u, v in zip(lo, hi)]
 
+        length <<= 1
 
 
-def circular_convolution(X: list, Y: list) -> 'DenseVector':
-    n  = len(X)
-    Xn = [0]*(n - len(X)) + X
-    Yn = [0]*(n - len(Y)) + Y
 
-    R, pow_table, inv_table = find_parameters(Xn, Yn)
+def _convolve_mod_prime(X: list, Y: list, prime_idx: int, logn: int) -> list:
+    p, g, k = NTT_PRIMES[prime_idx]
+    fwd, inv, n_inv = _root_tables(p, g, k, logn)
+    n = 1 << logn
 
-    Xn = _dense_vector.DenseVector(Xn, R)
-    Yn = _dense_vector.DenseVector(Yn, R)
+    Xn = [x % p for x in X] + [0]*(n-len(X))
+    ntt(Xn, p, fwd)
 
-    Xf = fft(Xn, pow_table)
-    Yf = fft(Yn, pow_table)
+    if X is Y:
+        Yn = Xn
+    else:
+        Yn = [y % p for y in Y] + [0]*(n-len(Y))
+        ntt(Yn, p, fwd)
 
-    result = fft([a*b for a,b in zip(Xf, Yf)], inv_table)
-    n_inv  = ~R(n)
-    return [(r*n_inv).val for r in result]
+    Z = [a*b % p for a, b in zip(Xn, Yn)]
+    ntt(Z, p, inv)
+    return [z*n_inv % p for z in Z]
 
 
 
+def linear_convolution(X: list, Y: list, modulus: int=None) -> list:
+    """
+    Computes the linear convolution of two integer lists using NTTs over precomputed primes.
+    Multiple primes are combined with the CRT when the coefficients are too large for a single prime.
 
-def fft(X: 'DenseVector', pow_table: list) -> 'DenseVector':
-    X  = X.copy()
-    n  = len(X)
-    nb = n.bit_length()-1
+    Parameters:
+        X       (list): First list of integers.
+        Y       (list): Second list of integers.
+        modulus  (int): (Optional) Reduce inputs and outputs modulo `modulus`.
 
-    for i in range(n):
-        j = reverse_bits(i, nb)
-        if j > i:
-            X[i], X[j] = X[j], X[i]
+    Returns:
+        list: Convolution of length len(`X`) + len(`Y`) - 1.
+
+    Examples:
+        >>> from samson.math.fft.ntt import linear_convolution
+        >>> linear_convolution([1, 2, 3], [-4, 5])
+        [-4, -3, -2, 15]
+
+        >>> linear_convolution([2**100, 1], [2**100, -1], modulus=2**127-1)
+        [9444732965739290427392, 0, 170141183460469231731687303715884105726]
+
+    """
+    if not (X and Y):
+        return []
+
+    X = [int(x) for x in X]
+    Y = [int(y) for y in Y] if X is not Y else X
+
+    if modulus:
+        X = [x % modulus for x in X]
+        Y = [y % modulus for y in Y] if X is not Y else X
+
+    out_len = len(X) + len(Y) - 1
+    logn    = max(out_len-1, 1).bit_length()
+
+    # Bound the largest possible coefficient
+    max_x = max(abs(x) for x in X)
+    max_y = max(abs(y) for y in Y)
+    bound = 2*max_x*max_y*min(len(X), len(Y)) + 1
+
+    num_primes = 0
+    prod       = 1
+    while prod <= bound:
+        if num_primes == len(NTT_PRIMES):
+            register_ntt_primes(max(len(NTT_PRIMES) // 2, 1))
 
+        p, _g, k = NTT_PRIMES[num_primes]
 
-    for level in range(1, n.bit_length()):
-        size       = 2**level
-        half_size  = size // 2
-        table_step = n // size
+        if k < logn:
+            raise ValueError(f"Convolution of length 2^{logn} exceeds the supported NTT length")
+
+        prod       *= p
+        num_primes += 1
+
+
+    residues = [_convolve_mod_prime(X, Y, i, logn) for i in range(num_primes)]
+
+    if num_primes == 1:
+        Z = residues[0]
+        M = NTT_PRIMES[0][0]
+    else:
+        crt_coeffs, M = _crt_parameters(num_primes)
+        Z = [sum(r*c for r, c in zip(res, crt_coeffs)) % M for res in zip(*residues)]
+
+    Z = Z[:out_len]
+
+    if modulus:
+        return [z % modulus for z in Z]
+    else:
+        half_M = M >> 1
+        return [z - M if z > half_M else z for z in Z]
+
+
+
+def circular_convolution(X: list, Y: list, modulus: int=None) -> list:
+    """
+    Computes the circular (cyclic) convolution of two integer lists of equal length.
+
+    Parameters:
+        X       (list): First list of integers.
+        Y       (list): Second list of integers.
+        modulus  (int): (Optional) Reduce inputs and outputs modulo `modulus`.
+
+    Returns:
+        list: Circular convolution of length len(`X`).
+    """
+    n = len(X)
+    Z = linear_convolution(X, Y, modulus)
+    C = Z[:n]
 
-        for i in range(0, n, size):
-            k = 0
-            for j in range(i, i+half_size):
-                l     = j + half_size
-                left  = X[j]
-                right = X[l] * pow_table[k]
+    for i, z in enumerate(Z[n:]):
+        C[i] += z
 
-                X[j] = left + right
-                X[l] = left - right
-                k   += table_step
+    if modulus:
+        C = [c % modulus for c in C]
 
-    return X
+    return C
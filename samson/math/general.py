@@ -26,6 +26,8 @@ _dense         = lazy_import('_dense', 'samson.math.dense_vector')
 _factor_gen    = lazy_import('_factor_gen', 'samson.math.factorization.general')
 _ell_curve     = lazy_import('_ell_curve', 'samson.math.algebra.curves.weierstrass_curve')
 _symbols       = lazy_import('_symbols', 'samson.math.symbols')
+_lattice       = lazy_import('_lattice', 'samson.math.lattice_reduction')
+_mod_comp      = lazy_import('_mod_comp', 'samson.math.optimization.modular_composition_cache')
 
 
 def int_to_poly(integer: int, modulus: int=2) -> 'Polynomial':
@@ -111,21 +113,19 @@ def frobenius_monomial_base(poly: 'Polynomial') -> List['Polynomial']:
     bases = [None]*n
     bases[0] = P.one
 
+    reduce_mod = _mod_comp.reduce_mod
+    mulmod     = _mod_comp.mulmod
+
     if q < n:
         for i in range(1, n):
-            bases[i] = (bases[i-1] << q) % poly
+            bases[i] = reduce_mod(bases[i-1] << q, poly)
 
     elif n > 1:
-        R = P/poly
         x = P.symbol
-        bases[1] = R(x)**q
+        bases[1] = _mod_comp.powmod(P(x), q, poly)
 
         for i in range(2, n):
-            bases[i] = bases[i-1] * bases[1]
-
-        # Peel off the quotient ring
-        for i in range(1, n):
-            bases[i] = bases[i].val
+            bases[i] = mulmod(bases[i-1], bases[1], poly)
 
     return bases
 
@@ -137,7 +137,7 @@ def frobenius_map(f: 'Polynomial', g: 'Polynomial', bases: List['Polynomial']=No
     Parameters:
         f           (Polynomial): Base.
         g           (Polynomial): Modulus.
-        bases (List[Polynomial]): Frobenius monomial bases. Will generate if not provided.
+        bases (List[Polynomial]): Frobenius monomial bases (or their `DenseBasis`). Will generate if not provided.
 
     Returns:
         Polynomial: `f`**p % `g`
@@ -150,21 +150,18 @@ def frobenius_map(f: 'Polynomial', g: 'Polynomial', bases: List['Polynomial']=No
 
     dg = g.degree()
     df = f.degree()
-    P  = f.ring
 
     if df >= dg:
-        f %= g
+        f  = _mod_comp.reduce_mod(f, g)
         df = f.degree()
 
     if not f:
         return f
 
-    sf = P([f.coeffs[0]])
-
-    for i in range(1, df+1):
-        sf += bases[i] * P([f.coeffs[i]])
+    if type(bases) is not _mod_comp.DenseBasis:
+        bases = _mod_comp.DenseBasis(bases, dg)
 
-    return sf
+    return bases.combine([f.coeffs[i] for i in range(df+1)])
 
 
 def gcd(*args) -> 'RingElement':
@@ -245,15 +242,20 @@ def xgcd(a: 'RingElement', b: 'RingElement') -> Tuple['RingElement', 'RingElemen
 
     R = a.ring
 
-    # Generic xgcd
-    prevx, x = R.one, R.zero; prevy, y = R.zero, R.one
-    while b:
-        q = a // b
-        x, prevx = prevx - q*x, x
-        y, prevy = prevy - q*y, y
-        a, b = b, a % b
+    if type(a) is _poly.Polynomial and a.coeff_ring.is_field() and max(a.degree(), b.degree()) >= RUNTIME.poly_half_gcd_supremacy:
+        from samson.math.half_gcd import fast_xgcd
+        g, s, t = fast_xgcd(a, b)
 
-    g, s, t = a, prevx, prevy
+    else:
+        # Generic xgcd
+        prevx, x = R.one, R.zero; prevy, y = R.zero, R.one
+        while b:
+            q = a // b
+            x, prevx = prevx - q*x, x
+            y, prevy = prevy - q*y, y
+            a, b = b, a % b
+
+        g, s, t = a, prevx, prevy
 
     # Normalize if possible
     if g.is_invertible() and s:
@@ -1208,6 +1210,45 @@ def gram_schmidt(matrix: 'Matrix', full: bool=False, A_star: 'Matrix'=None, mu:
     return Q, mu
 
 
+def _integral_lattice_basis(in_basis: 'Matrix') -> tuple:
+    """
+    Scales a basis over ZZ or QQ to integer rows. Returns None for other rings.
+    """
+    R  = in_basis.coeff_ring
+    ZZ = _integer_ring.ZZ
+
+    if R == ZZ:
+        return [[int(elem) for elem in row] for row in in_basis.rows], 1
+
+    if type(R).__name__ != 'FractionField' or R.ring != ZZ:
+        return None
+
+    denom = 1
+    for row in in_basis.rows:
+        for elem in row:
+            d = int(elem.denominator)
+
+            if d != 1:
+                denom = denom // math.gcd(denom, d) * d
+
+    return [[int(elem.numerator) * (denom // int(elem.denominator)) for elem in row] for row in in_basis.rows], denom
+
+
+def _lattice_to_matrix(basis: list, zeros: int, denom: int, num_cols: int) -> 'Matrix':
+    """
+    Converts a reduced integer basis back into a Matrix over QQ. Removed zero vectors are placed first.
+    """
+    from samson.math.algebra.fields.fraction_field import FractionField
+    R = FractionField(_integer_ring.ZZ)
+
+    if denom == 1:
+        rows = [[R(v) for v in row] for row in basis]
+    else:
+        rows = [[R((v, denom)) for v in row] for row in basis]
+
+    return _mat.Matrix([[R.zero]*num_cols for _ in range(zeros)] + rows, coeff_ring=R)
+
+
 @add_complexity(KnownComplexities.LLL)
 def lll(in_basis: 'Matrix', delta: float=0.75) -> 'Matrix':
     """
@@ -1238,6 +1279,16 @@ def lll(in_basis: 'Matrix', delta: float=0.75) -> 'Matrix':
     from samson.math.all import QQ
     Matrix = _mat.Matrix
 
+    # Integer lattices use the floating-point L^2 reduction over an exact integer Gram matrix
+    int_basis = _integral_lattice_basis(in_basis)
+
+    if int_basis:
+        basis, denom = int_basis
+        gso   = _lattice.IntegerGSO(basis)
+        zeros = gso.lll(delta)
+        return _lattice_to_matrix(gso.B, zeros, denom, in_basis.num_cols)
+
+
     # Prepare ring and basis
     if type(in_basis.coeff_ring).__name__ != 'FractionField':
         from samson.math.algebra.fields.fraction_field import FractionField
@@ -1295,6 +1346,45 @@ def lll(in_basis: 'Matrix', delta: float=0.75) -> 'Matrix':
     return basis
 
 
+def bkz(in_basis: 'Matrix', block_size: int=10, delta: float=0.99, max_tours: int=None) -> 'Matrix':
+    """
+    Performs Schnorr-Euchner block Korkine-Zolotarev lattice basis reduction. Produces shorter
+    vectors than LLL at the cost of enumerating within blocks of size `block_size`.
+
+    Parameters:
+        in_basis (Matrix): Matrix representing the original basis over ZZ or QQ.
+        block_size  (int): Size of the enumeration blocks. A block size of 2 is equivalent to LLL.
+        delta     (float): Minimum optimality of the reduced basis.
+        max_tours   (int): Maximum number of BKZ tours. Runs until no improvement if not specified.
+
+    Returns:
+        Matrix: Reduced basis.
+
+    Examples:
+        >>> from samson.math.general import bkz
+        >>> from samson.math.matrix import Matrix
+        >>> from samson.math.all import QQ
+        >>> m = Matrix([[1, 2, 3, 4], [5, 6, 7, 8]], QQ)
+        >>> bkz(m)
+        <Matrix: coeff_ring=Frac(ZZ), num_rows=2, num_cols=4, 
+            0  1  2  3
+        0 [ 3, 2, 1, 0]
+        1 [-2, 0, 2, 4]>
+
+    References:
+        "Lattice Basis Reduction: Improved Practical Algorithms and Solving Subset Sum Problems" (https://doi.org/10.1007/BF01581144)
+    """
+    int_basis = _integral_lattice_basis(in_basis)
+
+    if not int_basis:
+        raise ValueError("BKZ is only supported for bases over ZZ or QQ")
+
+    basis, denom = int_basis
+    gso   = _lattice.IntegerGSO(basis)
+    zeros = gso.bkz(block_size, delta, max_tours=max_tours)
+    return _lattice_to_matrix(gso.B, zeros, denom, in_basis.num_cols)
+
+
 def generate_superincreasing_seq(length: int, max_diff: int, starting: int=0) -> List[int]:
     """
     Generates a superincreasing sequence.
@@ -1630,7 +1720,7 @@ def sieve_of_eratosthenes(n: int, chunk_size: int=1024, prime_base: set=None) ->
         prime_base = PRIMES_UNDER_1000.difference({2})
 
     # Generate what's in prime_base first
-    for p in {2}.union(prime_base):
+    for p in sorted({2}.union(prime_base)):
         if p < n:
             yield p
         else:
@@ -1800,7 +1890,8 @@ def frobenius_trace_mod_l(curve: 'EllipticCurve', l: int) -> 'QuotientElement':
 
         return elkies_trace_mod_l(curve, l)
 
-    except NoSolutionException:
+    # Degenerate Elkies cases (e.g. repeated roots of the modular polynomial) fall back to Schoof
+    except (NoSolutionException, ZeroDivisionError):
         ZZ = _integer_ring.ZZ
 
         torsion_quotient_ring = ZZ/ZZ(l)
@@ -1851,12 +1942,23 @@ def frobenius_trace_mod_l(curve: 'EllipticCurve', l: int) -> 'QuotientElement':
 
 
 
-def frobenius_trace(curve: 'EllipticCurve') -> int:
+def _frobenius_trace_mod_l_worker(params: tuple) -> Tuple[int, int]:
+    # Curves are rebuilt from integers; symbolic state doesn't survive pickling
+    a, b, p, l = params
+    ZZ    = _integer_ring.ZZ
+    R     = ZZ/ZZ(p)
+    curve = _ell_curve.EllipticCurve(R(a), R(b))
+    return int(frobenius_trace_mod_l(curve, l).val), l
+
+
+
+def frobenius_trace(curve: 'EllipticCurve', processes: int=None) -> int:
     """
     Calculates the Frobenius trace of the `curve`.
 
     Parameters:
         curve (EllipticCurve): Elliptic curve.
+        processes       (int): Number of processes to distribute the torsion primes over. Defaults to every core for curves larger than `RUNTIME.parallel_frobenius_trace_supremacy` bits.
 
     Returns:
         int: Frobenius trace.
@@ -1871,12 +1973,13 @@ def frobenius_trace(curve: 'EllipticCurve') -> int:
         -3
 
     """
+    from multiprocessing import cpu_count
     Symbol = _symbols.Symbol
-    ZZ = _integer_ring.ZZ
 
-    search_range      = hasse_frobenius_trace_interval(curve.p)
-    torsion_primes    = primes_product(search_range[1] - search_range[0], [curve.ring.characteristic()])
-    trace_congruences = []
+    search_range   = hasse_frobenius_trace_interval(curve.p)
+    width          = search_range[1] - search_range[0]
+    torsion_primes = primes_product(width, [curve.ring.characteristic()])
+    n, mod         = 0, 1
 
     # Handle 2 separately to prevent multivariate poly arithmetic
     if 2 in torsion_primes:
@@ -1889,18 +1992,48 @@ def frobenius_trace(curve: 'EllipticCurve') -> int:
         rational_char = frobenius_map(rational_char, defining_poly, bases=bases)
 
         if gcd(rational_char - x, defining_poly).degree() == 0:
-            trace_congruences.append((ZZ/ZZ(2))(1))
+            n, mod = 1, 2
         else:
-            trace_congruences.append((ZZ/ZZ(2))(0))
+            n, mod = 0, 2
 
         torsion_primes.remove(2)
 
 
-    for l in torsion_primes:
-        trace_congruences.append(frobenius_trace_mod_l(curve, l))
+    if processes is None:
+        processes = cpu_count() if curve.p.bit_length() >= RUNTIME.parallel_frobenius_trace_supremacy else 1
+
+
+    if processes > 1 and len(torsion_primes) > 1:
+        # Queue a few spare primes. Elkies primes are much faster than Atkin primes,
+        # so the spares can pin down the trace before the slowest workers finish
+        torsion_primes = sorted(torsion_primes)
+        l = torsion_primes[-1]
+
+        for _ in range(processes):
+            l = next_prime(l+1)
 
-    n, mod = crt(trace_congruences)
-    return find_representative((ZZ/ZZ(mod))(n), range(*search_range))
+            if l != curve.ring.characteristic():
+                torsion_primes.append(l)
+
+
+        def combine(results):
+            nonlocal n, mod
+            t_l, l = results[-1]
+            n, mod = crt([(n, mod), (t_l, l)])
+            return mod >= width
+
+        a, b = int(curve.a), int(curve.b)
+        # One prime per task, so the trace is combined as soon as each is found. Workers still
+        # running once the CRT is large enough are killed
+        RUNTIME.parallel(processes, chunk_size=1, terminate_filter=combine)(_frobenius_trace_mod_l_worker)([(a, b, curve.p, l) for l in torsion_primes])
+
+    else:
+        for l in torsion_primes:
+            n, mod = crt([(n, mod), (int(frobenius_trace_mod_l(curve, l).val), l)])
+
+
+    ZZ = _integer_ring.ZZ
+    return find_representative((ZZ/ZZ(int(mod)))(n), range(*search_range))
 
 
 def schoofs_algorithm(curve: 'EllipticCurve') -> int:
@@ -0,0 +1,242 @@
+from samson.utilities.exceptions import NoSolutionException
+
+# Linear forms over GF(2) are represented as integers: bit 0 is the constant term and bit `i`+1 is the coefficient of variable `i`
+
+
+def parity(x: int) -> int:
+    return bin(x).count('1') & 1
+
+
+class LinearWord(object):
+    """
+    Fixed-width word whose bits are linear forms over GF(2) in a set of unknown bits. Supports the operations
+    used by shift/XOR PRNGs (XOR, shifts, rotations, masking), so running a PRNG on `LinearWord`s yields
+    the linear equations relating its outputs to its unknown state. Bits that aren't linear (e.g. the carries
+    of an addition) are `None`.
+
+    Examples:
+        >>> from samson.math.gf2_system import LinearWord
+        >>> x = LinearWord.variables(8, 0)
+        >>> y = x ^ (x << 3) ^ 0x10
+        >>> y.evaluate(0b1011) == 0b1011 ^ ((0b1011 << 3) & 0xFF) ^ 0x10
+        True
+
+    """
+
+    def __init__(self, bits: list):
+        """
+        Parameters:
+            bits (list): Linear form of each bit (least significant first).
+        """
+        self.bits = bits
+
+
+    def __repr__(self):
+        return f"<LinearWord: width={self.width}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    @property
+    def width(self) -> int:
+        return len(self.bits)
+
+
+    @staticmethod
+    def variables(width: int, offset: int) -> 'LinearWord':
+        """
+        Creates a word of unknowns `offset`, ..., `offset` + `width` - 1.
+
+        Parameters:
+            width  (int): Width in bits.
+            offset (int): Index of the first unknown.
+
+        Returns:
+            LinearWord: Word.
+        """
+        return LinearWord([1 << (offset + i + 1) for i in range(width)])
+
+
+    @staticmethod
+    def constant(value: int, width: int) -> 'LinearWord':
+        return LinearWord([(value >> i) & 1 for i in range(width)])
+
+
+    @staticmethod
+    def select(mask: int, form: int, width: int) -> 'LinearWord':
+        """
+        Creates a word that equals `mask` if `form` evaluates to one and zero otherwise.
+
+        Parameters:
+            mask  (int): Constant mask.
+            form  (int): Linear form.
+            width (int): Width in bits.
+
+        Returns:
+            LinearWord: Word.
+        """
+        return LinearWord([form if (mask >> i) & 1 else 0 for i in range(width)])
+
+
+    def __xor__(self, other) -> 'LinearWord':
+        if type(other) is int:
+            return LinearWord([None if bit is None else bit ^ ((other >> i) & 1) for i, bit in enumerate(self.bits)])
+
+        return LinearWord([None if a is None or b is None else a ^ b for a, b in zip(self.bits, other.bits)])
+
+    __rxor__ = __xor__
+
+
+    def __add__(self, other) -> 'LinearWord':
+        # Only the least significant bit is free of carries
+        other = LinearWord.constant(other, self.width) if type(other) is int else other
+        return LinearWord((self ^ other).bits[:1] + [None]*(self.width-1))
+
+    __radd__ = __add__
+
+
+    def __and__(self, mask: int) -> 'LinearWord':
+        return LinearWord([bit if (mask >> i) & 1 else 0 for i, bit in enumerate(self.bits)])
+
+    __rand__ = __and__
+
+
+    def __rshift__(self, amount: int) -> 'LinearWord':
+        return LinearWord(self.bits[amount:] + [0]*min(amount, self.width))
+
+
+    def __lshift__(self, amount: int) -> 'LinearWord':
+        return LinearWord(([0]*amount + self.bits)[:self.width])
+
+
+    def __getitem__(self, idx: int) -> int:
+        return self.bits[idx]
+
+
+    def rotl(self, amount: int) -> 'LinearWord':
+        amount %= self.width
+        return LinearWord(self.bits[-amount:] + self.bits[:-amount] if amount else self.bits[:])
+
+
+    def evaluate(self, assignment: int) -> int:
+        """
+        Evaluates the word.
+
+        Parameters:
+            assignment (int): Values of the unknowns (bit `i` is unknown `i`).
+
+        Returns:
+            int: Value.
+        """
+        assignment = (assignment << 1) | 1
+        return sum(parity(bit & assignment) << i for i, bit in enumerate(self.bits))
+
+
+    def equations(self, value: int, mask: int=None) -> list:
+        """
+        Returns the equations stating that this word equals `value` on the bits of `mask`.
+
+        Parameters:
+            value (int): Observed value.
+            mask  (int): Observed bits. Defaults to all bits.
+
+        Returns:
+            list: List of (linear form, value) pairs. Nonlinear bits are skipped.
+        """
+        return [(bit, (value >> i) & 1) for i, bit in enumerate(self.bits) if bit is not None and (mask is None or (mask >> i) & 1)]
+
+
+
+class GF2LinearSystem(object):
+    """
+    Incrementally eliminated linear system over GF(2). Equations are reduced against the current pivots as they are
+    added, so dependent equations are discarded immediately and the system can be solved at any time.
+
+    Examples:
+        >>> from samson.math.gf2_system import GF2LinearSystem, LinearWord
+        >>> x = LinearWord.variables(8, 0)
+        >>> system = GF2LinearSystem(8)
+        >>> for form, value in (x ^ (x >> 1)).equations(0b11010010 ^ 0b01101001) + x.equations(0b11010010, mask=0x80):
+        ...     _ = system.add_equation(form, value)
+        >>> system.rank, bin(system.solve())
+        (8, '0b11010010')
+
+    """
+
+    def __init__(self, num_vars: int):
+        """
+        Parameters:
+            num_vars (int): Number of unknowns.
+        """
+        self.num_vars = num_vars
+        self.pivots   = {}
+
+
+    def __repr__(self):
+        return f"<GF2LinearSystem: num_vars={self.num_vars}, rank={self.rank}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    @property
+    def rank(self) -> int:
+        return len(self.pivots)
+
+
+    def add_equation(self, form: int, value: int) -> bool:
+        """
+        Adds the equation `form` = `value`.
+
+        Parameters:
+            form  (int): Linear form (bit 0 is the constant term).
+            value (int): Right-hand side.
+
+        Returns:
+            bool: Whether the equation was independent.
+
+        Raises:
+            NoSolutionException: If the equation contradicts the system.
+        """
+        row    = form ^ value
+        pivots = self.pivots
+
+        while row > 1:
+            pivot = row.bit_length() - 1
+
+            if pivot not in pivots:
+                pivots[pivot] = row
+                return True
+
+            row ^= pivots[pivot]
+
+        if row:
+            raise NoSolutionException("Inconsistent system of equations")
+
+        return False
+
+
+    def solve(self, free_value: int=0) -> int:
+        """
+        Solves the system. Unknowns without a pivot take their value from `free_value`.
+
+        Parameters:
+            free_value (int): Assignment of free unknowns.
+
+        Returns:
+            int: Assignment (bit `i` is unknown `i`).
+        """
+        pivots   = self.pivots
+        solution = 1
+
+        for var in range(self.num_vars):
+            if (var + 1) not in pivots:
+                solution |= ((free_value >> var) & 1) << (var + 1)
+
+        # Pivot rows only reference lower unknowns, so solve from the bottom up
+        for pivot in sorted(pivots):
+            row = pivots[pivot] ^ (1 << pivot)
+            solution |= parity(row & solution) << pivot
+
+        return solution >> 1
@@ -0,0 +1,294 @@
+from samson.utilities.runtime import RUNTIME
+from typing import Tuple, List
+from types import FunctionType
+
+# Transition matrices are represented as 4-tuples `(a, b, c, d)` corresponding to [[a, b], [c, d]]
+
+
+def _divmod_field(A: 'Polynomial', B: 'Polynomial') -> Tuple['Polynomial', 'Polynomial']:
+    return divmod(A, B)
+
+
+def _divmod_naive(A: 'Polynomial', B: 'Polynomial') -> Tuple['Polynomial', 'Polynomial']:
+    # Assumes the leading coefficient is invertible despite not being a field
+    lc_inv = ~B.LC()
+    q, r   = divmod(A, B*lc_inv)
+    return q*lc_inv, r
+
+
+def _identity(P: 'PolynomialRing') -> tuple:
+    return (P.one, P.zero, P.zero, P.one)
+
+
+def _mat_mul(M: tuple, N: tuple) -> tuple:
+    a, b, c, d = M
+    e, f, g, h = N
+    return (a*e + b*g, a*f + b*h, c*e + d*g, c*f + d*h)
+
+
+def _mat_apply(M: tuple, A: 'Polynomial', B: 'Polynomial') -> Tuple['Polynomial', 'Polynomial']:
+    a, b, c, d = M
+    return a*A + b*B, c*A + d*B
+
+
+def _elementary_mul(q: 'Polynomial', M: tuple) -> tuple:
+    # [[0, 1], [1, -q]] * M
+    a, b, c, d = M
+    return (c, d, a - q*c, b - q*d)
+
+
+def _is_small(A: 'Polynomial') -> bool:
+    return A.degree() < RUNTIME.poly_half_gcd_supremacy
+
+
+def _classical_hgcd(A: 'Polynomial', B: 'Polynomial', m: int, div_func: FunctionType, quotients: list) -> tuple:
+    M = _identity(A.ring)
+
+    while B and B.degree() >= m:
+        q, r = div_func(A, B)
+        A, B = B, r
+        M    = _elementary_mul(q, M)
+
+        if quotients is not None:
+            quotients.append(q)
+
+    return M
+
+
+def half_gcd(A: 'Polynomial', B: 'Polynomial', div_func: FunctionType=_divmod_field, quotients: list=None) -> tuple:
+    """
+    Computes the transition matrix `M` of the first half of the remainder sequence of `A` and `B`.
+    If (`A'`, `B'`) = `M`*(`A`, `B`), then deg(`A'`) >= ceil(deg(`A`)/2) > deg(`B'`).
+
+    Parameters:
+        A   (Polynomial): First polynomial.
+        B   (Polynomial): Second polynomial with deg(`B`) < deg(`A`).
+        div_func  (func): Function that performs Euclidean division.
+        quotients (list): If specified, the quotients of the remainder sequence are appended in order.
+
+    Returns:
+        tuple: Transition matrix as (a, b, c, d).
+
+    References:
+        "Modern Computer Algebra, Chapter 11" (von zur Gathen, Gerhard)
+        https://cp-algorithms.com/algebra/polynomial.html#half-gcd-algorithm
+    """
+    m = (A.degree() + 1) // 2
+
+    if not B or B.degree() < m:
+        return _identity(A.ring)
+
+    if _is_small(A):
+        return _classical_hgcd(A, B, m, div_func, quotients)
+
+    # Reduce the top half
+    R    = half_gcd(A >> m, B >> m, div_func, quotients)
+    A, B = _mat_apply(R, A, B)
+
+    if not B or B.degree() < m:
+        return R
+
+    # Single Euclidean step
+    q, r = div_func(A, B)
+    A, B = B, r
+    R    = _elementary_mul(q, R)
+
+    if quotients is not None:
+        quotients.append(q)
+
+    if not B or B.degree() < m:
+        return R
+
+    # Reduce the remaining quarter
+    k = 2*m - A.degree()
+    S = half_gcd(A >> k, B >> k, div_func, quotients)
+
+    return _mat_mul(S, R)
+
+
+
+def _remainder_sequence(A: 'Polynomial', B: 'Polynomial', div_func: FunctionType, quotients: list=None, track_cofactors: bool=False) -> Tuple['Polynomial', tuple]:
+    P = A.ring
+    M = _identity(P) if track_cofactors else None
+
+    while B:
+        if _is_small(A):
+            # Finish classically; cheaper than recursing on small inputs
+            while B:
+                q, r = div_func(A, B)
+                A, B = B, r
+
+                if track_cofactors:
+                    M = _elementary_mul(q, M)
+
+                if quotients is not None:
+                    quotients.append(q)
+
+            break
+
+        R    = half_gcd(A, B, div_func, quotients)
+        A, B = _mat_apply(R, A, B)
+
+        if track_cofactors:
+            M = _mat_mul(R, M)
+
+        if not B:
+            break
+
+        q, r = div_func(A, B)
+        A, B = B, r
+
+        if track_cofactors:
+            M = _elementary_mul(q, M)
+
+        if quotients is not None:
+            quotients.append(q)
+
+    return A, M
+
+
+
+def fast_gcd(a: 'Polynomial', b: 'Polynomial', use_naive: bool=False) -> 'Polynomial':
+    """
+    Computes the GCD of two polynomials using the half-GCD algorithm in O(M(n)log(n)).
+    Returns the same (unnormalized) remainder as the Euclidean algorithm.
+
+    Parameters:
+        a   (Polynomial): First polynomial.
+        b   (Polynomial): Second polynomial.
+        use_naive (bool): Assume leading coefficients are invertible even if the coefficient ring isn't a field.
+
+    Returns:
+        Polynomial: GCD of `a` and `b`.
+
+    Examples:
+        >>> from samson.math.all import ZZ, Symbol
+        >>> from samson.math.half_gcd import fast_gcd
+        >>> x = Symbol('x')
+        >>> _ = (ZZ/ZZ(7))[x]
+        >>> fast_gcd((x+1)*(x**2+1), (x+1)*(x+5)).monic()
+        <Polynomial: x + 1, coeff_ring=ZZ/(ZZ(7))>
+
+    """
+    div_func = _divmod_naive if use_naive else _divmod_field
+
+    if not b:
+        return a
+
+    # First step makes deg(A) > deg(B)
+    _q, r = div_func(a, b)
+    g, _M = _remainder_sequence(b, r, div_func)
+    return g
+
+
+
+def fast_xgcd(a: 'Polynomial', b: 'Polynomial') -> Tuple['Polynomial', 'Polynomial', 'Polynomial']:
+    """
+    Extended half-GCD. Finds `g`, `s`, and `t` such that `a``s` + `b``t` = `g` = gcd(`a`, `b`).
+    Returns the same (unnormalized) results as the extended Euclidean algorithm.
+
+    Parameters:
+        a (Polynomial): First polynomial.
+        b (Polynomial): Second polynomial.
+
+    Returns:
+        Tuple[Polynomial, Polynomial, Polynomial]: Formatted as (GCD, s, t).
+    """
+    P = a.ring
+
+    if not b:
+        return a, P.one, P.zero
+
+    q, r = divmod(a, b)
+    g, M = _remainder_sequence(b, r, _divmod_field, track_cofactors=True)
+    M    = _mat_mul(M, (P.zero, P.one, P.one, -q))
+    return g, M[0], M[1]
+
+
+
+def remainder_quotients(a: 'Polynomial', b: 'Polynomial') -> Tuple['Polynomial', List['Polynomial']]:
+    """
+    Computes the GCD and the quotients of the Euclidean remainder sequence of `a` and `b`
+    without materializing the intermediate remainders.
+
+    Parameters:
+        a (Polynomial): First polynomial with deg(`a`) >= deg(`b`).
+        b (Polynomial): Second polynomial.
+
+    Returns:
+        Tuple[Polynomial, List[Polynomial]]: Formatted as (GCD, quotients).
+    """
+    quotients = []
+
+    if not b:
+        return a, quotients
+
+    q, r = divmod(a, b)
+    quotients.append(q)
+
+    g, _M = _remainder_sequence(b, r, _divmod_field, quotients)
+    return g, quotients
+
+
+
+def resultant(a: 'Polynomial', b: 'Polynomial') -> 'RingElement':
+    """
+    Computes the resultant of two polynomials over a field. The degrees and leading coefficients
+    of the remainder sequence are recovered from the quotients, so this runs in half-GCD time.
+
+    Parameters:
+        a (Polynomial): First polynomial.
+        b (Polynomial): Second polynomial.
+
+    Returns:
+        RingElement: Resultant of `a` and `b`.
+
+    Examples:
+        >>> from samson.math.all import ZZ, Symbol
+        >>> from samson.math.half_gcd import resultant
+        >>> x = Symbol('x')
+        >>> _ = (ZZ/ZZ(7))[x]
+        >>> resultant(x**2 + 1, x + 3)
+        <QuotientElement: val=3, ring=ZZ/(ZZ(7))>
+
+    References:
+        https://en.wikipedia.org/wiki/Resultant#Computation
+    """
+    R = a.coeff_ring
+
+    if not a or not b:
+        return R.zero
+
+    n, m = a.degree(), b.degree()
+
+    if n < m:
+        res = resultant(b, a)
+        return -res if (n*m) & 1 else res
+
+    if not m:
+        return b.LC()**n
+
+    g, quotients = remainder_quotients(a, b)
+
+    if g.degree():
+        return R.zero
+
+    # d_i = d_{i-1} - deg(q_i) and lc(r_{i-1}) = lc(q_i)*lc(r_i)
+    degrees = [n, m]
+    lcs     = [a.LC(), b.LC()]
+
+    for q in quotients[1:]:
+        degrees.append(degrees[-1] - q.degree())
+        lcs.append(lcs[-1] / q.LC())
+
+    res = R.one
+    for i in range(1, len(degrees)-1):
+        d_prev, d_curr, d_next = degrees[i-1], degrees[i], degrees[i+1]
+
+        if (d_prev*d_curr) & 1:
+            res = -res
+
+        res *= lcs[i]**(d_prev - d_next)
+
+    # Last remainder is a nonzero constant
+    return res * lcs[-1]**degrees[-2]
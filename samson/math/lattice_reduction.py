@@ -0,0 +1,349 @@
+from operator import mul
+import mpmath
+
+# Largest Gram entry (in bits) that safely fits in a double
+FLOAT_MAX_BITS = 1000
+
+# Largest dimension where doubles are precise enough in practice
+FLOAT_MAX_DIM = 160
+
+# Size-reduction passes on a row before its Gram-Schmidt coefficients are deemed too imprecise
+SIZE_REDUCE_MAX_LOOPS = 32
+
+# Precision (in bits) past which size reduction gives up
+MAX_PRECISION = 2**16
+
+
+def _dot(u: list, v: list) -> int:
+    return sum(map(mul, u, v))
+
+
+
+class IntegerGSO(object):
+    """
+    Gram-Schmidt orthogonalization of an integer lattice basis. The basis and its Gram matrix
+    are kept exact, while the Gram-Schmidt coefficients (`r` and `mu`) are floating-point approximations
+    computed from the exact Gram matrix (L^2 style).
+
+    Row `i` of `r` and `mu` is only valid once it has been (re)computed with `compute_row`.
+    """
+
+    def __init__(self, basis: list, precision: int=None):
+        """
+        Parameters:
+            basis    (list): List of integer row vectors.
+            precision (int): Floating-point precision in bits. Uses doubles when possible if not specified.
+        """
+        self.B = [[int(e) for e in row] for row in basis]
+        self.n = len(self.B)
+        self.G = [[_dot(b_i, b_j) for b_j in self.B] for b_i in self.B]
+
+        max_bits = max([self.G[i][i].bit_length() for i in range(self.n)] + [0])
+
+        if not precision:
+            precision = 53 if self.n < FLOAT_MAX_DIM else int(1.6*self.n) + 32
+
+        self._set_precision(precision, max_bits)
+
+
+    def _set_precision(self, precision: int, max_bits: int=0):
+        if precision <= 53 and max_bits < FLOAT_MAX_BITS:
+            self.fp    = float
+            self.round = round
+        else:
+            ctx        = mpmath.ctx_mp.MPContext()
+            ctx.prec   = max(precision, 53)
+            self.fp    = ctx.mpf
+            self.round = lambda x: int(ctx.nint(x))
+
+        self.precision = precision
+        zero    = self.fp(0)
+        self.r  = [[zero]*self.n for _ in range(self.n)]
+        self.mu = [[zero]*self.n for _ in range(self.n)]
+
+
+    def increase_precision(self, rows: int):
+        """
+        Doubles the floating-point precision and recomputes the Gram-Schmidt coefficients of the first `rows` rows.
+        """
+        precision = max(2*self.precision, 106)
+
+        if precision > MAX_PRECISION:
+            raise RuntimeError(f'Size reduction did not converge with {self.precision} bits of precision')
+
+        self._set_precision(precision)
+
+        for i in range(rows):
+            self.compute_row(i)
+
+
+    def compute_row(self, k: int):
+        """
+        Computes the Gram-Schmidt coefficients of row `k`. Assumes rows before `k` are valid.
+        """
+        fp   = self.fp
+        G_k  = self.G[k]
+        r_k  = self.r[k]
+        mu_k = self.mu[k]
+        r    = self.r
+        mu   = self.mu
+
+        for j in range(k):
+            r_kj    = fp(G_k[j]) - sum(map(mul, mu[j][:j], r_k[:j]))
+            r_k[j]  = r_kj
+            mu_k[j] = r_kj / r[j][j]
+
+        r_k[k] = fp(G_k[k]) - sum(map(mul, mu_k[:k], r_k[:k]))
+
+
+    def sub_row(self, k: int, j: int, x: int):
+        """
+        Performs b_k -= `x`*b_j and updates the Gram matrix.
+        """
+        G   = self.G
+        G_k = G[k]
+        G_j = G[j]
+
+        self.B[k] = [a - x*b for a, b in zip(self.B[k], self.B[j])]
+
+        G_kk = G_k[k] - 2*x*G_k[j] + x*x*G_j[j]
+
+        for i in range(self.n):
+            G_k[i] -= x*G_j[i]
+
+        for i in range(self.n):
+            G[i][k] = G_k[i]
+
+        G_k[k] = G_kk
+
+
+    def move_row(self, src: int, dst: int):
+        """
+        Moves row `src` to position `dst`, shifting the rows in between.
+        """
+        for M in (self.B, self.r, self.mu):
+            M.insert(dst, M.pop(src))
+
+        G = self.G
+        G.insert(dst, G.pop(src))
+
+        for row in G:
+            row.insert(dst, row.pop(src))
+
+
+    def insert_row(self, k: int, v: list):
+        """
+        Inserts the integer vector `v` at position `k`.
+        """
+        v = [int(e) for e in v]
+        self.B.insert(k, v)
+
+        g = [_dot(v, b) for b in self.B]
+
+        for row, g_i in zip(self.G, g[:k] + g[k+1:]):
+            row.insert(k, g_i)
+
+        self.G.insert(k, g)
+        self.n += 1
+
+        zero = self.fp(0)
+        self.r.insert(k, [zero]*self.n)
+        self.mu.insert(k, [zero]*self.n)
+
+        for row in self.r + self.mu:
+            while len(row) < self.n:
+                row.append(zero)
+
+
+    def remove_row(self, k: int):
+        """
+        Removes row `k`.
+        """
+        for M in (self.B, self.r, self.mu, self.G):
+            M.pop(k)
+
+        for row in self.G:
+            row.pop(k)
+
+        self.n -= 1
+
+
+    def size_reduce(self, k: int, eta: float=0.51):
+        """
+        Size-reduces row `k` against every previous row. Rows are recomputed until
+        the reduction is stable since the Gram-Schmidt coefficients are approximate.
+        Like fplll, the precision is increased if it doesn't stabilize.
+        """
+        loops = 0
+
+        while True:
+            self.compute_row(k)
+            mu_k = self.mu[k]
+
+            if all(abs(mu_k[j]) <= eta for j in range(k)):
+                return
+
+            loops += 1
+            if loops > SIZE_REDUCE_MAX_LOOPS:
+                self.increase_precision(k)
+                loops = 0
+                continue
+
+            for j in reversed(range(k)):
+                x = self.round(mu_k[j])
+
+                if x:
+                    self.sub_row(k, j, x)
+                    mu_j = self.mu[j]
+
+                    for t in range(j):
+                        mu_k[t] -= x*mu_j[t]
+
+                    mu_k[j] -= x
+
+
+    def lll(self, delta: float=0.99, eta: float=0.51, start: int=0, end: int=None, first: int=None) -> int:
+        """
+        LLL-reduces rows [`start`, `end`). Rows before `first` must have valid Gram-Schmidt coefficients
+        and already be reduced. Zero vectors (from linearly dependent rows) are removed from the basis.
+
+        Parameters:
+            delta (float): Lovász parameter.
+            eta   (float): Size-reduction parameter.
+            start   (int): First row to reduce.
+            end     (int): End of the range to reduce.
+            first   (int): Row to resume reduction from. Defaults to `start`.
+
+        Returns:
+            int: Number of zero vectors removed.
+        """
+        end   = self.n if end is None else end
+        zeros = 0
+        k     = start if first is None else first
+
+        while k < end:
+            self.size_reduce(k, eta)
+
+            if not self.G[k][k]:
+                self.remove_row(k)
+                end   -= 1
+                zeros += 1
+                continue
+
+            if k > start:
+                r_prev = self.r[k-1][k-1]
+                mu_kk1 = self.mu[k][k-1]
+
+                # Lovász condition
+                if delta * r_prev > self.r[k][k] + mu_kk1*mu_kk1*r_prev:
+                    self.move_row(k, k-1)
+                    k -= 1
+                    continue
+
+            k += 1
+
+        return zeros
+
+
+    def enumerate(self, start: int, end: int, radius: float) -> list:
+        """
+        Schnorr-Euchner enumeration of the shortest vector in the projected lattice of rows [`start`, `end`).
+
+        Parameters:
+            start     (int): First row of the block.
+            end       (int): End of the block.
+            radius  (float): Only vectors with squared projected norm less than `radius` are considered.
+
+        Returns:
+            list: Integer coefficients over the block's rows or None if no such vector exists.
+        """
+        d  = end - start
+        r  = [self.r[start+i][start+i] for i in range(d)]
+        mu = [self.mu[start+i][start:end] for i in range(d)]
+        fp = self.fp
+
+        x   = [0]*d
+        c   = [fp(0)]*d
+        l   = [fp(0)]*(d+1)
+        dx  = [0]*d
+        ddx = [0]*d
+
+        x[0] = 1
+        best = None
+        R    = fp(radius)
+        i    = 0
+
+        while True:
+            diff = x[i] - c[i]
+            l[i] = l[i+1] + diff*diff*r[i]
+
+            if l[i] < R:
+                if i == 0:
+                    R    = l[0]
+                    best = list(x)
+                else:
+                    # Descend, centering on the projection
+                    i   -= 1
+                    c[i] = -sum(x[j]*mu[j][i] for j in range(i+1, d))
+                    x[i] = self.round(c[i])
+                    ddx[i] = dx[i] = -1 if c[i] < x[i] else 1
+                    continue
+            else:
+                i += 1
+                if i == d:
+                    break
+
+            # Next candidate at level `i`. Only go positive on the top level to avoid +-v duplicates.
+            if l[i+1] == 0:
+                x[i] += 1
+            else:
+                x[i]  += dx[i]
+                ddx[i] = -ddx[i]
+                dx[i]  = ddx[i] - dx[i]
+
+        return best
+
+
+    def bkz(self, block_size: int, delta: float=0.99, eta: float=0.51, max_tours: int=None) -> int:
+        """
+        Performs Schnorr-Euchner BKZ reduction.
+
+        Parameters:
+            block_size (int): Block size.
+            delta    (float): Lovász parameter.
+            eta      (float): Size-reduction parameter.
+            max_tours  (int): Maximum number of BKZ tours. Runs until no improvement is found if not specified.
+
+        Returns:
+            int: Number of zero vectors removed.
+        """
+        zeros = self.lll(delta, eta)
+        tours = 0
+
+        while max_tours is None or tours < max_tours:
+            tours += 1
+            clean  = True
+
+            for k in range(self.n-1):
+                h      = min(k+block_size, self.n)
+                coeffs = self.enumerate(k, h, delta*self.r[k][k])
+
+                if coeffs:
+                    clean = False
+                    v     = [0]*len(self.B[k])
+
+                    for c, b in zip(coeffs, self.B[k:h]):
+                        if c:
+                            v = [v_i + c*b_i for v_i, b_i in zip(v, b)]
+
+                    # `v` is linearly dependent on the block, so LLL will remove exactly one vector
+                    self.insert_row(k, v)
+                    self.lll(delta, eta, end=min(h+2, self.n), first=k)
+                else:
+                    # Keep the Gram-Schmidt coefficients of the next block valid
+                    self.lll(delta, eta, end=min(h+1, self.n), first=k)
+
+            if clean:
+                break
+
+        return zeros
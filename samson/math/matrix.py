@@ -1,7 +1,7 @@
 from samson.math.dense_vector import DenseVector
 from samson.math.algebra.rings.ring import Ring, RingElement
 from samson.math.algebra.rings.integer_ring import ZZ
-from samson.math.general import gaussian_elimination, is_prime, lll, gram_schmidt, is_power_of_two
+from samson.math.general import gaussian_elimination, is_prime, lll, bkz, gram_schmidt, is_power_of_two
 from samson.utilities.runtime import RUNTIME
 from shutil import get_terminal_size
 from types import FunctionType
@@ -415,6 +415,33 @@ class Matrix(RingElement):
         return lll(self, delta)
 
 
+    def BKZ(self, block_size: int=10, delta: float=0.99, max_tours: int=None) -> 'Matrix':
+        """
+        Performs block Korkine-Zolotarev lattice basis reduction.
+
+        Parameters:
+            block_size (int): Size of the enumeration blocks.
+            delta    (float): Minimum optimality of the reduced basis.
+            max_tours  (int): Maximum number of BKZ tours.
+
+        Returns:
+            Matrix: Reduced basis.
+
+        Examples:
+            >>> from samson.math.matrix import Matrix
+            >>> from samson.math.all import ZZ
+            >>> m = Matrix([[1, 0, 0, 1000], [0, 1, 0, 1234], [0, 0, 1, 4321]], ZZ)
+            >>> m.BKZ(3)
+            <Matrix: coeff_ring=Frac(ZZ), num_rows=3, num_cols=4, 
+                 0    1  2    3
+            0 [  0,  -7, 2,   4]
+            1 [  8, -10, 1, -19]
+            2 [-21,  -4, 6, -10]>
+
+        """
+        return bkz(self, block_size, delta, max_tours)
+
+
     def gram_schmidt(self, full: bool=False) -> 'Matrix':
         """
         Performs Gram-Schmidt orthonormalization.
@@ -0,0 +1,233 @@
+from samson.math.optimization.poly_division_cache import PolyDivisionCache
+from samson.math.fft.convolution import ntt_modulus
+from samson.core.base_object import BaseObject
+from samson.utilities.runtime import RUNTIME
+from math import isqrt
+
+
+@RUNTIME.global_cache(32)
+def division_cache(mod: 'Polynomial') -> PolyDivisionCache:
+    """
+    Returns a (cached) Newton division cache able to reduce products of two reduced polynomials modulo `mod`.
+    """
+    return PolyDivisionCache(mod, 2*mod.degree())
+
+
+def reduce_mod(f: 'Polynomial', mod: 'Polynomial') -> 'Polynomial':
+    """
+    Reduces `f` modulo `mod` using a cached Newton inverse of `mod`.
+
+    Parameters:
+        f   (Polynomial): Polynomial to reduce.
+        mod (Polynomial): Modulus.
+
+    Returns:
+        Polynomial: `f` % `mod`.
+    """
+    n = mod.degree()
+
+    if f.degree() < n:
+        return f
+
+    # Newton division needs an invertible leading coefficient
+    if n < 2 or f.degree() > 2*n or not (mod.is_monic() or mod.coeff_ring.is_field()):
+        return f % mod
+
+    _q, r = division_cache(mod).__relemdivmod__(f)
+    return r
+
+
+def mulmod(a: 'Polynomial', b: 'Polynomial', mod: 'Polynomial') -> 'Polynomial':
+    """
+    Computes `a`*`b` % `mod`.
+    """
+    return reduce_mod(a*b, mod)
+
+
+def powmod(a: 'Polynomial', e: int, mod: 'Polynomial') -> 'Polynomial':
+    """
+    Computes `a`^`e` % `mod` by square-and-multiply.
+    """
+    result = mod.ring.one
+    a      = reduce_mod(a, mod)
+
+    while e:
+        if e & 1:
+            result = mulmod(result, a, mod)
+
+        e >>= 1
+
+        if e:
+            a = mulmod(a, a, mod)
+
+    return result
+
+
+
+class DenseBasis(BaseObject):
+    """
+    Dense representation of a list of reduced polynomials. Used to efficiently compute linear combinations over them.
+    For ZZ/ZZ(n) coefficients, the combinations are computed over native ints.
+    """
+
+    def __init__(self, polys: list, n: int):
+        """
+        Parameters:
+            polys (list): Polynomials of degree less than `n`.
+            n      (int): Dimension.
+        """
+        P = polys[0].ring
+
+        self.poly_ring  = P
+        self.coeff_ring = P.ring
+        self.n          = n
+        self.modulus    = ntt_modulus(self.coeff_ring)
+
+        if self.modulus:
+            self.vectors = [[int(c) for c in self._dense(poly)] for poly in polys]
+        else:
+            self.vectors = [self._dense(poly) for poly in polys]
+
+
+    def __reprdir__(self):
+        return ['n', 'modulus']
+
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+
+    def _dense(self, poly: 'Polynomial') -> list:
+        coeffs = poly.coeffs
+        return [coeffs[i] for i in range(self.n)]
+
+
+    def combine(self, coeffs: list) -> 'Polynomial':
+        """
+        Computes sum(`coeffs`[i] * `polys`[i]).
+
+        Parameters:
+            coeffs (list): Coefficients of the linear combination.
+
+        Returns:
+            Polynomial: Resulting polynomial.
+        """
+        if self.modulus:
+            modulus = self.modulus
+            acc     = [0]*self.n
+
+            for c, vec in zip(coeffs, self.vectors):
+                c = int(c)
+
+                if c:
+                    acc = [a + c*v for a, v in zip(acc, vec)]
+
+            R = self.coeff_ring
+            return self.poly_ring([R(a % modulus) for a in acc])
+
+        else:
+            acc = [self.coeff_ring.zero]*self.n
+
+            for c, vec in zip(coeffs, self.vectors):
+                if c:
+                    acc = [a + c*v for a, v in zip(acc, vec)]
+
+            return self.poly_ring(acc)
+
+
+
+class ModularCompositionCache(BaseObject):
+    """
+    Caches the baby steps of `h` modulo `mod` so many polynomials can be composed with `h`
+    using the Brent-Kung baby-step giant-step algorithm.
+
+    Examples:
+        >>> from samson.math.all import ZZ, Symbol
+        >>> from samson.math.optimization.modular_composition_cache import ModularCompositionCache
+        >>> x = Symbol('x')
+        >>> _ = (ZZ/ZZ(7))[x]
+        >>> mod = x**5 + 3*x + 1
+        >>> cache = ModularCompositionCache(x**3 + 2, mod)
+        >>> f = x**7 + 4*x**2 + 1
+        >>> cache(f) == f.modular_composition(x**3 + 2, mod)
+        True
+
+    References:
+        "Fast Algorithms for Manipulating Formal Power Series" (https://doi.org/10.1145/322092.322099)
+    """
+
+    def __init__(self, h: 'Polynomial', mod: 'Polynomial', num_baby_steps: int=None):
+        """
+        Parameters:
+            h              (Polynomial): Inner polynomial.
+            mod            (Polynomial): Modulus.
+            num_baby_steps        (int): Number of baby steps to cache. Defaults to ceil(sqrt(deg(`mod`))).
+        """
+        n = mod.degree()
+
+        self.mod = mod
+        self.h   = reduce_mod(h, mod)
+        self.num_baby_steps = num_baby_steps or max(isqrt(n-1)+1, 1)
+
+        powers = [mod.ring.one]
+        for _ in range(self.num_baby_steps-1):
+            powers.append(mulmod(powers[-1], self.h, mod))
+
+        self.baby_steps = DenseBasis(powers, max(n, 1))
+        self.giant_step = mulmod(powers[-1], self.h, mod)
+
+
+    def __reprdir__(self):
+        return ['h', 'mod', 'num_baby_steps']
+
+
+    def compose(self, f: 'Polynomial') -> 'Polynomial':
+        """
+        Computes `f`(`h`) % `mod`.
+
+        Parameters:
+            f (Polynomial): Outer polynomial.
+
+        Returns:
+            Polynomial: Composition.
+        """
+        m      = self.num_baby_steps
+        coeffs = [f.coeffs[i] for i in range(f.degree()+1)]
+        chunks = [coeffs[i:i+m] for i in range(0, len(coeffs), m)]
+
+        result = self.mod.ring.zero
+        for chunk in chunks[::-1]:
+            result = mulmod(result, self.giant_step, self.mod) + self.baby_steps.combine(chunk)
+
+        return result
+
+
+    __call__ = compose
+
+
+
+def iterated_frobenius(x_q: 'Polynomial', e: int, mod: 'Polynomial') -> 'Polynomial':
+    """
+    Computes x^(q^`e`) % `mod` from `x_q` = x^q % `mod` using composition doubling.
+
+    Parameters:
+        x_q (Polynomial): x^q % `mod`.
+        e          (int): Number of Frobenius iterations.
+        mod (Polynomial): Modulus.
+
+    Returns:
+        Polynomial: x^(q^`e`) % `mod`.
+    """
+    if not e:
+        return mod.ring(mod.symbol)
+
+    frob = ModularCompositionCache(x_q, mod)
+    X    = x_q
+
+    for bit in bin(e)[3:]:
+        X = ModularCompositionCache(X, mod)(X)
+
+        if bit == '1':
+            X = frob(X)
+
+    return X
@@ -10,6 +10,7 @@ from samson.utilities.general import add_or_increment
 from samson.utilities.manipulation import get_blocks
 from samson.utilities.runtime import RUNTIME
 from types import FunctionType
+from math import isqrt
 import itertools
 
 from samson.auxiliary.lazy_loader import LazyLoader
@@ -274,25 +275,31 @@ class Polynomial(RingElement):
 
 
 
-    def modular_composition(self, h, mod):
-        x = h % mod
-        if not self.degree():
-            return self[0]
+    def modular_composition(self, h: 'Polynomial', mod: 'Polynomial') -> 'Polynomial':
+        """
+        Computes `self`(`h`) % `mod` using Brent-Kung baby-step giant-step composition.
 
-        coeffs   = self.coeffs
-        total    = self.coeff_ring.zero
-        last_idx = coeffs.last()
+        Parameters:
+            h   (Polynomial): Inner polynomial.
+            mod (Polynomial): Modulus.
 
-        for idx, c in coeffs.values.items()[::-1]:
-            total *= x**(last_idx-idx)
-            total += c
-            total %= mod
-            last_idx = idx
+        Returns:
+            Polynomial: Composition.
 
+        Examples:
+            >>> from samson.math.all import ZZ, Symbol
+            >>> x = Symbol('x')
+            >>> _ = (ZZ/ZZ(7))[x]
+            >>> (x**2 + 1).modular_composition(x + 1, x**3 + 2)
+            <Polynomial: x^2 + (2)*x + 2, coeff_ring=ZZ/(ZZ(7))>
 
-        total *= x**idx
+        """
+        from samson.math.optimization.modular_composition_cache import ModularCompositionCache
+
+        if not self.degree():
+            return self[0]
 
-        return total % mod
+        return ModularCompositionCache(h, mod)(self)
 
 
 
@@ -360,7 +367,7 @@ class Polynomial(RingElement):
             x = self.symbol
             if R.characteristic():
                 frob = frobenius_map(self.symbol, self)
-                facs = gcd(frob - x, self).factor(**factor_kwargs)
+                facs = gcd(frob - x, self).monic().factor(**factor_kwargs)
             else:
                 facs = self.factor(**factor_kwargs)
             return [-fac.monic().coeffs[0] for fac in facs.keys() if fac.degree() == 1]
@@ -744,49 +751,65 @@ class Polynomial(RingElement):
         References:
             https://en.wikipedia.org/wiki/Factorization_of_polynomials_over_finite_fields#Distinct-degree_factorization
         """
-        from samson.math.general import frobenius_map, frobenius_monomial_base
+        from samson.math.optimization.modular_composition_cache import ModularCompositionCache, mulmod, powmod
 
-        f = self
-        f_star = f
+        f = self.monic()
+        n = f.degree()
         S = []
-        i = 1
 
-        x      = self.symbol
-        x_poly = f.ring(x)
+        one    = self.ring.one
+        x_poly = f.ring(self.symbol)
+
+        if n < 2:
+            return [(f if n else self, 1)]
 
-        if not f_star.is_monic():
-            f_star = f_star.monic()
+        # Baby steps h_i = x^(q^i) for i < l and giant steps H_j = x^(q^(l*j))
+        l     = isqrt(n // 2 - 1) + 1
+        frob  = ModularCompositionCache(powmod(x_poly, self.coeff_ring.order(), f), f)
+        baby  = [x_poly]
 
-        bases = frobenius_monomial_base(f_star)
+        for _ in range(l):
+            baby.append(frob(baby[-1]))
 
-        while f_star.degree() >= 2*i:
-            # Calculate P(x**q**i - x)
-            h = bases[1]
+        giant   = ModularCompositionCache(baby[l], f)
+        H       = x_poly
+        f_star  = f
+        j       = 0
 
-            for _ in range(i-1):
-                h = frobenius_map(h, f_star, bases=bases)
+        while f_star.degree() >= 2*(l*j+1):
+            j += 1
+            H  = giant(H)
 
-            g = gcd(f_star, h - x_poly).monic()
+            # Interval polynomial catches every factor with degree in (l*(j-1), l*j]
+            I = one
+            for h_i in baby[:l]:
+                I = mulmod(I, H - h_i, f)
 
-            if g != self.ring.one:
-                S.append((g, i))
-                f_star //= g
+            g = gcd(f_star, I).monic()
 
-                if not f_star.is_monic():
-                    f_star = f_star.monic()
+            if g == one:
+                continue
 
-                bases = frobenius_monomial_base(f_star)
+            f_star //= g
 
-            i += 1
+            for i in range(l-1, -1, -1):
+                g_i = gcd(g, H - baby[i]).monic()
 
+                if g_i != one:
+                    S.append((g_i, l*j-i))
+                    g //= g_i
+
+                    if g.degree() < 1:
+                        break
 
-        if f_star != self.ring.one:
+
+        if f_star != one:
             S.append((f_star, f_star.degree()))
 
         if not S:
-            return [(f, 1)]
+            return [(self, 1)]
         else:
-            return S
+            return sorted(S, key=lambda fac: fac[1])
 
 
     ddf = distinct_degree_factorization
@@ -804,14 +827,13 @@ class Polynomial(RingElement):
             list: Equal-degree factors of self.
         """
         from samson.math.symbols import oo
-        from samson.math.general import frobenius_map, frobenius_monomial_base
+        from samson.math.optimization.modular_composition_cache import ModularCompositionCache, mulmod, powmod
 
         f = self.monic()
         n = f.degree()
         r = n // d
         S = [f]
 
-        f_quot = f.ring / f
         q = self.coeff_ring.order()
 
         if self.coeff_ring.order() != oo:
@@ -847,7 +869,24 @@ class Polynomial(RingElement):
         attempts = 0
         found = False
 
-        bases = frobenius_monomial_base(f)
+        x_q  = powmod(f.ring(self.symbol), q, f)
+        frob = ModularCompositionCache(x_q, f)
+
+        def frobenius_norm(k):
+            # Computes k^(1 + q + ... + q^(d-1)) via composition doubling:
+            # N_2a = N_a * N_a(x^(q^a)) and x^(q^2a) = x^(q^a)(x^(q^a))
+            N, X = k, x_q
+
+            for bit in bin(d)[3:]:
+                comp = ModularCompositionCache(X, f)
+                N    = mulmod(N, comp(N), f)
+                X    = comp(X)
+
+                if bit == '1':
+                    N = mulmod(k, frob(N), f)
+                    X = frob(X)
+
+            return N
 
         try:
             while len(S) < r and (not irreducibility_cache or not all([irreducibility_cache[poly] for poly in S])) and not user_stop_func(S):
@@ -855,15 +894,8 @@ class Polynomial(RingElement):
                 g = gcd(h, f).monic()
 
                 if g == one:
-                    h = f_quot(h)
-                    k = h**(exponent % q)
-                    l = k
-                    k = k.val
-                    for _ in range(d-1):
-                        k  = frobenius_map(k, f, bases=bases)
-                        l *= k
-
-                    g = l.val - one
+                    k = powmod(h, exponent % q, f)
+                    g = frobenius_norm(k) - one
 
 
                 for u in S:
@@ -992,7 +1024,8 @@ class Polynomial(RingElement):
             https://en.wikipedia.org/wiki/Irreducible_polynomial#Over_the_integers_and_finite_field
             https://www.imomath.com/index.php?options=623&lmm=0#:~:text=Table%20of%20contents)-,Irreducibility,nonconstant%20polynomials%20with%20integer%20coefficients.&text=Every%20quadratic%20or%20cubic%20polynomial,3%E2%88%924x%2B1.
         """
-        from samson.math.general import frobenius_map, frobenius_monomial_base, batch_gcd
+        from samson.math.general import batch_gcd
+        from samson.math.optimization.modular_composition_cache import iterated_frobenius, powmod
         ZZ = _integer_ring.ZZ
 
         n = self.degree()
@@ -1027,22 +1060,19 @@ class Polynomial(RingElement):
         f = self.monic()
         P = self.ring
 
-        subgroups = {n // fac for fac in factor_int(n)}
-
-        bases  = frobenius_monomial_base(f)
-        h      = bases[1]
-        x_poly = P(x)
-        one    = P.one
+        subgroups = sorted({n // fac for fac in factor_int(n)})
+        x_poly    = P(x)
+        x_q       = powmod(x_poly, self.coeff_ring.order(), f)
+        one       = P.one
 
-        for idx in range(1, n):
-            if idx in subgroups:
-                if gcd(f, h - x_poly).monic() != one:
-                    return False
+        # Rabin's test only needs x^(q^(n/p)) for primes p | n, so jump straight to them
+        for idx in subgroups:
+            h = iterated_frobenius(x_q, idx, f)
 
+            if gcd(f, h - x_poly).monic() != one:
+                return False
 
-            h = frobenius_map(h, f, bases=bases)
-
-        return h == x_poly
+        return iterated_frobenius(x_q, n, f) == x_poly
 
 
     def is_prime(self) -> bool:
@@ -1449,10 +1479,55 @@ class Polynomial(RingElement):
 
             return f + g + h + i
 
+        elif d > 4:
+            a = self.LC()
+            r = self.resultant(self.derivative())
+
+            if (d*(d-1) // 2) & 1:
+                r = -r
+
+            if self.coeff_ring.is_field():
+                return r / a
+            else:
+                return r // a
+
         else:
             raise ValueError(f"Discriminant is not defined for polynomials of degree {d}")
 
 
+    def resultant(self, other: 'Polynomial') -> RingElement:
+        """
+        Computes the resultant of `self` and `other`. Uses the half-GCD algorithm over fields.
+
+        Parameters:
+            other (Polynomial): Other polynomial.
+
+        Returns:
+            RingElement: Resultant.
+
+        Examples:
+            >>> from samson.math.all import ZZ, Symbol
+            >>> x = Symbol('x')
+            >>> _ = ZZ[x]
+            >>> (x**2 - 4).resultant(x - 3)
+            <IntegerElement: val=5, ring=ZZ>
+
+        References:
+            https://en.wikipedia.org/wiki/Resultant
+        """
+        from samson.math.algebra.fields.fraction_field import FractionField
+        from samson.math.half_gcd import resultant
+
+        R = self.coeff_ring
+        if R.is_field():
+            return resultant(self, other)
+
+        # Embed ring into a fraction field
+        Q   = FractionField(R)
+        res = resultant(self.change_ring(Q), other.change_ring(Q))
+        return R(res.numerator)
+
+
 
     def ordinality(self) -> int:
         """
@@ -1657,7 +1732,7 @@ class Polynomial(RingElement):
 
         else:
             # FFT conv
-            from samson.math.fft.gss import _convolution
+            from samson.math.fft.convolution import convolution
 
             self_powers  = list(self.coeffs.values.keys())
             other_powers = list(other.coeffs.values.keys())
@@ -1687,7 +1762,7 @@ class Polynomial(RingElement):
 
 
             # Convolve and reconstruct
-            poly = self._create_poly(_convolution(list(small_self), list(small_other))) << (self_smallest_pow+other_smallest_pow)
+            poly = self._create_poly(convolution(list(small_self), list(small_other))) << (self_smallest_pow+other_smallest_pow)
 
             if denom > 1:
                 poly.coeffs = poly.coeffs.map(lambda idx, val: (idx*denom, val))
@@ -1777,13 +1852,22 @@ class Polynomial(RingElement):
             https://math.stackexchange.com/a/2587365
         """
         from samson.math.algebra.fields.fraction_field import FractionField
+        from samson.math.half_gcd import fast_gcd
 
         # Euclidean division is only defined for polynomials over a field
         R = self.coeff_ring
+        use_hgcd = max(self.degree(), other.degree()) >= RUNTIME.poly_half_gcd_supremacy
+
         if R.is_field():
+            if use_hgcd:
+                return fast_gcd(self, other)
+
             return super().gcd(other)
 
         elif use_naive:
+            if use_hgcd:
+                return fast_gcd(self.monic(), other.monic(), use_naive=True).monic()
+
             # Assumes invertibility despite not being a field
             # We use monic to reduce the leading coefficient so the algorithm will terminate
             a, b = self, other
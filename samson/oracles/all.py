@@ -3,6 +3,7 @@ from .chosen_ciphertext_oracle import ChosenCiphertextOracle
 from .chosen_plaintext_oracle import ChosenPlaintextOracle
 from .padding_oracle import PaddingOracle
 from .timing_oracle import TimingOracle
+from .async_oracle import AsyncOracle, AsyncPaddingOracle, AsyncChosenPlaintextOracle, AsyncTimingOracle
 
 
-__all__ = ["Oracle", "ChosenCiphertextOracle", "ChosenPlaintextOracle", "PaddingOracle", "TimingOracle"]
+__all__ = ["Oracle", "ChosenCiphertextOracle", "ChosenPlaintextOracle", "PaddingOracle", "TimingOracle", "AsyncOracle", "AsyncPaddingOracle", "AsyncChosenPlaintextOracle", "AsyncTimingOracle"]
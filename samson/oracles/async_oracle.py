@@ -0,0 +1,263 @@
+from samson.oracles.chosen_plaintext_oracle import analyze_io_lengths
+from samson.oracles.timing_oracle import TimingOracle, average, percentile_filter
+from timeit import default_timer
+from array import array
+from types import FunctionType
+import asyncio
+
+import logging
+log = logging.getLogger(__name__)
+
+
+def _cache_key(args: tuple) -> tuple:
+    return tuple(bytes(arg) if isinstance(arg, (bytes, bytearray)) else arg for arg in args)
+
+
+class AsyncOracle(object):
+    """
+    Oracle that wraps an `async def` request function (e.g. a network client). Requests are bounded by a semaphore, can be
+    retried with exponential backoff, time out individually and can be cached. Synchronous request functions are run in the
+    event loop's default executor.
+    """
+
+    def __init__(self, request_func: FunctionType, concurrency: int=16, retries: int=0, backoff: float=0.1, timeout: float=None, cache: bool=False, retry_on: tuple=(OSError, asyncio.TimeoutError)):
+        """
+        Parameters:
+            request_func (func): Coroutine function (or regular function) that provides the oracle.
+            concurrency   (int): Maximum number of requests in flight.
+            retries       (int): Number of times to retry a request that raised one of `retry_on`.
+            backoff     (float): Seconds to wait before the first retry. Doubles on each retry.
+            timeout     (float): Seconds before a single attempt times out.
+            cache        (bool): Whether to cache responses by request.
+            retry_on    (tuple): Exception types that trigger a retry. Other exceptions (e.g. `DecryptionException`) propagate immediately.
+        """
+        self.request_func = request_func
+        self.concurrency  = concurrency
+        self.retries      = retries
+        self.backoff      = backoff
+        self.timeout      = timeout
+        self.retry_on     = retry_on
+        self.cache        = {} if cache else None
+
+        self._semaphore = None
+        self._loop      = None
+
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: concurrency={self.concurrency}, retries={self.retries}, timeout={self.timeout}, cache={self.cache is not None}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they're first used on
+        loop = asyncio.get_running_loop()
+
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop      = loop
+
+        return self._semaphore
+
+
+    async def _call(self, *args):
+        if asyncio.iscoroutinefunction(self.request_func):
+            return await self.request_func(*args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, self.request_func, *args)
+
+
+    def _settle(self, key: tuple, future: asyncio.Future):
+        # Failed requests are dropped so they can be retried; results replace the pending future
+        if future.cancelled() or future.exception() is not None:
+            if self.cache.get(key) is future:
+                del self.cache[key]
+        else:
+            self.cache[key] = future.result()
+
+
+    async def _request(self, *args):
+        async with self._get_semaphore():
+            for attempt in range(self.retries + 1):
+                try:
+                    if self.timeout is None:
+                        return await self._call(*args)
+                    else:
+                        return await asyncio.wait_for(self._call(*args), self.timeout)
+
+                except self.retry_on as e:
+                    if attempt == self.retries:
+                        raise
+
+                    log.debug(f'Request failed with {e!r}; retrying ({attempt + 1}/{self.retries})')
+                    await asyncio.sleep(self.backoff * 2**attempt)
+
+
+    async def request(self, *args):
+        """
+        Sends a request to the oracle. With caching enabled, identical requests in flight at the same time share a single call.
+
+        Parameters:
+            *args: Arguments to pass to `request_func`.
+
+        Returns:
+            object: The oracle's response.
+        """
+        if self.cache is None:
+            return await self._request(*args)
+
+        key = _cache_key(args)
+
+        if key not in self.cache:
+            future = asyncio.ensure_future(self._request(*args))
+            future.add_done_callback(lambda future: self._settle(key, future))
+            self.cache[key] = future
+
+        entry = self.cache[key]
+
+        if not isinstance(entry, asyncio.Future):
+            return entry
+
+        # Shielded so cancelling one caller doesn't cancel the request for the others
+        return await asyncio.shield(entry)
+
+
+
+    async def request_many(self, inputs: list) -> list:
+        """
+        Sends a request for each input concurrently.
+
+        Parameters:
+            inputs (list): Inputs to send (one argument per request).
+
+        Returns:
+            list: Responses in the same order as `inputs`.
+        """
+        return await asyncio.gather(*[self.request(message) for message in inputs])
+
+
+
+class AsyncPaddingOracle(AsyncOracle):
+    """
+    Asynchronous oracle that determines if a ciphertext has the correct padding or not. The `request` function must return a boolean indicating this.
+    """
+
+    async def check_padding(self, ciphertext: bytes) -> bool:
+        return await self.request(ciphertext)
+
+
+    async def check_many(self, ciphertexts: list) -> list:
+        return await self.request_many(ciphertexts)
+
+
+    async def find_first(self, ciphertexts: list, expected: bool=True) -> (int, int):
+        """
+        Concurrently finds the first ciphertext whose padding check returns `expected`. The remaining checks
+        are cancelled once the first match is settled.
+
+        Parameters:
+            ciphertexts (list): Ciphertexts to check in order.
+            expected    (bool): Padding check result to search for.
+
+        Returns:
+            (int, int): Formatted as (index of the first match or None, number of oracle queries made).
+        """
+        tasks = [asyncio.ensure_future(self.check_padding(ciphertext)) for ciphertext in ciphertexts]
+
+        try:
+            for idx, task in enumerate(tasks):
+                if await task == expected:
+                    return idx, sum(1 for task in tasks if task.done())
+
+            return None, len(tasks)
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+
+class AsyncChosenPlaintextOracle(AsyncOracle):
+    """
+    Asynchronous oracle that provides an interface to a chosen-plaintext attack.
+    """
+
+    async def test_io_relation(self, min_input_len: int=1) -> dict:
+        lengths = [len(sample) for sample in await self.request_many([b'a'*i for i in range(min_input_len, 64)])]
+        return analyze_io_lengths(lengths, min_input_len)
+
+
+
+class AsyncTimingOracle(TimingOracle):
+    """
+    Oracle that times an asynchronous `request_func`. Samples are taken one at a time since concurrent requests
+    would skew each other's timings.
+    """
+
+    def __init__(self, request_func: FunctionType, timer: object=default_timer, filters: list=[], aggregator: FunctionType=average):
+        """
+        Parameters:
+            request_func (func): Coroutine function that takes in bytes.
+            timer      (object): Function returning the current time.
+            filters      (list): List of filter functions that take in a list of items and output the items that satisfy the filter.
+            aggregator   (func): Aggregation function (e.g. average).
+        """
+        super().__init__(request_func, timer, filters, aggregator)
+
+
+    async def get_timing(self, message: object, sample_size: int=1000) -> (float, float):
+        """
+        Times awaiting the `request_func` with `message`.
+
+        Parameters:
+            message  (object): Message to send to oracle function.
+            sample_size (int): Number of samples to collect.
+
+        Returns:
+            (float, float): Timing information formatted as (timing, jitter).
+        """
+        timings = []
+
+        for _ in range(sample_size):
+            start = self.timer()
+            await self.request_func(message)
+            timings.append(self.timer() - start)
+
+        for filt in self.filters:
+            timings = filt(timings)
+
+        return self.aggregator(timings), average([abs(a-b) for a,b in zip(timings, timings[1:])])
+
+
+
+    async def rank(self, messages: list, max_samples: int=100000, batch_size: int=1000, z: float=5.0, estimator: FunctionType=lambda items: percentile_filter(0.1, items)) -> list:
+        """
+        Ranks `messages` from slowest to fastest with interleaved, randomized measurements and adaptive stopping.
+        See `TimingOracle.rank`.
+
+        Parameters:
+            messages    (list): Candidate messages to send to the oracle function.
+            max_samples  (int): Maximum number of samples to collect per candidate.
+            batch_size   (int): Number of samples to collect per candidate between tests.
+            z          (float): Number of standard errors the candidates must be separated by.
+            estimator   (func): Filter applied to each candidate's samples before estimating their mean and variance.
+
+        Returns:
+            list: Candidates formatted as (message, timing, number of samples) sorted from slowest to fastest.
+        """
+        steps = self._rank_steps(messages, max_samples, batch_size, z, estimator)
+
+        try:
+            order = next(steps)
+            while True:
+                timings = array('d')
+                for idx in order:
+                    start = self.timer()
+                    await self.request_func(messages[idx])
+                    timings.append(self.timer() - start)
+
+                order = steps.send(timings)
+
+        except StopIteration as result:
+            return result.value
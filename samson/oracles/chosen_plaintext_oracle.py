@@ -3,12 +3,60 @@ from samson.utilities.bytes import Bytes
 from samson.oracles.oracle import Oracle
 from samson.analysis.general import count_items
 from samson.math.general import gcd
+from samson.utilities.runtime import RUNTIME
 from types import FunctionType
 
 import logging
 log = logging.getLogger(__name__)
 
 
+def analyze_io_lengths(lengths: list, min_input_len: int=1) -> dict:
+    """
+    Determines the IO relation and block size from the output lengths of inputs of length `min_input_len`, `min_input_len` + 1, ...
+    Lengths past the point where `ChosenPlaintextOracle.test_io_relation` would stop requesting are ignored.
+
+    Parameters:
+        lengths      (list): Output lengths.
+        min_input_len (int): Input length of the first output.
+
+    Returns:
+        dict: IO relation, block size and the output length of the shortest input.
+    """
+    base_len = lengths[0]
+    new_len  = base_len
+
+    i       = min_input_len + 1
+    io_diff = []
+
+    for length in lengths[1:]:
+        if not (base_len == new_len and i < 64 or i < 32):
+            break
+
+        new_len = length
+        io_diff.append(new_len)
+        i += 1
+
+
+    size_counts = sorted(count_items(io_diff).values())
+
+    # Determine IO relation
+
+    # This heuristic takes into account random size fluctuations
+    # in number theoretical algorithms like RSA. There's a
+    # 1 in 5,961,809 chance of getting five or more size differences
+    # in a FIXED algorithm.
+
+    # `probability_of_at_least_x_occurences(32, 5, 1/256)`
+    if sum(size_counts[:-1]) > 4:
+        io_relation = IORelationType.EQUAL
+    else:
+        io_relation = IORelationType.FIXED
+
+
+    return {"io_relation": io_relation, "block_size": gcd(new_len, base_len), "base_len": base_len}
+
+
+
 class ChosenPlaintextOracle(Oracle):
     """
     Oracle that provides an interface to a chosen-plaintext attack.
@@ -22,7 +70,32 @@ class ChosenPlaintextOracle(Oracle):
         self.request = request_func
 
 
-    def test_io_relation(self, min_input_len: int=1) -> dict:
+    def test_io_relation(self, min_input_len: int=1, threads: int=1) -> dict:
+        """
+        Determines the IO relation and block size by requesting increasingly long inputs.
+
+        Parameters:
+            min_input_len (int): Length of the shortest input.
+            threads       (int): Number of requests to run concurrently. Inputs shorter than 32 bytes are always
+                                 needed and are requested together; longer ones are requested `threads` at a time.
+
+        Returns:
+            dict: IO relation, block size and the output length of the shortest input.
+        """
+        if threads > 1:
+            log.debug('Starting block size/output size testing')
+            request_lengths = lambda lengths: [len(sample) for sample in RUNTIME.threaded(threads)(self.request)([b'a'*i for i in lengths])]
+
+            lengths = request_lengths(range(min_input_len, max(32, min_input_len + 2)))
+            i       = min_input_len + len(lengths)
+
+            while i < 64 and lengths[-1] == lengths[0]:
+                lengths += request_lengths(range(i, min(i + threads, 64)))
+                i       += threads
+
+            return analyze_io_lengths(lengths, min_input_len)
+
+
         sample   = self.request(b'a'*min_input_len)
         base_len = len(sample)
         new_len  = base_len
@@ -37,24 +110,7 @@ class ChosenPlaintextOracle(Oracle):
             io_diff.append(new_len)
             i += 1
 
-
-        size_counts = sorted(count_items(io_diff).values())
-
-        # Determine IO relation
-
-        # This heuristic takes into account random size fluctuations
-        # in number theoretical algorithms like RSA. There's a
-        # 1 in 5,961,809 chance of getting five or more size differences
-        # in a FIXED algorithm.
-
-        # `probability_of_at_least_x_occurences(32, 5, 1/256)`
-        if sum(size_counts[:-1]) > 4:
-            io_relation = IORelationType.EQUAL
-        else:
-            io_relation = IORelationType.FIXED
-
-
-        return {"io_relation": io_relation, "block_size": gcd(new_len, base_len)}
+        return analyze_io_lengths([base_len] + io_diff, min_input_len)
 
 
 
@@ -1,6 +1,7 @@
 from samson.utilities.exceptions import CiphertextLengthException, DecryptionException
 from samson.utilities.bytes import Bytes
-from samson.utilities.general import binary_search
+from samson.utilities.general import kary_search
+from samson.utilities.runtime import RUNTIME
 from samson.math.general import kth_root
 from types import FunctionType
 import math
@@ -22,7 +23,17 @@ class Oracle(object):
 
 
 
-    def test_max_input(self, max_int: int=2**16383) -> int:
+    def test_max_input(self, max_int: int=2**16383, threads: int=1) -> int:
+        """
+        Finds the smallest input the oracle rejects with a `CiphertextLengthException`.
+
+        Parameters:
+            max_int (int): Largest input to test.
+            threads (int): Number of probes to run concurrently per search round.
+
+        Returns:
+            int: Smallest rejected input or -1 if the oracle seems to take in arbitrary-sized inputs.
+        """
         # Use 'max_int' as a canary. If the primitive will take 'max_int', then
         # it's most likely going to take anything. Only run this test if we know the primitive
         # has a fixed output size (e.g. hashes and number-theoretical crypto).
@@ -49,7 +60,8 @@ class Oracle(object):
 
         # Use binary search to find max input size. This is both the most efficient method of finding
         # the max size and the most precise. For example, if the primitive is RSA and rejects inputs
-        # larger than its modulus, then "end_idx" will be the modulus.
+        # larger than its modulus, then "end_idx" will be the modulus. We first search for its bit length
+        # so the number of probes depends on the size of the result rather than of `max_int`.
         max_val = -1
 
         if should_test_max:
@@ -67,7 +79,15 @@ class Oracle(object):
 
                 return True
 
-            max_val = binary_search(search_func, max_int)
+
+            if threads > 1:
+                search_many = RUNTIME.threaded(threads)(search_func)
+            else:
+                search_many = lambda values: [search_func(value) for value in values]
+
+            exponent = kary_search(lambda exponents: search_many([2**e for e in exponents]), max_int.bit_length(), k=threads+1)
+            low      = 2**(exponent-1)
+            max_val  = low + kary_search(lambda offsets: search_many([low + offset for offset in offsets]), min(2**exponent, max_int) - low, k=threads+1)
 
             log.info(f'Max input size: {round(math.log(max_val, 2), 1)} bits')
 
@@ -1,3 +1,4 @@
+from samson.utilities.runtime import RUNTIME
 from types import FunctionType
 
 class PaddingOracle(object):
@@ -11,3 +12,58 @@ class PaddingOracle(object):
             request_func (func): Function that takes in bytes and returns a boolean indicating whether the resulting plaintext has correct padding.
         """
         self.check_padding = request_func
+
+
+    def check_many(self, ciphertexts: list, threads: int=1) -> list:
+        """
+        Checks the padding of each ciphertext.
+
+        Parameters:
+            ciphertexts (list): Ciphertexts to check.
+            threads      (int): Number of threads to use.
+
+        Returns:
+            list: Padding check results in the same order as `ciphertexts`.
+        """
+        if threads == 1:
+            return [self.check_padding(ciphertext) for ciphertext in ciphertexts]
+
+        return RUNTIME.threaded(threads=threads)(self.check_padding)(ciphertexts)
+
+
+    def find_first(self, ciphertexts: list, expected: bool=True, threads: int=1) -> (int, int):
+        """
+        Finds the first ciphertext whose padding check returns `expected`. With more than one thread, the
+        ciphertexts are checked concurrently and the remaining checks are cancelled once the first match is settled.
+
+        Parameters:
+            ciphertexts (list): Ciphertexts to check in order.
+            expected    (bool): Padding check result to search for.
+            threads      (int): Number of threads to use.
+
+        Returns:
+            (int, int): Formatted as (index of the first match or None, number of oracle queries made).
+        """
+        if threads == 1:
+            for idx, ciphertext in enumerate(ciphertexts):
+                if self.check_padding(ciphertext) == expected:
+                    return idx, idx + 1
+
+            return None, len(ciphertexts)
+
+
+        def settled(results):
+            # Stop once a match is found and every ciphertext before it has been checked
+            done    = {idx for idx, _ in results}
+            matches = [idx for idx, match in results if match]
+            return bool(matches) and all(idx in done for idx in range(min(matches)))
+
+
+        @RUNTIME.threaded(threads=threads, terminate_filter=settled)
+        def check(idx):
+            return idx, self.check_padding(ciphertexts[idx]) == expected
+
+        results = check(range(len(ciphertexts)))
+        matches = [idx for idx, match in results if match]
+
+        return (min(matches) if matches else None), len(results)
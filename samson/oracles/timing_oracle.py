@@ -1,16 +1,87 @@
 from types import FunctionType
 from timeit import Timer, default_timer
-from math import ceil
+from array import array
+from math import ceil, sqrt
+import random
+
+import logging
+log = logging.getLogger(__name__)
 
 def average(items):
     return sum(items) / len(items)
 
 
+def variance(items):
+    mean = average(items)
+    return sum((item - mean)**2 for item in items) / max(len(items) - 1, 1)
+
+
+def percentile(items, percentile):
+    items = sorted(items)
+    return items[min(int(len(items) * percentile), len(items) - 1)]
+
+
 def percentile_filter(percentile, items):
     items = sorted(items)
     return items[:ceil(len(items) * percentile)]
 
 
+def box_filter(low, high, items):
+    """
+    Keeps the items between the `low` and `high` percentiles (e.g. 0.05 and 0.1). Crosby et al. found low
+    percentile boxes to be the most reliable timing estimators over noisy networks.
+
+    References:
+        "Opportunities and Limits of Remote Timing Attacks" (https://www.cs.rice.edu/~dwallach/pub/crosby-timing2009.pdf)
+    """
+    items = sorted(items)
+    return items[int(len(items) * low):max(ceil(len(items) * high), int(len(items) * low) + 1)]
+
+
+def trim_filter(proportion, items):
+    """
+    Cuts `proportion` of the items off of each end.
+    """
+    items = sorted(items)
+    cut   = int(len(items) * proportion)
+    return items[cut:len(items) - cut] or items
+
+
+def trimmed_mean(proportion, items):
+    """
+    Averages the items after cutting `proportion` of them off of each end.
+    """
+    return average(trim_filter(proportion, items))
+
+
+def box_test(low, high, items_a, items_b) -> int:
+    """
+    Crosby et al.'s box test. Compares the [`low`, `high`] percentile boxes of two timing distributions.
+
+    Parameters:
+        low        (float): Lower percentile of the box.
+        high       (float): Upper percentile of the box.
+        items_a (iterable): First timing distribution.
+        items_b (iterable): Second timing distribution.
+
+    Returns:
+        int: 1 if `items_a` is distinguishably slower, -1 if it's distinguishably faster, and 0 if the boxes overlap.
+
+    References:
+        "Opportunities and Limits of Remote Timing Attacks" (https://www.cs.rice.edu/~dwallach/pub/crosby-timing2009.pdf)
+    """
+    a_low, a_high = percentile(items_a, low), percentile(items_a, high)
+    b_low, b_high = percentile(items_b, low), percentile(items_b, high)
+
+    if a_low > b_high:
+        return 1
+
+    elif a_high < b_low:
+        return -1
+
+    return 0
+
+
 class TimingOracle(object):
     """
     Oracle that times the `request_func`.
@@ -43,12 +114,92 @@ class TimingOracle(object):
             (float, float): Timing information formatted as (timing, jitter).
         """
         timer = Timer(stmt=lambda: self.request_func(message), timer=self.timer)
-        timings = []
-
-        for _ in range(sample_size):
-            timings.append(timer.timeit(number=1))
+        timings = array('d', (timer.timeit(number=1) for _ in range(sample_size)))
 
         for filt in self.filters:
             timings = filt(timings)
 
         return self.aggregator(timings), average([abs(a-b) for a,b in zip(timings, timings[1:])])
+
+
+
+    def rank(self, messages: list, max_samples: int=100000, batch_size: int=1000, z: float=5.0, estimator: FunctionType=lambda items: percentile_filter(0.1, items), box: tuple=None) -> list:
+        """
+        Ranks `messages` from slowest to fastest. Measurements are interleaved across the candidates in random order, so
+        drift affects all of them equally. After each batch, a candidate is no longer sampled once its estimate is more
+        than `z` standard errors below the slowest candidate's (or, if `box` is given, once the slowest candidate wins the
+        box test against it). Sampling stops when one candidate is left or when `max_samples` is reached.
+
+        Parameters:
+            messages    (list): Candidate messages to send to the oracle function.
+            max_samples  (int): Maximum number of samples to collect per candidate.
+            batch_size   (int): Number of samples to collect per candidate between tests.
+            z          (float): Number of standard errors the candidates must be separated by.
+            estimator   (func): Filter applied to each candidate's samples before estimating their mean and variance (e.g. `box_filter` or `trim_filter` for trimmed means).
+            box        (tuple): (low, high) percentiles for `box_test`. Replaces the `z` test if given.
+
+        Returns:
+            list: Candidates formatted as (message, timing, number of samples). Candidates still in the running come first sorted
+                  from slowest to fastest, followed by the eliminated ones from the last to the first eliminated.
+        """
+        steps = self._rank_steps(messages, max_samples, batch_size, z, estimator, box)
+        timer = self.timer
+
+        try:
+            order = next(steps)
+            while True:
+                timings = array('d')
+                for idx in order:
+                    start = timer()
+                    self.request_func(messages[idx])
+                    timings.append(timer() - start)
+
+                order = steps.send(timings)
+
+        except StopIteration as result:
+            return result.value
+
+
+
+    def _rank_steps(self, messages: list, max_samples: int, batch_size: int, z: float, estimator: FunctionType, box: tuple):
+        """
+        Yields the randomized order of the next batch of measurements and is sent back their timings.
+        """
+        samples    = [array('d') for _ in messages]
+        active     = list(range(len(messages)))
+        estimate   = [0.0] * len(messages)
+        eliminated = []
+
+        while len(active) > 1 and len(samples[active[0]]) < max_samples:
+            order = active * batch_size
+            random.shuffle(order)
+
+            timings = yield order
+            for idx, timing in zip(order, timings):
+                samples[idx].append(timing)
+
+
+            stats = {}
+            for idx in active:
+                filtered      = estimator(samples[idx])
+                estimate[idx] = average(filtered)
+                stats[idx]    = estimate[idx], variance(filtered) / len(filtered)
+
+            leader = max(active, key=lambda idx: estimate[idx])
+            lead_mean, lead_err = stats[leader]
+
+            if box:
+                separated = lambda idx: box_test(*box, samples[leader], samples[idx]) == 1
+            else:
+                separated = lambda idx: (lead_mean - stats[idx][0]) > z * sqrt(lead_err + stats[idx][1])
+
+            dropped = [idx for idx in active if idx != leader and separated(idx)]
+            active  = [idx for idx in active if idx not in dropped]
+
+            # Estimates of eliminated candidates are frozen with fewer samples, so they're only compared within their round
+            eliminated.append(sorted(dropped, key=lambda idx: estimate[idx], reverse=True))
+            log.debug(f'{len(active)} candidates left after {len(samples[leader])} samples each')
+
+
+        order = sorted(active, key=lambda idx: estimate[idx], reverse=True) + [idx for dropped in reversed(eliminated) for idx in dropped]
+        return [(messages[idx], estimate[idx], len(samples[idx])) for idx in order]
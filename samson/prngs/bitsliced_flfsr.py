@@ -1,9 +1,11 @@
 from samson.utilities.bitstring import Bitstring
 from samson.core.base_object import BaseObject
+from samson.prngs.word_lfsr import WordLFSR, parity, reverse_bits
 
 class BitslicedFLFSR(BaseObject):
     """
-    An implementation of an FLFSR using an internal bitstring rather than an integer.
+    An implementation of an FLFSR addressed by bit position like a bitstring (position 0 is the oldest bit).
+    Internally, the register is an integer where position `p` is stored in bit `length` - `p` - 1.
     """
 
     def __init__(self, length: int, clock_bit: int, taps: list, seed: int=0):
@@ -14,11 +16,28 @@ class BitslicedFLFSR(BaseObject):
             taps     (list): Positional taps used to determine the next bit.
             seed      (int): Inital state represented as an integer.
         """
-        self.state = bin(seed)[2:].zfill(length)
-        self.length = length
+        self.length    = length
         self.clock_bit = clock_bit
-        self.taps = taps
+        self.taps      = taps
+        self.register  = seed & ((1 << length) - 1)
 
+        self._mask       = (1 << length) - 1
+        self._tap_mask   = sum(1 << tap for tap in set(taps))
+        self._value_bit  = length - 1
+        self._clock_bit  = length - clock_bit - 1
+
+
+    def __reprdir__(self):
+        return ['state', 'length', 'clock_bit', 'taps']
+
+
+    @property
+    def state(self) -> str:
+        return bin(self.register)[2:].zfill(self.length)
+
+    @state.setter
+    def state(self, value: str):
+        self.register = int(value, 2)
 
 
     def mix_state(self, in_val: bytes, size: int):
@@ -42,13 +61,22 @@ class BitslicedFLFSR(BaseObject):
         Parameters:
             bit (int): (Optional) Value to XOR'd in with the next bit.
         """
-        for tap in self.taps:
-            position = self.length - tap - 1
-            bit ^= int(self.state[position])
+        bit ^= parity(self.register & self._tap_mask)
+        self.register = ((self.register << 1) | bit) & self._mask
 
-        self.state += '0'
-        self.state = self.state[1:]
-        self.state = (self.state[:self.length - 1] + str(bit))
+
+    def jump(self, num_clocks: int):
+        """
+        Advances the FLFSR by `num_clocks` clocks (without input) in O(log(`num_clocks`)) operations.
+
+        Parameters:
+            num_clocks (int): Number of clocks.
+        """
+        # The newest bit is the least significant, so the recurrence window is the reversed register
+        n    = self.length
+        lfsr = WordLFSR(n, [n - tap - 1 for tap in self.taps], seed=reverse_bits(self.register, n))
+        lfsr.jump(num_clocks)
+        self.register = reverse_bits(lfsr.state, n)
 
 
     def value(self) -> int:
@@ -58,7 +86,7 @@ class BitslicedFLFSR(BaseObject):
         Returns:
             int: Current value.
         """
-        return int(self.state[0])
+        return (self.register >> self._value_bit) & 1
 
 
     def clock_value(self) -> int:
@@ -68,7 +96,7 @@ class BitslicedFLFSR(BaseObject):
         Returns:
             int: Clock value.
         """
-        return int(self.state[self.clock_bit])
+        return (self.register >> self._clock_bit) & 1
 
 
 
@@ -5,6 +5,171 @@ from samson.utilities.runtime import RUNTIME
 from samson.core.base_object import BaseObject
 import random
 
+# Backdoor recovery uses raw Jacobian arithmetic on integers; `None` is the point at infinity
+_WINDOW_BITS = 4
+
+
+def _jacobian_double(P: tuple, a: int, p: int) -> tuple:
+    if P is None:
+        return None
+
+    X, Y, Z = P
+    if not Y:
+        return None
+
+    YY = Y*Y % p
+    ZZ = Z*Z % p
+    S  = 4*X*YY % p
+
+    # NIST curves have a = -3, which saves a squaring
+    if a == p - 3:
+        M = 3*(X - ZZ)*(X + ZZ) % p
+    else:
+        M = (3*X*X + a*ZZ*ZZ) % p
+
+    X3 = (M*M - 2*S) % p
+    Y3 = (M*(S - X3) - 8*YY*YY) % p
+    return X3, Y3, 2*Y*Z % p
+
+
+def _jacobian_add(P: tuple, Q: tuple, a: int, p: int) -> tuple:
+    if P is None:
+        return Q
+
+    if Q is None:
+        return P
+
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+
+    Z1Z1 = Z1*Z1 % p
+    Z2Z2 = Z2*Z2 % p
+    U1   = X1*Z2Z2 % p
+    U2   = X2*Z1Z1 % p
+    S1   = Y1*Z2*Z2Z2 % p
+    S2   = Y2*Z1*Z1Z1 % p
+    H    = (U2 - U1) % p
+    R    = (S2 - S1) % p
+
+    if not H:
+        return _jacobian_double(P, a, p) if not R else None
+
+    HH  = H*H % p
+    HHH = H*HH % p
+    V   = U1*HH % p
+    X3  = (R*R - HHH - 2*V) % p
+    Y3  = (R*(V - X3) - S1*HHH) % p
+    return X3, Y3, H*Z1*Z2 % p
+
+
+def _batch_affine_x(points: list, p: int) -> list:
+    # Montgomery's trick: a single inversion converts the whole batch
+    prefix = [1]
+    for point in points:
+        prefix.append(prefix[-1] * (point[2] if point else 1) % p)
+
+    inv    = mod_inv(prefix[-1], p)
+    x_vals = [None]*len(points)
+
+    for i in reversed(range(len(points))):
+        point = points[i]
+        if point:
+            z_inv     = prefix[i] * inv % p
+            inv       = inv * point[2] % p
+            x_vals[i] = point[0] * z_inv * z_inv % p
+
+    return x_vals
+
+
+def _window_digits(scalar: int) -> list:
+    digits = []
+    while scalar:
+        digits.append(scalar & (2**_WINDOW_BITS-1))
+        scalar >>= _WINDOW_BITS
+
+    return digits[::-1]
+
+
+def _window_mul(P: tuple, digits: list, a: int, p: int) -> tuple:
+    table = [None, P]
+    for _ in range(2**_WINDOW_BITS-2):
+        table.append(_jacobian_add(table[-1], P, a, p))
+
+    result = None
+    for digit in digits:
+        for _ in range(_WINDOW_BITS):
+            result = _jacobian_double(result, a, p)
+
+        result = _jacobian_add(result, table[digit], a, p)
+
+    return result
+
+
+def _scalar_mul_x(P: WeierstrassPoint, scalar: int) -> int:
+    curve = P.curve
+    p     = curve.p
+    x     = _batch_affine_x([_window_mul((int(P.x), int(P.y), 1), _window_digits(scalar), int(curve.a), p)], p)[0]
+    return x or 0
+
+
+def _fixed_base_table(Q: WeierstrassPoint, bits: int) -> list:
+    # table[i][j] = j * 2^(w*i) * Q, so multiplication only needs one addition per window
+    a, p  = int(Q.curve.a), Q.curve.p
+    base  = (int(Q.x), int(Q.y), 1)
+    table = []
+
+    for _ in range(-(-bits // _WINDOW_BITS)):
+        row = [None, base]
+        for _ in range(2**_WINDOW_BITS-2):
+            row.append(_jacobian_add(row[-1], base, a, p))
+
+        table.append(row)
+
+        for _ in range(_WINDOW_BITS):
+            base = _jacobian_double(base, a, p)
+
+    return table
+
+
+def _fixed_base_mul(table: list, scalar: int, a: int, p: int) -> tuple:
+    result = None
+    for row in table:
+        result  = _jacobian_add(result, row[scalar & (2**_WINDOW_BITS-1)], a, p)
+        scalar >>= _WINDOW_BITS
+
+    return result
+
+
+def _sqrt_mod(n: int, p: int) -> int:
+    if p % 4 == 3:
+        y = pow(n, (p + 1) // 4, p)
+        return y if y*y % p == n else None
+
+    from samson.math.algebra.rings.integer_ring import ZZ
+
+    y = (ZZ/ZZ(p))(n)
+    return int(y.sqrt()) if y.is_square() else None
+
+
+def _search_backdoor_states(params: tuple) -> list:
+    a, b, p, d_digits, Q_table, r1, r2, start, stop = params
+
+    # Lift every candidate x-coordinate; R and -R lead to the same state, so either root works
+    points = []
+    for i in range(start, stop):
+        x   = (i << 240) | r1
+        rhs = (x*x*x + a*x + b) % p
+        y   = _sqrt_mod(rhs, p)
+
+        if y is not None:
+            points.append(_window_mul((x, y, 1), d_digits, a, p))
+
+    states  = _batch_affine_x(points, p)
+    outputs = _batch_affine_x([_fixed_base_mul(Q_table, s, a, p) for s in states], p)
+
+    return [s for s, r in zip(states, outputs) if r is not None and int.to_bytes(r, 32, 'big')[2:2 + len(r2)] == r2]
+
+
 class DualEC(BaseObject):
     """
     Implementation of the NSA's backdoored DRBG.
@@ -31,9 +196,9 @@ class DualEC(BaseObject):
         Returns:
             int: Next pseudorandom output.
         """
-        s = int((self.t * self.P).x)
+        s = _scalar_mul_x(self.P, self.t)
         self.t = s
-        self.r = int((s * self.Q).x)
+        self.r = _scalar_mul_x(self.Q, s)
 
         return Bytes(int.to_bytes(self.r, 32, 'big')).zfill(32)[2:]
 
@@ -59,15 +224,22 @@ class DualEC(BaseObject):
 
     @classmethod
     @RUNTIME.report
-    def derive_from_backdoor(cls: object, P: WeierstrassPoint, Q: WeierstrassPoint, d: int, observed_out: bytes) -> list:
+    def derive_from_backdoor(cls: object, P: WeierstrassPoint, Q: WeierstrassPoint, d: int, observed_out: bytes, processes: int=1) -> list:
         """
         Recovers the internal state of a Dual EC generator and builds a replica.
 
+        The 16 truncated bits of the first output are searched in batches: each batch lifts its x-coordinates with
+        modular square roots, multiplies by `d` using a precomputed window decomposition, and checks the next output
+        against a fixed-base table of `Q`. Batches are spread across `processes`, and the search stops at the first match
+        if `observed_out` contains more than two bytes of the second output (otherwise false positives are likely and all
+        matches are returned).
+
         Parameters:
             P (WeierstrassPoint): Elliptical curve point `P`.
             Q (WeierstrassPoint): Elliptical curve point `Q`.
             d              (int): Backdoor that relates Q to P.
             observed_out (bytes): Observed output from the compromised Dual EC generator.
+            processes      (int): Number of worker processes.
 
         Returns:
             list: List of possible internal states.
@@ -75,24 +247,28 @@ class DualEC(BaseObject):
         assert len(observed_out) >= 30
 
         curve = P.curve
+        a, b  = int(curve.a), int(curve.b)
+        p     = curve.p
+
+        r1 = int.from_bytes(observed_out[:30], 'big')
+        r2 = bytes(observed_out[30:])
 
-        r1 = observed_out[:30]
-        r2 = observed_out[30:]
+        first_only = len(r2) > 2
+        d_digits   = _window_digits(d % curve.G.order())
+        Q_table    = _fixed_base_table(Q, curve.cardinality().bit_length())
 
-        possible_states = []
-        Q_cache         = Q.cache_mul(curve.cardinality().bit_length())
+        batch  = max(2**16 // (processes*16), 1)
+        params = [(a, b, p, d_digits, Q_table, r1, r2, start, start + batch) for start in range(0, 2**16, batch)]
 
-        for i in RUNTIME.report_progress(range(2**16), desc='Statespace searched', unit='states'):
-            test_r1 = int.to_bytes(i, 2, 'big') + r1
-            test_x  = int.from_bytes(test_r1, 'big')
-            try:
-                R  = curve(test_x)
-                dR = d * R
-                test_r2 = Q_cache * int(dR.x)
+        if processes == 1:
+            results = []
+            for param in RUNTIME.report_progress(params, desc='Statespace searched', unit='batches'):
+                results.append(_search_backdoor_states(param))
 
-                if int.to_bytes(int(test_r2.x), 32, 'big')[2:2 + len(r2)] == r2:
-                    possible_states.append(DualEC(P, Q, int(dR.x)))
-            except AssertionError:
-                pass
+                if first_only and results[-1]:
+                    break
+        else:
+            terminate_filter = (lambda results: bool(results[-1])) if first_only else None
+            results = RUNTIME.parallel(processes, terminate_filter=terminate_filter)(_search_backdoor_states)(params)
 
-        return possible_states
+        return [DualEC(P, Q, s) for states in results for s in states]
@@ -1,6 +1,7 @@
 from samson.math.polynomial import Polynomial
 from samson.math.general import poly_to_int
 from samson.prngs.glfsr import GLFSR
+from samson.prngs.word_lfsr import WordLFSR, parity, reverse_bits
 
 class FLFSR(GLFSR):
     """
@@ -52,13 +53,36 @@ class FLFSR(GLFSR):
         """
         self.state <<= 1
 
-        lsb = sum([int(bit) for bit in bin(self.state & self.polynomial)[2:]]) % 2
-        self.state |= lsb
+        self.state |= parity(self.state & self.polynomial)
         self.state &= 0xFFFFFFFFFFFFFFFF
         return self.state & 1
 
 
 
+    def jump(self, num_clocks: int):
+        """
+        Advances the FLFSR by `num_clocks` clocks in O(log(`num_clocks`)) polynomial operations.
+
+        Parameters:
+            num_clocks (int): Number of clocks.
+        """
+        degree = self.polynomial.bit_length() - 1
+
+        # The 64-bit state holds older outputs than the recurrence needs; they're only
+        # outputs of the recurrence once 64 clocks have passed
+        if num_clocks < 64 or not 0 < degree <= 64:
+            for _ in range(num_clocks):
+                self.clock()
+            return
+
+        # The newest output is the least significant bit, so the recurrence window is the reversed state
+        taps = [degree - j for j in range(1, degree+1) if (self.polynomial >> j) & 1]
+        lfsr = WordLFSR(degree, taps, seed=reverse_bits(self.state, degree))
+        lfsr.jump(num_clocks - 64 + degree)
+        self.state = reverse_bits(lfsr.generate_bits(64), 64)
+
+
+
     def reverse_clock(self, output: int):
         """
         Clocks the state in reverse given the previous output.
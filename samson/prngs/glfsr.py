@@ -3,6 +3,7 @@ from samson.math.general import berlekamp_massey
 from samson.math.general import poly_to_int
 from samson.core.base_object import BaseObject
 from samson.core.metadata import CrackingDifficulty
+from samson.prngs.word_lfsr import gf2_mulmod, gf2_x_powmod
 
 class GLFSR(BaseObject):
     """
@@ -70,6 +71,23 @@ class GLFSR(BaseObject):
 
 
 
+    def jump(self, num_clocks: int):
+        """
+        Advances the GLFSR by `num_clocks` clocks in O(log(`num_clocks`)) polynomial operations.
+        Each clock multiplies the state by x modulo the polynomial.
+
+        Parameters:
+            num_clocks (int): Number of clocks.
+        """
+        if num_clocks <= 0:
+            return
+
+        # The first clock shifts out the top bit of an unreduced seed
+        state = self.state & (self.mask - 1)
+        self.state = gf2_mulmod(state, gf2_x_powmod(num_clocks, self.polynomial), self.polynomial) if state else 0
+
+
+
     def reverse_clock(self, output: int):
         """
         Clocks the state in reverse given the previous output.
@@ -1,13 +1,91 @@
 from samson.math.general import gcd, mod_inv, is_power_of_two, is_prime, is_primitive_root
 from samson.math.factorization.general import factor as factorint
 from samson.math.matrix import Matrix
+from samson.math.lattice_reduction import IntegerGSO
 from samson.utilities.exceptions import SearchspaceExhaustedException
 from samson.utilities.runtime import RUNTIME
 from samson.core.primitives import BasePRNG
 from samson.core.metadata import CrackingDifficulty, SizeSpec, SizeType
+from itertools import product
 import functools
 
 
+def truncated_lcg_candidates(targets: list, multiplier: int, modulus: int, bound: int, num_neighbors: int=3) -> list:
+    """
+    Finds candidates for `x` such that `multiplier`^i * `x` is within `bound` of `targets`[i] (mod `modulus`) for every `i`.
+    Kannan's embedding of the targets into the lattice of (x, a*x, a^2*x, ...) mod `modulus` is LLL-reduced with integer
+    arithmetic; the reduced rows containing the embedding are combined with the `num_neighbors` shortest lattice
+    vectors to enumerate nearby candidates.
+
+    Parameters:
+        targets      (list): Approximations of `multiplier`^i * `x` (mod `modulus`).
+        multiplier    (int): Multiplier.
+        modulus       (int): Modulus.
+        bound         (int): Bound on the approximation errors.
+        num_neighbors (int): Number of short lattice vectors to combine with each solution.
+
+    Returns:
+        list: Candidates for `x` (mod `modulus`).
+
+    Examples:
+        >>> from samson.prngs.lcg import truncated_lcg_candidates
+        >>> a, m, x = 0x5DEECE66D, 2**48, 0x123456789AB
+        >>> targets = [(pow(a, i, m)*x >> 16) << 16 | 2**15 for i in range(4)]
+        >>> x in truncated_lcg_candidates(targets, a, m, 2**15)
+        True
+
+    References:
+        "Reconstructing Truncated Integer Variables Satisfying Linear Congruences" (https://www.math.cmu.edu/~af1p/Texfiles/RECONTRUNC.pdf)
+    """
+    n     = len(targets)
+    bound = max(bound, 1)
+    basis = [[pow(multiplier, i, modulus) for i in range(n)] + [0]]
+
+    for i in range(1, n):
+        basis.append([0]*i + [modulus] + [0]*(n-i))
+
+    basis.append([t % modulus for t in targets] + [bound])
+
+    gso = IntegerGSO(basis)
+    gso.lll()
+
+    embedded  = [row for row in gso.B if abs(row[-1]) == bound]
+    neighbors = [row for row in gso.B if not row[-1]][:num_neighbors]
+
+    candidates = set()
+    for row in embedded:
+        sign = 1 if row[-1] > 0 else -1
+
+        for coeffs in product((-1, 0, 1), repeat=len(neighbors)):
+            error = sign*row[0] + sum(c*neighbor[0] for c, neighbor in zip(coeffs, neighbors))
+            candidates.add((targets[0] - error) % modulus)
+
+    return list(candidates)
+
+
+def _lcg_matches(states: list, outputs: list, multiplier: int, increment: int, modulus: int, trunc_amount: int) -> list:
+    # Verifies all candidate states in lockstep, dropping mismatches as early as possible
+    for output in outputs:
+        states = [state for state in states if state >> trunc_amount == output]
+        states = [(multiplier*state + increment) % modulus for state in states]
+
+    return states
+
+
+def _sweep_increments(params: tuple) -> list:
+    first, diff, outputs, multiplier, modulus, trunc_amount, start, stop = params
+    results = []
+
+    for z in range(start, stop):
+        x_0 = (first << trunc_amount) + z
+        c   = (x_0 + diff - multiplier*x_0) % modulus
+
+        if _lcg_matches([x_0], outputs, multiplier, c, modulus, trunc_amount):
+            results.append((x_0, c))
+
+    return results
+
+
 class LCG(BasePRNG):
     """
     Linear congruential generator of the form `(a*X + c) mod m`.
@@ -155,16 +233,20 @@ class LCG(BasePRNG):
 
     @classmethod
     @RUNTIME.report
-    def crack_truncated(cls: object, outputs: list, outputs_to_predict: list, multiplier: int, increment: int, modulus: int, trunc_amount: int) -> 'LCG':
+    def crack_truncated(cls: object, outputs: list, outputs_to_predict: list, multiplier: int, increment: int, modulus: int, trunc_amount: int, processes: int=1) -> 'LCG':
         """
-        Given a decent number of truncated states (about 200 when there's only 3-bit outputs), returns a replica LCG.
+        Given a few truncated states, returns a replica LCG. The states are recovered by lattice reduction and all nearby
+        candidates are verified against `outputs` and `outputs_to_predict`. If `increment` is unknown (None), it's recovered by
+        sweeping the truncated bits of the first state across `processes` workers.
 
         Parameters:
             outputs            (list): List of truncated-state outputs (in order).
             outputs_to_predict (list): Next few outputs to compare against. Accuracy/number of samples trade-off.
             multiplier          (int): The LCG's multiplier.
-            increment           (int): The LCG's increment.
+            increment           (int): The LCG's increment (None if unknown).
             modulus             (int): The LCG's modulus.
+            trunc_amount        (int): Number of truncated bits.
+            processes           (int): Number of worker processes for the increment sweep.
 
         Returns:
             LCG: Replica LCG that predicts all future outputs of the original.
@@ -177,55 +259,56 @@ class LCG(BasePRNG):
             outputs_to_predict = outputs[-2:]
             outputs = outputs[:-2]
 
-        # Trivial case
-        if increment == 0:
-            computed_seed = LCG.solve_tlcg(outputs + outputs_to_predict, multiplier, modulus, trunc_amount)
+        all_outputs = outputs + outputs_to_predict
+        half        = (1 << trunc_amount) >> 1
+        a, m        = multiplier, modulus
+
+        if increment is not None:
+            # X_i - c_i = a^i * X_0 (mod m) where c_i is the accumulated increment
+            targets, c_i = [], 0
+            for output in outputs:
+                targets.append((output << trunc_amount) + half - c_i)
+                c_i = (a*c_i + increment) % m
 
-            # Here we take the second to last seed since our implementation edits the state BEFORE it returns
-            return LCG((multiplier * computed_seed[-2]) % modulus, multiplier, increment, modulus, trunc=trunc_amount)
+            candidates = [(x_0, increment) for x_0 in truncated_lcg_candidates(targets, a, m, half)]
 
         else:
-            diffs      = [o2 - o1 for o1, o2 in zip(outputs, outputs[1:])]
-            seed_diffs = LCG.solve_tlcg(diffs, multiplier, modulus, trunc_amount)
-            seed_diffs = [int(seed_diff) % modulus for row in seed_diffs for seed_diff in row]
+            # Differences cancel out the increment: X_{i+1} - X_i = a^i * (X_1 - X_0) (mod m)
+            diffs = [(o2 - o1) << trunc_amount for o1, o2 in zip(outputs, outputs[1:])]
+            candidates = []
 
-            # Bruteforce low bits
-            for z in RUNTIME.report_progress(range(2 ** trunc_amount), desc='Seedspace searched', unit='seeds'):
-                x_0 = (outputs[0] << trunc_amount) + z
-                x_1 = (seed_diffs[0] + x_0) % modulus
+            for diff in truncated_lcg_candidates(diffs, a, m, 1 << trunc_amount):
+                chunk  = max(2**trunc_amount // (processes*4), 1)
+                params = [(outputs[0], diff, all_outputs, a, m, trunc_amount, z, min(z + chunk, 2**trunc_amount)) for z in range(0, 2**trunc_amount, chunk)]
 
-                if increment is None:
-                    computed_c = (x_1 - multiplier * x_0) % modulus
+                if processes == 1:
+                    results = [_sweep_increments(param) for param in params]
                 else:
-                    computed_c = increment
-
-                computed_x_2 = (multiplier * x_1 + computed_c) % modulus
-                actual_x_2   = (seed_diffs[1] + x_1) % modulus
-
-                if computed_x_2 == actual_x_2:
-                    computed_seeds = [x_0]
+                    results = RUNTIME.parallel(processes)(_sweep_increments)(params)
 
-                    for diff in seed_diffs:
-                        computed_seeds.append((diff + computed_seeds[-1]) % modulus)
+                candidates.extend([result for chunk_results in results for result in chunk_results])
 
 
-                    # It's possible to find a spectrum of nearly-equivalent LCGs.
-                    # The accuracy of `predicted_lcg` is dependent on the size of `outputs_to_predict` and the
-                    # parameters of the LCG.
-                    predicted_seed = (multiplier * computed_seeds[-2] + computed_c) % modulus
-                    predicted_lcg  = LCG(X=int(predicted_seed), a=multiplier, c=int(computed_c), m=modulus, trunc=trunc_amount)
+        # It's possible to find a spectrum of nearly-equivalent LCGs when the increment is unknown.
+        # The accuracy of the replica is dependent on the size of `outputs_to_predict` and the
+        # parameters of the LCG.
+        for x_0, c in candidates:
+            if _lcg_matches([x_0], all_outputs, a, c, m, trunc_amount):
+                # Synchronize to the state of the last output
+                x_n = x_0
+                for _ in range(len(all_outputs) - 1):
+                    x_n = (a*x_n + c) % m
 
-                    if [predicted_lcg.generate() for _ in range(len(outputs_to_predict))] == outputs_to_predict:
-                        return predicted_lcg
+                return LCG(X=x_n, a=a, c=c, m=m, trunc=trunc_amount)
 
-            raise SearchspaceExhaustedException('Seedspace exhausted')
+        raise SearchspaceExhaustedException('Seedspace exhausted')
 
 
 
     @staticmethod
     def solve_tlcg(outputs: list, multiplier: int, modulus: int, trunc_amount: int) -> Matrix:
         """
-        Used internally by `crack_truncated`. Uses the LLL algorithm to find seed differentials.
+        Uses the LLL algorithm to find seed differentials. See `truncated_lcg_candidates` for the embedding used by `crack_truncated`.
 
         Parameters:
             outputs   (list): List of truncated-state outputs (in order).
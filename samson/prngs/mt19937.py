@@ -1,5 +1,8 @@
 from samson.core.metadata import CrackingDifficulty, SizeType, SizeSpec
-from samson.utilities.bytes import Bytes
+from samson.utilities.exceptions import NoSolutionException
+from samson.math.gf2_system import GF2LinearSystem, LinearWord
+from samson.auxiliary.chain_table import ChainTable
+from samson.utilities.runtime import RUNTIME
 from samson.core.primitives import BasePRNG
 
 w, n, m, r = (32, 624, 397, 31)
@@ -70,6 +73,103 @@ def untemper(y):
 
 
 
+def _init_genrand(seed: int, length: int=n) -> list:
+    mt = [seed & d]
+    for i in range(1, length):
+        prev = mt[-1]
+        mt.append((f * (prev ^ (prev >> 30)) + i) & d)
+
+    return mt
+
+
+def first_outputs(seed: int, count: int=1, seed_type: str='mt19937') -> list:
+    """
+    Computes the first outputs of a freshly seeded MT19937. The first `n` - `m` outputs of the twist only depend on
+    the first `m` + `count` words of the seeded state, so neither the full state nor the full twist is computed.
+    This doesn't apply to 'python' seeds: every word of `init_by_array`'s state depends on the whole state, so it's fully seeded.
+
+    Parameters:
+        seed      (int): Seed.
+        count     (int): Number of outputs.
+        seed_type (str): Either 'mt19937' (`init_genrand`) or 'python' (`random.seed`).
+
+    Returns:
+        list: Outputs.
+
+    Examples:
+        >>> from samson.prngs.mt19937 import MT19937, first_outputs
+        >>> mt = MT19937(5489)
+        >>> first_outputs(5489, 3) == [mt.generate() for _ in range(3)]
+        True
+
+    """
+    if seed_type == 'python':
+        mt = MT19937.python_seed(seed).state
+    elif seed_type == 'mt19937':
+        mt = _init_genrand(seed, min(m + count, n))
+    else:
+        raise ValueError(f"Unknown seed type '{seed_type}'")
+
+    if count > n - m:
+        prng = MT19937(0)
+        prng.state = mt
+        return [prng.generate() for _ in range(count)]
+
+    outputs = []
+    for k in range(count):
+        y = (mt[k] & 0x80000000) | (mt[k + 1] & 0x7fffffff)
+        outputs.append(temper(mt[k + m] ^ (y >> 1) ^ (MAGIC if y & 1 else 0)))
+
+    return outputs
+
+
+
+def _sweep_seeds(params: tuple) -> int:
+    outputs, seed_type, bits, start, stop = params
+    shift = w - bits
+    first = outputs[0]
+
+    for seed in range(start, stop):
+        if first_outputs(seed, 1, seed_type)[0] >> shift == first and [out >> shift for out in first_outputs(seed, len(outputs), seed_type)] == outputs:
+            return seed
+
+    return None
+
+
+def _index_seeds(params: tuple) -> bytes:
+    seed_type, start, stop = params
+    chains = [(seed, first_outputs(seed, 1, seed_type)[0]) for seed in range(start, stop)]
+    return ChainTable.from_chains(chains, w, 1, unique=False).serialize()
+
+
+@RUNTIME.global_cache(1)
+def _python_base_state_cached() -> tuple:
+    return tuple(_init_genrand(19650218))
+
+
+def _python_base_state() -> list:
+    return list(_python_base_state_cached())
+
+
+def _symbolic_twist(state: list) -> list:
+    state = state[:]
+
+    for i in range(n):
+        y = (state[i] & 0x80000000) ^ (state[(i + 1) % n] & 0x7fffffff)
+        state[i] = state[(i + m) % n] ^ (y >> 1) ^ LinearWord.select(MAGIC, y[0], w)
+
+    return state
+
+
+def _symbolic_temper(y: LinearWord) -> LinearWord:
+    y ^= (y >> u)
+    y ^= (y << s) & b
+    y ^= (y << t) & c
+    y ^= (y >> l)
+    return y
+
+
+
 # Implementation of MT19937
 class MT19937(BasePRNG):
     """
@@ -196,9 +296,166 @@ class MT19937(BasePRNG):
         return cloned
 
 
+    @staticmethod
+    def crack_partial(outputs: list, bits: int=32) -> 'MT19937':
+        """
+        Cracks the internal state from truncated outputs (e.g. Python's `random.getrandbits(bits)`) by solving the
+        GF(2) linear system relating the observed bits to the state. Somewhat more than 19968/`bits` outputs are required.
+
+        Parameters:
+            outputs (list): Consecutive outputs truncated to their `bits` most significant bits. Unobserved outputs may be `None`.
+            bits     (int): Number of observed bits per output.
+
+        Returns:
+            MT19937: A replica of the original MT19937 (synchronized to after the last output).
+
+        Examples:
+            >>> import random
+            >>> from samson.prngs.mt19937 import MT19937
+            >>> outputs = [random.getrandbits(16) for _ in range(1400)]
+            >>> mt = MT19937.crack_partial(outputs, bits=16)
+            >>> [mt.generate() >> 16 for _ in range(5)] == [random.getrandbits(16) for _ in range(5)]
+            True
+
+        """
+        shift  = w - bits
+        mask   = ((1 << bits) - 1) << shift
+        state  = [LinearWord.variables(w, w*i) for i in range(n)]
+        system = GF2LinearSystem(w*n)
+
+        # The low 31 bits of the first word never affect the outputs
+        max_rank = w*n - (w - 1)
+        idx      = n
+
+        for output in outputs:
+            if idx >= n:
+                state = _symbolic_twist(state)
+                idx   = 0
+
+            if output is not None:
+                for form, value in _symbolic_temper(state[idx]).equations(output << shift, mask):
+                    system.add_equation(form, value)
+
+            idx += 1
+
+            if system.rank == max_rank:
+                break
+
+
+        if system.rank < max_rank:
+            raise NoSolutionException(f"Not enough outputs to determine the state (rank {system.rank}/{max_rank})")
+
+        solution = system.solve()
+        cloned   = MT19937(0)
+        cloned.state = [(solution >> (w*i)) & d for i in range(n)]
+
+        for output in outputs:
+            if output is not None and cloned.generate() >> shift != output:
+                raise NoSolutionException("Outputs are inconsistent")
+
+            elif output is None:
+                cloned.generate()
+
+        return cloned
+
+
+    @staticmethod
+    def recover_seed(outputs: list, seed_type: str='mt19937', bits: int=32, start: int=0, stop: int=2**32, processes: int=None, index: ChainTable=None) -> int:
+        """
+        Recovers the 32-bit seed of an MT19937 from its first outputs. Seeds are swept across `processes` workers using
+        only the first words of the seeded state; alternatively, candidates are looked up in a precomputed `index`.
+
+        Parameters:
+            outputs   (list): First outputs after seeding truncated to their `bits` most significant bits.
+            seed_type  (str): Either 'mt19937' (`init_genrand`) or 'python' (`random.seed`).
+            bits       (int): Number of observed bits per output.
+            start      (int): First seed to try.
+            stop       (int): Seed to stop at (exclusive).
+            processes  (int): Number of worker processes. Defaults to one.
+            index (ChainTable): (Optional) Index built by `build_seed_index` (requires `bits` = 32).
+
+        Returns:
+            int: Seed.
+
+        Examples:
+            >>> from samson.prngs.mt19937 import MT19937
+            >>> mt = MT19937(1337)
+            >>> MT19937.recover_seed([mt.generate() for _ in range(2)], start=1000, stop=2000)
+            1337
+
+        """
+        outputs = list(outputs)
+
+        if index is not None:
+            if bits != w:
+                raise ValueError("Seed indices require full outputs")
+
+            for seed in index.find(outputs[0]):
+                if first_outputs(seed, len(outputs), seed_type) == outputs:
+                    return seed
+
+            raise NoSolutionException("Seed not in index")
+
+
+        # Small tasks let the sweep stop soon after a hit
+        processes = processes or 1
+        chunk     = min(max(-(-(stop - start) // processes), 1), 2**20)
+        params    = [(outputs, seed_type, bits, i, min(i + chunk, stop)) for i in range(start, stop, chunk)]
+
+        if processes == 1:
+            results = (_sweep_seeds(param) for param in params)
+        else:
+            results = RUNTIME.parallel(processes, chunk_size=1, terminate_filter=lambda results: results[-1] is not None)(_sweep_seeds)(params)
+
+        for seed in results:
+            if seed is not None:
+                return seed
+
+        raise NoSolutionException("Seed not in range")
+
+
+    @staticmethod
+    def build_seed_index(start: int=0, stop: int=2**32, seed_type: str='mt19937', processes: int=None, filepath: str=None) -> ChainTable:
+        """
+        Builds a table mapping the first output to its seeds for O(log n) seed recovery. The table is sorted by
+        output, so it can be saved to `filepath` and later memory-mapped with `ChainTable.load`.
+
+        Parameters:
+            start      (int): First seed to index.
+            stop       (int): Seed to stop at (exclusive).
+            seed_type  (str): Either 'mt19937' (`init_genrand`) or 'python' (`random.seed`).
+            processes  (int): Number of worker processes. Defaults to one.
+            filepath   (str): (Optional) Path to save the index to.
+
+        Returns:
+            ChainTable: Index where the endpoints are first outputs and the start points are seeds.
+        """
+        processes = processes or 1
+        chunk     = max(-(-(stop - start) // processes), 1)
+        params    = [(seed_type, i, min(i + chunk, stop)) for i in range(start, stop, chunk)]
+
+        if processes == 1:
+            results = [_index_seeds(param) for param in params]
+        else:
+            results = RUNTIME.parallel(processes)(_index_seeds)(params)
+
+        index = ChainTable.from_chains([], w, 1)
+        for result in results:
+            index = index.merge(ChainTable.deserialize(result), unique=False)
+
+        if filepath:
+            index.save(filepath)
+
+        return index
+
+
     @staticmethod
     def init_by_array(init_key: list) -> 'MT19937':
-        prng       = MT19937(19650218)
+        # Skip reseeding with the constant 19650218 by copying its cached state
+        prng       = MT19937.__new__(MT19937)
+        prng.seed  = 19650218
+        prng.index = n
+        prng.state = _python_base_state()
         mt         = prng.state
         key_length = len(init_key)
 
@@ -230,4 +487,6 @@ class MT19937(BasePRNG):
 
     @staticmethod
     def python_seed(seed: int) -> 'MT19937':
-        return MT19937.init_by_array([b.change_byteorder().int() for b in Bytes(seed, 'little').pad_congruent_left(4).chunk(4)])
+        # CPython splits the absolute value of the seed into 32-bit words, least significant first
+        seed = abs(seed)
+        return MT19937.init_by_array([(seed >> (w*i)) & d for i in range(max(-(-seed.bit_length() // w), 1))])
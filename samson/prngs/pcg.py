@@ -1,4 +1,6 @@
-from samson.utilities.manipulation import right_rotate
+from samson.utilities.manipulation import right_rotate, left_rotate
+from samson.utilities.exceptions import SearchspaceExhaustedException
+from samson.utilities.runtime import RUNTIME
 from samson.core.base_object import BaseObject
 from samson.math.general import mod_inv
 from types import FunctionType
@@ -11,6 +13,40 @@ def V32_64_XSH_RR(x, mult, inc):
     return state, right_rotate((x >> 27) & 0xFFFFFFFF, count)
 
 
+def _xsh_rr_high_bits(output: int, count: int) -> int:
+    # Undoes the rotation and xorshift, recovering bits 27..63 of the state for a guessed rotation `count`
+    v    = left_rotate(output, count)
+    high = count << 32
+
+    for j in range(58, 26, -1):
+        high |= (((v >> (j-27)) & 1) ^ ((high >> (j-9)) & 1)) << (j-27)
+
+    return high
+
+
+def _crack_xsh_rr(params: tuple) -> list:
+    from samson.prngs.lcg import truncated_lcg_candidates
+
+    count, outputs, multiplier, increment = params
+    mask    = 0xFFFFFFFFFFFFFFFF
+    high_0  = _xsh_rr_high_bits(outputs[0], count)
+    results = []
+
+    for count_1 in range(32):
+        high_1  = _xsh_rr_high_bits(outputs[1], count_1)
+        targets = [(high_0 << 27) + 2**26, ((high_1 << 27) + 2**26 - increment) & mask]
+        states  = truncated_lcg_candidates(targets, multiplier, 2**64, 2**26)
+
+        # Verify all candidates against each output in lockstep
+        for output in outputs:
+            states = [state for state in states if V32_64_XSH_RR(state, multiplier, increment)[1] == output]
+            states = [(state*multiplier + increment) & mask for state in states]
+
+        results.extend(states)
+
+    return results
+
+
 
 # https://en.wikipedia.org/wiki/Permuted_congruential_generator
 class PCG(BaseObject):
@@ -40,6 +76,49 @@ class PCG(BaseObject):
         return result
 
 
+    @staticmethod
+    def crack(outputs: list, multiplier: int, increment: int, processes: int=1) -> 'PCG':
+        """
+        Recovers the state of a `V32_64_XSH_RR` PCG from at least three consecutive outputs. The rotations of the
+        first two outputs are guessed, which reveals the top 37 bits of their states, and the remaining bits are recovered
+        by lattice reduction. The guesses are split across `processes` workers.
+
+        Parameters:
+            outputs    (list): Consecutive outputs.
+            multiplier  (int): Multiplier.
+            increment   (int): Increment.
+            processes   (int): Number of worker processes.
+
+        Returns:
+            PCG: Replica PCG synchronized after `outputs`.
+
+        Examples:
+            >>> from samson.prngs.pcg import PCG
+            >>> pcg     = PCG(seed=0x4d595df4d0f33173, multiplier=6364136223846793005, increment=1442695040888963407)
+            >>> outputs = [pcg.generate() for _ in range(4)]
+            >>> PCG.crack(outputs, pcg.multiplier, pcg.increment).generate() == pcg.generate()
+            True
+
+        References:
+            "Practical seed-recovery for the PCG Pseudo-Random Number Generator" (https://doi.org/10.13154/tosc.v2020.i3.175-196)
+        """
+        if len(outputs) < 3:
+            raise ValueError("At least three outputs are required")
+
+        params = [(count, outputs, multiplier, increment) for count in range(32)]
+
+        if processes == 1:
+            results = [_crack_xsh_rr(param) for param in params]
+        else:
+            results = RUNTIME.parallel(processes)(_crack_xsh_rr)(params)
+
+        for states in results:
+            if states:
+                return PCG(seed=states[0], multiplier=multiplier, increment=increment)
+
+        raise SearchspaceExhaustedException('Seedspace exhausted')
+
+
     def reverse_clock(self) -> int:
         inv_mul = mod_inv(self.multiplier, 2**64)
         self.state = ((self.state - self.increment) * inv_mul) % 2**64
@@ -0,0 +1,235 @@
+from samson.core.base_object import BaseObject
+from samson.utilities.runtime import RUNTIME
+
+
+def parity(x: int) -> int:
+    return bin(x).count('1') & 1
+
+
+def reverse_bits(x: int, length: int) -> int:
+    """
+    Reverses the lowest `length` bits of `x`.
+    """
+    return int(bin(x)[2:].zfill(length)[::-1][:length], 2) if length else 0
+
+
+def gf2_mod(a: int, mod: int) -> int:
+    """
+    Reduces the GF(2) polynomial `a` modulo `mod` (both represented as integers).
+    """
+    n = mod.bit_length() - 1
+
+    for i in range(a.bit_length()-1, n-1, -1):
+        if (a >> i) & 1:
+            a ^= mod << (i - n)
+
+    return a
+
+
+def gf2_mulmod(a: int, b: int, mod: int) -> int:
+    """
+    Multiplies the GF(2) polynomials `a` and `b` modulo `mod` (represented as integers).
+    """
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+
+        b >>= 1
+        a <<= 1
+
+    return gf2_mod(result, mod)
+
+
+def gf2_x_powmod(exponent: int, mod: int) -> int:
+    """
+    Computes x^`exponent` modulo the GF(2) polynomial `mod`. Squaring in GF(2)[x] only spreads
+    the bits, so only the reductions cost anything.
+
+    Parameters:
+        exponent (int): Exponent.
+        mod      (int): Modulus represented as an integer.
+
+    Returns:
+        int: Reduced polynomial represented as an integer.
+    """
+    result = 1
+
+    for bit in bin(exponent)[2:]:
+        result = gf2_mod(int('0'.join(bin(result)[2:]), 2), mod)
+
+        if bit == '1':
+            result = gf2_mod(result << 1, mod)
+
+    return gf2_mod(result, mod)
+
+
+@RUNTIME.global_cache(32)
+def _step_tables(length: int, tap_mask: int, word_size: int) -> tuple:
+    """
+    Precomputes byte-indexed tables mapping a state to the next `word_size` sequence bits.
+    Since the map is linear, the next bits are the XOR of one table lookup per state byte.
+    """
+    top = length - 1
+    columns = []
+
+    # Image of each basis vector
+    for i in range(length):
+        state = 1 << i
+        bits  = 0
+
+        for j in range(word_size):
+            bit    = parity(state & tap_mask)
+            state  = (state >> 1) | (bit << top)
+            bits  |= bit << j
+
+        columns.append(bits)
+
+
+    tables = []
+    for offset in range(0, length, 8):
+        cols  = columns[offset:offset+8]
+        table = [0]*(1 << len(cols))
+
+        for b in range(1, len(table)):
+            low      = b & -b
+            table[b] = table[b ^ low] ^ cols[low.bit_length()-1]
+
+        tables.append(table)
+
+    return tuple(tables)
+
+
+
+class WordLFSR(BaseObject):
+    """
+    Word-parallel Fibonacci LFSR over the linear recurrence s_{t+n} = XOR_{i in taps} s_{t+i}.
+    The state holds the window s_t, ..., s_{t+n-1} with s_t in the least significant bit.
+    Steps of `word_size` clocks use precomputed byte tables, and jumps use x^N mod the characteristic polynomial.
+
+    Examples:
+        >>> from samson.prngs.word_lfsr import WordLFSR
+        >>> a = WordLFSR(16, [0, 2, 3, 5], seed=0xACE1)
+        >>> b = WordLFSR(16, [0, 2, 3, 5], seed=0xACE1)
+        >>> bits = a.generate_bits(1000)
+        >>> b.jump(936)
+        >>> b.generate_bits(64) == bits >> 936
+        True
+
+    """
+
+    def __init__(self, length: int, taps: list, seed: int=0, word_size: int=64):
+        """
+        Parameters:
+            length    (int): Length of the register in bits.
+            taps     (list): Indices `i` (0 <= i < `length`) of the recurrence s_{t+n} = XOR s_{t+i}.
+            seed      (int): Initial window.
+            word_size (int): Number of bits produced per table step.
+        """
+        self.length    = length
+        self.taps      = sorted(taps)
+        self.tap_mask  = sum(1 << i for i in set(taps))
+        self.word_size = word_size
+        self.mask      = (1 << length) - 1
+        self.state     = seed & self.mask
+
+        # Characteristic polynomial x^n + sum(x^i)
+        self.char_poly = (1 << length) | self.tap_mask
+        self._tables   = None
+
+
+    def __reprdir__(self):
+        return ['length', 'taps', 'state']
+
+
+    def clock(self) -> int:
+        """
+        Clocks the register once.
+
+        Returns:
+            int: Output bit (the oldest bit of the window).
+        """
+        out = self.state & 1
+        self.state = (self.state >> 1) | (parity(self.state & self.tap_mask) << (self.length-1))
+        return out
+
+
+    def _next_word(self, state: int) -> int:
+        if not self._tables:
+            self._tables = _step_tables(self.length, self.tap_mask, self.word_size)
+
+        bits = 0
+        for table in self._tables:
+            bits  ^= table[state & 0xFF]
+            state >>= 8
+
+        return bits
+
+
+    def generate_word(self) -> int:
+        """
+        Clocks the register `word_size` times.
+
+        Returns:
+            int: Output bits with the first bit in the least significant position.
+        """
+        ext        = self.state | (self._next_word(self.state) << self.length)
+        self.state = (ext >> self.word_size) & self.mask
+        return ext & ((1 << self.word_size) - 1)
+
+
+    def generate_bits(self, num_bits: int) -> int:
+        """
+        Clocks the register `num_bits` times.
+
+        Parameters:
+            num_bits (int): Number of clocks.
+
+        Returns:
+            int: Output bits with the first bit in the least significant position.
+        """
+        word_size = self.word_size
+        result    = 0
+        produced  = 0
+
+        while produced + word_size <= num_bits:
+            result   |= self.generate_word() << produced
+            produced += word_size
+
+        for _ in range(num_bits - produced):
+            result   |= self.clock() << produced
+            produced += 1
+
+        return result
+
+
+    def peek_bits(self, num_bits: int) -> int:
+        """
+        Returns the next `num_bits` output bits without clocking the register.
+        """
+        state  = self.state
+        result = self.generate_bits(num_bits)
+        self.state = state
+        return result
+
+
+    def jump(self, num_clocks: int):
+        """
+        Advances the register by `num_clocks` clocks in O(log(`num_clocks`)) polynomial operations.
+
+        Parameters:
+            num_clocks (int): Number of clocks.
+        """
+        if num_clocks < 2*self.length:
+            self.generate_bits(num_clocks)
+            return
+
+        # s_{t+N+j} = sum(r_i * s_{t+i+j}) where x^N mod P = sum(r_i * x^i)
+        r   = gf2_x_powmod(num_clocks, self.char_poly)
+        ext = self.peek_bits(2*self.length - 1)
+
+        state = 0
+        for j in range(self.length):
+            state |= parity((ext >> j) & r) << j
+
+        self.state = state
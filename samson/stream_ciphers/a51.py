@@ -45,6 +45,41 @@ class A51(StreamCipher):
 
 
 
+    @staticmethod
+    def from_state(state: int) -> 'A51':
+        """
+        Creates an A5/1 instance directly from its 64-bit internal state (e.g. recovered by a time-memory tradeoff).
+
+        Parameters:
+            state (int): Concatenated registers R1 || R2 || R3 with R1 in the most significant bits.
+
+        Returns:
+            A51: A5/1 instance.
+        """
+        a51 = A51.__new__(A51)
+        Primitive.__init__(a51)
+
+        a51.key = None
+        a51.frame_num = None
+        a51.lfsr_regs = [
+            BitslicedFLFSR(19, 10, [13, 16, 17, 18], state >> 45),
+            BitslicedFLFSR(22, 11, [20, 21], state >> 23),
+            BitslicedFLFSR(23, 12, [7, 20, 21, 22], state)
+        ]
+
+        return a51
+
+
+    @property
+    def state(self) -> int:
+        """
+        64-bit internal state R1 || R2 || R3.
+        """
+        r1, r2, r3 = [lfsr.register for lfsr in self.lfsr_regs]
+        return (r1 << 45) | (r2 << 23) | r3
+
+
+
     def clock(self):
         """
         Performs the majority-vote clocking.
@@ -67,9 +102,25 @@ class A51(StreamCipher):
         Returns:
             Bytes: Keystream.
         """
-        bitstring = ''
-        for _ in range(length * 8):
+        return Bytes(self.generate_bits(length * 8)).zfill(length)
+
+
+
+    def generate_bits(self, num_bits: int) -> int:
+        """
+        Generates `num_bits` of keystream.
+
+        Parameters:
+            num_bits (int): Desired length of keystream in bits.
+
+        Returns:
+            int: Keystream with the first bit in the most significant position.
+        """
+        r1, r2, r3 = self.lfsr_regs
+        result = 0
+
+        for _ in range(num_bits):
             self.clock()
-            bitstring += str(self.lfsr_regs[0].value() ^ self.lfsr_regs[1].value() ^ self.lfsr_regs[2].value())
+            result = (result << 1) | (r1.value() ^ r2.value() ^ r3.value())
 
-        return Bytes(int(bitstring, 2)).zfill(length)
+        return result
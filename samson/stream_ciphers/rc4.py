@@ -75,3 +75,53 @@ class RC4(StreamCipher):
             keystream += bytes([self.S[(self.S[self.i] + self.S[self.j]) % 256]])
 
         return keystream
+
+
+
+    @staticmethod
+    def batch_generate(keys: list, length: int):
+        """
+        Generates `length` bytes of keystream for each key in `keys`. This avoids instantiating
+        a cipher per key and is intended for bulk sampling (e.g. bias analysis).
+
+        Parameters:
+            keys  (list): Keys to generate keystreams for.
+            length (int): Desired length of each keystream in bytes.
+
+        Returns:
+            generator: Keystreams as `bytes`.
+
+        Examples:
+            >>> from samson.stream_ciphers.rc4 import RC4
+            >>> keys = [b'Key', b'Wiki']
+            >>> list(RC4.batch_generate(keys, 4)) == [RC4(key).generate(4) for key in keys]
+            True
+
+        """
+        indices = range(256)
+        prga    = range(1, length+1)
+
+        for key in keys:
+            key_length = len(key)
+            S = list(indices)
+            j = 0
+
+            for i in indices:
+                S_i  = S[i]
+                j    = (j + S_i + key[i % key_length]) & 255
+                S[i] = S[j]
+                S[j] = S_i
+
+            keystream = bytearray(length)
+            j = 0
+
+            for idx in prga:
+                i    = idx & 255
+                S_i  = S[i]
+                j    = (j + S_i) & 255
+                S_j  = S[j]
+                S[i] = S_j
+                S[j] = S_i
+                keystream[idx-1] = S[(S_i + S_j) & 255]
+
+            yield bytes(keystream)
@@ -0,0 +1,135 @@
+from samson.utilities.runtime import RUNTIME
+import hashlib
+import zlib
+import time
+import dill
+import re
+import os
+
+
+class Checkpoint(object):
+    """
+    Periodically snapshots the state of a long-running computation to disk so an interrupted run can resume from it.
+    Snapshots are `dill`-serialized, compressed and written atomically, so a crash mid-write leaves the previous snapshot intact.
+    A Checkpoint without a name is disabled: it never saves and always loads the default. Snapshots record the computation's
+    `inputs`, and loading one saved for different inputs raises a ValueError instead of resuming the wrong computation.
+
+    Examples:
+        >>> import tempfile
+        >>> from samson.utilities.checkpoint import Checkpoint
+        >>> checkpoint = Checkpoint('example', directory=tempfile.mkdtemp(), inputs=12)
+        >>> checkpoint.load(default=[])
+        []
+        >>> checkpoint.save([1, 2, 3], force=True)
+        True
+        >>> Checkpoint('example', directory=checkpoint.directory, inputs=12).load()
+        [1, 2, 3]
+        >>> Checkpoint('example', directory=checkpoint.directory, inputs=13).load()
+        Traceback (most recent call last):
+            ...
+        ValueError: Checkpoint 'example' was saved for different inputs
+        >>> checkpoint.clear()
+        >>> checkpoint.load() is None
+        True
+
+    """
+
+    def __init__(self, name: str=None, directory: str=None, interval: float=None, inputs: object=None):
+        """
+        Parameters:
+            name        (str): Unique name of the computation. Disables checkpointing if None.
+            directory   (str): Directory to store snapshots in. Defaults to `RUNTIME.checkpoint_dir`.
+            interval  (float): Minimum seconds between snapshots. Defaults to `RUNTIME.checkpoint_interval`.
+            inputs   (object): Inputs identifying the computation. Must be comparable with `==` after serialization.
+        """
+        self.name       = name
+        self.inputs     = inputs
+        self.directory  = directory or RUNTIME.checkpoint_dir
+        self.interval   = RUNTIME.checkpoint_interval if interval is None else interval
+        self.last_saved = time.time()
+
+        if name:
+            filename = re.sub(r'[^\w.-]', '_', name)
+
+            # Names often contain the (large) inputs
+            if len(filename) > 96:
+                filename = filename[:64] + '-' + hashlib.sha256(name.encode('utf-8')).hexdigest()[:16]
+
+            self.path = os.path.join(self.directory, filename + '.ckpt')
+        else:
+            self.path = None
+
+
+    def __repr__(self):
+        return f"<Checkpoint: name={self.name}, path={self.path}, interval={self.interval}>"
+
+    def __str__(self):
+        return self.__repr__()
+
+
+    def __bool__(self):
+        return bool(self.name)
+
+
+    def due(self) -> bool:
+        """
+        Returns whether a snapshot is due. Lets callers skip building expensive state.
+        """
+        return bool(self.name) and time.time() - self.last_saved >= self.interval
+
+
+    def load(self, default: object=None) -> object:
+        """
+        Loads the latest snapshot.
+
+        Parameters:
+            default (object): Value to return if there's no snapshot.
+
+        Returns:
+            object: Saved state or `default`.
+        """
+        if not (self.path and os.path.exists(self.path)):
+            return default
+
+        with open(self.path, 'rb') as f:
+            inputs, state = dill.loads(zlib.decompress(f.read()))
+
+        if inputs != self.inputs:
+            raise ValueError(f"Checkpoint '{self.name}' was saved for different inputs")
+
+        return state
+
+
+    def save(self, state: object, force: bool=False) -> bool:
+        """
+        Snapshots `state` if one is due.
+
+        Parameters:
+            state (object): State to save.
+            force   (bool): Whether to save regardless of the interval.
+
+        Returns:
+            bool: Whether the state was saved.
+        """
+        if not (self.name and (force or self.due())):
+            return False
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f'{self.path}.{os.getpid()}.tmp'
+
+        with open(tmp_path, 'wb') as f:
+            f.write(zlib.compress(dill.dumps((self.inputs, state)), 1))
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.path)
+        self.last_saved = time.time()
+        return True
+
+
+    def clear(self):
+        """
+        Deletes the snapshot. Call once the computation finishes.
+        """
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
@@ -187,6 +187,42 @@ def binary_search(func: FunctionType, max_int: int):
     return end_idx
 
 
+def kary_search(func: FunctionType, max_int: int, k: int=2):
+    """
+    Performs k-ary search between 0 and `max_int`. Each round splits the interval at `k` - 1 points that
+    are evaluated with a single call to `func`, so the probes can be batched or run concurrently.
+
+    Parameters:
+        func   (func): Function that takes in a list of values and returns a list of booleans that are True if the value is less than the hidden number.
+        max_int (int): Maximum integer to try.
+        k       (int): Number of subintervals per round.
+
+    Returns:
+        int: Index of hidden value.
+
+    Examples:
+        >>> from samson.utilities.general import kary_search
+        >>> kary_search(lambda values: [value < 1337 for value in values], 2**16, k=8)
+        1337
+
+    """
+    start_idx = 0
+    end_idx   = max_int
+
+    while end_idx - 1 != start_idx:
+        width  = end_idx - start_idx
+        points = sorted({start_idx + width*i // k for i in range(1, k)} - {start_idx})
+
+        for point, result in zip(points, func(points)):
+            if result:
+                start_idx = point
+            else:
+                end_idx = point
+                break
+
+    return end_idx
+
+
 def binary_search_unbounded(func: FunctionType):
     """
     Finds the upper bound and then performs binary search.
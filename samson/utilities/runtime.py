@@ -1,20 +1,53 @@
 from samson.auxiliary.progress import Progress
-from multiprocessing.dummy import Pool as ThreadPool
-from multiprocessing.pool import Pool as ProcessPool
+from samson.core.metadata import SizeType
+from samson.auxiliary.lazy_loader import LazyLoader
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from multiprocessing import cpu_count
 from functools import wraps, lru_cache
 from types import FunctionType
 from hmac import compare_digest
+import threading
+import atexit
 import math
 import logging
 import inspect
 import sys
 import os
 
+_convolution = LazyLoader('_convolution', globals(), 'samson.math.fft.convolution')
+
 
 URANDOM = open("/dev/urandom", "rb")
 
 
+def _run_chunk(func: FunctionType, chunk: list, starmap: bool) -> list:
+    if starmap:
+        return [func(*item) for item in chunk]
+
+    return [func(item) for item in chunk]
+
+
+def _shutdown_executor(pool: 'Executor', wait: bool, terminate: bool=False):
+    # Process workers can't be interrupted, and the interpreter joins them on exit,
+    # so tasks that are already running (or queued to a worker) have to be killed
+    processes = list((getattr(pool, '_processes', None) or {}).values()) if terminate else []
+    pool.shutdown(wait=wait and not terminate, cancel_futures=not wait or terminate)
+
+    for process in processes:
+        process.terminate()
+
+    for process in processes:
+        process.join()
+
+
+
+_POOL_WORKER = threading.local()
+
+def _mark_pool_worker(key: tuple):
+    _POOL_WORKER.keys = getattr(_POOL_WORKER, 'keys', set()) | {key}
+
+
 def default_poly_fft_heuristic(p1, p2):
     max_deg = max(len(p1)-p1.valuation(), len(p2)-p2.valuation())
     if not max_deg:
@@ -23,7 +56,16 @@ def default_poly_fft_heuristic(p1, p2):
     logn = math.ceil(math.log2(max_deg))
     n    = 2**logn
 
-    return p1.coeffs.sparsity * p2.coeffs.sparsity > 10*(3*n*logn+n)
+    conv_estimate = p1.coeffs.sparsity * p2.coeffs.sparsity
+    modulus       = _convolution.ntt_modulus(p1.coeff_ring)
+
+    # Integer NTTs work on native ints and cross over much earlier than generic SSA.
+    # Measured with scripts/performance/poly_fft_crossover.py (CPython 3.11), NTTs win for
+    # ZZ/ZZ(2^127-1) once the ratio passes ~1 and for 64-bit ZZ coefficients once it passes ~1.5-2
+    if modulus is not None:
+        return conv_estimate > (1 if modulus else 2)*(3*n*logn+n)
+
+    return conv_estimate > 10*(3*n*logn+n)
 
 
 class RuntimeConfiguration(object):
@@ -69,6 +111,7 @@ class RuntimeConfiguration(object):
 
         self.random = lambda size: URANDOM.read(size)
         self.poly_fft_heuristic = default_poly_fft_heuristic
+        self.poly_half_gcd_supremacy = 128
         self.poly_exp_separator = "^"
 
         if minimize_output:
@@ -82,11 +125,17 @@ class RuntimeConfiguration(object):
         self.enable_MOV_attack = True
         self.auto_promote = True
         self.index_calculus_supremacy = 70
+        self.parallel_frobenius_trace_supremacy = 128
 
         self.last_tb = None
 
         self.global_cache_size = 1024
         self.global_cache_enabled = True
+        self.cache_dir = os.environ.get('SAMSON_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'samson'))
+
+        # Snapshots of long-running computations (see `checkpoint`)
+        self.checkpoint_dir      = os.path.join(self.cache_dir, 'checkpoints')
+        self.checkpoint_interval = 60.0
 
         # Find mseive
         import distutils.spawn
@@ -102,8 +151,23 @@ class RuntimeConfiguration(object):
 
         self.primitives = []
 
+        # Index of registered primitives by IO relation and block size (in bits). Primitives whose
+        # block sizes can't be enumerated (e.g. ARBITRARY or DEPENDENT) are checked on lookup
+        self._primitive_index     = {}
+        self._primitive_wildcards = {}
+        self._primitive_order     = {}
+        self._primitive_buckets   = {}
+
         self._contexts = {}
 
+        # Long-lived executors keyed by (kind, workers). Process calls that can stop early check out
+        # a private executor from `_idle_pools` instead, since their stale workers may have to be killed
+        self._pools      = {}
+        self._idle_pools = {}
+        self._pools_pid  = os.getpid()
+        self._pool_lock = threading.Lock()
+        atexit.register(self.shutdown_pools)
+
 
     def __repr__(self):
         return f"<RuntimeConfiguration: reporter={self.reporter}, auto_promote={self.auto_promote}, enable_poly_intercept={self.enable_poly_intercept}, enable_MOV_attack={self.enable_MOV_attack}>"
@@ -155,7 +219,7 @@ class RuntimeConfiguration(object):
 
     def report(self, func: FunctionType) -> FunctionType:
         """
-        Initializes a reporting context for an object or class method.
+        Initializes a reporting context for an object or class method (or coroutine method).
 
         Parameters:
             func (func): Object or class method.
@@ -163,6 +227,20 @@ class RuntimeConfiguration(object):
         Returns:
             func: Contextualized function.
         """
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def new_coro(*args, **kwargs):
+                caller = args[0]
+
+                try:
+                    self.reporter.create_context(caller, func)
+                    return await func(*args, **kwargs)
+                finally:
+                    self.reporter.cleanup_context(caller, func)
+
+            return new_coro
+
+
         @wraps(func)
         def new_func(*args, **kwargs):
             result = None
@@ -193,11 +271,58 @@ class RuntimeConfiguration(object):
 
 
     def register_primitive(self, cls):
+        self._primitive_order.setdefault(cls, len(self.primitives))
         self.primitives.append(cls)
 
+        block_size = cls.BLOCK_SIZE
+        by_size    = self._primitive_index.setdefault(cls.IO_RELATION_TYPE, {})
+
+        if block_size.size_type == SizeType.SINGLE:
+            by_size.setdefault(block_size.sizes, []).append(cls)
 
-    def search_primitives(self, filter_func: FunctionType=lambda primitive: True):
-        return [primitive for primitive in self.primitives if filter_func(primitive)]
+        elif block_size.size_type == SizeType.RANGE and type(block_size.sizes) is list:
+            for size in block_size.sizes:
+                by_size.setdefault(size, []).append(cls)
+
+        else:
+            self._primitive_wildcards.setdefault(cls.IO_RELATION_TYPE, []).append(cls)
+
+        self._primitive_buckets.clear()
+
+
+    def search_primitives(self, filter_func: FunctionType=lambda primitive: True, block_size: int=None, io_relation: 'IORelationType'=None):
+        """
+        Searches the registered primitives. Searches by `block_size` and `io_relation` use the index built
+        at registration, and their candidates are cached until the next registration. `filter_func` is
+        applied to the candidates on every call.
+
+        Parameters:
+            filter_func            (func): Function that takes in a primitive and returns whether it matches.
+            block_size              (int): Block size in bits to match.
+            io_relation (IORelationType): IO relation to match.
+
+        Returns:
+            list: Matching primitives in order of registration.
+        """
+        key = (io_relation, block_size)
+
+        if key not in self._primitive_buckets:
+            if block_size is None:
+                candidates = [primitive for primitive in self.primitives if io_relation is None or primitive.IO_RELATION_TYPE == io_relation]
+
+            else:
+                relations  = [io_relation] if io_relation is not None else set(self._primitive_index) | set(self._primitive_wildcards)
+                candidates = set()
+
+                for relation in relations:
+                    candidates.update(self._primitive_index.get(relation, {}).get(block_size, []))
+                    candidates.update(primitive for primitive in self._primitive_wildcards.get(relation, []) if block_size in primitive.BLOCK_SIZE)
+
+                candidates = sorted(candidates, key=self._primitive_order.get)
+
+            self._primitive_buckets[key] = candidates
+
+        return [primitive for primitive in self._primitive_buckets[key] if filter_func(primitive)]
 
 
     def show_primitives(self, filter_func: FunctionType=lambda primitive: True, sort_key: FunctionType=lambda primitive: str(primitive).split('.')[-1][:-2], reverse: bool=False):
@@ -303,16 +428,18 @@ class RuntimeConfiguration(object):
 
 
 
-    def threaded(self, threads: int, starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None):
+    def threaded(self, threads: int, starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None, stream: bool=False):
         """
         Runs the function with `threads` threads. The returned function should take an iterable.
 
         Parameters:
-            threads      (int): Number of threads to run.
-            starmap     (bool): Whether or not to "starmap" output (see Python multiprocessing).
-            visual      (bool): Whether or not to display a progress bar.
-            visual_args (dict): Kwargs for progress bar.
-            chunk_size   (int): Chunk sizes to use for visual mode. This is a tradeoff between progress granularity and communication overhead.
+            threads           (int): Number of threads to run.
+            starmap          (bool): Whether or not to "starmap" output (see Python multiprocessing).
+            visual           (bool): Whether or not to display a progress bar.
+            visual_args      (dict): Kwargs for progress bar.
+            chunk_size        (int): Number of items per task. This is a tradeoff between progress granularity and communication overhead.
+            terminate_filter (func): Function that takes in the results so far and returns whether to cancel the remaining items.
+            stream           (bool): Whether to return a generator yielding results as they complete.
 
         Returns:
             list: Results.
@@ -326,19 +453,22 @@ class RuntimeConfiguration(object):
             [0, 1, 2, 3, 4]
 
         """
-        return self.__build_concurrent_pool(threads, ThreadPool, starmap, visual, visual_args, chunk_size, terminate_filter=terminate_filter)
+        return self.__build_concurrent_pool(threads, 'thread', starmap, visual, visual_args, chunk_size, terminate_filter=terminate_filter, stream=stream)
+
 
 
-    def parallel(self, processes: int=None, starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None):
+    def parallel(self, processes: int=None, starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None, stream: bool=False):
         """
         Runs the function with `processes` processes. The returned function should take an iterable.
 
         Parameters:
-            processes    (int): Number of processes to run.
-            starmap     (bool): Whether or not to "starmap" output (see Python multiprocessing).
-            visual      (bool): Whether or not to display a progress bar.
-            visual_args (dict): Kwargs for progress bar.
-            chunk_size   (int): Chunk sizes to use for visual mode. This is a tradeoff between progress granularity and communication overhead.
+            processes         (int): Number of processes to run.
+            starmap          (bool): Whether or not to "starmap" output (see Python multiprocessing).
+            visual           (bool): Whether or not to display a progress bar.
+            visual_args      (dict): Kwargs for progress bar.
+            chunk_size        (int): Number of items per task. This is a tradeoff between progress granularity and communication overhead.
+            terminate_filter (func): Function that takes in the results so far and returns whether to cancel the remaining items.
+            stream           (bool): Whether to return a generator yielding results as they complete.
 
         Returns:
             list: Results.
@@ -352,65 +482,226 @@ class RuntimeConfiguration(object):
             [0, 1, 2, 3, 4]
 
         """
-        return self.__build_concurrent_pool(processes or cpu_count(), ProcessPool, starmap, visual, visual_args, chunk_size, terminate_filter=terminate_filter)
+        return self.__build_concurrent_pool(processes or cpu_count(), 'process', starmap, visual, visual_args, chunk_size, terminate_filter=terminate_filter, stream=stream)
+
+
+
+    def _check_pools_pid(self):
+        # Forked children inherit the parent's executors but can't use them
+        if self._pools_pid != os.getpid():
+            self._pools      = {}
+            self._idle_pools = {}
+            self._pools_pid  = os.getpid()
+
+
+
+    def get_pool(self, kind: str, workers: int) -> 'Executor':
+        """
+        Returns the long-lived executor of `kind` ('thread' or 'process') with `workers` workers, creating it on first use.
+
+        Parameters:
+            kind    (str): Either 'thread' or 'process'.
+            workers (int): Number of workers.
+
+        Returns:
+            Executor: Executor.
+        """
+        key = (kind, workers)
+
+        with self._pool_lock:
+            self._check_pools_pid()
+            pool = self._pools.get(key)
+
+            if pool is None:
+                if kind == 'thread':
+                    pool = ThreadPoolExecutor(workers, thread_name_prefix=f'samson-{workers}', initializer=_mark_pool_worker, initargs=(key,))
+                elif kind == 'process':
+                    pool = ProcessPoolExecutor(workers)
+                else:
+                    raise ValueError(f"Unknown pool kind '{kind}'")
+
+                self._pools[key] = pool
+
+            return pool
 
 
 
-    def __build_concurrent_pool(self, workers: int, pool_type: 'Pool', starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None):
+    def _acquire_private_pool(self, workers: int) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            self._check_pools_pid()
+            idle = self._idle_pools.get(workers)
+
+            if idle:
+                return idle.pop()
+
+        pool = ProcessPoolExecutor(workers)
+        pool.private = True
+        return pool
+
+
+
+    def _release_private_pool(self, workers: int, pool: ProcessPoolExecutor, terminate: bool):
+        # Nobody else submits to a private executor, so its workers can be killed safely
+        if terminate:
+            _shutdown_executor(pool, wait=False, terminate=True)
+            return
+
+        with self._pool_lock:
+            if self._pools_pid == os.getpid():
+                self._idle_pools.setdefault(workers, []).append(pool)
+                return
+
+        pool.shutdown(wait=False)
+
+
+
+    def retire_pool(self, kind: str, workers: int, wait: bool=False, terminate: bool=False, pool: 'Executor'=None):
+        """
+        Shuts down the executor of `kind` with `workers` workers. The next request creates a fresh one.
+
+        Parameters:
+            kind          (str): Either 'thread' or 'process'.
+            workers       (int): Number of workers.
+            wait         (bool): Whether to wait for running tasks to finish.
+            terminate    (bool): Whether to kill process workers instead of letting their running tasks finish.
+            pool     (Executor): Only retire the executor if it's still this one.
+        """
+        with self._pool_lock:
+            current = self._pools.get((kind, workers))
+
+            if pool is not None and current is not pool:
+                return
+
+            self._pools.pop((kind, workers), None)
+
+        if current is not None and self._pools_pid == os.getpid():
+            _shutdown_executor(current, wait=wait, terminate=terminate)
+
+
+
+    def shutdown_pools(self, wait: bool=True):
+        """
+        Gracefully shuts down all executors.
+
+        Parameters:
+            wait (bool): Whether to wait for running tasks to finish.
+        """
+        for kind, workers in list(self._pools):
+            self.retire_pool(kind, workers, wait=wait)
+
+        with self._pool_lock:
+            idle, self._idle_pools = self._idle_pools, {}
+
+        if self._pools_pid == os.getpid():
+            for pools in idle.values():
+                for pool in pools:
+                    pool.shutdown(wait=wait)
+
+
+
+    def __build_concurrent_pool(self, workers: int, kind: str, starmap: bool=False, visual: bool=False, visual_args: dict=None, chunk_size: int=None, terminate_filter: FunctionType=None, stream: bool=False):
         if not visual_args:
             visual_args = {}
 
-        def _outer_wrap(func):
-            def _runner(iterable):
-                local_func      = func
-                local_chunk     = chunk_size
-                local_term_filt = terminate_filter
+        key = (kind, workers)
 
-                with pool_type(workers) as pool:
-                    run_func = local_func
+        def _outer_wrap(func):
+            def _submit(iterable):
+                items = list(iterable)
 
-                    if visual or local_term_filt:
-                        pool_runner = pool.imap_unordered
+                local_chunk = chunk_size
+                if not local_chunk:
+                    local_chunk = max(len(items) // (workers*4), 1) if kind == 'process' else 1
 
-                        # Manually create a starmapper since we can't have unordered and starmap normally
-                        if starmap:
-                            def star_wrapper(arg):
-                                return local_func(*arg)
+                chunks = [items[i:i+local_chunk] for i in range(0, len(items), local_chunk)]
 
-                            run_func = star_wrapper
+                # A thread submitting to its own pool could starve it, so nested calls get a temporary pool
+                if key in getattr(_POOL_WORKER, 'keys', ()):
+                    pool = ThreadPoolExecutor(workers)
+                    pool.shutdown_after = True
 
-                    elif starmap:
-                        pool_runner = pool.starmap
+                # Process workers can't be interrupted, so calls that may stop early run on a private
+                # executor whose stale workers can be killed without touching anyone else's work
+                elif kind == 'process' and (terminate_filter or stream):
+                    pool = self._acquire_private_pool(workers)
+                else:
+                    pool = self.get_pool(kind, workers)
+
+                try:
+                    futures = [pool.submit(_run_chunk, func, chunk, starmap) for chunk in chunks]
+                except BrokenProcessPool:
+                    if getattr(pool, 'private', False):
+                        pool.shutdown(wait=False)
+                        pool = self._acquire_private_pool(workers)
                     else:
-                        pool_runner = pool.map
+                        self.retire_pool(kind, workers, pool=pool)
+                        pool = self.get_pool(kind, workers)
 
+                    futures = [pool.submit(_run_chunk, func, chunk, starmap) for chunk in chunks]
 
-                    # https://stackoverflow.com/questions/41920124/multiprocessing-use-tqdm-to-display-a-progress-bar
-                    if visual:
-                        from tqdm import tqdm
-                        num_items = len(iterable)
+                return pool, futures, len(items)
 
-                        if not local_chunk:
-                            local_chunk = max(num_items // (workers*2), 1)
 
-                        final_runner = tqdm(pool_runner(run_func, iterable, chunksize=local_chunk), total=num_items, **visual_args)
+            def _release(pool, pending):
+                # Cancel only this call's futures that haven't started. Anything already running
+                # on a shared pool is left to drain
+                running = [future for future in pending if not (future.done() or future.cancel())]
 
-                    else:
-                        final_runner = pool_runner(run_func, iterable)
+                if getattr(pool, 'shutdown_after', False):
+                    pool.shutdown(wait=False, cancel_futures=True)
 
+                elif getattr(pool, 'private', False):
+                    self._release_private_pool(workers, pool, terminate=bool(running))
 
-                    if local_term_filt:
-                        results = []
-                        for result in final_runner:
-                            results.append(result)
 
-                            if local_term_filt(results):
-                                pool.terminate()
-                                break
-                        
-                        return results
-                    else:
-                        return list(final_runner)
+            def _stream(iterable):
+                pool, futures, num_items = _submit(iterable)
+
+                progress = None
+                if visual:
+                    from tqdm import tqdm
+                    progress = tqdm(total=num_items, **visual_args)
+
+                pending = set(futures)
+                results = []
+
+                try:
+                    while pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                        for future in done:
+                            for result in future.result():
+                                if progress:
+                                    progress.update(1)
+
+                                yield result
+
+                                if terminate_filter:
+                                    results.append(result)
+
+                                    if terminate_filter(results):
+                                        return
+                finally:
+                    if progress:
+                        progress.close()
+
+                    _release(pool, pending)
+
+
+            def _runner(iterable):
+                if stream:
+                    return _stream(iterable)
+
+                # Progress bars and early termination use completion order (like `imap_unordered`)
+                if visual or terminate_filter:
+                    return list(_stream(iterable))
+
+                pool, futures, _ = _submit(iterable)
+
+                try:
+                    return [result for future in futures for result in future.result()]
+                finally:
+                    _release(pool, futures)
 
             return _runner
 
@@ -418,6 +709,23 @@ class RuntimeConfiguration(object):
 
 
 
+    def checkpoint(self, name: str=None, interval: float=None, inputs: object=None) -> 'Checkpoint':
+        """
+        Gets a Checkpoint for a long-running computation. Snapshots are stored in `checkpoint_dir`.
+
+        Parameters:
+            name       (str): Unique name of the computation. Returns a disabled Checkpoint if None.
+            interval (float): Minimum seconds between snapshots. Defaults to `checkpoint_interval`.
+            inputs  (object): Inputs identifying the computation. Resuming a snapshot saved for other inputs raises a ValueError.
+
+        Returns:
+            Checkpoint: Checkpoint for `name`.
+        """
+        from samson.utilities.checkpoint import Checkpoint
+        return Checkpoint(name, interval=interval, inputs=inputs)
+
+
+
     def global_cache(self, size: int=None):
         """
         Wraps a function with a LRU cache of size `size`.
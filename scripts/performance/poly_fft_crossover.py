@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+# Times naive/Karatsuba against NTT polynomial multiplication to find the crossovers used by
+# `default_poly_fft_heuristic`. "ratio" is the heuristic's convolution estimate over 3*n*log(n)+n.
+import argparse
+import random
+import timeit
+import math
+from samson.math.all import ZZ, Polynomial
+from samson.utilities.runtime import RUNTIME
+
+
+def ratio(p1, p2):
+    max_deg = max(len(p1)-p1.valuation(), len(p2)-p2.valuation())
+    logn    = math.ceil(math.log2(max_deg))
+    n       = 2**logn
+    return p1.coeffs.sparsity*p2.coeffs.sparsity / (3*n*logn+n)
+
+
+def main(degrees):
+    heuristic = RUNTIME.poly_fft_heuristic
+
+    try:
+        for name, R, bits in [('ZZ', ZZ, 64), ('ZZ/ZZ(2^127-1)', ZZ/ZZ(2**127-1), 127)]:
+            for d in degrees:
+                p1 = Polynomial([R(random.getrandbits(bits)) for _ in range(d)])
+                p2 = Polynomial([R(random.getrandbits(bits)) for _ in range(d)])
+
+                timings = {}
+                for use_fft in (False, True):
+                    RUNTIME.poly_fft_heuristic = lambda a, b: use_fft
+                    number = max(1, 2000 // d)
+                    timings[use_fft] = min(timeit.repeat(lambda: p1*p2, number=number, repeat=3)) / number
+
+                print(f'{name:16} deg={d:4} ratio={ratio(p1, p2):6.2f} naive={timings[False]*1e6:10.1f}us ntt={timings[True]*1e6:10.1f}us')
+    finally:
+        RUNTIME.poly_fft_heuristic = heuristic
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Polynomial multiplication crossover benchmark.')
+    parser.add_argument('--degrees', type=int, nargs='+', default=[4, 8, 12, 16, 24, 32, 48, 64, 96, 128, 256])
+    main(parser.parse_args().degrees)
@@ -5,7 +5,9 @@ from samson.padding.pkcs7 import PKCS7
 from samson.utilities.general import rand_bytes
 from samson.attacks.cbc_padding_oracle_attack import CBCPaddingOracleAttack
 from samson.oracles.padding_oracle import PaddingOracle
+from samson.oracles.async_oracle import AsyncPaddingOracle
 from samson.utilities.exceptions import InvalidPaddingException
+import asyncio
 import random
 import base64
 import unittest
@@ -84,3 +86,18 @@ class CBCPaddingOracleTestCase(unittest.TestCase):
 
         print(recovered_plaintext)
         self.assertEqual(base64.b64decode(chosen_plaintext.encode()), recovered_plaintext)
+
+
+
+    def test_paddingattack_async(self):
+        ciphertext = encrypt_data()
+
+        async def decrypt_remote(data):
+            await asyncio.sleep(0.001)
+            return decrypt_data(data)
+
+        attack = CBCPaddingOracleAttack(AsyncPaddingOracle(decrypt_remote, concurrency=64), block_size=block_size)
+        recovered_plaintext = asyncio.run(attack.execute_async(bytes(ciphertext), iv=iv))
+
+        recovered_plaintext = padder.unpad(recovered_plaintext)
+        self.assertEqual(base64.b64decode(chosen_plaintext.encode()), recovered_plaintext)
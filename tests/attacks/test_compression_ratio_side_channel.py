@@ -53,9 +53,19 @@ class CompressionRatioSideChannelTestCase(unittest.TestCase):
         self._execute()
 
 
-    def _execute(self):
+    def test_ctr_threaded(self):
+        self.request = lambda msg: aes_ctr_oracle(format_req(msg))
+        self._execute(threads=4)
+
+
+    def test_ctr_early_stop(self):
+        self.request = lambda msg: aes_ctr_oracle(format_req(msg))
+        self._execute(early_stop=True)
+
+
+    def _execute(self, threads=1, early_stop=False):
         known_plaintext = b'Cookie: '
-        attack = CRIMEAttack(self)
+        attack = CRIMEAttack(self, threads=threads, early_stop=early_stop)
 
         recovered_plaintext = attack.execute(known_plaintext, 54)
 
@@ -1,10 +1,12 @@
 #!/usr/bin/python3
+import asyncio
 import base64
 from samson.block_ciphers.rijndael import Rijndael
 from samson.block_ciphers.modes.ecb import ECB
 from samson.padding.pkcs7 import PKCS7
 from samson.utilities.general import rand_bytes
 from samson.oracles.chosen_plaintext_oracle import ChosenPlaintextOracle
+from samson.oracles.async_oracle import AsyncChosenPlaintextOracle
 from samson.attacks.ecb_prepend_attack import ECBPrependAttack
 import unittest
 
@@ -33,3 +35,35 @@ class ECBPrependAttackTestCase(unittest.TestCase):
         recovered_plaintext = padder.unpad(recovered_plaintext)
 
         self.assertEqual(recovered_plaintext, unknown_string)
+
+
+
+    def test_prepend_attack_threaded(self):
+        secret = unknown_string[:20]
+
+        def encrypt(message):
+            return ECB(Rijndael(key)).encrypt(message + secret)
+
+        attack = ECBPrependAttack(ChosenPlaintextOracle(encrypt), threads=4)
+        recovered_plaintext = attack.execute()
+
+        padder = PKCS7(block_size)
+        recovered_plaintext = padder.unpad(recovered_plaintext)
+
+        self.assertEqual(recovered_plaintext, secret)
+
+
+
+    def test_prepend_attack_async(self):
+        secret = unknown_string[:20]
+
+        async def encrypt_remote(message):
+            return ECB(Rijndael(key)).encrypt(message + secret)
+
+        attack = ECBPrependAttack(AsyncChosenPlaintextOracle(encrypt_remote, cache=True))
+        recovered_plaintext = asyncio.run(attack.execute_async())
+
+        padder = PKCS7(block_size)
+        recovered_plaintext = padder.unpad(recovered_plaintext)
+
+        self.assertEqual(recovered_plaintext, secret)
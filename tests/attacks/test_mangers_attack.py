@@ -1,8 +1,11 @@
 from samson.attacks.mangers_attack import MangersAttack
 from samson.oracles.padding_oracle import PaddingOracle
+from samson.oracles.async_oracle import AsyncPaddingOracle
 from samson.utilities.bytes import Bytes
 from samson.public_key.rsa import RSA
 from samson.padding.oaep import OAEP
+import asyncio
+import math
 import unittest
 
 import logging
@@ -34,3 +37,25 @@ class MangersAttackTestCase(unittest.TestCase):
         attack = MangersAttack(oracle, rsa)
         recovered_plaintext = oaep.unpad(attack.execute(ciphertext))
         self.assertEqual(recovered_plaintext, plaintext)
+
+
+    def test_batched(self):
+        rsa  = RSA(1024)
+        oaep = OAEP(rsa.bits)
+
+        plaintext  = b'Super secret ;)'
+        ciphertext = Bytes(rsa.encrypt(oaep.pad(plaintext)))
+        B          = 2**(8*(math.ceil(rsa.n.bit_length() / 8) - 1))
+
+        def oracle_func(attempt):
+            return rsa.decrypt(attempt.int()).int() >= B
+
+        async def async_oracle_func(attempt):
+            return oracle_func(attempt)
+
+
+        attack = MangersAttack(PaddingOracle(oracle_func), rsa, threads=4)
+        self.assertEqual(oaep.unpad(attack.execute(ciphertext)), plaintext)
+
+        attack = MangersAttack(AsyncPaddingOracle(async_oracle_func, concurrency=4), rsa)
+        self.assertEqual(oaep.unpad(asyncio.run(attack.execute_async(ciphertext))), plaintext)
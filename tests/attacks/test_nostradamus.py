@@ -5,6 +5,7 @@ from samson.utilities.manipulation import stretch_key
 from samson.block_ciphers.modes.ecb import ECB
 
 from samson.auxiliary.naive_collider import NaiveMDCollider
+import hashlib
 import unittest
 
 import logging
@@ -30,6 +31,18 @@ def construction_func(iv, message):
     return md.yield_state(message)
 
 
+def fast_construction_func(iv, message):
+    md = MerkleDamgardConstruction(iv, lambda block, state: bytes(hashlib.sha256(bytes(state + block)).digest()[:3]), digest_size=3, block_size=3)
+    md.pad_func = padder
+    return md.yield_state(message)
+
+
+def wide_block_construction_func(iv, message):
+    md = MerkleDamgardConstruction(iv, lambda block, state: bytes(hashlib.sha256(bytes(state + block)).digest()[:3]), digest_size=3, block_size=8)
+    md.pad_func = padder
+    return md.yield_state(message)
+
+
 class NostradamusAttackTestCase(unittest.TestCase):
     def test_nostradamus(self):
         collider = NaiveMDCollider(construction_func=construction_func, output_size=hash_size)
@@ -53,3 +66,36 @@ class NostradamusAttackTestCase(unittest.TestCase):
             new_message = attack.execute(orig_hash)
             hashed_message = list(construction_func( b'\x00' * 2, prefix + new_message))[-1]
             self.assertEqual(hashed_message, attack.crafted_hash)
+
+
+    def test_distinguished_points(self):
+        collider = NaiveMDCollider(construction_func=fast_construction_func, output_size=3, memory=2**6)
+        self.assertEqual(collider.dp_bits, 8)
+
+        p1, p2 = b'abc', b'def'
+        p1_suffix, p2_suffix, collision = collider.find_collision(p1, p2)
+
+        self.assertEqual(list(fast_construction_func(p1, p1_suffix))[-1], collision)
+        self.assertEqual(list(fast_construction_func(p2, p2_suffix))[-1], collision)
+
+
+    def test_parallel(self):
+        collider = NaiveMDCollider(construction_func=fast_construction_func, output_size=3)
+        attack   = NostradamusAttack(k=4, collision_func=collider.find_collision, output_size=3, processes=2)
+
+        for prefix in attack.prefixes:
+            hashed_message = list(fast_construction_func(prefix, attack.execute(prefix)))[-1]
+            self.assertEqual(hashed_message, attack.crafted_hash)
+
+
+    def test_block_size(self):
+        collider = NaiveMDCollider(construction_func=wide_block_construction_func, output_size=3, block_size=8)
+        p1_suffix, p2_suffix, collision = collider.find_collision(b'abc', b'def')
+
+        self.assertEqual(len(p1_suffix), 8)
+        self.assertEqual(list(wide_block_construction_func(b'abc', p1_suffix)), [collision])
+        self.assertEqual(list(wide_block_construction_func(b'def', p2_suffix)), [collision])
+
+        # States wider than `output_size` can't be compared
+        collider = NaiveMDCollider(construction_func=fast_construction_func, output_size=2, block_size=3)
+        self.assertRaises(ValueError, collider.find_collision, b'ab', b'de')
@@ -1,7 +1,9 @@
 from samson.oracles.padding_oracle import PaddingOracle
+from samson.oracles.async_oracle import AsyncPaddingOracle
 from samson.public_key.rsa import RSA
 from samson.attacks.pkcs1v15_padding_oracle_attack import PKCS1v15PaddingOracleAttack
 from samson.padding.pkcs1v15_padding import PKCS1v15Padding
+import asyncio
 import unittest
 
 import logging
@@ -20,6 +22,10 @@ def oracle_func(ciphertext):
     except Exception as _:
         return False
 
+# Only checks the 0x0002 header
+def lenient_oracle_func(ciphertext):
+    return rsa.decrypt(ciphertext).int() >> (key_length - 16) == 2
+
 
 class PKCS1v15PaddingOracleAttackTestCase(unittest.TestCase):
     def test_padding_oracle_attack(self):
@@ -32,3 +38,23 @@ class PKCS1v15PaddingOracleAttackTestCase(unittest.TestCase):
 
         attack = PKCS1v15PaddingOracleAttack(oracle)
         self.assertEqual(attack.execute(c, rsa.n, rsa.e, key_length), m)
+
+
+    def test_threaded(self):
+        m = padding.pad(b'kick it, CC')
+        c = rsa.encrypt(m)
+
+        attack = PKCS1v15PaddingOracleAttack(PaddingOracle(lenient_oracle_func), threads=4)
+        self.assertEqual(attack.execute(c, rsa.n, rsa.e, key_length), m)
+        self.assertGreater(attack.queries, 0)
+
+
+    def test_async(self):
+        async def request(ciphertext):
+            return lenient_oracle_func(ciphertext)
+
+        m = padding.pad(b'kick it, CC')
+        c = rsa.encrypt(m)
+
+        attack = PKCS1v15PaddingOracleAttack(AsyncPaddingOracle(request, concurrency=8))
+        self.assertEqual(asyncio.run(attack.execute_async(c, rsa.n, rsa.e, key_length)), m)
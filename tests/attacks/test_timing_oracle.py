@@ -1,5 +1,6 @@
-from samson.oracles.timing_oracle import TimingOracle, percentile_filter
+from samson.oracles.timing_oracle import TimingOracle, percentile_filter, box_filter, trim_filter, trimmed_mean, box_test
 from tqdm import tqdm
+import random
 import string
 import unittest
 
@@ -14,6 +15,29 @@ def vulnerable_func(attempt):
             break
 
 
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def simulated_func(clock, rng):
+    # Each matching character costs 1% of the noise-free response time
+    def func(attempt):
+        matches = 0
+        for a, b in zip(attempt, SECRET):
+            if a != b:
+                break
+
+            matches += 1
+
+        clock.now += 1.0 + 0.01*matches + rng.expovariate(10)
+
+    return func
+
+
 class TimingOracleTestCase(unittest.TestCase):
     def test_hi_res(self):
         oracle = TimingOracle(vulnerable_func, filters=[lambda items: percentile_filter(0.1, items)])
@@ -26,3 +50,49 @@ class TimingOracleTestCase(unittest.TestCase):
 
 
         self.assertEqual(answer, SECRET)
+
+
+    def test_rank(self):
+        random.seed(0)
+        clock  = FakeClock()
+        oracle = TimingOracle(simulated_func(clock, random.Random(1)), timer=clock)
+
+        answer  = ''
+        samples = 0
+        for _ in range(11):
+            results = oracle.rank([answer + char + 'z'*(10 - len(answer)) for char in string.ascii_lowercase], max_samples=80000, batch_size=500)
+            answer  += results[0][0][len(answer)]
+            samples += sum(result[2] for result in results)
+
+
+        self.assertEqual(answer, SECRET)
+        self.assertLess(samples, 11*26*80000 // 10)
+
+
+    def test_rank_order(self):
+        # Eliminated candidates come after the survivors, latest eliminated first
+        random.seed(0)
+        clock  = FakeClock()
+        oracle = TimingOracle(simulated_func(clock, random.Random(1)), timer=clock)
+
+        results = oracle.rank(['abrz', 'abzz', 'azzz', 'zzzz'], max_samples=80000, batch_size=500)
+        self.assertEqual([result[0] for result in results], ['abrz', 'abzz', 'azzz', 'zzzz'])
+        self.assertEqual(results[0][2], max(result[2] for result in results))
+
+
+    def test_rank_estimators(self):
+        random.seed(0)
+        clock  = FakeClock()
+        oracle = TimingOracle(simulated_func(clock, random.Random(1)), timer=clock)
+
+        candidates = ['a' + char + 'z'*9 for char in string.ascii_lowercase]
+        for kwargs in [{'estimator': lambda items: box_filter(0.05, 0.1, items)}, {'estimator': lambda items: trim_filter(0.1, items)}, {'box': (0.05, 0.1)}]:
+            results = oracle.rank(candidates, max_samples=80000, batch_size=500, **kwargs)
+            self.assertEqual(results[0][0], 'ab' + 'z'*9)
+
+
+    def test_estimators(self):
+        self.assertEqual(trimmed_mean(0.1, [100] + list(range(1, 9)) + [-100]), 4.5)
+        self.assertEqual(box_test(0.1, 0.2, range(10, 20), range(10)), 1)
+        self.assertEqual(box_test(0.1, 0.2, range(10), range(10, 20)), -1)
+        self.assertEqual(box_test(0.1, 0.9, range(10), range(5, 15)), 0)
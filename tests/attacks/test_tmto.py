@@ -0,0 +1,69 @@
+from samson.attacks.tmto_attack import TMTOAttack, A51KeystreamFunction
+from samson.auxiliary.chain_table import ChainTable
+from samson.stream_ciphers.a51 import A51
+from samson.utilities.bytes import Bytes
+import tempfile
+import unittest
+
+
+def _function(x):
+    return ((x * 0x5DEECE66D + 11) % 2**24) ^ 0xC0FFEE
+
+
+class TMTOTestCase(unittest.TestCase):
+    def _run_test(self, attack):
+        attack.generate_tables()
+        walker = attack._walker(attack.tables[0])
+
+        # Every point on a stored chain must be recoverable
+        for i in range(0, len(attack.tables[0]), 97):
+            point = attack.tables[0].starts[i]
+
+            for column in range(Bytes.random(1).int() % 8):
+                next_point = walker.reduce(_function(point), column)
+
+                # Distinguished chains end at the first distinguished point
+                if attack.dp_bits and not next_point & walker.dp_mask:
+                    break
+
+                point = next_point
+
+            preimage = attack.invert(_function(point))
+            self.assertEqual(_function(preimage), _function(point))
+
+
+    def test_rainbow(self):
+        self._run_test(TMTOAttack(_function, space_bits=16, chain_length=32, num_chains=2**10, num_tables=2))
+
+
+    def test_distinguished_points(self):
+        self._run_test(TMTOAttack(_function, space_bits=16, chain_length=256, num_chains=2**10, num_tables=2, dp_bits=3))
+
+
+    def test_load_tables(self):
+        attack = TMTOAttack(_function, space_bits=16, chain_length=32, num_chains=2**9)
+        attack.generate_tables()
+
+        with tempfile.TemporaryDirectory() as directory:
+            attack.save_tables(directory)
+
+            loaded = TMTOAttack(_function, space_bits=16, chain_length=32, num_chains=2**9)
+            loaded.load_tables(directory)
+            table = loaded.tables[0]
+
+            self.assertEqual(list(table.ends), list(attack.tables[0].ends))
+            self.assertEqual(table.find(table.ends[3]), attack.tables[0].find(table.ends[3]))
+            self.assertEqual(ChainTable.deserialize(table.serialize()).starts.tolist(), list(attack.tables[0].starts))
+
+
+    def test_a51_frames(self):
+        function = A51KeystreamFunction(space_bits=12, output_bits=16, base_state=Bytes.random(8).int())
+        attack   = TMTOAttack(function, space_bits=12, chain_length=16, num_chains=2**8)
+        attack.generate_tables()
+
+        state = function.base_state | attack.tables[0].starts[0]
+        frame = A51.from_state(state).generate_bits(24)
+        found = [(offset, preimage) for _, offset, preimage in attack.execute([frame], frame_bits=24, output_bits=16)]
+
+        self.assertIn(0, [offset for offset, _ in found])
+        self.assertTrue(all(function(preimage) == (frame >> (8 - offset)) & 0xFFFF for offset, preimage in found))
@@ -2,6 +2,7 @@ from samson.attacks.xor_dictionary_attack import XORDictionaryAttack
 from samson.analyzers.english_analyzer import EnglishAnalyzer
 from samson.utilities.general import rand_bytes
 from samson.utilities.manipulation import xor_buffs
+from samson.auxiliary.aho_corasick import build_automaton
 import unittest
 
 import logging
@@ -21,3 +22,21 @@ class XORDictionaryAttackTestCase(unittest.TestCase):
 
         attack = XORDictionaryAttack(EnglishAnalyzer(), top_1000)
         self.assertIn('significant risk', attack.execute(ciphertexts)[0])
+
+
+    def test_drag_delimiter(self):
+        # The dragged word must line up with the candidate, including a leading non-whitespace delimiter
+        key = rand_bytes(16)
+        msgA = b'-significant-ris'
+        msgB = b'this movie sucks'
+
+        two_time = xor_buffs(xor_buffs(key, msgA), xor_buffs(key, msgB))
+        attack   = XORDictionaryAttack(None, top_1000)
+        attack.automaton = build_automaton(tuple(top_1000))
+
+        words = list(attack._drag('', '-', two_time, set(msgB)))
+        self.assertIn('significant', words)
+
+        for word in words:
+            candidate = bytes('-' + word, 'utf-8')
+            self.assertTrue(all(a ^ b in set(msgB) for a, b in zip(candidate, two_time)))
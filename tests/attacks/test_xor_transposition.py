@@ -3,9 +3,11 @@ from samson.block_ciphers.rijndael import Rijndael
 from samson.block_ciphers.modes.ctr import CTR
 
 from samson.utilities.general import rand_bytes
+from samson.utilities.manipulation import xor_buffs
 from samson.analysis.general import levenshtein_distance
 from samson.attacks.xor_transposition_attack import XORTranspositionAttack
 from samson.analyzers.english_analyzer import EnglishAnalyzer
+from samson.analyzers.analyzer import Analyzer
 from samson.stream_ciphers.rc4 import RC4
 import base64
 import unittest
@@ -27,6 +29,19 @@ def encrypt_rc4(secret):
     return cipher.generate(len(secret)) ^ secret
 
 
+class LetterAnalyzer(Analyzer):
+    def __init__(self):
+        self.ranked = 0
+
+    def analyze(self, in_bytes):
+        return sum(chr(char).isalpha() or char == 32 for char in in_bytes)
+
+    def rank_xor_keys(self, column, top_k=None):
+        self.ranked += 1
+        return super().rank_xor_keys(column, top_k)
+
+
+
 class XORTranspositionTestCase(unittest.TestCase):
     def try_encryptor(self, encryptor):
         with open(f'{os.path.dirname(os.path.abspath(__file__))}/test_ctr_transposition.txt') as f:
@@ -50,3 +65,29 @@ class XORTranspositionTestCase(unittest.TestCase):
 
     def test_ctr_attack(self):
         self.try_encryptor(encrypt_ctr)
+
+
+    def test_rank_xor_keys(self):
+        with open(f'{os.path.dirname(os.path.abspath(__file__))}/test_ctr_transposition.txt') as f:
+            secrets = [base64.b64decode(line.strip().encode()) for line in f.readlines()]
+
+        ciphertexts = [encrypt_rc4(secret) for secret in secrets]
+        keystream   = RC4(key).generate(10)
+        analyzer    = EnglishAnalyzer()
+
+        for i in range(10):
+            column = bytes([ciphertext[i] for ciphertext in ciphertexts])
+            self.assertIn(keystream[i], analyzer.rank_xor_keys(column, 32))
+
+
+    def test_exhaustive_by_default(self):
+        secrets     = [b'the quick brown fox', b'jumps over the lazy', b'dog and then it ran', b'away from the angry']
+        ciphertexts = [xor_buffs((key + key)[:len(secret)], secret) for secret in secrets]
+
+        analyzer   = LetterAnalyzer()
+        exhaustive = XORTranspositionAttack(analyzer).execute(ciphertexts, iterations=1)
+        self.assertEqual(analyzer.ranked, len(secrets[0]))
+
+        # The base analyzer ranks every key, so pruning to all 256 changes nothing
+        self.assertEqual(XORTranspositionAttack(analyzer).execute(ciphertexts, iterations=1, top_k=256), exhaustive)
+        self.assertGreater(analyzer.ranked, len(secrets[0]))
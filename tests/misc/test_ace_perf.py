@@ -0,0 +1,44 @@
+from samson.ace.ace import ACE
+from samson.ace.consequence import Consequence
+from samson.ace.constraints import IdentityConstraint
+from samson.ace.exploit import DynamicExploit
+from samson.ace.state import State
+import unittest
+
+
+def layered_protocol(layers: int, width: int, revealed: int, solvable: bool=True) -> ACE:
+    # A chain of `layers` states, each protected by its own constraint that only the last of its `width` exploits
+    # breaks. `revealed` states all lead into the top of the chain
+    def layer(child, idx):
+        constraint = IdentityConstraint()
+        constraint.needed_consequence = Consequence.ENCRYPTION_BYPASS
+        constraint.layer = idx
+
+        exploits = [DynamicExploit(None, Consequence.KEY_RECOVERY, []) for _ in range(width-1)] + [DynamicExploit(idx, Consequence.ENCRYPTION_BYPASS, [])]
+        return State(child, None, [constraint], exploits)
+
+
+    leaf  = State(None, None, [], [DynamicExploit('leaf', Consequence.PLAINTEXT_RECOVERY, [])] if solvable else [])
+    state = leaf
+
+    for idx in range(layers):
+        state = layer(state, idx)
+
+    ctx = ACE()
+    for idx in range(revealed):
+        ctx.reveal(layer(state, -idx-1))
+
+    ctx.goal(leaf, Consequence.PLAINTEXT_RECOVERY)
+    return ctx
+
+
+
+class ACEPerfTestCase(unittest.TestCase):
+    def test_solvable(self):
+        chain = layered_protocol(300, 10, 300).solve()
+        self.assertEqual([exploit.attack for exploit in chain], [-1] + list(range(299, -1, -1)) + ['leaf'])
+
+
+    def test_unsolvable(self):
+        with self.assertRaises(RuntimeError):
+            layered_protocol(300, 10, 300, solvable=False).solve()
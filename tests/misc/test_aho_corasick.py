@@ -0,0 +1,49 @@
+from samson.auxiliary.aho_corasick import AhoCorasick
+from samson.attacks.xor_dictionary_attack import XORDictionaryAttack
+from samson.analyzers.analyzer import Analyzer
+from samson.utilities.general import rand_bytes
+from samson.utilities.manipulation import xor_buffs
+import random
+import re
+import unittest
+
+
+WORDS = ['the', 'there', 'then', 'he', 'her', 'here', 'risk', 'movie', 'this', 'significant', 'sign', 'sucks', 'is', 'a']
+
+
+class LetterAnalyzer(Analyzer):
+    def analyze(self, in_bytes: bytes) -> float:
+        return 2 ** sum(c in b'abcdefghijklmnopqrstuvwxyz ' for c in in_bytes)
+
+
+class AhoCorasickTestCase(unittest.TestCase):
+    def test_search(self):
+        ac = AhoCorasick(WORDS)
+
+        for _ in range(20):
+            text     = ''.join(random.choice('theirsk ') for _ in range(50))
+            expected = sorted([(m.start(), word) for word in WORDS for m in re.finditer(f'(?={word})', text)], key=lambda match: (match[0], len(match[1])))
+            self.assertEqual(ac.search(text.encode()), expected)
+
+
+    def test_prefix_search(self):
+        ac = AhoCorasick(WORDS)
+        self.assertTrue(ac.is_prefix('signif'))
+        self.assertFalse(ac.is_prefix('sx'))
+
+        # Rejecting 'e' at depth 2 prunes every 'the*' word
+        found = set(ac.prefix_search(lambda depth, char: not (depth == 2 and char == ord('e'))))
+        self.assertEqual(found, set(WORDS) - {'the', 'there', 'then'})
+
+        # Words are truncated at `max_depth`
+        self.assertEqual(set(ac.prefix_search(lambda depth, char: True, 2)), set(WORDS))
+
+
+    def test_crib_dragging(self):
+        key  = rand_bytes(16)
+        msgA = b'significant risk'
+        msgB = b'this movie sucks'
+
+        ciphertexts = [xor_buffs(key, msgA), xor_buffs(key, msgB)]
+        attack = XORDictionaryAttack(LetterAnalyzer(), WORDS)
+        self.assertIn('significant risk', attack.execute(ciphertexts)[0])
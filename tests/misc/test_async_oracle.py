@@ -0,0 +1,110 @@
+from samson.oracles.async_oracle import AsyncOracle
+from samson.utilities.exceptions import DecryptionException
+import asyncio
+import unittest
+
+
+class AsyncOracleTestCase(unittest.TestCase):
+    def test_concurrency_limit(self):
+        in_flight = [0, 0]
+
+        async def request(message):
+            in_flight[0] += 1
+            in_flight[1]  = max(in_flight)
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return message
+
+        oracle  = AsyncOracle(request, concurrency=4)
+        results = asyncio.run(oracle.request_many(list(range(20))))
+
+        self.assertEqual(results, list(range(20)))
+        self.assertEqual(in_flight[1], 4)
+
+
+    def test_retries(self):
+        attempts = []
+
+        async def request(message):
+            attempts.append(message)
+            if len(attempts) < 3:
+                raise ConnectionResetError
+
+            return message
+
+        oracle = AsyncOracle(request, retries=2, backoff=0.001)
+        self.assertEqual(asyncio.run(oracle.request(b'abc')), b'abc')
+        self.assertEqual(len(attempts), 3)
+
+        oracle = AsyncOracle(request, retries=1, backoff=0.001)
+        attempts.clear()
+
+        with self.assertRaises(ConnectionResetError):
+            asyncio.run(oracle.request(b'abc'))
+
+
+    def test_timeout(self):
+        async def request(message):
+            await asyncio.sleep(1)
+
+        oracle = AsyncOracle(request, timeout=0.01)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(oracle.request(b'abc'))
+
+
+    def test_no_retry_on_oracle_errors(self):
+        attempts = []
+
+        async def request(message):
+            attempts.append(message)
+            raise DecryptionException
+
+        oracle = AsyncOracle(request, retries=3, backoff=0.001)
+
+        with self.assertRaises(DecryptionException):
+            asyncio.run(oracle.request(b'abc'))
+
+        self.assertEqual(len(attempts), 1)
+
+
+    def test_cache(self):
+        attempts = []
+
+        def request(message):
+            attempts.append(message)
+            return len(message)
+
+        oracle = AsyncOracle(request, cache=True)
+
+        async def run():
+            first  = await oracle.request_many([b'a', b'bb'])
+            second = await oracle.request_many([bytearray(b'a'), b'bb'])
+            return first, second
+
+        self.assertEqual(asyncio.run(run()), ([1, 2], [1, 2]))
+        self.assertEqual(len(attempts), 2)
+
+
+    def test_cache_in_flight(self):
+        attempts = []
+
+        async def request(message):
+            attempts.append(message)
+            await asyncio.sleep(0.01)
+
+            if len(attempts) == 1:
+                raise DecryptionException
+
+            return len(message)
+
+        oracle = AsyncOracle(request, cache=True)
+
+        # Concurrent duplicates await a single request, and a failed request isn't cached
+        with self.assertRaises(DecryptionException):
+            asyncio.run(oracle.request_many([b'a', b'a', b'a']))
+
+        self.assertEqual(len(attempts), 1)
+        self.assertEqual(asyncio.run(oracle.request_many([b'a', b'a', b'a'])), [1, 1, 1])
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(oracle.cache, {(b'a',): 1})
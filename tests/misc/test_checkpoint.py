@@ -0,0 +1,169 @@
+from samson.utilities.checkpoint import Checkpoint
+from samson.utilities.runtime import RUNTIME
+from samson.attacks.nostradamus_attack import NostradamusAttack
+from samson.math.discrete_logarithm import pollards_kangaroo
+from samson.math.factorization.general import factor
+from samson.math.factorization.factors import Factors
+from samson.math.algebra.rings.integer_ring import ZZ
+import samson.math.factorization.siqs as siqs_module
+import subprocess
+import tempfile
+import unittest
+import sys
+import os
+
+
+class Interrupt(Exception):
+    pass
+
+
+def interrupt_after(func, calls):
+    counter = [0]
+
+    def wrapper(*args, **kwargs):
+        counter[0] += 1
+        if counter[0] > calls:
+            raise Interrupt()
+
+        return func(*args, **kwargs)
+
+    return wrapper, counter
+
+
+class CheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory    = tempfile.mkdtemp()
+        self.old_dir      = RUNTIME.checkpoint_dir
+        self.old_interval = RUNTIME.checkpoint_interval
+
+        RUNTIME.checkpoint_dir      = self.directory
+        RUNTIME.checkpoint_interval = 0
+
+
+    def tearDown(self):
+        RUNTIME.checkpoint_dir      = self.old_dir
+        RUNTIME.checkpoint_interval = self.old_interval
+
+
+    def test_save_load(self):
+        checkpoint = RUNTIME.checkpoint('test/save:load')
+        self.assertEqual(os.path.dirname(checkpoint.path), self.directory)
+        self.assertIsNone(checkpoint.load())
+
+        self.assertTrue(checkpoint.save({'a': [1, 2]}))
+        self.assertEqual(RUNTIME.checkpoint('test/save:load').load(), {'a': [1, 2]})
+        self.assertEqual(os.listdir(self.directory), [os.path.basename(checkpoint.path)])
+
+        checkpoint.clear()
+        self.assertIsNone(checkpoint.load())
+
+
+    def test_interval(self):
+        checkpoint = Checkpoint('interval', directory=self.directory, interval=3600)
+        self.assertFalse(checkpoint.save(1))
+        self.assertTrue(checkpoint.save(2, force=True))
+        self.assertEqual(checkpoint.load(), 2)
+
+
+    def test_disabled(self):
+        checkpoint = RUNTIME.checkpoint()
+        self.assertFalse(checkpoint)
+        self.assertFalse(checkpoint.save(1, force=True))
+        self.assertEqual(checkpoint.load(default=5), 5)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+    def test_mismatched_inputs(self):
+        RUNTIME.checkpoint('job', inputs=105).save((Factors({3: 1, 5: 1, 7: 1}), 1), force=True)
+        self.assertRaises(ValueError, factor, 1000003*1000033, checkpoint='job')
+        self.assertEqual(factor(105, checkpoint='job').recombine(), 105)
+
+
+    def test_long_name(self):
+        n = 2**2048 - 1
+        self.assertLess(len(os.path.basename(RUNTIME.checkpoint(f'factor-{n}').path)), 100)
+        self.assertNotEqual(RUNTIME.checkpoint(f'factor-{n}').path, RUNTIME.checkpoint(f'factor-{n-2}').path)
+
+
+    def test_siqs_resume(self):
+        n = 100000000000031 * 100000000000067
+
+        trial_div = siqs_module.siqs_trial_div
+        siqs_module.siqs_trial_div, counter = interrupt_after(trial_div, 3)
+
+        try:
+            self.assertRaises(Interrupt, siqs_module.siqs, n, checkpoint='siqs')
+        finally:
+            siqs_module.siqs_trial_div = trial_div
+
+        self.assertTrue(RUNTIME.checkpoint('siqs', inputs=n).load()[0])
+
+        primes, _ = siqs_module.siqs(n, checkpoint='siqs')
+        self.assertEqual(sorted(primes), [100000000000031, 100000000000067])
+        self.assertIsNone(RUNTIME.checkpoint('siqs', inputs=n).load())
+
+
+    def test_kangaroo_resume(self):
+        p = 2**127 - 1
+        R = (ZZ/ZZ(p)).mul_group()
+        g = R(5)
+        x = 2**100 + 12345
+        y = g*x
+
+        f, counter = interrupt_after(lambda y, k: pow(2, int(y) % k, 1000), 200)
+        self.assertRaises(Interrupt, pollards_kangaroo, g, y, x-100000, x+100000, f=f, checkpoint='kangaroo')
+
+        k, steps, *_ = RUNTIME.checkpoint('kangaroo', inputs=(g, y, x-100000, x+100000)).load()
+        self.assertEqual(k, 30)
+        self.assertGreater(steps, 0)
+
+        counter[0] = -2**64
+        dlog = pollards_kangaroo(g, y, x-100000, x+100000, f=f, checkpoint='kangaroo')
+        self.assertEqual(g*dlog, y)
+        self.assertIsNone(RUNTIME.checkpoint('kangaroo', inputs=(g, y, x-100000, x+100000)).load())
+
+
+    def test_nostradamus_resume(self):
+        def collision_func(p1, p2):
+            return b'\x01' + p1, b'\x02' + p2, bytes(a ^ b for a, b in zip(p1, p2))
+
+        collide, counter = interrupt_after(collision_func, 5)
+        prefixes = [int.to_bytes(i, 2, 'little') for i in range(8)]
+        self.assertRaises(Interrupt, NostradamusAttack, 3, collide, 2, checkpoint='nostradamus')
+
+        start, _, solution_tree, _ = RUNTIME.checkpoint('nostradamus', inputs=(3, prefixes)).load()
+        self.assertEqual(start, 1)
+        self.assertEqual(len(solution_tree[1]), 1)
+
+        counter[0] = 0
+        attack = NostradamusAttack(3, collide, 2, checkpoint='nostradamus')
+        self.assertEqual(counter[0], 2)
+        self.assertEqual(attack.crafted_hash, NostradamusAttack(3, collision_func, 2).crafted_hash)
+        self.assertIsNone(RUNTIME.checkpoint('nostradamus', inputs=(3, prefixes)).load())
+
+
+    def test_kangaroo_stable_map(self):
+        # The default map must not depend on the process' hash seed
+        script = '\n'.join([
+            'from samson.utilities.checkpoint import Checkpoint',
+            'from samson.utilities.runtime import RUNTIME',
+            'from samson.math.discrete_logarithm import pollards_kangaroo',
+            'from samson.math.algebra.rings.integer_ring import ZZ',
+            'import sys',
+            f'RUNTIME.checkpoint_dir = {self.directory!r}',
+            'RUNTIME.checkpoint_interval = 0',
+            'def save(self, state, force=False):',
+            '    print(state[:3])',
+            '    sys.exit(0)',
+            'Checkpoint.save = save',
+            'g = (ZZ/ZZ(2**127 - 1)).mul_group()(5)',
+            'pollards_kangaroo(g, g*(2**100), 2**100 - 100000, 2**100 + 100000, checkpoint="stable")'
+        ])
+
+        outputs = []
+        for seed in ['1', '2']:
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path), PYTHONHASHSEED=seed)
+            outputs.append(subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True, timeout=120).stdout)
+
+        self.assertTrue(outputs[0])
+        self.assertEqual(outputs[0], outputs[1])
@@ -1,6 +1,9 @@
 from samson.math.algebra.rings.integer_ring import ZZ
 from samson.math.symbols import Symbol
 from samson.math.fft.gss import _convolution
+from samson.math.fft.ntt import linear_convolution
+from samson.math.fft.convolution import convolution, ntt_modulus
+import random
 import unittest
 
 x = Symbol('x')
@@ -8,6 +11,39 @@ P = ZZ[x]
 p1 = 10*x**2000-3*x**3+1
 p2 = -6*x**1000 + 5*x**1 + x
 
+
+def naive_convolution(X, Y):
+    Z = [0]*(len(X)+len(Y)-1)
+    for i, a in enumerate(X):
+        for j, b in enumerate(Y):
+            Z[i+j] += a*b
+
+    return Z
+
+
 class FFTTestCase(unittest.TestCase):
     def test_perf(self):
         _convolution(p1.coeffs, p2.coeffs)
+
+
+    def test_ntt_multiprime(self):
+        for bits in [4, 64, 250, 2000]:
+            X = [random.randint(-2**bits, 2**bits) for _ in range(random.randint(1, 200))]
+            Y = [random.randint(-2**bits, 2**bits) for _ in range(random.randint(1, 200))]
+            self.assertEqual(linear_convolution(X, Y), naive_convolution(X, Y))
+
+        self.assertEqual(linear_convolution([], [1, 2]), [])
+        self.assertEqual(linear_convolution([1, 2], [], modulus=7), [])
+
+
+    def test_ntt_modulus(self):
+        R = ZZ/ZZ(2**127-1)
+        X = [R.random() for _ in range(150)]
+        Y = [R.random() for _ in range(75)]
+
+        expected = [R(z) for z in naive_convolution([int(x) for x in X], [int(y) for y in Y])]
+        self.assertEqual(convolution(X, Y).list(), expected)
+
+        self.assertEqual(ntt_modulus(R), 2**127-1)
+        self.assertEqual(ntt_modulus(ZZ), 0)
+        self.assertIsNone(ntt_modulus((ZZ/ZZ(7))[x]))
@@ -0,0 +1,75 @@
+from samson.ace.fingerprinter import Fingerprinter
+from samson.oracles.chosen_plaintext_oracle import ChosenPlaintextOracle
+from samson.block_ciphers.rijndael import Rijndael
+from samson.block_ciphers.modes.cbc import CBC
+from samson.block_ciphers.modes.ecb import ECB
+from samson.public_key.rsa import RSA
+from samson.core.metadata import IORelationType
+from samson.utilities.exceptions import CiphertextLengthException
+from samson.utilities.general import kary_search
+from samson.utilities.runtime import RUNTIME
+from samson.utilities.bytes import Bytes
+import unittest
+
+
+class FingerprinterTestCase(unittest.TestCase):
+    def test_cbc(self):
+        key = Bytes.random(16)
+
+        for threads in [1, 4]:
+            oracle      = ChosenPlaintextOracle(lambda plaintext: CBC(Rijndael(key), iv=Bytes.random(16)).encrypt(plaintext))
+            fingerprint = Fingerprinter(oracle, threads=threads).execute()
+
+            self.assertEqual(fingerprint.io_relation, IORelationType.EQUAL)
+            self.assertEqual(fingerprint.block_size, 16)
+            self.assertEqual(fingerprint.group_candidates()[0][0][0], Rijndael)
+            self.assertEqual(fingerprint.modes, [CBC])
+
+
+    def test_ecb(self):
+        ecb         = ECB(Rijndael(Bytes.random(16)))
+        fingerprint = Fingerprinter(ChosenPlaintextOracle(ecb.encrypt), threads=4).execute()
+        self.assertEqual(fingerprint.modes, [ECB])
+
+
+    def test_max_input(self):
+        rsa   = RSA(512)
+        calls = []
+
+        def request(plaintext):
+            calls.append(plaintext)
+            if plaintext.int() >= rsa.n:
+                raise CiphertextLengthException
+
+            return Bytes(rsa.encrypt(plaintext.int()))
+
+
+        oracle = ChosenPlaintextOracle(request)
+        for threads in [1, 4]:
+            calls.clear()
+            self.assertEqual(oracle.test_max_input(threads=threads), rsa.n)
+            self.assertLess(len(calls), 1500)
+
+
+    def test_kary_search(self):
+        for k in range(2, 10):
+            for hidden in [1, 2, 3, 500, 1023, 1024]:
+                self.assertEqual(kary_search(lambda values: [value < hidden for value in values], 1024, k=k), hidden)
+
+
+    def test_search_primitives(self):
+        import samson.all
+
+        for block_size in [8, 64, 128, 256, 512]:
+            for io_relation in [None, IORelationType.EQUAL, IORelationType.FIXED]:
+                expected = [prim for prim in RUNTIME.search_primitives(Fingerprinter.BASIC_FILTER) if block_size in prim.BLOCK_SIZE and io_relation in [None, prim.IO_RELATION_TYPE]]
+                self.assertEqual(RUNTIME.search_primitives(Fingerprinter.BASIC_FILTER, block_size=block_size, io_relation=io_relation), expected)
+
+        # Filters aren't cached, so ones reading external state stay current
+        allowed = set()
+        search  = lambda: RUNTIME.search_primitives(lambda prim: prim in allowed, block_size=128)
+        self.assertEqual(search(), [])
+
+        allowed.update(RUNTIME.search_primitives(block_size=128)[:2])
+        self.assertEqual(set(search()), allowed)
+        self.assertFalse(any(callable(part) for key in RUNTIME._primitive_buckets for part in key))
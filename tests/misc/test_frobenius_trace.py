@@ -0,0 +1,56 @@
+from samson.math.algebra.rings.integer_ring import ZZ
+from samson.math.algebra.curves.weierstrass_curve import EllipticCurve
+from samson.math.general import frobenius_trace, next_prime
+from samson.auxiliary.atkin_modular_poly_db import AtkinDB, pack_terms, unpack_terms
+from samson.auxiliary.modular_polynomial_db import ClassicalDB, MODULAR_POLY_DB
+from samson.math.symbols import Symbol
+import multiprocessing
+import tempfile
+import os
+import unittest
+
+
+class FrobeniusTraceTestCase(unittest.TestCase):
+    def test_parallel_trace(self):
+        p = next_prime(2**16)
+        R = ZZ/ZZ(p)
+
+        for _ in range(2):
+            E     = EllipticCurve(R.random(), R.random())
+            trace = p + 1 - E.cardinality()
+
+            self.assertEqual(frobenius_trace(E, processes=1), trace)
+            self.assertEqual(frobenius_trace(E, processes=2), trace)
+
+            # Workers left running on unneeded primes are killed rather than left behind
+            self.assertLessEqual(len(multiprocessing.active_children()), 2)
+
+
+    def test_atkin_cache(self):
+        terms = [(0, 0, -2**300 + 5), (3, 1, 744), (1, 2, -1), (0, 4, 0)]
+        self.assertEqual(unpack_terms(pack_terms(terms)), terms)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            db  = AtkinDB(cache_dir)
+            phi = db[13]
+            self.assertTrue(os.path.exists(db._cache_path(13)))
+
+            # Second load comes from the binary cache
+            self.assertEqual(AtkinDB(cache_dir)[13], phi)
+
+
+    def test_classical_cache(self):
+        x = Symbol('x')
+        y = Symbol('y')
+        P = ZZ[x, y]
+
+        # Terms of Phi_2 with x-degree >= y-degree, as stored
+        phi_2 = x**3 - 162000*x**2 + 1488*x**2*y - x**2*y**2 + 8748000000*x + 40773375*x*y - 157464000000000
+        self.assertIn(2, MODULAR_POLY_DB)
+        self.assertNotIn(4, MODULAR_POLY_DB)
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            db = ClassicalDB(cache_dir)
+            self.assertEqual(db[2], P(phi_2))
+            self.assertTrue(os.path.exists(db._cache_path(2)))
+            self.assertEqual(ClassicalDB(cache_dir)[2], db[2])
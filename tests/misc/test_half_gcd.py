@@ -0,0 +1,70 @@
+from samson.math.algebra.rings.integer_ring import ZZ
+from samson.math.algebra.rings.ring import RingElement
+from samson.math.half_gcd import fast_gcd, fast_xgcd, resultant
+from samson.math.matrix import Matrix
+from samson.math.symbols import Symbol
+from samson.utilities.runtime import RUNTIME
+import unittest
+
+x = Symbol('x')
+F = ZZ/ZZ(65537)
+P = F[x]
+
+
+class HalfGCDTestCase(unittest.TestCase):
+    def setUp(self):
+        self.old_supremacy = RUNTIME.poly_half_gcd_supremacy
+        RUNTIME.poly_half_gcd_supremacy = 8
+
+
+    def tearDown(self):
+        RUNTIME.poly_half_gcd_supremacy = self.old_supremacy
+
+
+    def _random_pair(self, n, m, common_deg):
+        c = P.random(P(x**common_deg)) + P(x**common_deg)
+        a = P.random(P(x**n))*c
+        b = P.random(P(x**m))*c
+        return a, b
+
+
+    def test_gcd(self):
+        for n, m, common_deg in [(40, 30, 0), (50, 50, 5), (20, 45, 12), (64, 1, 3)]:
+            a, b = self._random_pair(n, m, common_deg)
+            self.assertEqual(fast_gcd(a, b), RingElement.gcd(a, b))
+
+
+    def test_xgcd(self):
+        for n, m, common_deg in [(40, 30, 0), (50, 50, 5), (20, 45, 12)]:
+            a, b    = self._random_pair(n, m, common_deg)
+            g, s, t = fast_xgcd(a, b)
+
+            self.assertEqual(g, RingElement.gcd(a, b))
+            self.assertEqual(a*s + b*t, g)
+
+
+    def _sylvester_resultant(self, a, b):
+        n, m = a.degree(), b.degree()
+        a_coeffs = [a[i] for i in reversed(range(n+1))]
+        b_coeffs = [b[i] for i in reversed(range(m+1))]
+
+        rows  = [[F.zero]*i + a_coeffs + [F.zero]*(m-1-i) for i in range(m)]
+        rows += [[F.zero]*i + b_coeffs + [F.zero]*(n-1-i) for i in range(n)]
+        return Matrix(rows, coeff_ring=F).determinant()
+
+
+    def test_resultant(self):
+        for n, m in [(40, 30), (17, 33), (25, 25), (1, 9)]:
+            a, b = self._random_pair(n, m, 0)
+            self.assertEqual(resultant(a, b), self._sylvester_resultant(a, b))
+
+        a, b = self._random_pair(20, 20, 2)
+        self.assertEqual(resultant(a, b), F.zero)
+
+
+    def test_discriminant(self):
+        f = ZZ[x]([1, 3, 0, 0, 0, 1])
+        self.assertEqual(f.discriminant(), 65333)
+
+        f = P(3*x**4 + 5*x**3 + 7*x + 11)
+        self.assertEqual(f.discriminant(), f.resultant(f.derivative()) / f.LC())
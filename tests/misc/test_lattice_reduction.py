@@ -0,0 +1,129 @@
+from samson.math.algebra.rings.integer_ring import ZZ
+from samson.math.algebra.fields.fraction_field import FractionField as Frac
+from samson.math.lattice_reduction import IntegerGSO
+from samson.math.matrix import Matrix
+from fractions import Fraction
+import random
+import unittest
+
+QQ = Frac(ZZ)
+
+
+def gram_schmidt(basis):
+    ortho = []
+    mu    = []
+    for b in basis:
+        b   = [Fraction(e) for e in b]
+        row = []
+        for o in ortho:
+            c = sum(x*y for x, y in zip(b, o)) / sum(x*x for x in o)
+            b = [x - c*y for x, y in zip(b, o)]
+            row.append(c)
+
+        ortho.append(b)
+        mu.append(row)
+
+    return [sum(x*x for x in o) for o in ortho], mu
+
+
+def det(rows):
+    # Gram determinant of the lattice
+    result = 1
+    for norm in gram_schmidt(rows)[0]:
+        result *= norm
+
+    return result
+
+
+class LatticeReductionTestCase(unittest.TestCase):
+    def _knapsack(self, n, bits):
+        a = [random.getrandbits(bits) for _ in range(n)]
+        rows = [[1 if i == j else 0 for j in range(n)] + [a[i]] for i in range(n)]
+        rows.append([0]*n + [sum(a[:n//2])])
+        return rows
+
+
+    def assert_lll_reduced(self, basis, delta):
+        norms, mu = gram_schmidt(basis)
+
+        for k in range(1, len(basis)):
+            self.assertTrue(all(abs(c) <= Fraction(51, 100) for c in mu[k]))
+            self.assertGreaterEqual(norms[k], (Fraction(delta) - mu[k][k-1]**2) * norms[k-1] * Fraction(999, 1000))
+
+
+    def test_lll(self):
+        for n, bits in [(8, 40), (20, 60), (10, 2000)]:
+            rows  = self._knapsack(n, bits)
+            gso   = IntegerGSO(rows)
+            zeros = gso.lll(0.99)
+
+            self.assertEqual(zeros, 0)
+            self.assert_lll_reduced(gso.B, 0.99)
+            self.assertEqual(det(gso.B), det(rows))
+
+            # Planted solution
+            self.assertIn(tuple(abs(e) for e in gso.B[0]), [tuple([1]*(n//2) + [0]*(n-n//2+1))])
+
+
+    def test_mpmath_precision(self):
+        rows = self._knapsack(10, 2000)
+        self.assertIsNot(IntegerGSO(rows).fp, float)
+        self.assertIs(IntegerGSO(self._knapsack(10, 60)).fp, float)
+
+
+    def test_dependent_rows(self):
+        m = Matrix([[1, 2, 3], [2, 4, 6], [1, 0, 1], [3, 2, 5]], ZZ)
+        B = m.LLL()
+
+        self.assertEqual(B.num_rows, 4)
+        self.assertEqual([list(row) for row in B.rows[:2]], [[QQ.zero]*3]*2)
+        self.assertEqual(det([[int(e.numerator) for e in row] for row in B.rows[2:]]), det([[1, 2, 3], [1, 0, 1]]))
+
+
+    def test_rationals(self):
+        m = Matrix([[QQ((1, 2)), QQ((1, 3))], [QQ((5, 7)), QQ(1)]], QQ)
+        B = m.LLL()
+
+        self.assertEqual(B.coeff_ring, QQ)
+        self.assertEqual(det([[Fraction(int(e.numerator), int(e.denominator)) for e in row] for row in B.rows]), det([[Fraction(1, 2), Fraction(1, 3)], [Fraction(5, 7), 1]]))
+
+
+    def test_bkz(self):
+        for _ in range(3):
+            n    = 20
+            rows = [[random.randint(-2**20, 2**20) for _ in range(n)] for _ in range(n)]
+
+            L = IntegerGSO(rows)
+            L.lll(0.99)
+
+            B = IntegerGSO(rows)
+            B.bkz(10, 0.99)
+
+            self.assert_lll_reduced(B.B, 0.99)
+            self.assertEqual(det(B.B), det(rows))
+            self.assertLessEqual(B.G[0][0], L.G[0][0])
+
+
+    def test_increase_precision(self):
+        # Simulates doubles that are too imprecise for size reduction to ever converge
+        class NoisyGSO(IntegerGSO):
+            def compute_row(self, k):
+                super().compute_row(k)
+
+                if (self.fp is float or self.always_noisy) and k:
+                    self.mu[k][0] = 2.0**20
+
+        rows = self._knapsack(8, 40)
+        gso  = NoisyGSO(rows)
+        gso.always_noisy = False
+        gso.lll(0.99)
+
+        self.assertGreater(gso.precision, 53)
+        self.assertIsNot(gso.fp, float)
+        self.assert_lll_reduced(gso.B, 0.99)
+        self.assertEqual(det(gso.B), det(rows))
+
+        # Gives up instead of looping forever
+        gso = NoisyGSO(rows)
+        gso.always_noisy = True
+        self.assertRaises(RuntimeError, gso.lll, 0.99)
@@ -0,0 +1,61 @@
+from samson.math.algebra.rings.integer_ring import ZZ
+from samson.math.optimization.modular_composition_cache import ModularCompositionCache, iterated_frobenius, powmod
+from samson.math.symbols import Symbol
+import unittest
+
+x = Symbol('x')
+F = ZZ/ZZ(65537)
+P = F[x]
+
+
+class ModularCompositionTestCase(unittest.TestCase):
+    def _random_poly(self, n):
+        return P.random(P(x**n)) + P(x**n)
+
+
+    def test_composition(self):
+        for n in [1, 2, 7, 16]:
+            mod   = self._random_poly(n)
+            h     = P.random(P(x**(n+3)))
+            cache = ModularCompositionCache(h, mod)
+
+            for _ in range(2):
+                f     = P.random(P(x**(2*n)))
+                naive = P.zero
+
+                for i in range(f.degree(), -1, -1):
+                    naive = (naive*h + f[i]) % mod
+
+                self.assertEqual(cache(f), naive)
+
+
+    def test_iterated_frobenius(self):
+        mod = self._random_poly(20)
+        x_q = powmod(P(x), 65537, mod)
+
+        X = P(x)
+        for e in range(8):
+            self.assertEqual(iterated_frobenius(x_q, e, mod), X)
+            X = powmod(X, 65537, mod)
+
+
+    def test_factorization(self):
+        facs = [P(x + 5), P(x + 7), P(x**2 + 3), P(x**3 + x + 2), self._random_poly(9)]
+        facs = [fac for fac in facs if fac.is_irreducible()]
+        f    = P.one
+
+        for fac in facs:
+            f *= fac
+
+        # Every irreducible factor should be found by DDF/EDF
+        ddf = f.ddf()
+        self.assertEqual([d for _g, d in ddf], sorted({fac.degree() for fac in facs}))
+
+        found = [fac for g, d in ddf for fac in g.edf(d)]
+        self.assertEqual(sorted(found, key=lambda p: (p.degree(), str(p))), sorted([fac.monic() for fac in facs], key=lambda p: (p.degree(), str(p))))
+
+
+    def test_is_irreducible(self):
+        self.assertTrue(P(x**4 + 3).is_irreducible())
+        self.assertFalse(P((x**2 + 3)*(x**2 + 5)).is_irreducible())
+        self.assertFalse(P((x**3 + x + 2)*(x**3 + x + 2)).is_irreducible())
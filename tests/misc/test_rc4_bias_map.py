@@ -0,0 +1,58 @@
+from samson.analysis.rc4_bias_map import RC4BiasMap
+from samson.analysis.general import generate_rc4_bias_map, merge_rc4_bias_maps, merge_rc4_bias_map_files, incremental_rc4_bias_map_gen
+from samson.stream_ciphers.rc4 import RC4
+from samson.utilities.general import rand_bytes
+import tempfile
+import json
+import os
+import unittest
+
+
+class RC4BiasMapTestCase(unittest.TestCase):
+    def test_batch_generate(self):
+        keys = [rand_bytes(16) for _ in range(20)]
+        self.assertEqual(list(RC4.batch_generate(keys, 300)), [RC4(key).generate(300) for key in keys])
+
+
+    def test_legacy_format(self):
+        ciphertexts = [rand_bytes(40) for _ in range(500)]
+
+        expected = [{} for _ in range(256)]
+        for c in ciphertexts:
+            for i, byte in enumerate(c):
+                expected[i][byte] = expected[i].get(byte, 0) + 1
+
+        bias_map = generate_rc4_bias_map(ciphertexts)
+        self.assertEqual([dict(entry) for entry in bias_map], expected)
+
+        # Merging legacy maps sums their counts
+        merged = merge_rc4_bias_maps([bias_map, bias_map])
+        self.assertEqual([dict(entry) for entry in merged], [{k: v*2 for k, v in entry.items()} for entry in expected])
+
+
+    def test_merge_and_persist(self):
+        a = RC4BiasMap.generate_random(300, bytes(16))
+        b = RC4BiasMap.generate_random(200, bytes(16), processes=2)
+        c = a + b
+
+        self.assertEqual(c.num_samples, 500)
+        self.assertTrue(all(sum(c[i]) == 500 for i in range(16)))
+        self.assertEqual(RC4BiasMap.deserialize(c.serialize()), c)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'bias_map')
+            incremental_rc4_bias_map_gen(path, data=bytes(8), sample_size=250, chunk_size=100)
+
+            # Legacy JSON chunks are still accepted
+            with open(f'{path}.3', 'w') as f:
+                f.write(json.dumps(generate_rc4_bias_map([bytes(8)]*10)))
+
+            merged = merge_rc4_bias_map_files(path, 4)
+            self.assertEqual(sum(count for _, count in merged[0]), 260)
+            self.assertEqual(merged[8], [])
+
+
+    def test_keystream_bias(self):
+        # The second keystream byte is biased towards zero (Mantin-Shamir)
+        bias_map = RC4BiasMap.generate_random(2**14, bytes(2))
+        self.assertEqual(bias_map.most_common(1, 1)[0][0], 0)
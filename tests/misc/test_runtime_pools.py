@@ -0,0 +1,81 @@
+from samson.utilities.runtime import RUNTIME
+import subprocess
+import unittest
+import time
+import sys
+import os
+
+
+def square(x):
+    return x*x
+
+
+def add(a, b):
+    return a + b
+
+
+def delay(x):
+    time.sleep(0.01 if x else 0)
+    return x
+
+
+class RuntimePoolsTestCase(unittest.TestCase):
+    def test_parallel(self):
+        self.assertEqual(RUNTIME.parallel(2)(square)(range(20)), [x*x for x in range(20)])
+        self.assertEqual(RUNTIME.parallel(2, starmap=True)(add)([(1, 2), (3, 4)]), [3, 7])
+
+        # The pool is kept alive between calls
+        pool = RUNTIME.get_pool('process', 2)
+        RUNTIME.parallel(2)(square)(range(5))
+        self.assertIs(RUNTIME.get_pool('process', 2), pool)
+
+
+    def test_threaded(self):
+        self.assertEqual(RUNTIME.threaded(4)(square)(range(20)), [x*x for x in range(20)])
+        self.assertEqual(sorted(RUNTIME.threaded(3, stream=True)(square)(range(6))), [x*x for x in range(6)])
+
+
+    def test_terminate(self):
+        results = RUNTIME.threaded(2, terminate_filter=lambda results: 0 in results)(delay)(range(100))
+        self.assertIn(0, results)
+        self.assertLess(len(results), 100)
+
+
+    def test_terminate_processes(self):
+        # Stale process workers must be killed, or the interpreter waits for them on exit
+        script = '\n'.join([
+            'from samson.utilities.runtime import RUNTIME',
+            'import time',
+            'RUNTIME.parallel(2, terminate_filter=lambda results: True, chunk_size=1)(time.sleep)([0.1, 8, 8, 8])'
+        ])
+
+        env   = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        start = time.time()
+        subprocess.run([sys.executable, '-c', script], env=env, check=True, timeout=60)
+        self.assertLess(time.time() - start, 6)
+
+
+    def test_terminate_keeps_shared_pool(self):
+        # Killing stale workers must not break other callers of the shared pool
+        pool   = RUNTIME.get_pool('process', 2)
+        future = pool.submit(delay, 1)
+
+        RUNTIME.parallel(2, terminate_filter=lambda results: True, chunk_size=1)(time.sleep)([0, 2, 2, 2])
+        self.assertEqual(future.result(), 1)
+        self.assertIs(RUNTIME.get_pool('process', 2), pool)
+        self.assertEqual(RUNTIME.parallel(2)(square)(range(5)), [x*x for x in range(5)])
+
+
+    def test_nested(self):
+        @RUNTIME.threaded(2)
+        def outer(x):
+            return sum(RUNTIME.threaded(2)(square)(range(x)))
+
+        self.assertEqual(outer(range(5)), [sum(x*x for x in range(n)) for n in range(5)])
+
+
+    def test_retire_pool(self):
+        pool = RUNTIME.get_pool('thread', 3)
+        RUNTIME.retire_pool('thread', 3)
+        self.assertIsNot(RUNTIME.get_pool('thread', 3), pool)
+        self.assertEqual(RUNTIME.threaded(3)(square)(range(5)), [x*x for x in range(5)])
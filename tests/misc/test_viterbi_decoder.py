@@ -1,4 +1,5 @@
 from samson.auxiliary.viterbi_decoder import ViterbiDecoder
+from samson.auxiliary.ngram_table import NgramTable
 from samson.analysis.general import levenshtein_distance
 import unittest
 
@@ -27,3 +28,42 @@ class ViterbiDecoderTestCase(unittest.TestCase):
 
             most_probable_decoding = vd.score(smashed_together)[1]
             self.assertLessEqual(levenshtein_distance(most_probable_decoding, correct), 2)
+
+
+    def test_incremental(self):
+        one_grams = {'the': 500, 'cat': 50, 'sat': 40, 'on': 300, 'mat': 20, 'a': 400, 'at': 200, 'he': 100, 'them': 30}
+        two_grams = {'the cat': 40, 'cat sat': 30, 'sat on': 30, 'on the': 200, 'the mat': 15}
+
+        vd   = ViterbiDecoder(one_grams, two_grams, num_tokens=10000)
+        text = 'THECATSATONTHEMAT'
+        self.assertEqual(vd.score(text)[1], ['THE', 'CAT', 'SAT', 'ON', 'THE', 'MAT'])
+
+        # Appending and modifying reuse the previous lattice but must match a fresh decoding
+        for variant in ['THECATSATONTHEMATA', 'THECATSATONAMAT', 'THE', 'ATHECAT', 'THECATSATONTHEMAT']:
+            self.assertEqual(vd.score(variant), ViterbiDecoder(one_grams, two_grams, num_tokens=10000).score(variant))
+
+
+    def test_ngram_table(self):
+        import tempfile, os
+        table = NgramTable.from_dict({'THE': -1.5, 'OF THE': -0.5, 'ZEBRA': -7.25})
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'table.bin')
+            table.save(path)
+            loaded = NgramTable.load(path)
+
+            for key in ['THE', 'OF THE', 'ZEBRA', 'OF', 'A', 'ZZZ']:
+                self.assertEqual(loaded.get(key), table.get(key))
+
+            loaded.keys.close()
+
+
+    def test_bounded_caches(self):
+        one_grams = {'the': 500, 'cat': 50, 'sat': 40, 'on': 300, 'mat': 20}
+        vd = ViterbiDecoder(one_grams, {'the cat': 40}, num_tokens=10000, cache_size=64)
+        vd.Pw.memo_size = 16
+
+        decoding = vd.score('THECATSATONTHEMAT' * 4)
+        self.assertLessEqual(len(vd._cPw_cache), 64)
+        self.assertLessEqual(len(vd.Pw._memo), 16)
+        self.assertEqual(decoding, ViterbiDecoder(one_grams, {'the cat': 40}, num_tokens=10000).score('THECATSATONTHEMAT' * 4))
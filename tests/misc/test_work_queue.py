@@ -0,0 +1,126 @@
+from samson.auxiliary.work_queue import WorkQueue, WorkQueueServer, RemoteWorkQueue, TaskStatus
+from multiprocessing import Process, AuthenticationError
+import tempfile
+import unittest
+import os
+
+
+def square(x):
+    return x*x
+
+
+def flaky(path):
+    # Fails the first time it's called
+    if not os.path.exists(path):
+        open(path, 'w').close()
+        raise ValueError('Transient failure')
+
+    return True
+
+
+def fail(x):
+    raise ValueError('Permanent failure')
+
+
+def run_worker(path):
+    WorkQueue(path).start_worker(poll_interval=0.05, stop_when_idle=True)
+
+
+def run_remote_worker(address, authkey):
+    RemoteWorkQueue(address, authkey).start_worker(poll_interval=0.05, stop_when_idle=True)
+
+
+class WorkQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir  = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'queue.db')
+
+
+    def test_map(self):
+        queue = WorkQueue(self.path)
+        self.assertEqual(queue.map(square, range(50), chunk_size=7).results(work=True), [x*x for x in range(50)])
+        self.assertEqual(queue.distribute(lambda a, b: a + b, [(1, 2), (3, 4)]), [3, 7])
+        self.assertEqual(queue.run(pow, 3, 5, 7), pow(3, 5, 7))
+
+
+    def test_workers(self):
+        queue   = WorkQueue(self.path)
+        job     = queue.map(square, range(200), chunk_size=10)
+        workers = [Process(target=run_worker, args=(self.path,)) for _ in range(2)]
+
+        for worker in workers:
+            worker.start()
+
+        self.assertEqual(job.results(poll_interval=0.05, timeout=60), [x*x for x in range(200)])
+
+        for worker in workers:
+            worker.join()
+
+
+    def test_search(self):
+        queue    = WorkQueue(self.path)
+        job      = queue.search(lambda chunk: next((x for x in chunk if x*x == 123**2), None), range(10000), 50)
+        idx, sol = job.first(work=True)
+
+        self.assertEqual((idx, sol), (2, 123))
+        self.assertGreater(job.status()[TaskStatus.CANCELLED], 0)
+
+
+    def test_resume(self):
+        queue = WorkQueue(self.path)
+        job   = queue.submit(square, list(range(20)), name='squares', starmap=False)
+        self.assertEqual(queue.start_worker(max_tasks=5), 5)
+
+        # Restart
+        queue = WorkQueue(self.path)
+        job   = queue.submit(square, list(range(20)), name='squares', starmap=False)
+        self.assertEqual(job.status()[TaskStatus.DONE], 5)
+        self.assertEqual(job.results(work=True), [x*x for x in range(20)])
+
+
+    def test_retries(self):
+        queue = WorkQueue(self.path, retries=1)
+        self.assertEqual(queue.submit(flaky, [os.path.join(self.dir, 'marker')], starmap=False).results(work=True), [True])
+
+        with self.assertRaises(RuntimeError):
+            queue.submit(fail, [1], starmap=False).results(work=True)
+
+
+    def test_lease_expiry(self):
+        queue = WorkQueue(self.path, lease=0)
+        job   = queue.submit(square, [3], starmap=False)
+
+        # Simulate a worker that claims the task and dies
+        queue._claim()
+        self.assertEqual(job.status()[TaskStatus.RUNNING], 1)
+        self.assertEqual(job.get(work=True), 9)
+
+
+    def test_remote(self):
+        server = WorkQueueServer(WorkQueue(self.path), ('127.0.0.1', 0), authkey=b'key').start()
+
+        try:
+            queue   = RemoteWorkQueue(server.address, b'key')
+            job     = queue.map(square, range(200), chunk_size=10, name='remote')
+            workers = [Process(target=run_remote_worker, args=(server.address, b'key')) for _ in range(2)]
+
+            for worker in workers:
+                worker.start()
+
+            self.assertEqual(job.results(poll_interval=0.05, timeout=60), [x*x for x in range(200)])
+
+            for worker in workers:
+                worker.join()
+
+            # Jobs live in the served queue
+            self.assertEqual(WorkQueue(self.path).job('remote').status()[TaskStatus.DONE], 20)
+            self.assertEqual(queue.search(lambda chunk: next((x for x in chunk if x == 777), None), range(10000), 100).first(work=True), (7, 777))
+
+            with self.assertRaises(RuntimeError):
+                queue.submit(fail, [1], starmap=False).results(work=True)
+
+            with self.assertRaises(AuthenticationError):
+                RemoteWorkQueue(server.address, b'wrong').jobs()
+
+        finally:
+            server.close()
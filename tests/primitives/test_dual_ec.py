@@ -4,21 +4,57 @@ import unittest
 
 
 class DualECTestCase(unittest.TestCase):
-    # TODO: This is too slow to run in testing! Need better performance
-    # def test_generate_backdoor(self):
-    #     from samson.utilities.bytes import Bytes
+    def test_derive_from_backdoor(self):
+        from samson.utilities.bytes import Bytes
 
-    #     for num_next_bytes in range(1, 3):
-    #         (P, Q, d) = DualEC.generate_backdoor(P256)
-    #         dual_ec = DualEC(P, Q, Bytes.random(8).int())
+        (P, Q, d) = DualEC.generate_backdoor(P256)
 
-    #         next_bytes = dual_ec.generate() + dual_ec.generate()[:num_next_bytes]
+        # Pick a state whose truncated bits are small so the search stops in the first batch
+        while True:
+            dual_ec    = DualEC(P, Q, Bytes.random(8).int())
+            next_bytes = dual_ec.generate()
 
-    #         derived_dual_ecs = DualEC.derive_from_backdoor(P, Q, d, next_bytes)
-    #         expected_output  = [dual_ec.generate() for _ in range(5)]
-    #         cracked_outputs  = [[possible_crack.generate() for _ in range(5)] for possible_crack in derived_dual_ecs]
+            if (dual_ec.r >> 240) < 2**11:
+                break
 
-    #         self.assertTrue(any([expected_output in cracked_outputs]))
+        next_bytes += dual_ec.generate()[:4]
+
+        derived_dual_ecs = DualEC.derive_from_backdoor(P, Q, d, next_bytes)
+        expected_output  = [dual_ec.generate() for _ in range(5)]
+        cracked_outputs  = [[possible_crack.generate() for _ in range(5)] for possible_crack in derived_dual_ecs]
+
+        self.assertIn(expected_output, cracked_outputs)
+
+
+    def _backdoored_output(self, P, Q, low, high, extra_bytes):
+        from samson.utilities.bytes import Bytes
+
+        # Pick a state whose truncated bits fall in [`low`, `high`)
+        while True:
+            dual_ec    = DualEC(P, Q, Bytes.random(8).int())
+            next_bytes = dual_ec.generate()
+
+            if low <= (dual_ec.r >> 240) < high:
+                return dual_ec, next_bytes + dual_ec.generate()[:extra_bytes]
+
+
+    def test_derive_from_backdoor_later_batch(self):
+        (P, Q, d) = DualEC.generate_backdoor(P256)
+        dual_ec, next_bytes = self._backdoored_output(P, Q, 2**12, 2**13, 4)
+
+        derived_dual_ecs = DualEC.derive_from_backdoor(P, Q, d, next_bytes, processes=2)
+        expected_output  = [dual_ec.generate() for _ in range(5)]
+        self.assertIn(expected_output, [[possible_crack.generate() for _ in range(5)] for possible_crack in derived_dual_ecs])
+
+
+    def test_derive_from_backdoor_all_matches(self):
+        (P, Q, d) = DualEC.generate_backdoor(P256)
+        dual_ec, next_bytes = self._backdoored_output(P, Q, 2**15, 2**16, 2)
+
+        # Only two bytes of the second output can't rule out false positives, so the whole space is searched
+        derived_dual_ecs = DualEC.derive_from_backdoor(P, Q, d, next_bytes)
+        expected_output  = [dual_ec.generate() for _ in range(5)]
+        self.assertIn(expected_output, [[possible_crack.generate() for _ in range(5)] for possible_crack in derived_dual_ecs])
 
 
 
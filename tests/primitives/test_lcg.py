@@ -38,6 +38,28 @@ class LCGTestCase(unittest.TestCase):
 
 
 
+    def test_truncated_crack_java(self):
+        for _ in range(10):
+            ref_lcg = LCG(X=Bytes.random(6).int(), a=0x5DEECE66D, c=11, m=2**48, trunc=16)
+            outputs = [ref_lcg.generate() for _ in range(6)]
+
+            cracked_lcg = ref_lcg.crack(outputs)
+            self.assertEqual([ref_lcg.generate() for _ in range(1000)], [cracked_lcg.generate() for _ in range(1000)])
+
+
+    def test_truncated_crack_unknown_increment(self):
+        for trunc_amount in range(4, 13, 4):
+            ref_lcg    = LCG(X=Bytes.random(4).int() % 2**31, a=1103515245, c=12345, m=2**31, trunc=trunc_amount)
+            outputs    = [ref_lcg.generate() for _ in range(10)]
+            to_predict = [ref_lcg.generate() for _ in range(50)]
+
+            cracked_lcg = LCG.crack_truncated(outputs, to_predict, multiplier=ref_lcg.a, increment=None, modulus=ref_lcg.m, trunc_amount=trunc_amount)
+
+            accuracy = sum([ref_lcg.generate() == cracked_lcg.generate() for _ in range(1000)]) / 1000
+            self.assertGreater(accuracy, 0.9)
+
+
+
     def test_correctness(self):
         for _ in range(100):
             seed = Bytes.random(16).int()
@@ -1,6 +1,7 @@
 from samson.prngs.mt19937 import MT19937
 import unittest
 import random
+import time
 
 class MT19937TestCase(unittest.TestCase):
     def test_vec0(self):
@@ -26,3 +27,50 @@ class MT19937TestCase(unittest.TestCase):
 
             # Does it work for an entire state over a twist boundary?
             self.assertEqual([mt.generate() for _ in range(624*2)][::-1], [mt.reverse_clock() for _ in range(624*2)])
+
+
+    def test_python_seed(self):
+        for seed in [0, 255, 256, random.getrandbits(32), random.getrandbits(100)]:
+            random.seed(seed)
+            self.assertEqual(MT19937.python_seed(seed).generate(), random.getrandbits(32))
+
+        random.seed()
+
+
+    def test_crack_partial(self):
+        for bits in [8, 32]:
+            outputs = [random.getrandbits(bits) for _ in range(19968 // bits + 256)]
+
+            # Drop some outputs
+            outputs[100:120] = [None]*20
+
+            mt = MT19937.crack_partial(outputs, bits=bits)
+            self.assertEqual([mt.generate() >> (32 - bits) for _ in range(1000)], [random.getrandbits(bits) for _ in range(1000)])
+
+
+    def test_recover_seed(self):
+        seed = random.randint(0, 2**32-1000)
+        mt   = MT19937(seed)
+        outputs = [mt.generate() for _ in range(3)]
+
+        self.assertEqual(MT19937.recover_seed(outputs, start=seed-500, stop=seed+500), seed)
+
+        index = MT19937.build_seed_index(seed-200, seed+200)
+        self.assertEqual(MT19937.recover_seed(outputs, index=index), seed)
+
+        random.seed(seed)
+        outputs = [random.getrandbits(16) for _ in range(2)]
+        random.seed()
+
+        self.assertEqual(MT19937.recover_seed(outputs, seed_type='python', bits=16, start=seed-50, stop=seed+50), seed)
+
+
+    def test_recover_seed_parallel(self):
+        seed = random.randint(1000, 2**32-2**23)
+        mt   = MT19937(seed)
+        outputs = [mt.generate() for _ in range(2)]
+
+        # The sweep stops soon after the hit instead of finishing the range
+        start = time.time()
+        self.assertEqual(MT19937.recover_seed(outputs, start=seed-1000, stop=seed+2**23, processes=2), seed)
+        self.assertLess(time.time() - start, 30)
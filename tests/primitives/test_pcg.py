@@ -1,4 +1,5 @@
 from samson.prngs.pcg import PCG
+from samson.utilities.bytes import Bytes
 import unittest
 
 # Test vectors manually generated from reference code
@@ -59,6 +60,15 @@ class PCGTestCase(unittest.TestCase):
         self._run_test(seed, multiplier, increment, expected_results)
 
 
+    def test_crack(self):
+        for _ in range(3):
+            pcg     = PCG(seed=Bytes.random(8).int(), multiplier=6364136223846793005, increment=Bytes.random(8).int() | 1)
+            outputs = [pcg.generate() for _ in range(4)]
+            cracked = PCG.crack(outputs, pcg.multiplier, pcg.increment)
+
+            self.assertEqual([pcg.generate() for _ in range(100)], [cracked.generate() for _ in range(100)])
+
+
 def test_vec1(self):
         seed = 13380192364271375673
         multiplier = 1738637689866693019
@@ -0,0 +1,57 @@
+from samson.prngs.bitsliced_flfsr import BitslicedFLFSR
+from samson.prngs.word_lfsr import WordLFSR
+from samson.prngs.flfsr import FLFSR
+from samson.prngs.glfsr import GLFSR
+from samson.utilities.bytes import Bytes
+import unittest
+
+
+class WordLFSRTestCase(unittest.TestCase):
+    def test_generate_bits(self):
+        for length in [1, 7, 19, 23, 64, 89]:
+            for _ in range(8):
+                taps  = list({Bytes.random(1).int() % length for _ in range(4)})
+                seed  = Bytes.random(12).int()
+                num   = Bytes.random(2).int() % 1000
+                word  = WordLFSR(length, taps, seed)
+                ref   = WordLFSR(length, taps, seed)
+                bits  = sum(ref.clock() << i for i in range(num))
+
+                self.assertEqual(word.generate_bits(num), bits)
+                self.assertEqual(word.state, ref.state)
+
+
+    def test_jump(self):
+        for length in [3, 19, 22, 23, 64]:
+            taps = [0, length // 2]
+            ref  = WordLFSR(length, taps, 1)
+            word = WordLFSR(length, taps, 1)
+
+            for num in [0, 1, 100, 1000]:
+                ref.generate_bits(num)
+                word.jump(num)
+                self.assertEqual(word.state, ref.state)
+
+
+    def test_flfsr_jump(self):
+        poly = (1 << 16) | (1 << 14) | (1 << 13) | (1 << 11) | 1
+
+        for num in [0, 63, 64, 65, 1000]:
+            for cls in [FLFSR, GLFSR]:
+                ref, lfsr = cls(0xACE1, poly), cls(0xACE1, poly)
+                [ref.clock() for _ in range(num)]
+                lfsr.jump(num)
+
+                self.assertEqual(lfsr.state, ref.state)
+                self.assertEqual([lfsr.clock() for _ in range(100)], [ref.clock() for _ in range(100)])
+
+
+    def test_bitsliced_jump(self):
+        for length, clock_bit, taps in [(19, 10, [13, 16, 17, 18]), (22, 11, [20, 21]), (23, 12, [7, 20, 21, 22])]:
+            seed = Bytes.random(3).int()
+            ref, lfsr = BitslicedFLFSR(length, clock_bit, taps, seed), BitslicedFLFSR(length, clock_bit, taps, seed)
+            [ref.clock() for _ in range(5000)]
+            lfsr.jump(5000)
+
+            self.assertEqual(lfsr.state, ref.state)
+            self.assertEqual([lfsr.generate() for _ in range(100)], [ref.generate() for _ in range(100)])
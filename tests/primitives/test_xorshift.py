@@ -798,3 +798,38 @@ class XorshiftTestCase(unittest.TestCase):
         other_xs = IterativePRNG.crack(Xorshift128Plus, out)
 
         self.assertEqual(xs.state, other_xs.state)
+
+
+    def test_crack_partial(self):
+        xs  = Xorshift128([Bytes.random(8).int() for _ in range(4)])
+        out = [xs.generate() for _ in range(24)]
+
+        # Observe only the top 32 bits and skip some outputs
+        observed = [(o, 0xFFFFFFFF << 32) if i % 3 else None for i, o in enumerate(out)]
+        other_xs = IterativePRNG.crack(Xorshift128, observed)
+
+        self.assertEqual(xs.state, other_xs.state)
+
+
+    def test_crack_math_random(self):
+        # V8's Math.random returns the top 53 bits of `state[0]` as a double
+        xs = Xorshift128Plus([Bytes.random(8).int(), Bytes.random(8).int()])
+        doubles = []
+
+        for _ in range(5):
+            xs.generate()
+            doubles.append((xs.state[0] >> 11) / 2**53)
+
+        observed = [(int(d * 2**53) << 11, (2**53 - 1) << 11) for d in doubles]
+        other_xs = IterativePRNG.crack(Xorshift128Plus, observed, observe=lambda state: state[0])
+
+        self.assertEqual(xs.state, other_xs.state)
+
+
+    def test_crack_lsb(self):
+        # Only the least significant bit of a '+' output is linear
+        xs  = Xorshift128Plus([Bytes.random(8).int(), Bytes.random(8).int()])
+        out = [(xs.generate(), 1) for _ in range(160)]
+        other_xs = IterativePRNG.crack(Xorshift128Plus, out)
+
+        self.assertEqual(xs.state, other_xs.state)